@@ -1,7 +1,6 @@
 """Intake agent for validating and preparing case data."""
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
-import json
 from pathlib import Path
 from dataclasses import dataclass, field
 
@@ -9,6 +8,7 @@ from backend.models.case_state import CaseState, PatientInfo, MedicationRequest,
 from backend.models.enums import CaseStage, PayerStatus
 from backend.config.logging_config import get_logger
 from backend.config.settings import get_settings
+from backend.storage.patient_store import PatientStore, get_patient_store
 
 logger = get_logger(__name__)
 
@@ -46,6 +46,7 @@ class IntakeAgent:
             enable_mcp_validation: Enable external MCP validation (default True)
         """
         self.patients_dir = patients_dir or Path(get_settings().patients_dir)
+        self.patient_store = get_patient_store() if patients_dir is None else PatientStore(self.patients_dir)
         self.enable_mcp_validation = enable_mcp_validation
         logger.info("Intake agent initialized", mcp_validation=enable_mcp_validation)
 
@@ -254,20 +255,12 @@ class IntakeAgent:
         Returns:
             Patient data dictionary
         """
-        file_path = self.patients_dir / f"{patient_id}.json"
-
-        if not file_path.exists():
-            raise FileNotFoundError(f"Patient data not found: {patient_id}")
-
         import asyncio
 
-        def _read_json():
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-
-        data = await asyncio.to_thread(_read_json)
+        data = await asyncio.to_thread(self.patient_store.get_raw, patient_id)
+        if data is None:
+            raise FileNotFoundError(f"Patient data not found: {patient_id}")
 
-        logger.debug("Patient data loaded", patient_id=patient_id)
         return data
 
     def validate_patient_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,5 +1,4 @@
 """Policy analyzer agent for coverage assessment."""
-import json
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
@@ -7,13 +6,11 @@ from backend.models.coverage import CoverageAssessment
 from backend.models.case_state import CaseState
 from backend.reasoning.policy_reasoner import get_policy_reasoner
 from backend.storage.waypoint_writer import get_waypoint_writer
+from backend.storage.patient_store import get_patient_store
 from backend.config.logging_config import get_logger
-from backend.config.settings import get_settings
 
 logger = get_logger(__name__)
 
-PATIENTS_DIR = Path(get_settings().patients_dir)
-
 
 class PolicyAnalyzerAgent:
     """
@@ -395,12 +392,8 @@ class PolicyAnalyzerAgent:
     @staticmethod
     def _load_raw_patient_data(patient_id: str) -> Optional[Dict[str, Any]]:
         """Load full raw patient JSON from data file for clinical context enrichment."""
-        patient_file = PATIENTS_DIR / f"{patient_id}.json"
-        if not patient_file.exists():
-            return None
         try:
-            with open(patient_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return get_patient_store().get_raw(patient_id)
         except Exception as e:
             logger.warning("Could not load raw patient data", patient_id=patient_id, error=str(e))
             return None
@@ -148,6 +148,8 @@ class StrategicIntelligenceAgent:
         self.historical_data_path = historical_data_path or Path(get_settings().historical_data_path)
         self._historical_data: Optional[Dict[str, Any]] = None
         self._historical_cases: Optional[List[Dict[str, Any]]] = None
+        # Lowercase medication name -> positions in _historical_cases
+        self._case_positions_by_medication: Dict[str, List[int]] = {}
         self.llm_gateway = get_llm_gateway()
         self.prompt_loader = get_prompt_loader()
         self.cache_ttl_hours = cache_ttl_hours
@@ -182,6 +184,10 @@ class StrategicIntelligenceAgent:
             self._historical_data = json.load(f)
 
         self._historical_cases = self._historical_data.get("cases", [])
+        self._case_positions_by_medication = {}
+        for position, case in enumerate(self._historical_cases):
+            case_med = case.get("medication", {}).get("name", "").lower()
+            self._case_positions_by_medication.setdefault(case_med, []).append(position)
         logger.info(
             "Loaded historical PA cases",
             count=len(self._historical_cases),
@@ -766,6 +772,29 @@ class StrategicIntelligenceAgent:
 
         return patterns
 
+    def _cases_for_medication(self, medication_name: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Historical cases whose medication matches, in file order.
+
+        Matches by substring either way, or via the brand/generic aliases from
+        config. The match is decided once per distinct case medication name.
+        """
+        if not medication_name:
+            return []
+        from backend.policy_digitalization.pipeline import MEDICATION_NAME_ALIASES
+
+        cases = self.historical_cases
+        med_lower = medication_name.lower()
+        alias = MEDICATION_NAME_ALIASES.get(med_lower, "")
+        positions: List[int] = []
+        for case_med, case_positions in self._case_positions_by_medication.items():
+            if (
+                med_lower in case_med or case_med in med_lower
+                or (alias and (alias in case_med or case_med in alias))
+            ):
+                positions.extend(case_positions)
+        return [cases[position] for position in sorted(positions)]
+
     def _analyze_compensating_factors(
         self,
         similar_cases: List[SimilarCase],
@@ -793,35 +822,8 @@ class StrategicIntelligenceAgent:
 
         # Get ALL cases with same medication/payer for comprehensive pattern analysis
         # This is critical - we need both severe+approved AND mild+denied cases to detect patterns
-        all_relevant_cases = []
-        for case in self.historical_data.get("cases", []):
-            case_med = case.get("medication", {}).get("name", "").lower()
-            case_payer = case.get("payer", {}).get("name", "").lower()
-
-            # Check for medication match (more lenient matching)
-            # Uses medication aliases from config for brand/generic resolution
-            med_match = False
-            if medication_name:
-                med_lower = medication_name.lower()
-                if med_lower in case_med or case_med in med_lower:
-                    med_match = True
-                # Also match on brand/generic aliases from config
-                if not med_match:
-                    from backend.policy_digitalization.pipeline import MEDICATION_NAME_ALIASES
-                    alias = MEDICATION_NAME_ALIASES.get(med_lower, "")
-                    if alias and (alias in case_med or case_med in alias):
-                        med_match = True
-
-            # Check for payer match
-            payer_match = False
-            if payer_name:
-                payer_lower = payer_name.lower()
-                if payer_lower in case_payer or case_payer in payer_lower:
-                    payer_match = True
-
-            # Include if medication matches (payer match optional for more data)
-            if med_match:
-                all_relevant_cases.append(case)
+        # Medication match only (payer match optional for more data)
+        all_relevant_cases = self._cases_for_medication(medication_name)
 
         logger.info(
             "Compensating factor analysis: using all relevant cases",
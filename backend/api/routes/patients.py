@@ -9,6 +9,7 @@ from backend.api.requests import UpdatePatientFieldRequest
 
 from backend.config.logging_config import get_logger
 from backend.config.settings import get_settings
+from backend.storage.patient_store import get_patient_store
 
 logger = get_logger(__name__)
 
@@ -35,13 +36,14 @@ async def list_available_patients() -> Dict[str, Any]:
     for each patient (demographics, payer, medication, diagnosis).
     """
     patients = []
+    store = get_patient_store()
 
-    for patient_file in sorted(PATIENTS_DIR.glob("*.json")):
+    for patient_id in store.list_ids():
         try:
-            with open(patient_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = store.get_raw(patient_id, copy=False)
+            if data is None:
+                continue
 
-            patient_id = patient_file.stem
             demographics = data.get("demographics", {})
             insurance = data.get("insurance", {})
             medication = data.get("medication_request") or data.get("medication", {}) or {}
@@ -97,7 +99,7 @@ async def list_available_patients() -> Dict[str, Any]:
                 "indication": indication,
             })
         except Exception as e:
-            logger.warning("Failed to read patient file", file=str(patient_file), error=str(e))
+            logger.warning("Failed to read patient file", patient_id=patient_id, error=str(e))
 
     return {
         "patients": patients,
@@ -105,6 +107,36 @@ async def list_available_patients() -> Dict[str, Any]:
     }
 
 
+@router.get("/cohort")
+async def get_patient_cohort(
+    payer: Optional[str] = None,
+    medication: Optional[str] = None,
+    icd10_family: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Patient IDs matching a payer, medication and/or ICD-10 family.
+
+    Served from the population index; only changed patient files are re-read.
+
+    Args:
+        payer: Primary payer name (case-insensitive)
+        medication: Requested medication, brand or generic (case-insensitive)
+        icd10_family: ICD-10 family, e.g. 'K50' (first three characters)
+
+    Returns:
+        Matching patient IDs
+    """
+    from backend.storage.population_index import get_patient_population_index
+
+    patient_ids = get_patient_population_index().patient_ids(
+        payer=payer, medication=medication, icd10_family=icd10_family,
+    )
+    return {
+        "patient_ids": patient_ids,
+        "total": len(patient_ids),
+    }
+
+
 @router.get("/{patient_id}/data")
 async def get_patient_data(patient_id: str) -> Dict[str, Any]:
     """
@@ -126,11 +158,14 @@ async def get_patient_data(patient_id: str) -> Dict[str, Any]:
         raise HTTPException(status_code=404, detail=f"Patient data not found: {patient_id}")
 
     try:
-        with open(patient_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = get_patient_store().get_raw(patient_id, copy=False)
+        if data is None:
+            raise HTTPException(status_code=404, detail=f"Patient data not found: {patient_id}")
 
         logger.info("Patient data retrieved", patient_id=patient_id)
         return data
+    except HTTPException:
+        raise
     except json.JSONDecodeError as e:
         logger.error("Invalid JSON in patient file", patient_id=patient_id, error=str(e))
         raise HTTPException(status_code=500, detail="Invalid patient data format")
@@ -139,6 +174,55 @@ async def get_patient_data(patient_id: str) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/{patient_id}/policy-options")
+async def get_patient_policy_options(patient_id: str, include_details: bool = False) -> Dict[str, Any]:
+    """
+    Rank every digitized policy by how well the patient satisfies it.
+
+    The patient is read and normalized once, then evaluated deterministically
+    against each cached policy.
+
+    Args:
+        patient_id: Patient identifier (e.g., 'maria_r', 'david_c')
+        include_details: Include the full evaluation result for each option
+
+    Returns:
+        Payer/medication options ordered by overall readiness, best first
+    """
+    import asyncio
+    from backend.policy_digitalization.evaluation_matrix import rank_policies_for_patient
+    from backend.policy_digitalization.policy_repository import get_policy_repository
+
+    patient_file = PATIENTS_DIR / f"{patient_id}.json"
+    _validate_patient_path(patient_file)
+
+    if not patient_file.exists():
+        raise HTTPException(status_code=404, detail=f"Patient data not found: {patient_id}")
+
+    try:
+        patient = get_patient_store().get_normalized(patient_id)
+        if patient is None:
+            raise HTTPException(status_code=404, detail=f"Patient data not found: {patient_id}")
+
+        policies = await get_policy_repository().load_all()
+        options = await asyncio.to_thread(rank_policies_for_patient, patient, policies, include_details)
+
+        logger.info("Patient policy options ranked", patient_id=patient_id, policies=len(policies))
+        return {
+            "patient_id": patient_id,
+            "options": options,
+            "total": len(options),
+        }
+    except HTTPException:
+        raise
+    except json.JSONDecodeError as e:
+        logger.error("Invalid JSON in patient file", patient_id=patient_id, error=str(e))
+        raise HTTPException(status_code=500, detail="Invalid patient data format")
+    except Exception as e:
+        logger.error("Error ranking policy options", patient_id=patient_id, error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/{patient_id}/documents")
 async def list_patient_documents(patient_id: str) -> Dict[str, Any]:
     """
@@ -228,8 +312,10 @@ async def update_patient_field(
         raise HTTPException(status_code=404, detail=f"Patient data not found: {patient_id}")
 
     try:
-        with open(patient_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        store = get_patient_store()
+        data = store.get_raw(patient_id)
+        if data is None:
+            raise HTTPException(status_code=404, detail=f"Patient data not found: {patient_id}")
 
         # Navigate to the field and update
         old_value = _get_nested_value(data, request.section)
@@ -248,9 +334,8 @@ async def update_patient_field(
             "timestamp": datetime.now(timezone.utc).isoformat()
         })
 
-        # Save updated data
-        with open(patient_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        # Save updated data (refreshes the cached record)
+        store.save(patient_id, data)
 
         logger.info(
             "Patient data field updated",
@@ -267,6 +352,8 @@ async def update_patient_field(
             "new_value": request.value,
             "correction_recorded": True
         }
+    except HTTPException:
+        raise
     except KeyError:
         raise HTTPException(status_code=400, detail=f"Field not found: {request.section}")
     except Exception as e:
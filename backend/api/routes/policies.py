@@ -5,8 +5,8 @@ import hashlib
 import traceback
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, List
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from typing import Any, Dict, Optional, List
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
 from pydantic import BaseModel, Field, field_validator
 
 from backend.api.requests import AnalyzePoliciesRequest
@@ -193,7 +193,6 @@ async def infer_policy_metadata(file: UploadFile = File(...)):
     the document directly — no local PDF parsing needed.
     """
     from pathlib import Path
-    import tempfile
     from backend.reasoning.prompt_loader import get_prompt_loader
     from backend.models.enums import TaskCategory
 
@@ -233,36 +232,31 @@ async def infer_policy_metadata(file: UploadFile = File(...)):
             }
 
         else:
-            # PDF — upload to Gemini and let the model read the file directly
+            # PDF — upload to Gemini and let the model read the file directly.
+            # The handle is cached by content hash, so the extraction that
+            # usually follows for the same file reuses this upload.
             import google.generativeai as genai
             from backend.config.settings import get_settings
+            from backend.reasoning.gemini_file_cache import get_gemini_file_cache
 
             settings = get_settings()
             genai.configure(api_key=settings.gemini_api_key)
 
-            # Write bytes to a temp file so genai.upload_file can read it
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-                tmp.write(content_bytes)
-                tmp_path = tmp.name
-
-            try:
-                uploaded_file = genai.upload_file(tmp_path)
-                prompt = prompt_loader.load(
-                    "policy_digitalization/infer_metadata.txt",
-                    {"document_text": "[PDF DOCUMENT ATTACHED — read the uploaded file]"},
-                )
-                model = genai.GenerativeModel(settings.gemini_model or "gemini-3-pro-preview")
-                response = await model.generate_content_async(
-                    [uploaded_file, prompt],
-                    generation_config=genai.GenerationConfig(
-                        temperature=0.0,
-                        max_output_tokens=1024,
-                    ),
-                    request_options={"timeout": 60},
-                )
-                raw = response.text
-            finally:
-                Path(tmp_path).unlink(missing_ok=True)
+            uploaded_file = await get_gemini_file_cache().get_or_upload_bytes(content_bytes, suffix=".pdf")
+            prompt = prompt_loader.load(
+                "policy_digitalization/infer_metadata.txt",
+                {"document_text": "[PDF DOCUMENT ATTACHED — read the uploaded file]"},
+            )
+            model = genai.GenerativeModel(settings.gemini_model or "gemini-3-pro-preview")
+            response = await model.generate_content_async(
+                [uploaded_file, prompt],
+                generation_config=genai.GenerationConfig(
+                    temperature=0.0,
+                    max_output_tokens=1024,
+                ),
+                request_options={"timeout": 60},
+            )
+            raw = response.text
 
             # Parse the raw text response from Gemini using robust JSON extractor
             from backend.reasoning.json_utils import extract_json_from_text
@@ -322,31 +316,40 @@ async def upload_policy(
         # Query directly for the hash instead of loading all rows
         from sqlalchemy import cast, String
         stmt = (
-            select(PolicyCacheModel)
+            select(
+                PolicyCacheModel.id,
+                PolicyCacheModel.payer_name,
+                PolicyCacheModel.medication_name,
+                PolicyCacheModel.policy_version,
+                PolicyCacheModel.parsed_criteria["extraction_quality"].as_string().label("extraction_quality"),
+            )
             .where(PolicyCacheModel.parsed_criteria.isnot(None))
             .where(PolicyCacheModel.parsed_criteria["source_document_hash"].as_string() == file_hash)
             .order_by(PolicyCacheModel.cached_at.desc())
             .limit(1)
         )
         result = await session.execute(stmt)
-        row = result.scalar_one_or_none()
-        if row:
-            logger.info(
-                "Upload skipped — identical file already exists",
-                payer=row.payer_name, medication=row.medication_name,
-                version=row.policy_version,
-            )
-            return {
-                "status": "unchanged",
-                "version": row.policy_version,
-                "cache_id": row.id,
-                "extraction_quality": row.parsed_criteria.get("extraction_quality", "existing"),
-                "criteria_count": len(row.parsed_criteria.get("atomic_criteria", {})),
-                "indications_count": len(row.parsed_criteria.get("indications", [])),
-                "message": f"File already digitized as {row.payer_name}/{row.medication_name} {row.policy_version} — pipeline skipped.",
-            }
+        row = result.first()
 
     repo = get_policy_repository()
+    if row:
+        logger.info(
+            "Upload skipped — identical file already exists",
+            payer=row.payer_name, medication=row.medication_name,
+            version=row.policy_version,
+        )
+        # Counts come from the parsed policy (usually already in the repository's LRU)
+        existing = await repo.load_version(row.payer_name, row.medication_name, row.policy_version or "latest")
+        return {
+            "status": "unchanged",
+            "version": row.policy_version,
+            "cache_id": row.id,
+            "extraction_quality": row.extraction_quality or "existing",
+            "criteria_count": len(existing.atomic_criteria) if existing else 0,
+            "indications_count": len(existing.indications) if existing else 0,
+            "message": f"File already digitized as {row.payer_name}/{row.medication_name} {row.policy_version} — pipeline skipped.",
+        }
+
     existing_versions = await repo.list_versions(payer_safe, med_safe)
 
     # Save file to data/policies/ — suppress file watcher to avoid duplicate pipeline run
@@ -388,6 +391,7 @@ async def upload_policy(
             payer_name=payer_safe,
             medication_name=med_safe,
             skip_store=True,  # Upload endpoint handles versioned storage
+            version_label=version_label,
         )
 
         # Build DigitizedPolicy from pipeline result and store as versioned entry
@@ -400,6 +404,7 @@ async def upload_policy(
                 source_filename=file.filename,
                 upload_notes=amendment_notes,
                 amendment_date=parsed_amendment_date,
+                pipeline_metrics=result.metrics,
             )
         else:
             cache_id = result.cache_id
@@ -457,6 +462,9 @@ async def upload_policy(
             "extraction_quality": result.extraction_quality,
             "criteria_count": result.criteria_count,
             "indications_count": result.indications_count,
+            "incremental_validation": result.incremental_validation,
+            "base_version": result.base_version,
+            "metrics": result.metrics,
         }
     except HTTPException:
         raise
@@ -760,6 +768,8 @@ class DigitalizeRequest(BaseModel):
     medication_name: str
     policy_text: Optional[str] = Field(None, max_length=500_000)
     skip_validation: bool = False
+    force_refresh: bool = False  # Re-run Pass 1 extraction even if cached
+    full_validation: bool = False  # Re-validate every criterion, not only those changed since the stored version
 
 
 class EvaluateRequest(BaseModel):
@@ -802,6 +812,8 @@ async def digitalize_policy(request: DigitalizeRequest):
                 skip_validation=request.skip_validation,
                 payer_name=payer_safe,
                 medication_name=med_safe,
+                force_refresh=request.force_refresh,
+                incremental_validation=not request.full_validation,
             )
         else:
             # Load from file
@@ -816,6 +828,8 @@ async def digitalize_policy(request: DigitalizeRequest):
                 skip_validation=request.skip_validation,
                 payer_name=payer_safe,
                 medication_name=med_safe,
+                force_refresh=request.force_refresh,
+                incremental_validation=not request.full_validation,
             )
 
         return {
@@ -828,6 +842,12 @@ async def digitalize_policy(request: DigitalizeRequest):
             "quality_score": result.quality_score,
             "passes_completed": result.passes_completed,
             "corrections_count": result.corrections_count,
+            "extraction_cached": result.extraction_cached,
+            "incremental_validation": result.incremental_validation,
+            "criteria_validated": result.criteria_validated,
+            "criteria_carried_over": result.criteria_carried_over,
+            "criteria_streamed": result.criteria_streamed,
+            "metrics": result.metrics,
             "stored": result.stored,
             "cache_id": result.cache_id,
         }
@@ -853,6 +873,202 @@ async def evaluate_patient_against_policy(payer: str, medication: str, request:
     )
 
 
+class MatrixPolicyRef(BaseModel):
+    payer: str = Field(..., min_length=1, max_length=50, pattern=r"^[a-zA-Z0-9_-]+$")
+    medication: str = Field(..., min_length=1, max_length=50, pattern=r"^[a-zA-Z0-9_-]+$")
+
+
+class EvaluationMatrixRequest(BaseModel):
+    policies: Optional[List[MatrixPolicyRef]] = Field(None, max_length=500)
+    patient_ids: Optional[List[str]] = Field(None, max_length=10_000)
+    include_details: bool = False
+
+
+async def _load_normalized_patients(patient_ids: Optional[List[str]]) -> list:
+    """Load normalized patients (all, or the given IDs) from the patient store."""
+    from backend.storage.patient_store import get_patient_store
+
+    store = get_patient_store()
+    if patient_ids is None:
+        ids = store.list_ids()
+    else:
+        ids = [_validate_name(pid, "Patient ID") for pid in patient_ids]
+
+    loaded = await store.load_many_normalized(ids)
+    missing = [pid for pid in ids if pid not in loaded]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Patient data not found: {missing[0]}")
+    return [loaded[pid] for pid in ids]
+
+
+@router.post("/evaluation-matrix")
+async def evaluate_policy_matrix(request: EvaluationMatrixRequest):
+    """
+    Evaluate every patient against every cached digitized policy (or a subset).
+
+    Runs the deterministic evaluator in worker processes and streams one NDJSON
+    row per (policy, patient) pair as results complete.
+    """
+    from fastapi.responses import StreamingResponse
+    from backend.policy_digitalization.policy_repository import get_policy_repository
+    from backend.policy_digitalization.evaluation_matrix import stream_evaluation_matrix
+
+    try:
+        repo = get_policy_repository()
+        if request.policies is None:
+            policies = await repo.load_all()
+        else:
+            policies = []
+            for ref in request.policies:
+                payer_safe = _validate_name(ref.payer, "Payer")
+                med_safe = _validate_name(ref.medication, "Medication")
+                policy = await repo.load(payer_safe, med_safe)
+                if not policy:
+                    raise HTTPException(status_code=404, detail=f"Policy not found for {payer_safe}/{med_safe}")
+                policies.append(policy)
+
+        patients = await _load_normalized_patients(request.patient_ids)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error preparing evaluation matrix", error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    async def ndjson_rows():
+        rows = stream_evaluation_matrix(
+            policies,
+            patients,
+            include_details=request.include_details,
+            max_workers=get_settings().evaluation_workers or None,
+        )
+        async for row in rows:
+            yield json.dumps(row, default=str) + "\n"
+
+    return StreamingResponse(ndjson_rows(), media_type="application/x-ndjson")
+
+
+class WhatIfRequest(BaseModel):
+    patient_id: str = Field(..., min_length=1, max_length=50, pattern=r"^[a-zA-Z0-9_-]+$")
+    changes: List[Dict[str, Any]] = Field(..., max_length=50)
+
+
+@router.post("/{payer}/{medication}/what-if")
+async def evaluate_what_if(payer: str, medication: str, request: WhatIfRequest):
+    """
+    Deterministic what-if: re-evaluate a patient against a policy with hypothetical data changes.
+
+    Each change is {"op": "add"|"set", "field": ..., "value": ...} against the
+    normalized patient (e.g. add a negative TB screening to completed_screenings).
+    Only affected criteria are re-evaluated; no LLM call is made. Also returns,
+    per indication, the smallest set of INSUFFICIENT_DATA criteria whose
+    resolution would make it MET.
+    """
+    import asyncio
+    from backend.policy_digitalization.policy_repository import get_policy_repository
+    from backend.storage.patient_store import get_patient_store
+    from backend.policy_digitalization.counterfactual import PatientChange, baseline_evaluation, what_if
+    from backend.policy_digitalization.exceptions import EvaluationError
+
+    payer_safe = _validate_name(payer, "Payer")
+    med_safe = _validate_name(medication, "Medication")
+    patient_id = _validate_name(request.patient_id, "Patient ID")
+
+    try:
+        changes = [PatientChange(**change) for change in request.changes]
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid change: {e}")
+
+    try:
+        repo = get_policy_repository()
+        policy = await repo.load(payer_safe, med_safe)
+        if not policy:
+            raise HTTPException(status_code=404, detail=f"Policy not found for {payer_safe}/{med_safe}")
+
+        patient = get_patient_store().get_normalized(patient_id)
+        if patient is None:
+            raise HTTPException(status_code=404, detail=f"Patient data not found: {patient_id}")
+
+        def run():
+            # The store hands out one normalized instance per file version
+            baseline = baseline_evaluation(policy, patient, (patient_id, id(patient)))
+            return what_if(policy, patient, changes, baseline=baseline)
+
+        result = await asyncio.to_thread(run)
+        return result.model_dump(mode="json")
+    except HTTPException:
+        raise
+    except EvaluationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error("What-if evaluation error", payer=payer_safe, medication=med_safe, error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/evaluator-metrics")
+async def get_evaluator_metrics(reset: bool = False):
+    """
+    Per-criterion-type evaluator metrics for this server process.
+
+    Call counts, cumulative/mean/p95 latency, verdict distribution and
+    exception counts. Empty unless evaluator_metrics_enabled is set.
+
+    Args:
+        reset: Clear the counters after reading them
+    """
+    from backend.policy_digitalization.evaluator_metrics import dump_evaluator_metrics
+    return dump_evaluator_metrics(reset=reset)
+
+
+@router.get("/extraction-cache")
+async def get_extraction_cache_stats():
+    """Entry count, size and hit/miss counters of the Pass 1 extraction cache."""
+    from backend.policy_digitalization.extraction_cache import get_extraction_cache
+    return get_extraction_cache().stats()
+
+
+@router.delete("/extraction-cache")
+async def clear_extraction_cache(older_than_days: Optional[float] = Query(None, ge=0)):
+    """
+    Evict cached Pass 1 extractions.
+
+    Args:
+        older_than_days: Only evict entries not used within this many days (default: all)
+    """
+    from backend.policy_digitalization.extraction_cache import get_extraction_cache
+    removed = get_extraction_cache().clear(older_than_days=older_than_days)
+    return {"removed": removed}
+
+
+@router.get("/pipeline-metrics")
+async def get_pipeline_metrics(
+    payer: Optional[str] = None,
+    medication: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    top: int = Query(10, ge=1, le=100),
+):
+    """
+    Digitalization ledger aggregated over stored policies.
+
+    Per-pass run count, total/mean wall time, tokens, estimated cost, retries
+    and cache hits, plus the slowest and most expensive policies.
+
+    Args:
+        payer: Only policies of this payer
+        medication: Only policies of this medication (brand/generic aliases included)
+        limit: Most recent stored runs to aggregate
+        top: Policies listed as slowest / most expensive
+    """
+    from backend.policy_digitalization.pipeline_metrics import aggregate_pipeline_metrics
+    from backend.policy_digitalization.policy_repository import get_policy_repository
+
+    try:
+        rows = await get_policy_repository().list_pipeline_metrics(payer, medication, limit=limit)
+    except Exception as e:
+        logger.error("Pipeline metrics query failed", error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+    return aggregate_pipeline_metrics(rows, top=top)
+
+
 @router.get("/{payer}/{medication}/provenance")
 async def get_policy_provenance(payer: str, medication: str):
     """
@@ -973,42 +1189,22 @@ async def analyze_policy_impact(payer: str, medication: str, request: ImpactRequ
         differ = PolicyDiffer()
         diff = differ.diff(old_policy, new_policy)
 
-        # Get cases from DB (orchestrator cases)
+        # Get active cases from DB (orchestrator cases) for this payer/medication
         from backend.storage.database import get_db
-        from backend.storage.case_repository import CaseRepository
+        from backend.storage.patient_store import get_patient_store
+        from backend.storage.population_index import get_case_cohort_index, get_patient_population_index
 
         case_states = []
         async with get_db() as session:
-            case_repo = CaseRepository(session)
-            all_cases = await case_repo.get_all(limit=500)
-            for c in all_cases:
-                if c.stage in ("completed", "failed"):
-                    continue
-                med_data = c.medication_data or {}
-                med_name = (med_data.get("medication_name") or "").lower()
-                payer_keys = [k.lower() for k in (c.payer_states or {}).keys()]
-                if med_name != med_safe or payer_safe not in payer_keys:
-                    continue
-                case_states.append(c.to_dict())
-
-        # Also load patient JSON files from data/patients/
-        import json as _json
-        from pathlib import Path as _Path
-        patients_dir = _Path(get_settings().patients_dir)
-        if patients_dir.exists():
-            for pf in patients_dir.glob("*.json"):
-                try:
-                    with open(pf, "r", encoding="utf-8") as f:
-                        pdata = _json.load(f)
-                    # Match by medication (brand_name or medication_name) and payer
-                    med_req = pdata.get("medication_request", {})
-                    brand = (med_req.get("brand_name") or "").lower()
-                    generic = (med_req.get("medication_name") or "").lower()
-                    pt_payer = (pdata.get("insurance", {}).get("primary", {}).get("payer_name") or "").lower()
-                    if (med_safe in (brand, generic) or brand == med_safe or generic == med_safe) and pt_payer == payer_safe:
-                        case_states.append({"patient_data": pdata, "case_id": pdata.get("patient_id", pf.stem)})
-                except Exception:
-                    continue
+            cases = await get_case_cohort_index().active_cases(session, payer_safe, med_safe)
+            case_states.extend(c.to_dict() for c in cases)
+
+        # Also load matching patient JSON files (brand or generic medication name, primary payer)
+        patient_store = get_patient_store()
+        for patient_id in get_patient_population_index().patient_ids(payer=payer_safe, medication=med_safe):
+            pdata = patient_store.get_raw(patient_id, copy=False)
+            if pdata is not None:
+                case_states.append({"patient_data": pdata, "case_id": pdata.get("patient_id", patient_id)})
 
         # Analyze impact
         analyzer = PolicyImpactAnalyzer()
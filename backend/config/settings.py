@@ -1,6 +1,6 @@
 """Application settings loaded from environment variables."""
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -57,11 +57,102 @@ class Settings(BaseSettings):
     claude_max_output_tokens: int = Field(default=8192, description="Max output tokens for Claude")
     azure_max_output_tokens: int = Field(default=4096, description="Max output tokens for Azure OpenAI")
 
+    # Token pricing (estimates for usage/cost ledgers)
+    llm_cost_per_million_tokens: Dict[str, Dict[str, float]] = Field(
+        default={
+            "claude": {"input": 3.0, "output": 15.0},
+            "gemini": {"input": 2.0, "output": 12.0},
+            "azure_openai": {"input": 2.5, "output": 10.0},
+        },
+        description="USD per million input/output tokens by provider"
+    )
+
     # Data directories (relative to project root)
     patients_dir: str = Field(default="data/patients", description="Directory containing patient JSON files")
     policies_dir: str = Field(default="data/policies", description="Directory containing policy files")
     historical_data_path: str = Field(default="data/historical_pa_cases.json", description="Path to historical PA cases")
 
+    # Policy digitalization
+    extraction_cache_enabled: bool = Field(default=True, description="Reuse Pass 1 extractions for unchanged documents, prompts and models")
+    extraction_cache_dir: str = Field(default="data/cache/extraction", description="Directory for cached Pass 1 extractions")
+    extraction_cache_max_entries: int = Field(default=256, description="Cached Pass 1 extractions kept before LRU eviction (0 = unbounded)")
+    extraction_chunking_threshold_chars: int = Field(
+        default=100_000,
+        description="Policy texts longer than this are extracted in section chunks"
+    )
+    extraction_chunk_max_chars: int = Field(default=40_000, description="Maximum characters per Pass 1 extraction chunk")
+    extraction_chunk_concurrency: int = Field(default=4, description="Pass 1 chunk extractions run in parallel")
+    extraction_streaming_enabled: bool = Field(
+        default=True,
+        description="Stream Pass 1 responses and start Pass 3 code lookups for criteria as they complete"
+    )
+    policy_cache_max_entries: int = Field(
+        default=128,
+        description="Parsed DigitizedPolicy objects kept in memory by PolicyRepository (0 = disabled)"
+    )
+    incremental_validation_enabled: bool = Field(
+        default=True,
+        description="For new versions of a stored policy, Pass 2 validates only added/modified criteria"
+    )
+    incremental_validation_max_changed_ratio: float = Field(
+        default=0.5,
+        description="Fall back to full Pass 2 validation when more than this share of criteria changed"
+    )
+    digitalization_checkpoint_dir: str = Field(
+        default="data/cache/digitalization_runs",
+        description="Directory for batch digitalization checkpoints (one subdirectory per run ID)"
+    )
+    digitalization_batch_concurrency: int = Field(default=8, description="Batch digitalization items in flight at once")
+    digitalization_provider_concurrency: Dict[str, int] = Field(
+        default={"gemini": 4, "claude": 2, "azure_openai": 2, "reference": 8},
+        description="Concurrent batch digitalization passes per provider (reference = Pass 3 code checks)"
+    )
+
+    # Reference code tables
+    icd10_table_path: str = Field(
+        default="data/reference/icd10cm_codes.tsv",
+        description="Bundled ICD-10-CM code table (see scripts/build_icd10_table.py)"
+    )
+    icd10_table_db_path: str = Field(
+        default="data/cache/reference/icd10cm.sqlite",
+        description="SQLite index built from the ICD-10-CM table, also caching remote lookups"
+    )
+    icd10_remote_validation: bool = Field(
+        default=True,
+        description="Query the NLM service for ICD-10 codes the local table cannot resolve"
+    )
+
+    # Deterministic evaluation
+    evaluation_workers: int = Field(default=0, description="Worker processes for evaluation matrix jobs (0 = CPU count)")
+    evaluator_metrics_enabled: bool = Field(default=False, description="Record per-criterion-type evaluator timing and verdict metrics")
+
+    # Deterministic-first coverage assessment (PolicyReasoner.assess_coverage)
+    coverage_fast_path_enabled: bool = Field(default=True, description="Skip the LLM when the deterministic evaluator is decisive")
+    coverage_fast_path_verdicts: List[str] = Field(
+        default=["met", "not_met"],
+        description="Overall evaluator verdicts that may be decided without the LLM"
+    )
+    coverage_fast_path_max_insufficient: int = Field(
+        default=0,
+        description=(
+            "INSUFFICIENT_DATA criteria tolerated in the deciding indications before escalating to the LLM. "
+            "Counts unused alternatives too (e.g. an OR branch the patient has no data for), so with 0 "
+            "most evaluations of the bundled policies escalate"
+        )
+    )
+    coverage_fast_path_exclusion_verdicts: List[str] = Field(
+        default=["not_applicable", "insufficient_data"],
+        description=(
+            "Exclusion trigger verdicts that do not block a deterministic MET; unresolved ones are reported "
+            "as documentation gaps. Triggers resolved either way are ambiguous (see evaluator) and escalate by default"
+        )
+    )
+    coverage_fast_path_met_likelihood: float = Field(default=0.9, description="Approval likelihood reported for deterministic MET decisions")
+    coverage_escalate_ambiguous_only: bool = Field(
+        default=True,
+        description="When escalating, pass deterministically resolved criteria as final and ask the LLM only about the rest"
+    )
+
 
 @lru_cache
 def get_settings() -> Settings:
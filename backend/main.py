@@ -37,6 +37,11 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized")
 
+    # Evaluator instrumentation (per-criterion-type timing and verdicts)
+    if settings.evaluator_metrics_enabled:
+        from backend.policy_digitalization.evaluator_metrics import instrument_evaluators
+        instrument_evaluators()
+
     # Initialize scenario manager
     get_scenario_manager()
     logger.info("Scenario manager initialized")
@@ -2,13 +2,14 @@
 
 This module provides integration with external healthcare validation services:
 - NPI Registry - Provider credential validation
-- ICD-10 Codes - Diagnosis code validation
+- ICD-10 Codes - Diagnosis code validation (local ICD-10-CM table, NLM service for misses)
 - CMS Coverage - Medicare LCD/NCD policy search
 """
 
 from backend.mcp.mcp_client import MCPClient, get_mcp_client
 from backend.mcp.npi_validator import NPIValidator, get_npi_validator
 from backend.mcp.icd10_validator import ICD10Validator, get_icd10_validator
+from backend.mcp.icd10_table import ICD10CodeTable, get_icd10_code_table
 from backend.mcp.cms_coverage import CMSCoverageClient, get_cms_coverage_client
 
 __all__ = [
@@ -18,6 +19,8 @@ __all__ = [
     "get_npi_validator",
     "ICD10Validator",
     "get_icd10_validator",
+    "ICD10CodeTable",
+    "get_icd10_code_table",
     "CMSCoverageClient",
     "get_cms_coverage_client",
 ]
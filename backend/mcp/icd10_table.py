@@ -0,0 +1,213 @@
+"""Local ICD-10-CM code table for offline code validation.
+
+The table is bundled as a tab-separated file (code, billable flag, description;
+"# key: value" header lines carry metadata) and indexed into a memory-mapped
+SQLite database on first use. The database is rebuilt whenever the bundled file
+changes. The code column is the primary key, so exact lookups and prefix scans
+("K50" -> every Crohn's code) are index range queries.
+
+A table marked "complete: true" (a full CMS release, see
+scripts/build_icd10_table.py) is authoritative: codes missing from it are
+invalid. The bundled seed only covers the codes the demo policies and patients
+use, so misses fall through to the remote NLM service. Definitive remote answers
+are stored in the same database so each code is fetched at most once.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.config.logging_config import get_logger
+from backend.config.settings import get_settings
+
+logger = get_logger(__name__)
+
+# Memory-map up to this many bytes of the database
+MMAP_SIZE = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS codes (
+    code TEXT PRIMARY KEY, billable INTEGER NOT NULL, description TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS remote (
+    code TEXT PRIMARY KEY, is_valid INTEGER NOT NULL, description TEXT, checked_at TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class ICD10TableEntry:
+    """One code of the local table."""
+    code: str
+    description: str
+    is_billable: bool
+
+
+def parse_table(lines: Iterable[str]) -> Tuple[Dict[str, str], List[Tuple[str, int, str]]]:
+    """Parse the bundled table into (metadata, [(code, billable, description)])."""
+    metadata: Dict[str, str] = {}
+    rows: List[Tuple[str, int, str]] = []
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line.strip():
+            continue
+        if line.startswith("#"):
+            key, sep, value = line[1:].partition(":")
+            if sep and " " not in key.strip():
+                metadata[key.strip()] = value.strip()
+            continue
+        code, billable, description = line.split("\t", 2)
+        rows.append((code.strip().upper(), 1 if billable.strip() == "1" else 0, description.strip()))
+    return metadata, rows
+
+
+class ICD10CodeTable:
+    """SQLite-indexed ICD-10-CM codes plus a cache of remote lookups."""
+
+    def __init__(self, source_path: Optional[Path] = None, db_path: Optional[Path] = None):
+        settings = get_settings()
+        self.source_path = Path(source_path or settings.icd10_table_path)
+        self.db_path = Path(db_path or settings.icd10_table_db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._metadata: Dict[str, str] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            conn.executescript(_SCHEMA)
+            self._sync(conn)
+            self._metadata = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+            self._conn = conn
+        return self._conn
+
+    def _sync(self, conn: sqlite3.Connection) -> None:
+        """(Re)build the codes table when the bundled file changed."""
+        if not self.source_path.exists():
+            logger.warning("ICD-10-CM table not found; local validation disabled", path=str(self.source_path))
+            return
+        content = self.source_path.read_bytes()
+        source_hash = hashlib.sha256(content).hexdigest()
+        row = conn.execute("SELECT value FROM meta WHERE key = 'source_hash'").fetchone()
+        if row and row[0] == source_hash:
+            return
+
+        metadata, rows = parse_table(content.decode("utf-8").splitlines())
+        with conn:
+            conn.execute("DELETE FROM codes")
+            conn.execute("DELETE FROM meta")
+            conn.executemany("INSERT OR REPLACE INTO codes VALUES (?, ?, ?)", rows)
+            conn.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                list({**metadata, "source_hash": source_hash}.items()),
+            )
+            if metadata.get("complete", "").lower() == "true":
+                # An authoritative table supersedes remote answers
+                conn.execute("DELETE FROM remote")
+        logger.info(
+            "ICD-10-CM table indexed",
+            codes=len(rows), release=metadata.get("release"), db=str(self.db_path),
+        )
+
+    @property
+    def release(self) -> str:
+        with self._lock:
+            self._connection()
+            return self._metadata.get("release", "")
+
+    @property
+    def complete(self) -> bool:
+        """Whether the table is a full release (codes missing from it are invalid)."""
+        with self._lock:
+            self._connection()
+            return self._metadata.get("complete", "").lower() == "true"
+
+    def lookup(self, code: str) -> Optional[ICD10TableEntry]:
+        """Entry for a normalized (dotted, upper-case) code, or None."""
+        return self.lookup_many([code]).get(code)
+
+    def lookup_many(self, codes: Iterable[str]) -> Dict[str, ICD10TableEntry]:
+        """Entries for the normalized codes found in the table."""
+        codes = list(dict.fromkeys(codes))
+        if not codes:
+            return {}
+        with self._lock:
+            conn = self._connection()
+            found: Dict[str, ICD10TableEntry] = {}
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(codes), 500):
+                batch = codes[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                for code, billable, description in conn.execute(
+                    f"SELECT code, billable, description FROM codes WHERE code IN ({placeholders})", batch,
+                ):
+                    found[code] = ICD10TableEntry(code=code, description=description, is_billable=bool(billable))
+        return found
+
+    def with_prefix(self, prefix: str, limit: int = 50) -> List[ICD10TableEntry]:
+        """Codes starting with prefix, in code order."""
+        prefix = prefix.upper().strip()
+        if not prefix:
+            return []
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT code, billable, description FROM codes WHERE code >= ? AND code < ? ORDER BY code LIMIT ?",
+                (prefix, prefix + "\uffff", limit),
+            ).fetchall()
+        return [ICD10TableEntry(code=c, description=d, is_billable=bool(b)) for c, b, d in rows]
+
+    def cached_remote(self, codes: Iterable[str]) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """Stored remote answers (is_valid, description) for the given normalized codes."""
+        codes = list(dict.fromkeys(codes))
+        if not codes:
+            return {}
+        with self._lock:
+            conn = self._connection()
+            found: Dict[str, Tuple[bool, Optional[str]]] = {}
+            for start in range(0, len(codes), 500):
+                batch = codes[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                for code, is_valid, description in conn.execute(
+                    f"SELECT code, is_valid, description FROM remote WHERE code IN ({placeholders})", batch,
+                ):
+                    found[code] = (bool(is_valid), description)
+        return found
+
+    def store_remote(self, code: str, is_valid: bool, description: Optional[str] = None) -> None:
+        """Remember a definitive remote answer for a normalized code."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO remote VALUES (?, ?, ?, ?)",
+                    (code, int(is_valid), description, datetime.now(timezone.utc).isoformat()),
+                )
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            conn = self._connection()
+            return {
+                "release": self._metadata.get("release", ""),
+                "complete": self._metadata.get("complete", "").lower() == "true",
+                "codes": conn.execute("SELECT COUNT(*) FROM codes").fetchone()[0],
+                "remote_cached": conn.execute("SELECT COUNT(*) FROM remote").fetchone()[0],
+            }
+
+
+# Global instance
+_icd10_code_table: Optional[ICD10CodeTable] = None
+
+
+def get_icd10_code_table() -> ICD10CodeTable:
+    """Get or create the global ICD-10-CM code table."""
+    global _icd10_code_table
+    if _icd10_code_table is None:
+        _icd10_code_table = ICD10CodeTable()
+    return _icd10_code_table
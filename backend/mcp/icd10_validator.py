@@ -1,13 +1,19 @@
 """ICD-10 code validation using NLM Clinical Tables API.
 
 This module validates ICD-10 diagnosis codes against the official clinical coding database.
+Codes are resolved against the local ICD-10-CM table first (see icd10_table.py);
+only codes it cannot resolve are sent to the NLM service, once per distinct code.
 """
 
+import asyncio
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 from backend.mcp.mcp_client import get_mcp_client
+from backend.mcp.icd10_table import get_icd10_code_table
+from backend.reasoning.usage_tracking import record_cache_hit
 from backend.config.logging_config import get_logger
+from backend.config.settings import get_settings
 
 logger = get_logger(__name__)
 
@@ -46,6 +52,7 @@ class ICD10Validator:
     def __init__(self):
         """Initialize the ICD-10 validator."""
         self._client = get_mcp_client()
+        self._table = get_icd10_code_table()
         logger.info("ICD-10 Validator initialized")
 
     async def validate_code(self, code: str) -> ICD10CodeInfo:
@@ -71,6 +78,70 @@ class ICD10Validator:
                 errors=["Invalid ICD-10 code format"]
             )
 
+        local = self._resolve_local([normalized_code]).get(normalized_code)
+        if local is not None:
+            return replace(local, code=code, errors=list(local.errors))
+        return await self._validate_remote(code, normalized_code)
+
+    def _resolve_local(self, normalized_codes: List[str]) -> Dict[str, ICD10CodeInfo]:
+        """Resolve codes from the local table and cached remote answers; omits codes that need the service."""
+        resolved: Dict[str, ICD10CodeInfo] = {}
+        try:
+            entries = self._table.lookup_many(normalized_codes)
+            remaining = [c for c in normalized_codes if c not in entries]
+            cached = self._table.cached_remote(remaining)
+            complete = self._table.complete
+            release = self._table.release
+        except Exception as e:
+            logger.warning("Local ICD-10-CM table unavailable", error=str(e))
+            return resolved
+
+        for code, entry in entries.items():
+            resolved[code] = ICD10CodeInfo(
+                code=code,
+                is_valid=True,
+                description=entry.description,
+                long_description=entry.description,
+                category=self._get_category(code),
+                is_billable=entry.is_billable,
+            )
+        for code, (is_valid, description) in cached.items():
+            resolved[code] = self._remote_info(code, is_valid, description)
+        if complete:
+            for code in remaining:
+                if code not in cached:
+                    resolved[code] = ICD10CodeInfo(
+                        code=code,
+                        is_valid=False,
+                        errors=[f"Code not found in ICD-10-CM table (release {release or 'unknown'})"]
+                    )
+        return resolved
+
+    def _remote_info(self, code: str, is_valid: bool, description: Optional[str]) -> ICD10CodeInfo:
+        if not is_valid:
+            return ICD10CodeInfo(
+                code=code,
+                is_valid=False,
+                errors=["Code not found in ICD-10-CM database."]
+            )
+        return ICD10CodeInfo(
+            code=code,
+            is_valid=True,
+            description=description,
+            long_description=description,
+            category=self._get_category(code),
+            is_billable=len(code.replace(".", "")) >= 4
+        )
+
+    async def _validate_remote(self, code: str, normalized_code: str) -> ICD10CodeInfo:
+        """Validate one code against the NLM service and cache definitive answers."""
+        if not get_settings().icd10_remote_validation:
+            return ICD10CodeInfo(
+                code=code,
+                is_valid=False,
+                errors=["Code not in local ICD-10-CM table and remote validation is disabled"]
+            )
+
         try:
             # Query NLM Clinical Tables API
             response = await self._client.call(
@@ -83,7 +154,13 @@ class ICD10Validator:
                 }
             )
 
-            return self._parse_code_response(code, normalized_code, response)
+            info = self._parse_code_response(code, normalized_code, response)
+            if isinstance(response, list) and len(response) >= 4:
+                try:
+                    self._table.store_remote(normalized_code, info.is_valid, info.description)
+                except Exception as e:
+                    logger.warning("Could not cache ICD-10 lookup", code=normalized_code, error=str(e))
+            return info
 
         except Exception as e:
             logger.error("ICD-10 validation failed", code=code, error=str(e))
@@ -95,32 +172,50 @@ class ICD10Validator:
 
     async def validate_batch(self, codes: List[str]) -> ICD10ValidationResult:
         """
-        Validate multiple ICD-10 codes concurrently.
+        Validate multiple ICD-10 codes.
+
+        Codes are de-duplicated after normalization and resolved from the local
+        table; only the remaining distinct codes are queried remotely (concurrently).
 
         Args:
             codes: List of ICD-10-CM diagnosis codes
 
         Returns:
-            ICD10ValidationResult with all code validations
+            ICD10ValidationResult with all code validations (one per input code, in order)
         """
-        import asyncio
-
-        logger.info("Validating ICD-10 batch", count=len(codes))
+        normalized = {code: self._normalize_code(code) for code in codes}
+        unique = list(dict.fromkeys(normalized.values()))
+
+        resolved: Dict[str, ICD10CodeInfo] = {}
+        for code in unique:
+            if not self._is_valid_format(code):
+                resolved[code] = ICD10CodeInfo(code=code, is_valid=False, errors=["Invalid ICD-10 code format"])
+        resolved.update(self._resolve_local([c for c in unique if c not in resolved]))
+        misses = [c for c in unique if c not in resolved]
+        record_cache_hit(len(unique) - len(misses))
+
+        logger.info(
+            "Validating ICD-10 batch",
+            count=len(codes), distinct=len(unique), local=len(unique) - len(misses), remote=len(misses),
+        )
 
-        # Validate all codes concurrently
-        tasks = [self.validate_code(code) for code in codes]
-        validation_results = await asyncio.gather(*tasks, return_exceptions=True)
+        if misses:
+            remote_results = await asyncio.gather(
+                *(self._validate_remote(code, code) for code in misses), return_exceptions=True
+            )
+            for code, result in zip(misses, remote_results):
+                if isinstance(result, Exception):
+                    result = ICD10CodeInfo(
+                        code=code,
+                        is_valid=False,
+                        errors=[f"Validation error: {str(result)}"]
+                    )
+                resolved[code] = result
 
         code_infos = []
-        for code, result in zip(codes, validation_results):
-            if isinstance(result, Exception):
-                code_infos.append(ICD10CodeInfo(
-                    code=code,
-                    is_valid=False,
-                    errors=[f"Validation error: {str(result)}"]
-                ))
-            else:
-                code_infos.append(result)
+        for code in codes:
+            info = resolved[normalized[code]]
+            code_infos.append(replace(info, code=code, errors=list(info.errors)))
 
         valid_count = sum(1 for c in code_infos if c.is_valid)
         invalid_count = len(code_infos) - valid_count
@@ -149,6 +244,25 @@ class ICD10Validator:
         """
         logger.debug("Searching ICD-10 codes", query=query)
 
+        # Code prefixes are answered from the local table when it is a full release
+        prefix = query.upper().strip()
+        if prefix and prefix[0].isalpha() and prefix[1:3].isdigit():
+            try:
+                if self._table.complete:
+                    return [
+                        ICD10CodeInfo(
+                            code=entry.code,
+                            is_valid=True,
+                            description=entry.description,
+                            long_description=entry.description,
+                            category=self._get_category(entry.code),
+                            is_billable=entry.is_billable,
+                        )
+                        for entry in self._table.with_prefix(self._normalize_code(prefix), limit=max_results)
+                    ]
+            except Exception as e:
+                logger.warning("Local ICD-10-CM search failed", query=query, error=str(e))
+
         try:
             response = await self._client.call(
                 server="icd10",
@@ -0,0 +1,483 @@
+"""Columnar Batch Evaluator — one policy against many patients at once.
+
+Population screening (e.g. after a policy update) evaluates the same policy
+against every patient. Instead of walking the group tree once per patient,
+evaluate_policy_batch turns the population into columns:
+
+- age (float, NaN when unknown) and gender codes
+- a diagnosis-code bitset over the population's distinct normalized ICD-10 codes
+- lab columns keyed by (test name, LOINC code): value and list position
+
+AGE, GENDER, LAB_VALUE and coded DIAGNOSIS_CONFIRMED criteria are evaluated as
+NumPy vectors; every other criterion type falls back to its registered
+evaluator per patient. Group AND/OR/NOT combinations run over verdict vectors
+in the plan's children-first order.
+
+Results are identical to calling evaluate_policy per patient — the vectorized
+evaluators reproduce the scalar evaluators' verdicts, evidence and reasoning.
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.models.policy_schema import (
+    DigitizedPolicy, ComparisonOperator, CriterionType, LogicalOperator,
+)
+from backend.policy_digitalization.compiled_policy import (
+    CompiledCriterion, CompiledPolicy, compile_policy, normalize_icd10,
+)
+from backend.policy_digitalization.evaluator import (
+    CriterionEvaluation, CriterionVerdict, GroupEvaluation, PolicyEvaluationResult,
+    _assemble_policy_result, _evaluate_step_therapy_plan, _lab_name_matches, _safe_float,
+    evaluate_criterion, evaluate_policy,
+)
+from backend.policy_digitalization.patient_data_adapter import NormalizedPatientData
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Verdicts are carried as small integer codes inside verdict vectors
+MET, NOT_MET, INSUFFICIENT, NOT_APPLICABLE = 0, 1, 2, 3
+VERDICT_BY_CODE = (
+    CriterionVerdict.MET,
+    CriterionVerdict.NOT_MET,
+    CriterionVerdict.INSUFFICIENT_DATA,
+    CriterionVerdict.NOT_APPLICABLE,
+)
+CODE_BY_VERDICT = {v: i for i, v in enumerate(VERDICT_BY_CODE)}
+
+# Position sentinel for "patient has no lab under this key"
+_ABSENT = np.iinfo(np.int32).max
+
+
+class PatientColumns:
+    """Columnar view of a patient population."""
+
+    def __init__(self, patients: Sequence[NormalizedPatientData]):
+        self.patients = patients
+        n = len(patients)
+
+        # Demographics
+        self.age = np.array(
+            [p.age_years if p.age_years is not None else np.nan for p in patients], dtype=np.float64,
+        )
+        self.has_age = np.array([p.age_years is not None for p in patients], dtype=bool)
+        self.gender_vocab: Dict[str, int] = {}
+        self.gender = np.full(n, -1, dtype=np.int32)
+        for i, p in enumerate(patients):
+            if p.gender:
+                self.gender[i] = self.gender_vocab.setdefault(p.gender.lower(), len(self.gender_vocab))
+
+        # Diagnosis codes: bitset over the population's distinct normalized codes
+        self.dx_vocab: Dict[str, int] = {}
+        self.dx_columns: List[List[int]] = []  # per patient, vocab column of each code in order
+        for p in patients:
+            self.dx_columns.append([
+                self.dx_vocab.setdefault(normalize_icd10(code), len(self.dx_vocab))
+                for code in p.diagnosis_codes
+            ])
+        self.dx_bits = np.zeros((n, len(self.dx_vocab)), dtype=bool)
+        for i, cols in enumerate(self.dx_columns):
+            self.dx_bits[i, cols] = True
+        self.has_dx = np.array([bool(p.diagnosis_codes) for p in patients], dtype=bool)
+
+        # Labs keyed by (lowercased test name, LOINC code): first position and value
+        self.lab_keys: Dict[Tuple[str, Optional[str]], int] = {}
+        entries: List[Tuple[int, int, int]] = []  # (patient, key, position)
+        for i, p in enumerate(patients):
+            seen = set()
+            for pos, lab in enumerate(p.lab_results):
+                key = self.lab_keys.setdefault((lab.test_name.lower(), lab.loinc_code), len(self.lab_keys))
+                if key not in seen:
+                    seen.add(key)
+                    entries.append((i, key, pos))
+        self.lab_position = np.full((n, len(self.lab_keys)), _ABSENT, dtype=np.int32)
+        for i, key, pos in entries:
+            self.lab_position[i, key] = pos
+
+    def __len__(self) -> int:
+        return len(self.patients)
+
+
+class CriterionColumn:
+    """Verdict vector for one criterion plus per-patient materialization."""
+
+    def __init__(
+        self,
+        verdicts: np.ndarray,
+        materialize: Callable[[int], CriterionEvaluation],
+    ):
+        self.verdicts = verdicts
+        self._materialize = materialize
+        self._objects: Dict[int, CriterionEvaluation] = {}
+
+    def result(self, i: int) -> CriterionEvaluation:
+        obj = self._objects.get(i)
+        if obj is None:
+            obj = self._objects[i] = self._materialize(i)
+        return obj
+
+
+# --- Vectorized comparisons ---
+
+def _compare_numeric_vec(values: np.ndarray, threshold: float, operator, upper_bound) -> np.ndarray:
+    """Vectorized counterpart of evaluator._compare_numeric."""
+    if operator is None or operator == ComparisonOperator.GREATER_THAN_OR_EQUAL:
+        return values >= threshold
+    if operator == ComparisonOperator.GREATER_THAN:
+        return values > threshold
+    if operator == ComparisonOperator.LESS_THAN:
+        return values < threshold
+    if operator == ComparisonOperator.LESS_THAN_OR_EQUAL:
+        return values <= threshold
+    if operator == ComparisonOperator.EQUALS:
+        return np.abs(values - threshold) < 1e-9
+    if operator == ComparisonOperator.NOT_EQUALS:
+        return np.abs(values - threshold) >= 1e-9
+    if operator == ComparisonOperator.BETWEEN:
+        upper = _safe_float(upper_bound) if upper_bound is not None else None
+        if upper is None:
+            return values >= threshold
+        return (values >= threshold) & (values <= upper)
+    if operator in (ComparisonOperator.IN, ComparisonOperator.NOT_IN):
+        hit = values == threshold
+        if upper_bound is not None:
+            parsed = _safe_float(upper_bound)
+            if parsed is not None:
+                hit |= values == parsed
+        return hit if operator == ComparisonOperator.IN else ~hit
+    return values >= threshold
+
+
+def _met_codes(met: np.ndarray) -> np.ndarray:
+    return np.where(met, MET, NOT_MET).astype(np.int8)
+
+
+def _constant_result(cc: CompiledCriterion, verdict: CriterionVerdict, reasoning: str) -> CriterionEvaluation:
+    return CriterionEvaluation(
+        criterion_id=cc.criterion_id,
+        criterion_name=cc.name,
+        verdict=verdict,
+        reasoning=reasoning,
+        is_required=cc.is_required,
+    )
+
+
+# --- Vectorized criterion evaluators ---
+# Each mirrors the scalar evaluator of the same type, branch for branch.
+
+def _age_column(cc: CompiledCriterion, cols: PatientColumns) -> Optional[CriterionColumn]:
+    patients = cols.patients
+    raw_threshold = cc.threshold_value
+    threshold = _safe_float(raw_threshold) if raw_threshold is not None else None
+    if raw_threshold is None:
+        no_data_reason = "No threshold defined in criterion"
+    elif threshold is None:
+        no_data_reason = f"Non-numeric threshold value: {raw_threshold}"
+    else:
+        no_data_reason = None
+
+    verdicts = np.full(len(cols), INSUFFICIENT, dtype=np.int8)
+    if threshold is not None:
+        met = _compare_numeric_vec(cols.age, threshold, cc.comparison_operator, cc.threshold_value_upper)
+        verdicts[cols.has_age] = _met_codes(met)[cols.has_age]
+
+    def materialize(i: int) -> CriterionEvaluation:
+        age = patients[i].age_years
+        if age is None:
+            return _constant_result(cc, CriterionVerdict.INSUFFICIENT_DATA, "Patient age not available")
+        if no_data_reason is not None:
+            return _constant_result(cc, CriterionVerdict.INSUFFICIENT_DATA, no_data_reason)
+        met = verdicts[i] == MET
+        return CriterionEvaluation(
+            criterion_id=cc.criterion_id,
+            criterion_name=cc.name,
+            verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
+            evidence=[f"Patient age: {age} years"],
+            reasoning=f"Age {age} {'meets' if met else 'does not meet'} {cc.comparison_operator or 'gte'} {threshold}",
+            is_required=cc.is_required,
+        )
+
+    return CriterionColumn(verdicts, materialize)
+
+
+def _gender_column(cc: CompiledCriterion, cols: PatientColumns) -> Optional[CriterionColumn]:
+    patients = cols.patients
+    allowed = list(cc.allowed_lower)
+    if not allowed and cc.threshold_value:
+        allowed = [str(cc.threshold_value).lower()]
+
+    has_gender = cols.gender >= 0
+    if allowed:
+        allowed_codes = np.array(
+            [code for g, code in cols.gender_vocab.items() if g in allowed], dtype=np.int32,
+        )
+        met = np.isin(cols.gender, allowed_codes)
+    else:
+        met = np.ones(len(cols), dtype=bool)
+    verdicts = np.where(has_gender, _met_codes(met), INSUFFICIENT).astype(np.int8)
+
+    def materialize(i: int) -> CriterionEvaluation:
+        gender = patients[i].gender
+        if not gender:
+            return _constant_result(cc, CriterionVerdict.INSUFFICIENT_DATA, "Patient gender not available")
+        is_met = verdicts[i] == MET
+        return CriterionEvaluation(
+            criterion_id=cc.criterion_id,
+            criterion_name=cc.name,
+            verdict=CriterionVerdict.MET if is_met else CriterionVerdict.NOT_MET,
+            evidence=[f"Patient gender: {gender}"],
+            reasoning=f"Gender '{gender}' {'is' if is_met else 'is not'} in allowed values {allowed}",
+            is_required=cc.is_required,
+        )
+
+    return CriterionColumn(verdicts, materialize)
+
+
+def _diagnosis_column(cc: CompiledCriterion, cols: PatientColumns) -> Optional[CriterionColumn]:
+    if not cc.icd_codes:
+        return None  # keyword matching — scalar evaluator
+    patients = cols.patients
+
+    # Match by exact or criterion-prefix over the population's code vocabulary
+    column_match = np.zeros(len(cols.dx_vocab), dtype=bool)
+    for code, col in cols.dx_vocab.items():
+        column_match[col] = cc.icd_trie.matches(code)
+    matched = (cols.dx_bits & column_match).any(axis=1) if cols.dx_bits.size else np.zeros(len(cols), dtype=bool)
+    verdicts = np.where(cols.has_dx, _met_codes(matched), INSUFFICIENT).astype(np.int8)
+
+    def materialize(i: int) -> CriterionEvaluation:
+        patient = patients[i]
+        if not patient.diagnosis_codes:
+            return _constant_result(cc, CriterionVerdict.INSUFFICIENT_DATA, "No diagnosis codes available")
+        evidence = [
+            f"Diagnosis {pc} matches criterion code"
+            for pc, col in zip(patient.diagnosis_codes, cols.dx_columns[i])
+            if column_match[col]
+        ]
+        is_met = verdicts[i] == MET
+        return CriterionEvaluation(
+            criterion_id=cc.criterion_id,
+            criterion_name=cc.name,
+            verdict=CriterionVerdict.MET if is_met else CriterionVerdict.NOT_MET,
+            evidence=evidence,
+            reasoning=f"Diagnosis {'confirmed' if is_met else 'not confirmed'} against criterion codes",
+            is_required=cc.is_required,
+        )
+
+    return CriterionColumn(verdicts, materialize)
+
+
+def _lab_value_column(cc: CompiledCriterion, cols: PatientColumns) -> Optional[CriterionColumn]:
+    patients = cols.patients
+    n = len(cols)
+
+    # Resolve the matched lab per patient: first LOINC match in list order,
+    # otherwise first name match — same precedence as _find_lab_result
+    loinc_mask = np.zeros(len(cols.lab_keys), dtype=bool)
+    name_mask = np.zeros(len(cols.lab_keys), dtype=bool)
+    for (test_name, loinc), key in cols.lab_keys.items():
+        loinc_mask[key] = bool(loinc) and loinc in cc.loinc_codes
+        name_mask[key] = _lab_name_matches(cc, test_name)
+
+    selected = np.full(n, -1, dtype=np.int64)
+    if cols.lab_keys:
+        for mask in (loinc_mask, name_mask):
+            if not mask.any():
+                continue
+            positions = np.where(mask, cols.lab_position, _ABSENT).min(axis=1)
+            pick = (selected < 0) & (positions != _ABSENT)
+            selected[pick] = positions[pick]
+
+    values = np.full(n, np.nan, dtype=np.float64)
+    has_value = np.zeros(n, dtype=bool)
+    for i in np.nonzero(selected >= 0)[0]:
+        value = patients[i].lab_results[selected[i]].value
+        if value is not None:
+            values[i] = value
+            has_value[i] = True
+
+    raw_threshold = cc.threshold_value
+    threshold = _safe_float(raw_threshold) if raw_threshold is not None else None
+    verdicts = np.full(n, INSUFFICIENT, dtype=np.int8)
+    if raw_threshold is None:
+        verdicts[has_value] = MET
+    elif threshold is not None:
+        met = _compare_numeric_vec(values, threshold, cc.comparison_operator, cc.threshold_value_upper)
+        verdicts[has_value] = _met_codes(met)[has_value]
+
+    def materialize(i: int) -> CriterionEvaluation:
+        patient = patients[i]
+        if not patient.lab_results:
+            return _constant_result(cc, CriterionVerdict.INSUFFICIENT_DATA, "No lab results available")
+        if not has_value[i]:
+            return _constant_result(
+                cc, CriterionVerdict.INSUFFICIENT_DATA, f"Lab result '{cc.name}' not found in patient data",
+            )
+        lab = patient.lab_results[selected[i]]
+        if raw_threshold is None:
+            return CriterionEvaluation(
+                criterion_id=cc.criterion_id,
+                criterion_name=cc.name,
+                verdict=CriterionVerdict.MET,
+                evidence=[f"{lab.test_name}: {lab.value} {lab.unit or ''}"],
+                reasoning="Lab present; no threshold to compare",
+                is_required=cc.is_required,
+            )
+        if threshold is None:
+            return _constant_result(
+                cc, CriterionVerdict.INSUFFICIENT_DATA, f"Non-numeric threshold value: {raw_threshold}",
+            )
+        is_met = verdicts[i] == MET
+        return CriterionEvaluation(
+            criterion_id=cc.criterion_id,
+            criterion_name=cc.name,
+            verdict=CriterionVerdict.MET if is_met else CriterionVerdict.NOT_MET,
+            evidence=[f"{lab.test_name}: {lab.value} {lab.unit or ''}"],
+            reasoning=f"Lab {lab.test_name} = {lab.value} {'meets' if is_met else 'does not meet'} threshold {cc.comparison_operator or 'gte'} {threshold}",
+            is_required=cc.is_required,
+        )
+
+    return CriterionColumn(verdicts, materialize)
+
+
+VECTORIZED_EVALUATORS: Dict[str, Callable[[CompiledCriterion, PatientColumns], Optional[CriterionColumn]]] = {
+    CriterionType.AGE: _age_column,
+    CriterionType.GENDER: _gender_column,
+    CriterionType.DIAGNOSIS_CONFIRMED: _diagnosis_column,
+    CriterionType.LAB_VALUE: _lab_value_column,
+}
+
+
+def _scalar_column(cc: CompiledCriterion, cols: PatientColumns) -> CriterionColumn:
+    """Evaluate a criterion per patient with its registered evaluator."""
+    results = [evaluate_criterion(cc, p) for p in cols.patients]
+    verdicts = np.array([CODE_BY_VERDICT[r.verdict] for r in results], dtype=np.int8)
+    return CriterionColumn(verdicts, results.__getitem__)
+
+
+def _criterion_column(cc: CompiledCriterion, cols: PatientColumns) -> CriterionColumn:
+    vectorized = VECTORIZED_EVALUATORS.get(cc.criterion_type)
+    if vectorized is not None:
+        try:
+            column = vectorized(cc, cols)
+        except Exception as exc:
+            logger.warning("Vectorized evaluation failed", criterion_id=cc.criterion_id, error=str(exc))
+            column = None
+        if column is not None:
+            return column
+    return _scalar_column(cc, cols)
+
+
+# --- Vectorized group combination ---
+
+def _combine_verdicts_vec(children: List[np.ndarray], operator, negated: bool, n: int) -> np.ndarray:
+    """Vectorized counterpart of evaluator._combine_verdicts."""
+    if not children:
+        return np.full(n, NOT_APPLICABLE, dtype=np.int8)
+    stacked = np.vstack(children)
+    effective = (stacked != NOT_APPLICABLE).sum(axis=0)
+    met = (stacked == MET).sum(axis=0)
+    not_met = (stacked == NOT_MET).sum(axis=0)
+
+    op = operator.value if isinstance(operator, LogicalOperator) else str(operator).upper()
+    if op == "AND":
+        result = np.where(met == effective, MET, np.where(not_met > 0, NOT_MET, INSUFFICIENT))
+    elif op == "OR":
+        result = np.where(met > 0, MET, np.where(not_met == effective, NOT_MET, INSUFFICIENT))
+    elif op == "NOT":
+        first = stacked[0]
+        result = np.where(first == MET, NOT_MET, np.where(first == NOT_MET, MET, first))
+    else:
+        result = np.full(n, INSUFFICIENT)
+
+    if negated:
+        result = np.where(result == MET, NOT_MET, np.where(result == NOT_MET, MET, result))
+    return np.where(effective == 0, NOT_APPLICABLE, result).astype(np.int8)
+
+
+def _reachable(plan: CompiledPolicy) -> Tuple[List[str], List[str]]:
+    """Groups reachable from indication roots (children first) and the criteria they use."""
+    reachable = set()
+    stack = [ind.initial_approval_criteria for ind in plan.indications if ind.initial_approval_criteria in plan.groups]
+    while stack:
+        gid = stack.pop()
+        if gid in reachable:
+            continue
+        reachable.add(gid)
+        stack.extend(plan.groups[gid].subgroups)
+    group_order = [gid for gid in plan.topo_order if gid in reachable]
+    criteria = {c.criterion_id for gid in group_order for c in plan.groups[gid].criteria}
+    criteria.update(c.criterion_id for c in plan.exclusion_triggers)
+    return group_order, [cid for cid in plan.criteria if cid in criteria]
+
+
+def evaluate_policy_batch(
+    policy: DigitizedPolicy,
+    patients: Sequence[NormalizedPatientData],
+) -> List[PolicyEvaluationResult]:
+    """
+    Evaluate many patients against one digitized policy.
+
+    Returns one PolicyEvaluationResult per patient, in input order, identical
+    to evaluate_policy(policy, patient).
+    """
+    patients = list(patients)
+    if not patients:
+        return []
+    plan = compile_policy(policy)
+    if plan.has_cycles:
+        # Cycle handling is path-dependent; keep the per-patient semantics
+        return [evaluate_policy(policy, p) for p in patients]
+
+    n = len(patients)
+    cols = PatientColumns(patients)
+    group_order, criterion_ids = _reachable(plan)
+
+    criterion_columns = {cid: _criterion_column(plan.criteria[cid], cols) for cid in criterion_ids}
+
+    group_verdicts: Dict[str, np.ndarray] = {}
+    for gid in group_order:
+        gp = plan.groups[gid]
+        children = [criterion_columns[c.criterion_id].verdicts for c in gp.criteria]
+        children += [group_verdicts[sg] for sg in gp.subgroups]
+        group_verdicts[gid] = _combine_verdicts_vec(children, gp.operator, gp.negated, n)
+
+    results = []
+    for i, patient in enumerate(patients):
+        group_cache: Dict[str, GroupEvaluation] = {}
+
+        def build(gid: str) -> GroupEvaluation:
+            cached = group_cache.get(gid)
+            if cached is not None:
+                return cached
+            gp = plan.groups[gid]
+            cached = group_cache[gid] = GroupEvaluation(
+                group_id=gid,
+                operator=gp.operator_label,
+                verdict=VERDICT_BY_CODE[group_verdicts[gid][i]],
+                criteria_results=[criterion_columns[c.criterion_id].result(i) for c in gp.criteria],
+                subgroup_results=[build(sg) for sg in gp.subgroups],
+            )
+            return cached
+
+        group_results = [
+            build(ind.initial_approval_criteria) if ind.initial_approval_criteria in plan.groups else None
+            for ind in plan.indications
+        ]
+        exclusion_evaluations = [criterion_columns[c.criterion_id].result(i) for c in plan.exclusion_triggers]
+        results.append(_assemble_policy_result(
+            plan, patient, group_results, exclusion_evaluations, _evaluate_step_therapy_plan(plan, patient),
+        ))
+
+    logger.info(
+        "Batch policy evaluation complete",
+        policy_id=plan.policy_id,
+        patients=n,
+        vectorized_criteria=sum(
+            1 for cid in criterion_ids if plan.criteria[cid].criterion_type in VECTORIZED_EVALUATORS
+        ),
+        total_criteria=len(criterion_ids),
+    )
+    return results
@@ -0,0 +1,387 @@
+"""Batch Digitalization — resumable, concurrent runs over a manifest of policies.
+
+A manifest lists (payer, medication, source file, version) items. Items run
+concurrently; each pass holds a slot for the provider it calls (Pass 1 the
+extraction model, Pass 2 the validation model, Pass 3 the reference checks), so
+one item's validation overlaps another's extraction without exceeding
+Settings.digitalization_provider_concurrency for any provider.
+
+After every completed pass the item's state (Pass 1 / Pass 2 results, then the
+stored cache ID) is checkpointed to <checkpoint_dir>/<run_id>/. Re-running the
+same run_id resumes each item after its last completed pass; a checkpoint is
+discarded when its source file has changed, and an item checkpointed as stored
+whose version is no longer in the repository is stored again.
+
+Manifest format (JSON), a list or {"items": [...]}:
+
+    [{"payer_name": "uhc", "medication_name": "infliximab",
+      "source": "data/policies/uhc_infliximab.txt", "version_label": "v1"}]
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from backend.models.enums import TaskCategory
+from backend.models.policy_schema import DigitizedPolicy
+from backend.policy_digitalization.extractor import RawExtractionResult
+from backend.policy_digitalization.validator import ValidatedExtractionResult
+from backend.policy_digitalization.pipeline_metrics import PipelineMetrics
+from backend.policy_digitalization.pipeline import (
+    PolicyDigitalizationPipeline,
+    get_digitalization_pipeline,
+    version_year_hint,
+)
+from backend.reasoning.llm_gateway import TASK_MODEL_ROUTING
+from backend.config.logging_config import get_logger
+from backend.config.settings import get_settings
+
+logger = get_logger(__name__)
+
+_SAFE_NAME = re.compile(r"[^a-z0-9_.-]+")
+
+# Concurrency slot for Pass 3 (reference/MCP code validation)
+REFERENCE_PROVIDER = "reference"
+
+
+class BatchItem(BaseModel):
+    """One policy version to digitalize."""
+    payer_name: str
+    medication_name: str
+    source: str  # Path to a .pdf, .txt or pre-digitized .json file
+    source_type: Optional[Literal["pdf", "text", "json"]] = None  # Inferred from the suffix when omitted
+    version_label: str = "v1"
+    version_year: Optional[int] = None
+    skip_validation: bool = False
+
+    @property
+    def item_id(self) -> str:
+        return f"{self.payer_name}/{self.medication_name}/{self.version_label}"
+
+    @property
+    def resolved_source_type(self) -> str:
+        if self.source_type:
+            return self.source_type
+        suffix = Path(self.source).suffix.lower()
+        return {".pdf": "pdf", ".json": "json"}.get(suffix, "text")
+
+    @property
+    def checkpoint_name(self) -> str:
+        return _SAFE_NAME.sub("_", self.item_id.lower().replace("/", "__")) + ".json"
+
+
+class ItemCheckpoint(BaseModel):
+    """Persisted progress of one item."""
+    item_id: str
+    source_hash: str
+    status: Literal["pending", "extracted", "validated", "stored", "failed"] = "pending"
+    raw: Optional[RawExtractionResult] = None
+    validated: Optional[ValidatedExtractionResult] = None
+    cache_id: Optional[str] = None
+    criteria_count: int = 0
+    error: Optional[str] = None
+    attempts: int = 0
+    pass_seconds: Dict[str, float] = Field(default_factory=dict)
+    metrics: PipelineMetrics = Field(default_factory=PipelineMetrics)
+
+
+class BatchItemReport(BaseModel):
+    item_id: str
+    status: Literal["stored", "skipped", "failed"]
+    resumed_from: Optional[str] = None  # Last completed pass found in the checkpoint
+    criteria_count: int = 0
+    cache_id: Optional[str] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class BatchReport(BaseModel):
+    run_id: str
+    total: int = 0
+    stored: int = 0
+    skipped: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    policies_per_minute: float = 0.0
+    mean_pass_seconds: Dict[str, float] = Field(default_factory=dict)
+    items: List[BatchItemReport] = Field(default_factory=list)
+
+
+def load_manifest(path: Union[str, Path]) -> List[BatchItem]:
+    """Read a JSON manifest of BatchItems."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("items", [])
+    return [BatchItem(**entry) for entry in data]
+
+
+def _file_hash(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _primary_provider(task_category: TaskCategory, default: str) -> str:
+    providers = TASK_MODEL_ROUTING.get(task_category) or []
+    return providers[0].value if providers else default
+
+
+class BatchDigitalizationRunner:
+    """Runs manifests through the 3-pass pipeline with per-provider limits and checkpoints."""
+
+    def __init__(
+        self,
+        run_id: str,
+        checkpoint_dir: Optional[Path] = None,
+        pipeline: Optional[PolicyDigitalizationPipeline] = None,
+        provider_concurrency: Optional[Dict[str, int]] = None,
+        max_items_in_flight: Optional[int] = None,
+    ):
+        settings = get_settings()
+        if not re.match(r"^[A-Za-z0-9_.-]+$", run_id):
+            raise ValueError(f"Invalid run ID: {run_id}")
+        self.run_id = run_id
+        self.run_dir = Path(checkpoint_dir or settings.digitalization_checkpoint_dir) / run_id
+        self._pipeline = pipeline
+        self.provider_concurrency = dict(provider_concurrency or settings.digitalization_provider_concurrency)
+        self.max_items_in_flight = max_items_in_flight or settings.digitalization_batch_concurrency
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def pipeline(self) -> PolicyDigitalizationPipeline:
+        if self._pipeline is None:
+            self._pipeline = get_digitalization_pipeline()
+        return self._pipeline
+
+    def _slot(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(max(1, self.provider_concurrency.get(provider, 2)))
+        return self._semaphores[provider]
+
+    # --- Checkpoints ---
+
+    def _checkpoint_path(self, item: BatchItem) -> Path:
+        return self.run_dir / item.checkpoint_name
+
+    def load_checkpoint(self, item: BatchItem) -> Optional[ItemCheckpoint]:
+        path = self._checkpoint_path(item)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return ItemCheckpoint(**json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable checkpoint", item=item.item_id, error=str(e))
+            return None
+
+    def _save_checkpoint(self, item: BatchItem, checkpoint: ItemCheckpoint) -> None:
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        path = self._checkpoint_path(item)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(checkpoint.model_dump_json())
+        os.replace(tmp_path, path)
+
+    # --- Run ---
+
+    async def run(self, items: List[BatchItem], skip_existing: bool = True, force_refresh: bool = False) -> BatchReport:
+        """
+        Digitalize every item, resuming from checkpoints of the same run_id.
+
+        Args:
+            items: Policies to digitalize
+            skip_existing: Skip items whose version is already in the repository
+                (unless this run's checkpoint says otherwise)
+            force_refresh: Bypass the Pass 1 extraction cache for items that still need Pass 1
+        """
+        start = time.perf_counter()
+        in_flight = asyncio.Semaphore(max(1, self.max_items_in_flight))
+
+        async def run_one(item: BatchItem) -> BatchItemReport:
+            async with in_flight:
+                return await self._run_item(item, skip_existing, force_refresh)
+
+        logger.info("Batch digitalization started", run_id=self.run_id, items=len(items))
+        reports = await asyncio.gather(*(run_one(item) for item in items))
+
+        elapsed = time.perf_counter() - start
+        pass_totals: Dict[str, List[float]] = {}
+        for item in items:
+            checkpoint = self.load_checkpoint(item)
+            for name, seconds in (checkpoint.pass_seconds if checkpoint else {}).items():
+                pass_totals.setdefault(name, []).append(seconds)
+
+        report = BatchReport(
+            run_id=self.run_id,
+            total=len(items),
+            stored=sum(1 for r in reports if r.status == "stored"),
+            skipped=sum(1 for r in reports if r.status == "skipped"),
+            failed=sum(1 for r in reports if r.status == "failed"),
+            elapsed_seconds=round(elapsed, 3),
+            mean_pass_seconds={name: round(sum(v) / len(v), 3) for name, v in sorted(pass_totals.items())},
+            items=list(reports),
+        )
+        report.policies_per_minute = round(report.stored * 60 / elapsed, 2) if elapsed > 0 else 0.0
+        logger.info(
+            "Batch digitalization complete",
+            run_id=self.run_id, stored=report.stored, skipped=report.skipped, failed=report.failed,
+            elapsed_seconds=report.elapsed_seconds, policies_per_minute=report.policies_per_minute,
+        )
+        return report
+
+    async def _run_item(self, item: BatchItem, skip_existing: bool, force_refresh: bool) -> BatchItemReport:
+        start = time.perf_counter()
+        source_path = Path(item.source)
+        checkpoint: Optional[ItemCheckpoint] = None
+        try:
+            if not source_path.exists():
+                raise FileNotFoundError(f"Policy source not found: {item.source}")
+            source_hash = await asyncio.to_thread(_file_hash, source_path)
+
+            checkpoint = self.load_checkpoint(item)
+            source_changed = checkpoint is not None and checkpoint.source_hash != source_hash
+            if source_changed:
+                logger.info("Source changed since checkpoint, restarting item", item=item.item_id)
+                checkpoint = None
+            if checkpoint is not None and checkpoint.status == "stored":
+                if await self._stored_version(item) is not None:
+                    return BatchItemReport(
+                        item_id=item.item_id, status="skipped", resumed_from="stored",
+                        criteria_count=checkpoint.criteria_count, cache_id=checkpoint.cache_id,
+                    )
+                # The row was deleted since (e.g. the database was recreated): store it again
+                logger.info("Checkpointed policy no longer stored, resuming item", item=item.item_id)
+                if checkpoint.validated is not None or item.resolved_source_type == "json":
+                    checkpoint.status = "validated"
+                else:
+                    checkpoint = None
+            if checkpoint is None and skip_existing and not source_changed:
+                existing = await self._stored_version(item)
+                if existing is not None:
+                    return BatchItemReport(
+                        item_id=item.item_id, status="skipped", criteria_count=len(existing.atomic_criteria),
+                    )
+
+            checkpoint = checkpoint or ItemCheckpoint(item_id=item.item_id, source_hash=source_hash)
+            resumed_from = checkpoint.status if checkpoint.status in ("extracted", "validated") else None
+            checkpoint.attempts += 1
+            checkpoint.error = None
+            await self._advance(item, checkpoint, force_refresh)
+            return BatchItemReport(
+                item_id=item.item_id,
+                status="stored",
+                resumed_from=resumed_from,
+                criteria_count=checkpoint.criteria_count,
+                cache_id=checkpoint.cache_id,
+                seconds=round(time.perf_counter() - start, 3),
+            )
+        except Exception as e:
+            logger.error("Batch item failed", run_id=self.run_id, item=item.item_id, error=str(e))
+            if checkpoint is not None:
+                checkpoint.error = str(e)
+                # Keep completed passes so the next run resumes after them
+                if checkpoint.status == "pending":
+                    checkpoint.status = "failed"
+                self._save_checkpoint(item, checkpoint)
+            return BatchItemReport(
+                item_id=item.item_id, status="failed", error=str(e),
+                seconds=round(time.perf_counter() - start, 3),
+            )
+
+    async def _stored_version(self, item: BatchItem) -> Optional[DigitizedPolicy]:
+        """The item's version as stored in the repository, or None."""
+        policy = await self.pipeline.repository.load_version(
+            item.payer_name, item.medication_name, item.version_label,
+        )
+        # load_version() falls back to another version when this one is missing
+        return policy if policy is not None and policy.version == item.version_label else None
+
+    async def _advance(self, item: BatchItem, checkpoint: ItemCheckpoint, force_refresh: bool) -> None:
+        """Run the passes the checkpoint has not completed, checkpointing after each."""
+        pipeline = self.pipeline
+        source_type = item.resolved_source_type
+
+        if source_type == "json":
+            policy = await asyncio.to_thread(self._load_predigitized, item)
+            await self._store(item, checkpoint, policy)
+            return
+
+        if source_type == "text":
+            source = await asyncio.to_thread(Path(item.source).read_text, encoding="utf-8")
+        else:
+            source = item.source
+
+        if checkpoint.raw is None:
+            provider = "gemini" if source_type == "pdf" else _primary_provider(TaskCategory.DATA_EXTRACTION, "gemini")
+            with checkpoint.metrics.track("extraction") as metrics:
+                async with self._slot(provider):
+                    checkpoint.raw = await pipeline.run_extraction(
+                        source, source_type,
+                        version_hint=version_year_hint(item.version_year),
+                        force_refresh=force_refresh,
+                    )
+            checkpoint.pass_seconds["extraction"] = metrics.seconds
+            checkpoint.status = "extracted"
+            self._save_checkpoint(item, checkpoint)
+
+        if checkpoint.validated is None:
+            provider = _primary_provider(TaskCategory.POLICY_REASONING, "claude")
+            with checkpoint.metrics.track("validation") as metrics:
+                policy_text = pipeline.policy_text_for(source, source_type)
+                if item.skip_validation:
+                    checkpoint.validated = await pipeline.run_validation(checkpoint.raw, policy_text, True)
+                else:
+                    previous = await pipeline.load_base_version(
+                        item.payer_name, item.medication_name, item.version_label,
+                    )
+                    async with self._slot(provider):
+                        checkpoint.validated = await pipeline.run_validation(
+                            checkpoint.raw, policy_text, previous=previous,
+                        )
+            checkpoint.pass_seconds["validation"] = metrics.seconds
+            checkpoint.status = "validated"
+            self._save_checkpoint(item, checkpoint)
+
+        with checkpoint.metrics.track("reference") as metrics:
+            async with self._slot(REFERENCE_PROVIDER):
+                policy = await pipeline.run_reference_validation(
+                    checkpoint.validated, checkpoint.raw,
+                    payer_name=item.payer_name, medication_name=item.medication_name,
+                )
+        checkpoint.pass_seconds["reference"] = metrics.seconds
+        await self._store(item, checkpoint, policy, pipeline_metrics=checkpoint.metrics.to_record())
+
+    def _load_predigitized(self, item: BatchItem) -> DigitizedPolicy:
+        with open(item.source, "r", encoding="utf-8") as f:
+            policy = DigitizedPolicy(**json.load(f))
+        policy.payer_name = item.payer_name
+        policy.medication_name = item.medication_name
+        return policy
+
+    async def _store(
+        self,
+        item: BatchItem,
+        checkpoint: ItemCheckpoint,
+        policy: DigitizedPolicy,
+        pipeline_metrics: Optional[dict] = None,
+    ) -> None:
+        checkpoint.cache_id = await self.pipeline.repository.store_version(
+            policy, item.version_label, pipeline_metrics=pipeline_metrics,
+        )
+        checkpoint.criteria_count = len(policy.atomic_criteria)
+        checkpoint.status = "stored"
+        self._save_checkpoint(item, checkpoint)
+        logger.info(
+            "Batch item stored",
+            run_id=self.run_id, item=item.item_id, criteria=checkpoint.criteria_count,
+        )
@@ -0,0 +1,276 @@
+"""Chunked Pass 1 — split large policy documents and merge per-chunk extractions.
+
+Very large policy texts (e.g. the 165 KB UHC infliximab policy) are split at
+section boundaries — headings, indication openers ("Infliximab is medically
+necessary for the treatment of ...") and page markers — and packed into chunks
+of at most Settings.extraction_chunk_max_chars. Each chunk is extracted on its
+own (see GeminiPolicyExtractor.extract_from_text) and the results are merged
+here into a single extraction.
+
+Merging de-duplicates by ID. A criterion, group, indication, exclusion or step
+therapy requirement whose ID was already taken by an earlier chunk is reused
+when it is equivalent, and renamed with a "__P<n>" suffix otherwise; references
+in later structures are rewritten to match.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_PAGE_MARKER = re.compile(r"^--- Page \d+ ---\s*$")
+_INDICATION_OPENER = re.compile(
+    r"^\S.{0,120}?\b(?:is|are)\s+(?:proven|(?:considered\s+)?medically\s+necessary|approved|covered)\b",
+    re.IGNORECASE,
+)
+_HEADING = re.compile(r"^[A-Z][\w’'(),/&\- ]{2,60}$")
+
+# Characters of the document head repeated as context in every later chunk
+HEADER_CONTEXT_CHARS = 2000
+
+_STRING_LIST_FIELDS = ("medication_brand_names", "medication_generic_names", "required_specialties")
+
+# Top-level fields combined across chunks; all others come from the first chunk that has them
+_MERGED_FIELDS = frozenset(_STRING_LIST_FIELDS) | {
+    "medication_codes", "atomic_criteria", "criterion_groups", "indications", "exclusions",
+    "step_therapy_requirements", "safety_screenings", "sections_identified",
+}
+
+# Criterion fields that decide equivalence (wording and provenance may differ between chunks)
+_CRITERION_SIGNATURE_FIELDS = (
+    "criterion_type", "comparison_operator", "threshold_value", "threshold_value_upper",
+    "threshold_unit", "allowed_values", "drug_names", "drug_classes", "clinical_codes", "is_required",
+)
+
+
+def _is_boundary(line: str, previous: str) -> bool:
+    stripped = line.strip()
+    if not stripped:
+        return False
+    if _PAGE_MARKER.match(stripped) or _INDICATION_OPENER.match(stripped):
+        return True
+    return not previous.strip() and bool(_HEADING.match(stripped)) and len(stripped.split()) <= 8
+
+
+def split_sections(text: str) -> List[str]:
+    """Split text into sections starting at detected boundaries."""
+    sections: List[str] = []
+    current: List[str] = []
+    previous = ""
+    for line in text.splitlines(keepends=True):
+        if current and _is_boundary(line, previous):
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+        previous = line
+    if current:
+        sections.append("".join(current))
+    return sections
+
+
+def _split_oversized(section: str, max_chars: int) -> List[str]:
+    """Split one section that exceeds max_chars at line boundaries."""
+    parts: List[str] = []
+    current = ""
+    for line in section.splitlines(keepends=True):
+        while len(line) > max_chars:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and len(current) + len(line) > max_chars:
+            parts.append(current)
+            current = ""
+        current += line
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_policy_sections(text: str, max_chars: int) -> List[str]:
+    """
+    Pack the sections of a policy document into chunks of at most max_chars.
+
+    Sections are never split unless a single section exceeds max_chars; the
+    chunks concatenate back to the original text.
+    """
+    chunks: List[str] = []
+    current = ""
+    for section in split_sections(text):
+        pieces = [section] if len(section) <= max_chars else _split_oversized(section, max_chars)
+        for piece in pieces:
+            if current and len(current) + len(piece) > max_chars:
+                chunks.append(current)
+                current = ""
+            current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_document(chunk: str, index: int, total: int, header: str) -> str:
+    """Policy document text sent to the extraction prompt for one chunk."""
+    if index == 0:
+        return f"[Part 1 of {total} of the policy document]\n\n{chunk}"
+    return (
+        f"[Document header — context only; extract criteria from the part below, not from this header]\n"
+        f"{header}\n\n"
+        f"[Part {index + 1} of {total} of the policy document]\n\n{chunk}"
+    )
+
+
+def chunk_directive(index: int, total: int) -> str:
+    """Extraction directive appended to the version hint for one chunk."""
+    return (
+        f"This is part {index + 1} of {total} of a large policy document that is being extracted in parts. "
+        f"Extract every criterion, group, indication, exclusion and step therapy requirement stated in this "
+        f"part. Each indication's criterion groups must be complete within this part."
+    )
+
+
+# --- Merge ---
+
+def _criterion_signature(criterion: Dict[str, Any]) -> Tuple:
+    return tuple(repr(criterion.get(field)) for field in _CRITERION_SIGNATURE_FIELDS)
+
+
+def _unique_id(base: str, part: int, taken: Dict[str, Any]) -> str:
+    candidate = f"{base}__P{part}"
+    n = 2
+    while candidate in taken:
+        candidate = f"{base}__P{part}_{n}"
+        n += 1
+    return candidate
+
+
+def _merge_keyed(
+    merged: Dict[str, Any],
+    item_id: str,
+    item: Dict[str, Any],
+    id_field: str,
+    part: int,
+    same: bool,
+) -> str:
+    """Add item under item_id, reusing or renaming on collision; returns the ID used."""
+    if item_id not in merged:
+        merged[item_id] = item
+        return item_id
+    if same:
+        return item_id
+    new_id = _unique_id(item_id, part, merged)
+    merged[new_id] = {**item, id_field: new_id}
+    return new_id
+
+
+def merge_chunk_extractions(extractions: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Merge per-chunk extractions (in document order) into one extraction.
+
+    None entries (failed chunks) are skipped.
+    """
+    merged: Dict[str, Any] = {}
+    criteria: Dict[str, Dict[str, Any]] = {}
+    groups: Dict[str, Dict[str, Any]] = {}
+    indications: Dict[str, Dict[str, Any]] = {}
+    exclusions: Dict[str, Dict[str, Any]] = {}
+    step_therapy: Dict[str, Dict[str, Any]] = {}
+    string_lists: Dict[str, List[str]] = {field: [] for field in _STRING_LIST_FIELDS}
+    medication_codes: Dict[Tuple, Dict[str, Any]] = {}
+    safety_screenings: List[Any] = []
+    sections: List[Any] = []
+
+    for part, data in enumerate(extractions, start=1):
+        if not data:
+            continue
+        # Scalars and any unrecognized top-level fields: first chunk that provides them wins
+        for field, value in data.items():
+            if field not in _MERGED_FIELDS and value not in (None, "", [], {}) and field not in merged:
+                merged[field] = value
+        for field in _STRING_LIST_FIELDS:
+            for value in data.get(field) or []:
+                if value not in string_lists[field]:
+                    string_lists[field].append(value)
+        for code in data.get("medication_codes") or []:
+            if isinstance(code, dict):
+                medication_codes.setdefault((code.get("system"), code.get("code")), code)
+        for screening in data.get("safety_screenings") or []:
+            if screening not in safety_screenings:
+                safety_screenings.append(screening)
+        sections.extend(data.get("sections_identified") or [])
+
+        criterion_ids: Dict[str, str] = {}
+        for cid, criterion in (data.get("atomic_criteria") or {}).items():
+            if not isinstance(criterion, dict):
+                continue
+            same = cid in criteria and _criterion_signature(criteria[cid]) == _criterion_signature(criterion)
+            criterion_ids[cid] = _merge_keyed(criteria, cid, criterion, "criterion_id", part, same)
+
+        # Group IDs are assigned first so subgroup references can be rewritten
+        group_ids: Dict[str, str] = {}
+        new_groups: Dict[str, Dict[str, Any]] = {}
+        for gid, group in (data.get("criterion_groups") or {}).items():
+            if not isinstance(group, dict):
+                continue
+            group = {**group, "criteria": [criterion_ids.get(c, c) for c in group.get("criteria") or []]}
+            existing = groups.get(gid)
+            if existing is not None and all(
+                existing.get(k) == group.get(k) for k in ("operator", "criteria", "subgroups", "negated")
+            ):
+                group_ids[gid] = gid
+                continue
+            new_id = gid if existing is None else _unique_id(gid, part, {**groups, **new_groups})
+            group_ids[gid] = new_id
+            new_groups[new_id] = group
+        for new_id, group in new_groups.items():
+            groups[new_id] = {
+                **group,
+                "group_id": new_id,
+                "subgroups": [group_ids.get(s, s) for s in group.get("subgroups") or []],
+            }
+
+        for indication in data.get("indications") or []:
+            if not isinstance(indication, dict):
+                continue
+            indication = {
+                **indication,
+                "initial_approval_criteria": group_ids.get(
+                    indication.get("initial_approval_criteria"), indication.get("initial_approval_criteria")
+                ),
+                "continuation_criteria": group_ids.get(
+                    indication.get("continuation_criteria"), indication.get("continuation_criteria")
+                ),
+            }
+            iid = indication.get("indication_id") or f"INDICATION_P{part}"
+            _merge_keyed(indications, iid, indication, "indication_id", part, indications.get(iid) == indication)
+
+        for exclusion in data.get("exclusions") or []:
+            if not isinstance(exclusion, dict):
+                continue
+            exclusion = {
+                **exclusion,
+                "trigger_criteria": [criterion_ids.get(c, c) for c in exclusion.get("trigger_criteria") or []],
+            }
+            eid = exclusion.get("exclusion_id") or f"EXCLUSION_P{part}"
+            _merge_keyed(exclusions, eid, exclusion, "exclusion_id", part, exclusions.get(eid) == exclusion)
+
+        for requirement in data.get("step_therapy_requirements") or []:
+            if not isinstance(requirement, dict):
+                continue
+            rid = requirement.get("requirement_id") or f"STEP_P{part}"
+            _merge_keyed(
+                step_therapy, rid, requirement, "requirement_id", part, step_therapy.get(rid) == requirement,
+            )
+
+    merged.update(string_lists)
+    merged["medication_codes"] = list(medication_codes.values())
+    merged["atomic_criteria"] = criteria
+    merged["criterion_groups"] = groups
+    merged["indications"] = list(indications.values())
+    merged["exclusions"] = list(exclusions.values())
+    merged["step_therapy_requirements"] = list(step_therapy.values())
+    merged["safety_screenings"] = safety_screenings
+    merged["sections_identified"] = sections
+    return merged
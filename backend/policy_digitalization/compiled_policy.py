@@ -0,0 +1,305 @@
+"""Compiled Policy Plans — evaluation-ready view of a DigitizedPolicy.
+
+Evaluating a patient against a DigitizedPolicy repeatedly lowercases the same
+criterion names, normalizes the same ICD-10/LOINC/drug lists and resolves the
+same group IDs. A CompiledPolicy does that work once per policy content hash:
+
+- Criteria are wrapped in CompiledCriterion objects carrying pre-normalized
+  code sets, an ICD-10 prefix trie, drug sets and keyword tokens. All criteria
+  of a policy share one multi-pattern DrugMatcher.
+- The criterion group DAG is flattened into GroupPlan nodes whose children are
+  already resolved (missing IDs dropped, exactly as evaluate_group does).
+- Indications (including the synthesized AUTO_INITIAL one), exclusion
+  triggers and step therapy items are resolved up front.
+
+Plans are kept in a bounded LRU keyed by content hash. The hash is computed
+from the policy on every lookup, so a policy mutated in place gets a new plan.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from backend.models.policy_schema import (
+    DigitizedPolicy, AtomicCriterion, CriterionGroup, IndicationCriteria,
+    LogicalOperator,
+)
+from backend.policy_digitalization.matchers import DrugMatcher, ICD10PrefixTrie
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+MAX_COMPILED_POLICIES = 64
+
+# Noise words skipped when matching lab criteria by keyword
+LAB_NOISE_WORDS = frozenset({
+    "test", "level", "value", "result", "lab", "blood", "serum", "plasma", "the", "and", "for", "with",
+})
+
+# Canonical screening types and the criterion phrases that imply them
+SCREENING_SYNONYMS = {
+    "tb": ("tb", "tuberculosis"),
+    "hepatitis_b": ("hepatitis b", "hep b"),
+    "hepatitis_c": ("hepatitis c", "hep c"),
+}
+
+
+def normalize_icd10(code: str) -> str:
+    """Normalize an ICD-10 code for prefix comparison (uppercase, no dots)."""
+    return code.upper().replace(".", "")
+
+
+class CompiledCriterion:
+    """An AtomicCriterion plus pre-normalized lookup data.
+
+    Attribute access falls through to the wrapped criterion, so evaluators can
+    treat a CompiledCriterion exactly like an AtomicCriterion.
+    """
+
+    __slots__ = (
+        "criterion", "criterion_id", "criterion_type", "name", "description", "is_required",
+        "name_lower", "desc_lower", "combined",
+        "icd_codes", "icd_trie", "loinc_codes", "drug_names_lower", "drug_classes_lower", "drug_matcher",
+        "allowed_lower",
+        "name_keywords", "lab_keywords", "name_tokens", "desc_tokens", "short_lab_tokens", "screening_types",
+    )
+
+    def __init__(self, criterion: AtomicCriterion, drug_matcher: Optional[DrugMatcher] = None):
+        self.criterion = criterion
+        self.criterion_id = criterion.criterion_id
+        self.criterion_type = criterion.criterion_type
+        self.name = criterion.name
+        self.description = criterion.description
+        self.is_required = criterion.is_required
+
+        self.name_lower = criterion.name.lower()
+        self.desc_lower = criterion.description.lower()
+        self.combined = self.name_lower + " " + self.desc_lower
+
+        self.icd_codes: FrozenSet[str] = frozenset(normalize_icd10(c.code) for c in criterion.clinical_codes)
+        self.icd_trie = ICD10PrefixTrie(self.icd_codes)
+        self.loinc_codes: FrozenSet[str] = frozenset(
+            c.code for c in criterion.clinical_codes if c.system == "LOINC"
+        )
+        self.drug_names_lower: FrozenSet[str] = frozenset(d.lower() for d in criterion.drug_names)
+        self.drug_classes_lower: FrozenSet[str] = frozenset(d.lower() for d in criterion.drug_classes)
+        # Policies share one matcher across criteria; a standalone criterion gets its own
+        self.drug_matcher = drug_matcher if drug_matcher is not None else DrugMatcher(self.drug_names_lower)
+        self.allowed_lower: List[str] = [v.lower() for v in criterion.allowed_values]
+
+        # Diagnosis keyword fallback: words of the criterion name (>= 4 chars)
+        self.name_keywords: Tuple[str, ...] = tuple(
+            w for w in self.name_lower.replace("_", " ").split() if len(w) >= 4
+        )
+        # Lab keyword matching: meaningful words of the criterion name
+        self.lab_keywords: FrozenSet[str] = frozenset(
+            kw for kw in self.name_lower.split() if len(kw) >= 4 and kw not in LAB_NOISE_WORDS
+        )
+        self.name_tokens: FrozenSet[str] = frozenset(self.name_lower.split())
+        self.desc_tokens: FrozenSet[str] = frozenset(self.desc_lower.split())
+        # Short alphabetic words (CRP, ESR) that match a lab test name exactly
+        self.short_lab_tokens: FrozenSet[str] = frozenset(
+            t for t in self.name_tokens | self.desc_tokens if len(t) < 4 and t.isalpha()
+        )
+        # Canonical screening types named by the criterion text
+        self.screening_types: FrozenSet[str] = frozenset(
+            canonical for canonical, phrases in SCREENING_SYNONYMS.items()
+            if any(phrase in self.combined for phrase in phrases)
+        )
+
+    def __getattr__(self, item):
+        # Only called for attributes not held in a slot
+        if item == "criterion":
+            raise AttributeError(item)
+        return getattr(self.criterion, item)
+
+    def __repr__(self) -> str:
+        return f"CompiledCriterion({self.criterion_id!r})"
+
+
+def compile_criterion(criterion) -> CompiledCriterion:
+    """Return the compiled form of a criterion (no-op if already compiled)."""
+    if isinstance(criterion, CompiledCriterion):
+        return criterion
+    return CompiledCriterion(criterion)
+
+
+class GroupPlan:
+    """A criterion group with its children resolved to compiled nodes."""
+
+    __slots__ = ("group", "group_id", "operator", "operator_label", "negated", "criteria", "subgroups")
+
+    def __init__(self, group: CriterionGroup, criteria: Tuple[CompiledCriterion, ...], subgroups: Tuple[str, ...]):
+        self.group = group
+        self.group_id = group.group_id
+        self.operator = group.operator
+        self.operator_label = (
+            group.operator.value if isinstance(group.operator, LogicalOperator) else str(group.operator)
+        )
+        self.negated = group.negated
+        self.criteria = criteria
+        self.subgroups = subgroups
+
+
+class StepTherapyItemPlan:
+    """A step therapy requirement with lowercase drug/class items."""
+
+    __slots__ = ("requirement", "items_lower")
+
+    def __init__(self, requirement):
+        self.requirement = requirement
+        self.items_lower: Tuple[str, ...] = tuple(
+            item.lower() for item in requirement.required_drugs + requirement.required_drug_classes
+        )
+
+
+class CompiledPolicy:
+    """Evaluation plan for a DigitizedPolicy."""
+
+    def __init__(self, policy: DigitizedPolicy, content_hash: str):
+        self.policy = policy
+        self.content_hash = content_hash
+        self.policy_id = policy.policy_id
+
+        self.step_therapy: Tuple[StepTherapyItemPlan, ...] = tuple(
+            StepTherapyItemPlan(req) for req in policy.step_therapy_requirements
+        )
+        # One automaton over every drug name, class and step therapy item in the policy
+        drug_patterns = {
+            d.lower() for c in policy.atomic_criteria.values() for d in c.drug_names + c.drug_classes
+        }
+        drug_patterns.update(item for step in self.step_therapy for item in step.items_lower)
+        self.drug_matcher = DrugMatcher(drug_patterns)
+
+        self.criteria: Dict[str, CompiledCriterion] = {
+            cid: CompiledCriterion(c, self.drug_matcher) for cid, c in policy.atomic_criteria.items()
+        }
+        self.groups: Dict[str, GroupPlan] = {
+            gid: self._plan_group(g) for gid, g in policy.criterion_groups.items()
+        }
+        self.topo_order, self.has_cycles = self._flatten_groups()
+
+        self.indications: List[IndicationCriteria] = list(policy.indications)
+        if not self.indications:
+            root_group_id = find_root_approval_group(policy)
+            if root_group_id:
+                self.indications.append(IndicationCriteria(
+                    indication_id="AUTO_INITIAL",
+                    indication_name=f"{policy.medication_name} - Initial Approval",
+                    initial_approval_criteria=root_group_id,
+                    initial_approval_duration_months=12,
+                ))
+
+        self.exclusion_triggers: Tuple[CompiledCriterion, ...] = tuple(
+            self.criteria[tid]
+            for excl in policy.exclusions
+            for tid in excl.trigger_criteria
+            if tid in self.criteria
+        )
+
+    def _plan_group(self, group: CriterionGroup) -> GroupPlan:
+        criteria = tuple(self.criteria[cid] for cid in group.criteria if cid in self.criteria)
+        subgroups = tuple(sg for sg in group.subgroups if sg in self.policy.criterion_groups)
+        return GroupPlan(group, criteria, subgroups)
+
+    def group_plan(self, group: CriterionGroup) -> GroupPlan:
+        """Plan for a group object, planning ad hoc if it is not the policy's own."""
+        plan = self.groups.get(group.group_id)
+        if plan is not None and plan.group is group:
+            return plan
+        return self._plan_group(group)
+
+    def _flatten_groups(self) -> Tuple[Tuple[str, ...], bool]:
+        """Order groups children-first and detect cycles in the group graph."""
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = on stack, 2 = done
+        has_cycles = False
+
+        for root in self.groups:
+            if root in state:
+                continue
+            stack = [(root, iter(self.groups[root].subgroups))]
+            state[root] = 1
+            while stack:
+                gid, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    state[gid] = 2
+                    order.append(gid)
+                    continue
+                child_state = state.get(child)
+                if child_state == 1:
+                    has_cycles = True
+                elif child_state is None:
+                    state[child] = 1
+                    stack.append((child, iter(self.groups[child].subgroups)))
+        return tuple(order), has_cycles
+
+
+def find_root_approval_group(policy: DigitizedPolicy) -> Optional[str]:
+    """Find the root initial approval group in a policy that has no indications.
+
+    Looks for groups named like 'INITIAL_APPROVAL', 'INITIAL_APPROVAL_GROUP', etc.
+    """
+    approval_keywords = ["initial_approval", "approval_group", "root"]
+    for gid, group in policy.criterion_groups.items():
+        gid_lower = gid.lower()
+        for kw in approval_keywords:
+            if kw in gid_lower:
+                return gid
+    # Fallback: return the group with the most criteria/subgroups
+    if policy.criterion_groups:
+        best_gid = max(
+            policy.criterion_groups,
+            key=lambda gid: len(policy.criterion_groups[gid].criteria) + len(policy.criterion_groups[gid].subgroups),
+        )
+        return best_gid
+    return None
+
+
+# --- Plan cache ---
+
+_plan_cache: "OrderedDict[str, CompiledPolicy]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def policy_content_hash(policy: DigitizedPolicy) -> str:
+    """Content hash of a policy (same scheme as PolicyRepository.store)."""
+    policy_dict = policy.model_dump(mode="json")
+    return hashlib.sha256(
+        json.dumps(policy_dict, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+
+
+def compile_policy(policy: DigitizedPolicy) -> CompiledPolicy:
+    """Get the compiled plan for a policy, building it on first use."""
+    content_hash = policy_content_hash(policy)
+    with _cache_lock:
+        plan = _plan_cache.get(content_hash)
+        if plan is not None:
+            _plan_cache.move_to_end(content_hash)
+            return plan
+
+    plan = CompiledPolicy(policy, content_hash)
+    with _cache_lock:
+        _plan_cache[content_hash] = plan
+        _plan_cache.move_to_end(content_hash)
+        while len(_plan_cache) > MAX_COMPILED_POLICIES:
+            _plan_cache.popitem(last=False)
+    logger.debug(
+        "Compiled policy plan",
+        policy_id=policy.policy_id,
+        content_hash=content_hash,
+        criteria=len(plan.criteria),
+        groups=len(plan.groups),
+    )
+    return plan
+
+
+def clear_compiled_policy_cache() -> None:
+    """Drop all compiled plans."""
+    with _cache_lock:
+        _plan_cache.clear()
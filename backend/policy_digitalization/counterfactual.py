@@ -0,0 +1,371 @@
+"""Counterfactual Evaluation — deterministic "what-if" on top of evaluate_policy.
+
+Applies hypothetical patient data changes (e.g. a negative TB screening, a
+failed methotrexate trial) to a copy of a NormalizedPatientData and
+re-evaluates incrementally with reevaluate(), so only criteria reading a
+changed field are recomputed. No LLM calls.
+
+minimal_resolutions() answers the follow-up question: for each indication
+that is not MET, the smallest set of INSUFFICIENT_DATA criteria whose
+resolution would make it MET.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from backend.models.policy_schema import DigitizedPolicy, LogicalOperator
+from backend.policy_digitalization.compiled_policy import CompiledPolicy, compile_policy
+from backend.policy_digitalization.evaluator import (
+    CriterionVerdict,
+    PolicyEvaluationResult,
+    changed_patient_fields,
+    collect_all_criteria_evals,
+    evaluate_policy,
+    reevaluate,
+)
+from backend.policy_digitalization.patient_data_adapter import (
+    NormalizedBiomarker,
+    NormalizedFunctionalScore,
+    NormalizedGeneticTest,
+    NormalizedImagingResult,
+    NormalizedLabResult,
+    NormalizedPatientData,
+    NormalizedScreening,
+    NormalizedTreatment,
+)
+from backend.policy_digitalization.exceptions import EvaluationError
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Baseline evaluations kept for repeated what-if calls on the same patient/policy
+MAX_CACHED_BASELINES = 128
+
+# List fields that accept "add" changes, with their item model (None = plain string)
+_LIST_FIELDS = {
+    "diagnosis_codes": None,
+    "program_enrollments": None,
+    "prior_treatments": NormalizedTreatment,
+    "lab_results": NormalizedLabResult,
+    "completed_screenings": NormalizedScreening,
+    "biomarkers": NormalizedBiomarker,
+    "functional_scores": NormalizedFunctionalScore,
+    "imaging_results": NormalizedImagingResult,
+    "genetic_tests": NormalizedGeneticTest,
+}
+
+_MARKER_PREFIX = "clinical_markers."
+
+
+class PatientChange(BaseModel):
+    """
+    One hypothetical change to normalized patient data.
+
+    op="add" prepends an item to a list field (hypothetical data is treated as
+    the most recent, so it wins first-match lookups). op="set" replaces a
+    scalar field, or one clinical marker via "clinical_markers.<key>".
+    """
+    op: Literal["add", "set"]
+    field: str
+    value: Any = None
+
+
+class CriterionChange(BaseModel):
+    criterion_id: str
+    criterion_name: str
+    before: Optional[CriterionVerdict] = None
+    after: CriterionVerdict
+
+
+class CriterionResolution(BaseModel):
+    criterion_id: str
+    criterion_name: str
+    required_verdict: CriterionVerdict
+
+
+class IndicationWhatIf(BaseModel):
+    indication_id: str
+    indication_name: str
+    before: CriterionVerdict
+    after: CriterionVerdict
+    # Smallest set of INSUFFICIENT_DATA criteria to resolve for MET; None if unreachable
+    resolution: Optional[List[CriterionResolution]] = None
+
+
+class WhatIfResult(BaseModel):
+    policy_id: str
+    patient_id: str
+    baseline_verdict: CriterionVerdict
+    verdict: CriterionVerdict
+    baseline_readiness: float
+    readiness: float
+    changed_fields: List[str] = Field(default_factory=list)
+    changed_criteria: List[CriterionChange] = Field(default_factory=list)
+    indications: List[IndicationWhatIf] = Field(default_factory=list)
+    result: PolicyEvaluationResult
+
+
+def apply_changes(patient: NormalizedPatientData, changes: List[PatientChange]) -> NormalizedPatientData:
+    """Return a copy of patient with the hypothetical changes applied."""
+    updated = patient.model_copy(deep=True)
+    for change in changes:
+        if change.op == "add":
+            if change.field not in _LIST_FIELDS:
+                raise EvaluationError(f"Cannot add to field '{change.field}'")
+            item_model = _LIST_FIELDS[change.field]
+            try:
+                item = item_model(**change.value) if item_model else str(change.value)
+            except (TypeError, ValueError) as e:
+                raise EvaluationError(f"Invalid value for '{change.field}': {e}") from e
+            setattr(updated, change.field, [item] + list(getattr(updated, change.field)))
+        elif change.field.startswith(_MARKER_PREFIX):
+            key = change.field[len(_MARKER_PREFIX):]
+            if not key:
+                raise EvaluationError("Clinical marker key is required")
+            updated.clinical_markers = {**updated.clinical_markers, key: change.value}
+        else:
+            if change.field not in NormalizedPatientData.model_fields or change.field in _LIST_FIELDS:
+                raise EvaluationError(f"Cannot set field '{change.field}'")
+            try:
+                updated = NormalizedPatientData.model_validate({**updated.model_dump(), change.field: change.value})
+            except ValueError as e:
+                raise EvaluationError(f"Invalid value for '{change.field}': {e}") from e
+    return updated
+
+
+# --- Minimal resolution sets ---
+
+Resolution = Dict[str, CriterionVerdict]
+
+_FLIP = {CriterionVerdict.MET: CriterionVerdict.NOT_MET, CriterionVerdict.NOT_MET: CriterionVerdict.MET}
+
+# Alternatives kept per group (smallest first); beyond it results may not be minimal
+MAX_RESOLUTION_CANDIDATES = 64
+
+
+def _prune(candidates: List[Resolution]) -> List[Resolution]:
+    """Distinct candidates that do not contain another one, smallest first (capped)."""
+    kept: List[Resolution] = []
+    for candidate in sorted(candidates, key=lambda r: (len(r), sorted(r.items()))):
+        if not any(other.items() <= candidate.items() for other in kept):
+            kept.append(candidate)
+    return kept[:MAX_RESOLUTION_CANDIDATES]
+
+
+def _merge_all(alternatives: List[List[Resolution]]) -> List[Resolution]:
+    """Every consistent combination of one candidate per child (a criterion cannot be needed both ways)."""
+    merged: List[Resolution] = [{}]
+    for candidates in alternatives:
+        combined = []
+        for base in merged:
+            for candidate in candidates:
+                if all(base.get(cid, verdict) == verdict for cid, verdict in candidate.items()):
+                    combined.append({**base, **candidate})
+        merged = _prune(combined)
+        if not merged:
+            break
+    return merged
+
+
+def _group_resolutions(
+    plan: CompiledPolicy,
+    group_id: str,
+    target: CriterionVerdict,
+    verdicts: Dict[str, CriterionVerdict],
+    group_verdicts: Dict[str, CriterionVerdict],
+    visiting: frozenset,
+) -> List[Resolution]:
+    """
+    Minimal sets of criterion verdicts that drive a group to target ([] if none).
+
+    A definite verdict never changes when more INSUFFICIENT_DATA criteria are
+    resolved, so a group's candidates combine its children's candidates: any
+    one child's for OR reaching MET (AND reaching NOT_MET), a consistent merge
+    of every child's otherwise.
+    """
+    group = plan.groups.get(group_id)
+    if group is None or group_id in visiting:
+        return []
+    visiting = visiting | {group_id}
+    if group.negated:
+        target = _FLIP[target]
+
+    # (current verdict, resolver) per child; NOT_APPLICABLE children are transparent and fixed
+    children: List[Tuple[CriterionVerdict, Any]] = []
+    for criterion in group.criteria:
+        cid = criterion.criterion_id
+        verdict = verdicts.get(cid, CriterionVerdict.INSUFFICIENT_DATA)
+        children.append((verdict, lambda t, cid=cid, verdict=verdict: (
+            [{}] if verdict == t else [{cid: t}] if verdict == CriterionVerdict.INSUFFICIENT_DATA else []
+        )))
+    for sg_id in group.subgroups:
+        children.append((
+            group_verdicts.get(sg_id, CriterionVerdict.INSUFFICIENT_DATA),
+            lambda t, sg_id=sg_id: _group_resolutions(plan, sg_id, t, verdicts, group_verdicts, visiting),
+        ))
+
+    op = group.operator.value if isinstance(group.operator, LogicalOperator) else str(group.operator).upper()
+    if op == "NOT":
+        if not children or children[0][0] == CriterionVerdict.NOT_APPLICABLE:
+            return []
+        return children[0][1](_FLIP[target])
+
+    effective = [resolve for verdict, resolve in children if verdict != CriterionVerdict.NOT_APPLICABLE]
+    if not effective or op not in ("AND", "OR"):
+        return []
+    # AND reaches MET (OR reaches NOT_MET) only through every child; otherwise one child suffices
+    if (op == "AND") == (target == CriterionVerdict.MET):
+        return _merge_all([resolve(target) for resolve in effective])
+    return _prune([candidate for resolve in effective for candidate in resolve(target)])
+
+
+def minimal_resolutions(
+    policy: DigitizedPolicy,
+    result: PolicyEvaluationResult,
+) -> Dict[str, Optional[List[CriterionResolution]]]:
+    """
+    Smallest set of INSUFFICIENT_DATA criteria to resolve for each indication to be MET.
+
+    Keyed by indication_id: [] for indications already MET, None when no
+    resolution of INSUFFICIENT_DATA criteria alone can make it MET. A criterion
+    under a NOT group must resolve to NOT_MET; required_verdict says which.
+    """
+    plan = compile_policy(policy)
+    verdicts: Dict[str, CriterionVerdict] = {}
+    names: Dict[str, str] = {}
+    group_verdicts: Dict[str, CriterionVerdict] = {}
+    stack = [ie.approval_criteria_result for ie in result.indication_evaluations if ie.approval_criteria_result]
+    while stack:
+        group_result = stack.pop()
+        if group_result.group_id in group_verdicts:
+            continue
+        group_verdicts[group_result.group_id] = group_result.verdict
+        stack.extend(group_result.subgroup_results)
+    for ie in result.indication_evaluations:
+        for ce in collect_all_criteria_evals(ie.approval_criteria_result):
+            verdicts[ce.criterion_id] = ce.verdict
+            names[ce.criterion_id] = ce.criterion_name
+
+    resolutions: Dict[str, Optional[List[CriterionResolution]]] = {}
+    for indication, ie in zip(plan.indications, result.indication_evaluations):
+        if ie.overall_verdict == CriterionVerdict.MET:
+            resolutions[ie.indication_id] = []
+            continue
+        candidates = _group_resolutions(
+            plan, indication.initial_approval_criteria, CriterionVerdict.MET, verdicts, group_verdicts, frozenset(),
+        )
+        resolutions[ie.indication_id] = [
+            CriterionResolution(criterion_id=cid, criterion_name=names.get(cid, cid), required_verdict=verdict)
+            for cid, verdict in sorted(candidates[0].items())
+        ] if candidates else None
+    return resolutions
+
+
+# --- What-if ---
+
+_baselines: "OrderedDict[tuple, Tuple[NormalizedPatientData, PolicyEvaluationResult]]" = OrderedDict()
+_baselines_lock = threading.Lock()  # The what-if route evaluates in worker threads
+
+
+def baseline_evaluation(
+    policy: DigitizedPolicy,
+    patient: NormalizedPatientData,
+    cache_key: Optional[Any] = None,
+) -> PolicyEvaluationResult:
+    """
+    evaluate_policy(policy, patient), cached under (policy content, cache_key).
+
+    cache_key must change whenever the underlying patient data does (the
+    what-if route uses the patient ID and the identity of the patient store's
+    normalized instance, which is replaced when the file changes); without one
+    nothing is cached. A hit also requires the cached patient to equal patient.
+    """
+    if cache_key is None:
+        return evaluate_policy(policy, patient)
+    key = (compile_policy(policy).content_hash, cache_key)
+    with _baselines_lock:
+        cached = _baselines.get(key)
+        if cached is not None and cached[0] == patient:
+            _baselines.move_to_end(key)
+            return cached[1]
+    # Evaluated outside the lock; concurrent misses on one key evaluate twice, last write wins
+    result = evaluate_policy(policy, patient)
+    with _baselines_lock:
+        _baselines[key] = (patient, result)
+        _baselines.move_to_end(key)
+        while len(_baselines) > MAX_CACHED_BASELINES:
+            _baselines.popitem(last=False)
+    return result
+
+
+def clear_baseline_cache() -> None:
+    with _baselines_lock:
+        _baselines.clear()
+
+
+def what_if(
+    policy: DigitizedPolicy,
+    patient: NormalizedPatientData,
+    changes: List[PatientChange],
+    baseline: Optional[PolicyEvaluationResult] = None,
+) -> WhatIfResult:
+    """
+    Evaluate a policy as if the patient data included the given changes.
+
+    baseline must be evaluate_policy(policy, patient) when given; it is computed
+    otherwise. Only criteria affected by the changes are re-evaluated.
+    """
+    if baseline is None:
+        baseline = evaluate_policy(policy, patient)
+    updated = apply_changes(patient, changes)
+    result = reevaluate(baseline, patient, updated, policy)
+
+    before: Dict[str, Any] = {}
+    for ie in baseline.indication_evaluations:
+        for ce in collect_all_criteria_evals(ie.approval_criteria_result):
+            before.setdefault(ce.criterion_id, ce.verdict)
+    changed_criteria: Dict[str, CriterionChange] = {}
+    for ie in result.indication_evaluations:
+        for ce in collect_all_criteria_evals(ie.approval_criteria_result):
+            if ce.criterion_id not in changed_criteria and before.get(ce.criterion_id) != ce.verdict:
+                changed_criteria[ce.criterion_id] = CriterionChange(
+                    criterion_id=ce.criterion_id,
+                    criterion_name=ce.criterion_name,
+                    before=before.get(ce.criterion_id),
+                    after=ce.verdict,
+                )
+
+    resolutions = minimal_resolutions(policy, result)
+    indications = [
+        IndicationWhatIf(
+            indication_id=new.indication_id,
+            indication_name=new.indication_name,
+            before=old.overall_verdict,
+            after=new.overall_verdict,
+            resolution=resolutions.get(new.indication_id),
+        )
+        for old, new in zip(baseline.indication_evaluations, result.indication_evaluations)
+    ]
+
+    logger.debug(
+        "What-if evaluation",
+        policy_id=result.policy_id,
+        changes=len(changes),
+        criteria_changed=len(changed_criteria),
+        verdict=result.overall_verdict.value,
+    )
+    return WhatIfResult(
+        policy_id=result.policy_id,
+        patient_id=result.patient_id,
+        baseline_verdict=baseline.overall_verdict,
+        verdict=result.overall_verdict,
+        baseline_readiness=baseline.overall_readiness,
+        readiness=result.overall_readiness,
+        changed_fields=sorted(changed_patient_fields(patient, updated)),
+        changed_criteria=list(changed_criteria.values()),
+        indications=indications,
+        result=result,
+    )
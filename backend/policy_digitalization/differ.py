@@ -76,7 +76,7 @@ class PolicyDiffer:
         """Diff two policy versions."""
         from datetime import datetime, timezone
 
-        criterion_changes = self._diff_criteria(old.atomic_criteria, new.atomic_criteria)
+        criterion_changes = self.diff_criteria(old.atomic_criteria, new.atomic_criteria)
         indication_changes = self._diff_indications(old.indications, new.indications)
         step_therapy_changes = self._diff_step_therapy(old.step_therapy_requirements, new.step_therapy_requirements)
         exclusion_changes = self._diff_exclusions(old.exclusions, new.exclusions)
@@ -129,7 +129,7 @@ class PolicyDiffer:
             criterion_changes=criterion_changes,
         )
 
-    def _diff_criteria(
+    def diff_criteria(
         self, old_criteria: Dict[str, AtomicCriterion], new_criteria: Dict[str, AtomicCriterion]
     ) -> List[CriterionChange]:
         """Diff atomic criteria between two versions."""
@@ -0,0 +1,164 @@
+"""Evaluation Matrix — every patient against every policy, across processes.
+
+A portfolio readiness sweep evaluates N patients against M digitized policies.
+stream_evaluation_matrix shards the N x M grid into (policy, patient range)
+tasks and runs them on a ProcessPoolExecutor. Policies and normalized patients
+are sent to each worker once, through the pool initializer; tasks only carry
+indexes. Rows are yielded as shards complete, so callers can stream them.
+
+rank_policies_for_patient is the single-patient slice of the same grid: one
+normalized patient (and its lab/screening indexes) evaluated in-process
+against every policy, best option first.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from backend.models.policy_schema import DigitizedPolicy
+from backend.policy_digitalization.evaluator import CriterionVerdict, evaluate_policy_fast
+from backend.policy_digitalization.patient_data_adapter import NormalizedPatientData
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Patients per task; small enough to stream early, large enough to amortize IPC
+MATRIX_SHARD_SIZE = 16
+
+# Tie-break order for options with equal readiness
+_VERDICT_RANK = {
+    CriterionVerdict.MET.value: 0,
+    CriterionVerdict.INSUFFICIENT_DATA.value: 1,
+    CriterionVerdict.NOT_APPLICABLE.value: 2,
+    CriterionVerdict.NOT_MET.value: 3,
+}
+
+# Worker-process state, set once by _init_worker
+_worker_policies: List[DigitizedPolicy] = []
+_worker_patients: List[NormalizedPatientData] = []
+
+
+def _init_worker(policies: List[DigitizedPolicy], patients: List[NormalizedPatientData]) -> None:
+    global _worker_policies, _worker_patients
+    _worker_policies = policies
+    _worker_patients = patients
+
+
+def _evaluate_shard(policy_index: int, start: int, stop: int, include_details: bool) -> List[Dict[str, Any]]:
+    policy = _worker_policies[policy_index]
+    return [matrix_row(policy, patient, include_details) for patient in _worker_patients[start:stop]]
+
+
+def matrix_row(
+    policy: DigitizedPolicy,
+    patient: NormalizedPatientData,
+    include_details: bool = False,
+) -> Dict[str, Any]:
+    """Evaluate one (policy, patient) cell as a JSON-ready row."""
+    row: Dict[str, Any] = {
+        "policy_id": policy.policy_id,
+        "payer_name": policy.payer_name,
+        "medication_name": policy.medication_name,
+        "patient_id": patient.patient_id or "unknown",
+    }
+    try:
+        record = evaluate_policy_fast(policy, patient)
+    except Exception as e:
+        logger.warning("Matrix cell evaluation failed", policy_id=policy.policy_id, patient_id=patient.patient_id, error=str(e))
+        row["error"] = type(e).__name__
+        return row
+
+    row.update({
+        "overall_verdict": record.overall_verdict.value,
+        "overall_readiness": record.overall_readiness,
+        "indications": [
+            {
+                "indication_id": ie.indication_id,
+                "indication_name": ie.indication_name,
+                "verdict": ie.overall_verdict.value,
+                "criteria_met": ie.criteria_met_count,
+                "criteria_total": ie.criteria_total_count,
+            }
+            for ie in record.indication_evaluations
+        ],
+        "gap_count": len(record.gaps),
+    })
+    if include_details:
+        row["result"] = record.to_model().model_dump(mode="json")
+    return row
+
+
+def rank_policies_for_patient(
+    patient: NormalizedPatientData,
+    policies: Sequence[DigitizedPolicy],
+    include_details: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate one normalized patient against every policy, best option first.
+
+    Options are ordered by overall_readiness (descending), then verdict, then
+    payer/medication. Cells that failed to evaluate sort last.
+    """
+    rows = [matrix_row(policy, patient, include_details) for policy in policies]
+    rows.sort(key=lambda row: (
+        "error" in row,
+        -row.get("overall_readiness", 0.0),
+        _VERDICT_RANK.get(row.get("overall_verdict"), len(_VERDICT_RANK)),
+        row["payer_name"],
+        row["medication_name"],
+    ))
+    return rows
+
+
+async def stream_evaluation_matrix(
+    policies: Sequence[DigitizedPolicy],
+    patients: Sequence[NormalizedPatientData],
+    include_details: bool = False,
+    max_workers: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Evaluate every patient against every policy in worker processes.
+
+    Yields one row per (policy, patient) pair, in completion order.
+    """
+    policies, patients = list(policies), list(patients)
+    shards = [
+        (policy_index, start, min(start + MATRIX_SHARD_SIZE, len(patients)))
+        for policy_index in range(len(policies))
+        for start in range(0, len(patients), MATRIX_SHARD_SIZE)
+    ]
+    if not shards:
+        return
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(shards)))
+    logger.info(
+        "Starting evaluation matrix",
+        policies=len(policies),
+        patients=len(patients),
+        shards=len(shards),
+        workers=workers,
+    )
+    loop = asyncio.get_running_loop()
+    # Spawned workers don't inherit the server's threads or event loop
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(policies, patients),
+    )
+    rows = 0
+    try:
+        futures = [
+            loop.run_in_executor(executor, _evaluate_shard, policy_index, start, stop, include_details)
+            for policy_index, start, stop in shards
+        ]
+        for completed in asyncio.as_completed(futures):
+            for row in await completed:
+                rows += 1
+                yield row
+    finally:
+        # Also runs when the consumer stops early (e.g. client disconnect)
+        executor.shutdown(wait=False, cancel_futures=True)
+    logger.info("Evaluation matrix complete", rows=rows)
@@ -10,8 +10,10 @@ Design principles:
 - Fully testable and auditable
 """
 
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Callable, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Callable, Set, Tuple, Union
 
 from pydantic import BaseModel, Field
 
@@ -20,6 +22,11 @@ from backend.models.policy_schema import (
     CriterionCategory, ComparisonOperator, LogicalOperator,
 )
 from backend.policy_digitalization.patient_data_adapter import NormalizedPatientData
+from backend.policy_digitalization.compiled_policy import (
+    CompiledCriterion, CompiledPolicy, GroupPlan, compile_criterion, compile_policy,
+    normalize_icd10,
+    find_root_approval_group as _find_root_approval_group,
+)
 from backend.policy_digitalization.exceptions import EvaluationError
 from backend.config.logging_config import get_logger
 
@@ -74,159 +81,311 @@ class PolicyEvaluationResult(BaseModel):
     gaps: List[Dict] = Field(default_factory=list)
 
 
+# --- Fast-mode result records ---
+# Slotted, unvalidated counterparts of the result models above, produced by
+# evaluate_policy_fast. Reasoning and evidence text is rendered on first access,
+# so bulk callers that only read verdicts never format it. Call to_model() at
+# the API boundary; render before mutating the inputs an evaluation read.
+
+TextSource = Union[str, Callable[[], str]]
+EvidenceSource = Union[List[str], Callable[[], List[str]], None]
+
+
+@dataclass(slots=True, eq=False)
+class CriterionRecord:
+    criterion_id: str
+    criterion_name: str
+    verdict: CriterionVerdict
+    is_required: bool = True
+    confidence: float = 1.0
+    _reasoning: TextSource = ""
+    _evidence: EvidenceSource = None
+
+    @property
+    def reasoning(self) -> str:
+        if callable(self._reasoning):
+            self._reasoning = self._reasoning()
+        return self._reasoning
+
+    @property
+    def evidence(self) -> List[str]:
+        if callable(self._evidence):
+            self._evidence = self._evidence()
+        elif self._evidence is None:
+            self._evidence = []
+        return self._evidence
+
+    def to_model(self) -> CriterionEvaluation:
+        return CriterionEvaluation(
+            criterion_id=self.criterion_id,
+            criterion_name=self.criterion_name,
+            verdict=self.verdict,
+            confidence=self.confidence,
+            evidence=self.evidence,
+            reasoning=self.reasoning,
+            is_required=self.is_required,
+        )
+
+
+@dataclass(slots=True, eq=False)
+class GroupRecord:
+    group_id: str
+    operator: str
+    verdict: CriterionVerdict
+    reasoning: str = ""
+    criteria_results: List[CriterionRecord] = field(default_factory=list)
+    subgroup_results: List["GroupRecord"] = field(default_factory=list)
+
+    def to_model(self) -> GroupEvaluation:
+        return GroupEvaluation(
+            group_id=self.group_id,
+            operator=self.operator,
+            verdict=self.verdict,
+            reasoning=self.reasoning,
+            criteria_results=[c.to_model() for c in self.criteria_results],
+            subgroup_results=[g.to_model() for g in self.subgroup_results],
+        )
+
+
+@dataclass(slots=True, eq=False)
+class IndicationRecord:
+    indication_id: str
+    indication_name: str
+    overall_verdict: CriterionVerdict
+    approval_criteria_result: Optional[GroupRecord] = None
+    criteria_met_count: int = 0
+    criteria_total_count: int = 0
+    unmet_criteria: List[CriterionRecord] = field(default_factory=list)
+    insufficient_criteria: List[CriterionRecord] = field(default_factory=list)
+
+    def to_model(self) -> IndicationEvaluation:
+        return IndicationEvaluation(
+            indication_id=self.indication_id,
+            indication_name=self.indication_name,
+            overall_verdict=self.overall_verdict,
+            approval_criteria_result=(
+                self.approval_criteria_result.to_model() if self.approval_criteria_result else None
+            ),
+            criteria_met_count=self.criteria_met_count,
+            criteria_total_count=self.criteria_total_count,
+            unmet_criteria=[c.to_model() for c in self.unmet_criteria],
+            insufficient_criteria=[c.to_model() for c in self.insufficient_criteria],
+        )
+
+
+@dataclass(slots=True, eq=False)
+class PolicyRecord:
+    policy_id: str
+    patient_id: str
+    indication_evaluations: List[IndicationRecord] = field(default_factory=list)
+    exclusion_evaluations: List[CriterionRecord] = field(default_factory=list)
+    step_therapy_evaluation: Optional[Dict] = None
+    overall_readiness: float = 0.0
+    overall_verdict: CriterionVerdict = CriterionVerdict.INSUFFICIENT_DATA
+    gaps: List[Dict] = field(default_factory=list)
+
+    def to_model(self) -> PolicyEvaluationResult:
+        return PolicyEvaluationResult(
+            policy_id=self.policy_id,
+            patient_id=self.patient_id,
+            indication_evaluations=[i.to_model() for i in self.indication_evaluations],
+            exclusion_evaluations=[c.to_model() for c in self.exclusion_evaluations],
+            step_therapy_evaluation=self.step_therapy_evaluation,
+            overall_readiness=self.overall_readiness,
+            overall_verdict=self.overall_verdict,
+            gaps=self.gaps,
+        )
+
+
+# Set while evaluate_policy_fast runs; selects records over pydantic models
+_fast_results: ContextVar[bool] = ContextVar("evaluator_fast_results", default=False)
+
+
+def _render(source):
+    return source() if callable(source) else source
+
+
+def _criterion_result(
+    criterion: AtomicCriterion,
+    verdict: CriterionVerdict,
+    reasoning: TextSource = "",
+    evidence: EvidenceSource = None,
+):
+    """Build a criterion result: a lazy CriterionRecord in fast mode, else a CriterionEvaluation."""
+    if _fast_results.get():
+        return CriterionRecord(
+            criterion.criterion_id, criterion.name, verdict, criterion.is_required, 1.0, reasoning, evidence,
+        )
+    return CriterionEvaluation(
+        criterion_id=criterion.criterion_id,
+        criterion_name=criterion.name,
+        verdict=verdict,
+        evidence=_render(evidence) or [],
+        reasoning=_render(reasoning),
+        is_required=criterion.is_required,
+    )
+
+
+def _group_result(**fields):
+    return GroupRecord(**fields) if _fast_results.get() else GroupEvaluation(**fields)
+
+
+def _indication_result(**fields):
+    return IndicationRecord(**fields) if _fast_results.get() else IndicationEvaluation(**fields)
+
+
+def _policy_result(**fields):
+    return PolicyRecord(**fields) if _fast_results.get() else PolicyEvaluationResult(**fields)
+
+
 # --- Evaluator Registry ---
 
 CriterionEvaluatorFn = Callable[[AtomicCriterion, NormalizedPatientData], CriterionEvaluation]
 
 EVALUATOR_REGISTRY: Dict[str, CriterionEvaluatorFn] = {}
 
+# NormalizedPatientData fields each criterion type's evaluator reads
+EVALUATOR_DEPENDENCIES: Dict[str, FrozenSet[str]] = {}
+
+ALL_PATIENT_FIELDS: FrozenSet[str] = frozenset(NormalizedPatientData.model_fields)
+
+
+def register_evaluator(*criterion_types: str, reads: Optional[Iterable[str]] = None):
+    """Decorator to register an evaluator function for one or more CriterionType values.
+
+    reads lists the NormalizedPatientData fields the evaluator depends on;
+    evaluators registered without it are assumed to read every field.
+    """
+    dependencies = frozenset(reads) if reads is not None else ALL_PATIENT_FIELDS
 
-def register_evaluator(*criterion_types: str):
-    """Decorator to register an evaluator function for one or more CriterionType values."""
     def decorator(fn: CriterionEvaluatorFn):
         for ct in criterion_types:
             EVALUATOR_REGISTRY[ct] = fn
+            EVALUATOR_DEPENDENCIES[ct] = dependencies
         return fn
     return decorator
 
 
+def criterion_dependencies(criterion_type: str) -> FrozenSet[str]:
+    """Patient fields a criterion of this type depends on."""
+    if criterion_type not in EVALUATOR_REGISTRY:
+        return frozenset()  # Constant "no evaluator registered" result
+    return EVALUATOR_DEPENDENCIES.get(criterion_type, ALL_PATIENT_FIELDS)
+
+
 # --- Individual criterion evaluators ---
 
-@register_evaluator(CriterionType.AGE)
+@register_evaluator(CriterionType.AGE, reads=("age_years",))
 def evaluate_age(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if patient.age_years is None:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="Patient age not available",
-            is_required=criterion.is_required,
         )
     raw_threshold = criterion.threshold_value
     if raw_threshold is None:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="No threshold defined in criterion",
-            is_required=criterion.is_required,
         )
     threshold = _safe_float(raw_threshold)
     if threshold is None:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
-            reasoning=f"Non-numeric threshold value: {raw_threshold}",
-            is_required=criterion.is_required,
+            reasoning=lambda: f"Non-numeric threshold value: {raw_threshold}",
         )
     met = _compare_numeric(patient.age_years, threshold, criterion.comparison_operator, criterion.threshold_value_upper)
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-        evidence=[f"Patient age: {patient.age_years} years"],
-        reasoning=f"Age {patient.age_years} {'meets' if met else 'does not meet'} {criterion.comparison_operator or 'gte'} {threshold}",
-        is_required=criterion.is_required,
+        evidence=lambda: [f"Patient age: {patient.age_years} years"],
+        reasoning=lambda: f"Age {patient.age_years} {'meets' if met else 'does not meet'} {criterion.comparison_operator or 'gte'} {threshold}",
     )
 
 
-@register_evaluator(CriterionType.GENDER)
+@register_evaluator(CriterionType.GENDER, reads=("gender",))
 def evaluate_gender(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.gender:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="Patient gender not available",
-            is_required=criterion.is_required,
         )
-    allowed = [v.lower() for v in criterion.allowed_values] if criterion.allowed_values else []
+    allowed = list(compile_criterion(criterion).allowed_lower)
     if not allowed and criterion.threshold_value:
         allowed = [str(criterion.threshold_value).lower()]
     met = patient.gender.lower() in allowed if allowed else True
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-        evidence=[f"Patient gender: {patient.gender}"],
-        reasoning=f"Gender '{patient.gender}' {'is' if met else 'is not'} in allowed values {allowed}",
-        is_required=criterion.is_required,
+        evidence=lambda: [f"Patient gender: {patient.gender}"],
+        reasoning=lambda: f"Gender '{patient.gender}' {'is' if met else 'is not'} in allowed values {allowed}",
     )
 
 
-@register_evaluator(CriterionType.DIAGNOSIS_CONFIRMED)
+@register_evaluator(CriterionType.DIAGNOSIS_CONFIRMED, reads=("diagnosis_codes", "disease_severity"))
 def evaluate_diagnosis_confirmed(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.diagnosis_codes:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="No diagnosis codes available",
-            is_required=criterion.is_required,
         )
+    cc = compile_criterion(criterion)
     # Check if any patient diagnosis code matches criterion's clinical codes
-    criterion_codes = {c.code.upper().replace(".", "") for c in criterion.clinical_codes}
-    patient_codes_normalized = {c.upper().replace(".", "") for c in patient.diagnosis_codes}
+    trie = cc.icd_trie
 
     # Match by exact or criterion-prefix (criterion K50 matches patient K5010)
     # Patient code must be at least as specific as criterion code (no reverse prefix)
     matched = False
     evidence = []
-    for pc in patient.diagnosis_codes:
-        pc_norm = pc.upper().replace(".", "")
-        for cc in criterion_codes:
-            if pc_norm == cc or pc_norm.startswith(cc):
+    if trie:
+        for pc in patient.diagnosis_codes:
+            if trie.matches(normalize_icd10(pc)):
                 matched = True
                 evidence.append(f"Diagnosis {pc} matches criterion code")
-                break
 
     # If no clinical codes on criterion, try keyword matching against criterion description
-    if not criterion_codes:
-        desc_lower = criterion.description.lower()
-        name_lower = criterion.name.lower()
+    if not trie:
         # Build keywords from patient's diagnosis codes and severity
         patient_context = " ".join(patient.diagnosis_codes).lower()
         if patient.disease_severity:
             patient_context += " " + patient.disease_severity.lower()
         # Check if criterion description keywords appear in diagnosis context or vice versa
         # Use the criterion name as key diagnostic term
-        diag_keywords = [w for w in name_lower.replace("_", " ").split() if len(w) >= 4]
-        if any(kw in patient_context for kw in diag_keywords):
+        if any(kw in patient_context for kw in cc.name_keywords):
             matched = True
             evidence = [f"Diagnosis keyword match: {criterion.name}"]
         else:
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.INSUFFICIENT_DATA,
                 evidence=[f"Criterion has no clinical codes; keyword match inconclusive"],
                 reasoning="Cannot verify diagnosis without criterion clinical codes",
-                is_required=criterion.is_required,
             )
 
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.MET if matched else CriterionVerdict.NOT_MET,
         evidence=evidence,
-        reasoning=f"Diagnosis {'confirmed' if matched else 'not confirmed'} against criterion codes",
-        is_required=criterion.is_required,
+        reasoning=lambda: f"Diagnosis {'confirmed' if matched else 'not confirmed'} against criterion codes",
     )
 
 
-@register_evaluator(CriterionType.DIAGNOSIS_SEVERITY)
+@register_evaluator(CriterionType.DIAGNOSIS_SEVERITY, reads=("disease_severity",))
 def evaluate_diagnosis_severity(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.disease_severity:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="Disease severity not documented",
-            is_required=criterion.is_required,
         )
+    cc = compile_criterion(criterion)
     # Check if patient severity matches allowed values or description keywords
-    allowed = [v.lower() for v in criterion.allowed_values] if criterion.allowed_values else []
+    allowed = cc.allowed_lower
     severity_lower = patient.disease_severity.lower().replace("-", "_").replace(" ", "_")
 
     met = False
@@ -234,57 +393,50 @@ def evaluate_diagnosis_severity(criterion: AtomicCriterion, patient: NormalizedP
         met = severity_lower in [a.replace("-", "_").replace(" ", "_") for a in allowed]
     else:
         # Check description keywords
-        desc_lower = criterion.description.lower()
+        desc_lower = cc.desc_lower
         if "moderate" in desc_lower and "moderate" in severity_lower:
             met = True
         elif "severe" in desc_lower and "severe" in severity_lower:
             met = True
 
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-        evidence=[f"Disease severity: {patient.disease_severity}"],
-        reasoning=f"Severity '{patient.disease_severity}' {'matches' if met else 'does not match'} criterion",
-        is_required=criterion.is_required,
+        evidence=lambda: [f"Disease severity: {patient.disease_severity}"],
+        reasoning=lambda: f"Severity '{patient.disease_severity}' {'matches' if met else 'does not match'} criterion",
     )
 
 
-@register_evaluator(CriterionType.PRIOR_TREATMENT_TRIED)
+@register_evaluator(CriterionType.PRIOR_TREATMENT_TRIED, reads=("prior_treatments",))
 def evaluate_prior_treatment_tried(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.prior_treatments:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="No prior treatment history available",
-            is_required=criterion.is_required,
         )
     matched = _find_treatment_match(criterion, patient)
     evidence = [f"Prior treatments: {[t.medication_name for t in patient.prior_treatments]}"]
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.MET if matched else CriterionVerdict.NOT_MET,
         evidence=evidence,
-        reasoning=f"Prior treatment {'found' if matched else 'not found'} matching criterion",
-        is_required=criterion.is_required,
+        reasoning=lambda: f"Prior treatment {'found' if matched else 'not found'} matching criterion",
     )
 
 
-@register_evaluator(CriterionType.PRIOR_TREATMENT_FAILED)
+@register_evaluator(CriterionType.PRIOR_TREATMENT_FAILED, reads=("prior_treatments", "clinical_markers"))
 def evaluate_prior_treatment_failed(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.prior_treatments:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="No prior treatment history available",
-            is_required=criterion.is_required,
         )
 
-    desc_lower = criterion.description.lower()
-    name_lower = criterion.name.lower()
+    cc = compile_criterion(criterion)
+    desc_lower = cc.desc_lower
+    name_lower = cc.name_lower
 
     # --- Special case: "X or more lines of therapy" criteria ---
     # These check total treatment lines, not a specific drug failure
@@ -306,24 +458,20 @@ def evaluate_prior_treatment_failed(criterion: AtomicCriterion, patient: Normali
             actual_lines = patient.clinical_markers.get("lines_of_therapy")
             if actual_lines is not None:
                 met = actual_lines >= required_lines
-                return CriterionEvaluation(
-                    criterion_id=criterion.criterion_id,
-                    criterion_name=criterion.name,
+                return _criterion_result(
+                    criterion,
                     verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-                    evidence=[f"Lines of therapy: {actual_lines} (required: {required_lines}+)"],
-                    reasoning=f"{actual_lines} lines {'meets' if met else 'does not meet'} requirement of {required_lines}+",
-                    is_required=criterion.is_required,
+                    evidence=lambda: [f"Lines of therapy: {actual_lines} (required: {required_lines}+)"],
+                    reasoning=lambda: f"{actual_lines} lines {'meets' if met else 'does not meet'} requirement of {required_lines}+",
                 )
             # Fall back to counting treatments
             actual_lines = len(patient.prior_treatments)
             met = actual_lines >= required_lines
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-                evidence=[f"Prior treatments count: {actual_lines} (required: {required_lines}+)"],
-                reasoning=f"{actual_lines} prior treatments {'meets' if met else 'does not meet'} {required_lines}+ requirement",
-                is_required=criterion.is_required,
+                evidence=lambda: [f"Prior treatments count: {actual_lines} (required: {required_lines}+)"],
+                reasoning=lambda: f"{actual_lines} prior treatments {'meets' if met else 'does not meet'} {required_lines}+ requirement",
             )
 
     # --- Special case: "refractory to lenalidomide" ---
@@ -332,186 +480,147 @@ def evaluate_prior_treatment_failed(criterion: AtomicCriterion, patient: Normali
         if isinstance(refractory_to, list):
             for drug in refractory_to:
                 if "lenalidomide" in drug.lower() or "revlimid" in drug.lower():
-                    return CriterionEvaluation(
-                        criterion_id=criterion.criterion_id,
-                        criterion_name=criterion.name,
+                    return _criterion_result(
+                        criterion,
                         verdict=CriterionVerdict.MET,
-                        evidence=[f"Refractory to: {drug}"],
+                        evidence=lambda: [f"Refractory to: {drug}"],
                         reasoning=f"Patient is refractory to lenalidomide",
-                        is_required=criterion.is_required,
                     )
         # Also check treatment outcomes
         for tx in patient.prior_treatments:
             if "lenalidomide" in tx.medication_name.lower() or "revlimid" in tx.medication_name.lower():
                 if tx.outcome in ("failed", "inadequate_response", "partial_response"):
-                    return CriterionEvaluation(
-                        criterion_id=criterion.criterion_id,
-                        criterion_name=criterion.name,
+                    return _criterion_result(
+                        criterion,
                         verdict=CriterionVerdict.MET,
-                        evidence=[f"Lenalidomide: outcome={tx.outcome}"],
-                        reasoning=f"Lenalidomide failure documented: {tx.outcome}",
-                        is_required=criterion.is_required,
+                        evidence=lambda: [f"Lenalidomide: outcome={tx.outcome}"],
+                        reasoning=lambda: f"Lenalidomide failure documented: {tx.outcome}",
                     )
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.NOT_MET,
             reasoning="Lenalidomide refractoriness not documented",
-            is_required=criterion.is_required,
         )
 
     # --- Special case: "NO prior gene therapy" phrased as prior_treatment_failed ---
     if "not previously received gene therapy" in desc_lower or "no prior" in name_lower.replace("_", " "):
         if criterion.drug_names:
-            drug_names_lower = {d.lower() for d in criterion.drug_names}
             for tx in patient.prior_treatments:
-                tx_lower = tx.medication_name.lower()
-                for dn in drug_names_lower:
-                    if dn in tx_lower or tx_lower in dn:
-                        return CriterionEvaluation(
-                            criterion_id=criterion.criterion_id,
-                            criterion_name=criterion.name,
-                            verdict=CriterionVerdict.NOT_MET,
-                            evidence=[f"Patient received excluded drug: {tx.medication_name}"],
-                            reasoning=f"Excluded therapy found: {tx.medication_name}",
-                            is_required=criterion.is_required,
-                        )
+                if _drug_name_related(cc, tx.medication_name.lower()):
+                    return _criterion_result(
+                        criterion,
+                        verdict=CriterionVerdict.NOT_MET,
+                        evidence=lambda: [f"Patient received excluded drug: {tx.medication_name}"],
+                        reasoning=lambda: f"Excluded therapy found: {tx.medication_name}",
+                    )
             # Check clinical markers
             prior_gt = patient.clinical_markers.get("prior_gene_therapy")
             if prior_gt is not None:
                 met = not prior_gt
-                return CriterionEvaluation(
-                    criterion_id=criterion.criterion_id,
-                    criterion_name=criterion.name,
+                return _criterion_result(
+                    criterion,
                     verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-                    evidence=[f"Prior gene therapy: {prior_gt}"],
-                    reasoning=f"Gene therapy {'not received' if met else 'previously received'}",
-                    is_required=criterion.is_required,
+                    evidence=lambda: [f"Prior gene therapy: {prior_gt}"],
+                    reasoning=lambda: f"Gene therapy {'not received' if met else 'previously received'}",
                 )
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.MET,
                 evidence=["No excluded drugs found in treatment history"],
                 reasoning="None of the excluded drugs found in patient history",
-                is_required=criterion.is_required,
             )
 
     # --- Standard treatment failure check ---
-    tx = _get_matched_treatment(criterion, patient)
+    tx = _get_matched_treatment(cc, patient)
     if not tx:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.NOT_MET,
             reasoning="No matching treatment found in history",
-            is_required=criterion.is_required,
         )
     # Check if the matched treatment failed
     failed_outcomes = {"failed", "inadequate_response", "partial_response", "steroid_dependent"}
     if tx.outcome in failed_outcomes:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.MET,
-            evidence=[f"{tx.medication_name}: outcome={tx.outcome}"],
-            reasoning=f"Treatment {tx.medication_name} failed with outcome: {tx.outcome}",
-            is_required=criterion.is_required,
+            evidence=lambda: [f"{tx.medication_name}: outcome={tx.outcome}"],
+            reasoning=lambda: f"Treatment {tx.medication_name} failed with outcome: {tx.outcome}",
         )
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.NOT_MET,
-        evidence=[f"Treatment found but outcome not a failure: {tx.outcome if tx else 'unknown'}"],
+        evidence=lambda: [f"Treatment found but outcome not a failure: {tx.outcome if tx else 'unknown'}"],
         reasoning="Treatment was tried but failure not documented",
-        is_required=criterion.is_required,
     )
 
 
-@register_evaluator(CriterionType.PRIOR_TREATMENT_INTOLERANT)
+@register_evaluator(CriterionType.PRIOR_TREATMENT_INTOLERANT, reads=("prior_treatments",))
 def evaluate_prior_treatment_intolerant(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.prior_treatments:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="No prior treatment history available",
-            is_required=criterion.is_required,
         )
     tx = _get_matched_treatment(criterion, patient)
     if tx and tx.outcome == "intolerant":
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.MET,
-            evidence=[f"{tx.medication_name}: intolerant"],
-            reasoning=f"Patient was intolerant to {tx.medication_name}",
-            is_required=criterion.is_required,
+            evidence=lambda: [f"{tx.medication_name}: intolerant"],
+            reasoning=lambda: f"Patient was intolerant to {tx.medication_name}",
         )
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.NOT_MET,
         reasoning="Intolerance not documented for matched treatment",
-        is_required=criterion.is_required,
     )
 
 
-@register_evaluator(CriterionType.PRIOR_TREATMENT_CONTRAINDICATED)
+@register_evaluator(CriterionType.PRIOR_TREATMENT_CONTRAINDICATED, reads=("prior_treatments",))
 def evaluate_prior_treatment_contraindicated(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.prior_treatments:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="No prior treatment history available",
-            is_required=criterion.is_required,
         )
     tx = _get_matched_treatment(criterion, patient)
     if tx and tx.outcome == "contraindicated":
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.MET,
-            evidence=[f"{tx.medication_name}: contraindicated"],
-            reasoning=f"Contraindication documented for {tx.medication_name}",
-            is_required=criterion.is_required,
+            evidence=lambda: [f"{tx.medication_name}: contraindicated"],
+            reasoning=lambda: f"Contraindication documented for {tx.medication_name}",
         )
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.NOT_MET,
         reasoning="Contraindication not documented for matched treatment",
-        is_required=criterion.is_required,
     )
 
 
-@register_evaluator(CriterionType.PRIOR_TREATMENT_DURATION)
+@register_evaluator(CriterionType.PRIOR_TREATMENT_DURATION, reads=("prior_treatments",))
 def evaluate_prior_treatment_duration(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.prior_treatments:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="No prior treatment history available",
-            is_required=criterion.is_required,
         )
     tx = _get_matched_treatment(criterion, patient)
     if not tx:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.NOT_MET,
             reasoning="No matching treatment found",
-            is_required=criterion.is_required,
         )
     if tx.duration_weeks is None:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
-            reasoning=f"Duration not documented for {tx.medication_name}",
-            is_required=criterion.is_required,
+            reasoning=lambda: f"Duration not documented for {tx.medication_name}",
         )
     # Convert minimum_duration_days or threshold to weeks for comparison
     threshold_days = None
@@ -520,178 +629,145 @@ def evaluate_prior_treatment_duration(criterion: AtomicCriterion, patient: Norma
         threshold_days = int(parsed) if parsed is not None else None
     min_days = criterion.minimum_duration_days or threshold_days
     if min_days is None:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.MET,
-            evidence=[f"{tx.medication_name}: {tx.duration_weeks} weeks"],
+            evidence=lambda: [f"{tx.medication_name}: {tx.duration_weeks} weeks"],
             reasoning="No minimum duration specified; treatment documented",
-            is_required=criterion.is_required,
         )
     # Convert days to weeks
     min_weeks = min_days / 7.0
     met = tx.duration_weeks >= min_weeks
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-        evidence=[f"{tx.medication_name}: {tx.duration_weeks} weeks (required: {min_weeks:.0f} weeks)"],
-        reasoning=f"Duration {tx.duration_weeks}w {'meets' if met else 'does not meet'} minimum {min_weeks:.0f}w",
-        is_required=criterion.is_required,
+        evidence=lambda: [f"{tx.medication_name}: {tx.duration_weeks} weeks (required: {min_weeks:.0f} weeks)"],
+        reasoning=lambda: f"Duration {tx.duration_weeks}w {'meets' if met else 'does not meet'} minimum {min_weeks:.0f}w",
     )
 
 
-@register_evaluator(CriterionType.LAB_VALUE)
+@register_evaluator(CriterionType.LAB_VALUE, reads=("lab_results",))
 def evaluate_lab_value(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.lab_results:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="No lab results available",
-            is_required=criterion.is_required,
         )
     # Find matching lab by name or LOINC code
     lab = _find_lab_result(criterion, patient)
     if not lab or lab.value is None:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
-            reasoning=f"Lab result '{criterion.name}' not found in patient data",
-            is_required=criterion.is_required,
+            reasoning=lambda: f"Lab result '{criterion.name}' not found in patient data",
         )
     if criterion.threshold_value is None:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.MET,
-            evidence=[f"{lab.test_name}: {lab.value} {lab.unit or ''}"],
+            evidence=lambda: [f"{lab.test_name}: {lab.value} {lab.unit or ''}"],
             reasoning="Lab present; no threshold to compare",
-            is_required=criterion.is_required,
         )
     threshold = _safe_float(criterion.threshold_value)
     if threshold is None:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
-            reasoning=f"Non-numeric threshold value: {criterion.threshold_value}",
-            is_required=criterion.is_required,
+            reasoning=lambda: f"Non-numeric threshold value: {criterion.threshold_value}",
         )
     met = _compare_numeric(lab.value, threshold, criterion.comparison_operator, criterion.threshold_value_upper)
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-        evidence=[f"{lab.test_name}: {lab.value} {lab.unit or ''}"],
-        reasoning=f"Lab {lab.test_name} = {lab.value} {'meets' if met else 'does not meet'} threshold {criterion.comparison_operator or 'gte'} {threshold}",
-        is_required=criterion.is_required,
+        evidence=lambda: [f"{lab.test_name}: {lab.value} {lab.unit or ''}"],
+        reasoning=lambda: f"Lab {lab.test_name} = {lab.value} {'meets' if met else 'does not meet'} threshold {criterion.comparison_operator or 'gte'} {threshold}",
     )
 
 
-@register_evaluator(CriterionType.LAB_TEST_COMPLETED)
+@register_evaluator(CriterionType.LAB_TEST_COMPLETED, reads=("lab_results",))
 def evaluate_lab_test_completed(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.lab_results:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="No lab results available",
-            is_required=criterion.is_required,
         )
     lab = _find_lab_result(criterion, patient)
     met = lab is not None
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.MET if met else CriterionVerdict.INSUFFICIENT_DATA,
-        evidence=[f"Lab {lab.test_name} found" if lab else f"Lab '{criterion.name}' not found"],
-        reasoning=f"Lab test {'completed' if met else 'not found'}",
-        is_required=criterion.is_required,
+        evidence=lambda: [f"Lab {lab.test_name} found" if lab else f"Lab '{criterion.name}' not found"],
+        reasoning=lambda: f"Lab test {'completed' if met else 'not found'}",
     )
 
 
-@register_evaluator(CriterionType.SAFETY_SCREENING_COMPLETED)
+@register_evaluator(CriterionType.SAFETY_SCREENING_COMPLETED, reads=("completed_screenings",))
 def evaluate_safety_screening_completed(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.completed_screenings:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="No screening data available",
-            is_required=criterion.is_required,
         )
     screening = _find_screening(criterion, patient)
     if screening and screening.completed:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.MET,
-            evidence=[f"Screening '{screening.screening_type}' completed"],
-            reasoning=f"Safety screening {screening.screening_type} completed",
-            is_required=criterion.is_required,
+            evidence=lambda: [f"Screening '{screening.screening_type}' completed"],
+            reasoning=lambda: f"Safety screening {screening.screening_type} completed",
         )
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.INSUFFICIENT_DATA if screening is None else CriterionVerdict.NOT_MET,
-        reasoning=f"Screening {'not found' if screening is None else 'not completed'}",
-        is_required=criterion.is_required,
+        reasoning=lambda: f"Screening {'not found' if screening is None else 'not completed'}",
     )
 
 
-@register_evaluator(CriterionType.SAFETY_SCREENING_NEGATIVE)
+@register_evaluator(CriterionType.SAFETY_SCREENING_NEGATIVE, reads=("completed_screenings",))
 def evaluate_safety_screening_negative(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.completed_screenings:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="No screening data available",
-            is_required=criterion.is_required,
         )
     screening = _find_screening(criterion, patient)
     if screening and screening.completed and screening.result_negative:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.MET,
-            evidence=[f"Screening '{screening.screening_type}' completed and negative"],
-            reasoning=f"Safety screening {screening.screening_type} negative",
-            is_required=criterion.is_required,
+            evidence=lambda: [f"Screening '{screening.screening_type}' completed and negative"],
+            reasoning=lambda: f"Safety screening {screening.screening_type} negative",
         )
     if screening and screening.completed and screening.result_negative is False:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.NOT_MET,
-            evidence=[f"Screening '{screening.screening_type}' positive/not negative"],
-            reasoning=f"Safety screening {screening.screening_type} not negative",
-            is_required=criterion.is_required,
+            evidence=lambda: [f"Screening '{screening.screening_type}' positive/not negative"],
+            reasoning=lambda: f"Safety screening {screening.screening_type} not negative",
         )
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.INSUFFICIENT_DATA,
         reasoning="Screening result not available",
-        is_required=criterion.is_required,
     )
 
 
-@register_evaluator(CriterionType.PRESCRIBER_SPECIALTY)
+@register_evaluator(CriterionType.PRESCRIBER_SPECIALTY, reads=("prescriber_specialty",))
 def evaluate_prescriber_specialty(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     if not patient.prescriber_specialty:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="Prescriber specialty not available",
-            is_required=criterion.is_required,
         )
-    allowed = [v.lower() for v in criterion.allowed_values] if criterion.allowed_values else []
+    cc = compile_criterion(criterion)
+    allowed = cc.allowed_lower
     # Also check against drug_names/description for specialty keywords
-    desc_lower = criterion.description.lower()
+    desc_lower = cc.desc_lower
     specialty_lower = patient.prescriber_specialty.lower()
 
     met = False
@@ -704,24 +780,22 @@ def evaluate_prescriber_specialty(criterion: AtomicCriterion, patient: Normalize
                 met = True
                 break
         # Also check criterion name
-        criterion_name_lower = criterion.name.lower()
+        criterion_name_lower = cc.name_lower
         if not met:
             for keyword in ["gastroenterolog", "rheumatolog", "dermatolog", "neurolog", "oncolog"]:
                 if keyword in criterion_name_lower and keyword in specialty_lower:
                     met = True
                     break
 
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-        evidence=[f"Prescriber specialty: {patient.prescriber_specialty}"],
-        reasoning=f"Specialty '{patient.prescriber_specialty}' {'matches' if met else 'does not match'} requirement",
-        is_required=criterion.is_required,
+        evidence=lambda: [f"Prescriber specialty: {patient.prescriber_specialty}"],
+        reasoning=lambda: f"Specialty '{patient.prescriber_specialty}' {'matches' if met else 'does not match'} requirement",
     )
 
 
-@register_evaluator(CriterionType.PRESCRIBER_CONSULTATION)
+@register_evaluator(CriterionType.PRESCRIBER_CONSULTATION, reads=("prescriber_specialty",))
 def evaluate_prescriber_consultation(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     """Evaluate prescriber consultation / attestation criteria.
 
@@ -734,9 +808,8 @@ def evaluate_prescriber_consultation(criterion: AtomicCriterion, patient: Normal
     For consultation criteria that reference a specific specialty we can still
     check the prescriber specialty on file.
     """
-    name_lower = criterion.name.lower()
-    desc_lower = (criterion.description or "").lower()
-    combined = f"{name_lower} {desc_lower}"
+    cc = compile_criterion(criterion)
+    combined = cc.combined
 
     # Attestation-type criteria — cannot be verified from patient data
     attestation_keywords = [
@@ -745,26 +818,24 @@ def evaluate_prescriber_consultation(criterion: AtomicCriterion, patient: Normal
         "neurological toxicity monitor", "cytokine release monitor",
     ]
     if any(kw in combined for kw in attestation_keywords):
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             evidence=[],
             reasoning="Attestation/monitoring agreement — requires provider documentation; cannot be verified from patient chart data",
-            is_required=criterion.is_required,
         )
 
     # For specialty-based consultation criteria, delegate to specialty check
-    return evaluate_prescriber_specialty(criterion, patient)
+    return evaluate_prescriber_specialty(cc, patient)
 
 
-@register_evaluator(CriterionType.CLINICAL_MARKER_PRESENT)
+@register_evaluator(CriterionType.CLINICAL_MARKER_PRESENT, reads=("biomarkers", "clinical_markers", "functional_scores", "prior_treatments"))
 def evaluate_clinical_marker(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     """Evaluate clinical marker presence using biomarkers, functional scores, and clinical_markers."""
-    name_lower = criterion.name.lower()
-    desc_lower = criterion.description.lower()
-    combined = name_lower + " " + desc_lower
-    allowed = [v.lower() for v in criterion.allowed_values] if criterion.allowed_values else []
+    cc = compile_criterion(criterion)
+    name_lower = cc.name_lower
+    combined = cc.combined
+    allowed = cc.allowed_lower
 
     # --- Biomarker checks (HR, HER2, ER, PR, BCMA, PIK3CA, Ki-67) ---
     biomarker_keywords = {
@@ -795,34 +866,28 @@ def evaluate_clinical_marker(criterion: AtomicCriterion, patient: NormalizedPati
                                 met = bm.positive is True or (bm.result and bm.result.lower() == "positive")
                             else:
                                 met = bm.result is not None
-                        return CriterionEvaluation(
-                            criterion_id=criterion.criterion_id,
-                            criterion_name=criterion.name,
+                        return _criterion_result(
+                            criterion,
                             verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-                            evidence=[f"{bm.biomarker_name}: {bm.result}"],
-                            reasoning=f"Biomarker {bm.biomarker_name}={bm.result} {'matches' if met else 'does not match'} criterion",
-                            is_required=criterion.is_required,
+                            evidence=lambda: [f"{bm.biomarker_name}: {bm.result}"],
+                            reasoning=lambda: f"Biomarker {bm.biomarker_name}={bm.result} {'matches' if met else 'does not match'} criterion",
                         )
             # Biomarker keyword matched but not found in patient data
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.INSUFFICIENT_DATA,
-                reasoning=f"Biomarker data for '{keyword}' not available",
-                is_required=criterion.is_required,
+                reasoning=lambda: f"Biomarker data for '{keyword}' not available",
             )
 
     # --- Organ function ---
     if "organ function" in combined or "organ and bone marrow" in combined:
         adequate = patient.clinical_markers.get("organ_function_adequate")
         if adequate is not None:
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.MET if adequate else CriterionVerdict.NOT_MET,
-                evidence=[f"Organ function adequate: {adequate}"],
-                reasoning=f"Organ function {'adequate' if adequate else 'not adequate'}",
-                is_required=criterion.is_required,
+                evidence=lambda: [f"Organ function adequate: {adequate}"],
+                reasoning=lambda: f"Organ function {'adequate' if adequate else 'not adequate'}",
             )
 
     # --- Ventilator dependence ---
@@ -831,13 +896,11 @@ def evaluate_clinical_marker(criterion: AtomicCriterion, patient: NormalizedPati
         if vent is not None:
             # "No Permanent Ventilator Dependence" means NOT ventilator dependent = MET
             met = not vent
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-                evidence=[f"Ventilator dependent: {vent}"],
-                reasoning=f"Ventilator dependent={vent}, criterion {'met' if met else 'not met'}",
-                is_required=criterion.is_required,
+                evidence=lambda: [f"Ventilator dependent: {vent}"],
+                reasoning=lambda: f"Ventilator dependent={vent}, criterion {'met' if met else 'not met'}",
             )
 
     # --- Symptomatic / Asymptomatic status ---
@@ -850,13 +913,11 @@ def evaluate_clinical_marker(criterion: AtomicCriterion, patient: NormalizedPati
                 met = symptom_status == "symptomatic"
             else:
                 met = symptom_status is not None
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-                evidence=[f"Symptom status: {symptom_status}"],
-                reasoning=f"Symptom status '{symptom_status}' {'matches' if met else 'does not match'} criterion",
-                is_required=criterion.is_required,
+                evidence=lambda: [f"Symptom status: {symptom_status}"],
+                reasoning=lambda: f"Symptom status '{symptom_status}' {'matches' if met else 'does not match'} criterion",
             )
 
     # --- Performance status (ECOG) ---
@@ -870,13 +931,11 @@ def evaluate_clinical_marker(criterion: AtomicCriterion, patient: NormalizedPati
                     met = _compare_numeric(ecog_val, op, threshold) if threshold is not None else True
                 else:
                     met = True  # score documented, no threshold to compare
-                return CriterionEvaluation(
-                    criterion_id=criterion.criterion_id,
-                    criterion_name=criterion.name,
+                return _criterion_result(
+                    criterion,
                     verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-                    evidence=[f"ECOG: {fs.score_value}"],
-                    reasoning=f"ECOG performance status {fs.score_value}" + (f" vs threshold {criterion.threshold_value}" if criterion.threshold_value else ""),
-                    is_required=criterion.is_required,
+                    evidence=lambda: [f"ECOG: {fs.score_value}"],
+                    reasoning=lambda: f"ECOG performance status {fs.score_value}" + (f" vs threshold {criterion.threshold_value}" if criterion.threshold_value else ""),
                 )
 
     # --- Disease progression ---
@@ -885,13 +944,11 @@ def evaluate_clinical_marker(criterion: AtomicCriterion, patient: NormalizedPati
         if disease_status:
             has_progression = "progress" in disease_status.lower()
             met = not has_progression
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-                evidence=[f"Disease status: {disease_status}"],
-                reasoning=f"Disease status '{disease_status}' {'shows' if has_progression else 'does not show'} progression",
-                is_required=criterion.is_required,
+                evidence=lambda: [f"Disease status: {disease_status}"],
+                reasoning=lambda: f"Disease status '{disease_status}' {'shows' if has_progression else 'does not show'} progression",
             )
 
     # --- Clinical improvement/stabilization (SMA renewal) ---
@@ -906,22 +963,18 @@ def evaluate_clinical_marker(criterion: AtomicCriterion, patient: NormalizedPati
                     baseline_val = _safe_float(baseline)
                     if baseline_val is not None:
                         improved_or_stable = score_val >= baseline_val
-                        return CriterionEvaluation(
-                            criterion_id=criterion.criterion_id,
-                            criterion_name=criterion.name,
+                        return _criterion_result(
+                            criterion,
                             verdict=CriterionVerdict.MET if improved_or_stable else CriterionVerdict.NOT_MET,
-                            evidence=[f"{fs.score_type}: {fs.score_value} (baseline: {baseline})"],
-                            reasoning=f"Motor score {fs.score_value} vs baseline {baseline}: {'stable/improved' if improved_or_stable else 'declined'}",
-                            is_required=criterion.is_required,
+                            evidence=lambda: [f"{fs.score_type}: {fs.score_value} (baseline: {baseline})"],
+                            reasoning=lambda: f"Motor score {fs.score_value} vs baseline {baseline}: {'stable/improved' if improved_or_stable else 'declined'}",
                         )
                 # No baseline available — score documented counts as met
-                return CriterionEvaluation(
-                    criterion_id=criterion.criterion_id,
-                    criterion_name=criterion.name,
+                return _criterion_result(
+                    criterion,
                     verdict=CriterionVerdict.MET,
-                    evidence=[f"{fs.score_type}: {fs.score_value}"],
-                    reasoning=f"Motor assessment documented: {fs.score_type}={fs.score_value}",
-                    is_required=criterion.is_required,
+                    evidence=lambda: [f"{fs.score_type}: {fs.score_value}"],
+                    reasoning=lambda: f"Motor assessment documented: {fs.score_type}={fs.score_value}",
                 )
 
     # --- Endocrine resistance ---
@@ -930,43 +983,35 @@ def evaluate_clinical_marker(criterion: AtomicCriterion, patient: NormalizedPati
         for tx in patient.prior_treatments:
             if tx.drug_class and "endocrine" in tx.drug_class.lower():
                 if tx.outcome in ("failed", "inadequate_response", "partial_response"):
-                    return CriterionEvaluation(
-                        criterion_id=criterion.criterion_id,
-                        criterion_name=criterion.name,
+                    return _criterion_result(
+                        criterion,
                         verdict=CriterionVerdict.MET,
-                        evidence=[f"Failed endocrine therapy: {tx.medication_name}"],
-                        reasoning=f"Endocrine resistance documented: {tx.medication_name} outcome={tx.outcome}",
-                        is_required=criterion.is_required,
+                        evidence=lambda: [f"Failed endocrine therapy: {tx.medication_name}"],
+                        reasoning=lambda: f"Endocrine resistance documented: {tx.medication_name} outcome={tx.outcome}",
                     )
 
     # Fallback: INSUFFICIENT_DATA
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.INSUFFICIENT_DATA,
-        reasoning=f"Clinical marker '{criterion.name}' requires manual verification",
-        is_required=criterion.is_required,
+        reasoning=lambda: f"Clinical marker '{criterion.name}' requires manual verification",
     )
 
 
-@register_evaluator(CriterionType.DOCUMENTATION_PRESENT)
+@register_evaluator(CriterionType.DOCUMENTATION_PRESENT, reads=("clinical_markers", "functional_scores"))
 def evaluate_documentation(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     """Evaluate documentation presence using available patient data."""
-    name_lower = criterion.name.lower()
-    desc_lower = criterion.description.lower()
-    combined = name_lower + " " + desc_lower
+    combined = compile_criterion(criterion).combined
 
     # REMS facility enrollment
     if "rems" in combined:
         rems = patient.clinical_markers.get("rems_enrolled")
         if rems is not None:
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.MET if rems else CriterionVerdict.NOT_MET,
-                evidence=[f"REMS enrolled: {rems}"],
-                reasoning=f"REMS enrollment {'confirmed' if rems else 'not confirmed'}",
-                is_required=criterion.is_required,
+                evidence=lambda: [f"REMS enrolled: {rems}"],
+                reasoning=lambda: f"REMS enrollment {'confirmed' if rems else 'not confirmed'}",
             )
 
     # Baseline motor milestone score
@@ -976,38 +1021,32 @@ def evaluate_documentation(criterion: AtomicCriterion, patient: NormalizedPatien
             if fs.score_type.upper() in allowed_scores or fs.score_type.upper() in (
                 "CHOP-INTEND", "HFMSE", "HINE", "ULM", "MFM32", "RULM",
             ):
-                return CriterionEvaluation(
-                    criterion_id=criterion.criterion_id,
-                    criterion_name=criterion.name,
+                return _criterion_result(
+                    criterion,
                     verdict=CriterionVerdict.MET,
-                    evidence=[f"Motor score documented: {fs.score_type}={fs.score_value}"],
-                    reasoning=f"Baseline motor score available: {fs.score_type}",
-                    is_required=criterion.is_required,
+                    evidence=lambda: [f"Motor score documented: {fs.score_type}={fs.score_value}"],
+                    reasoning=lambda: f"Baseline motor score available: {fs.score_type}",
                 )
 
     # Generic documentation check — can't deterministically verify
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.INSUFFICIENT_DATA,
         reasoning="Documentation presence requires manual verification",
-        is_required=criterion.is_required,
     )
 
 
-@register_evaluator(CriterionType.DISEASE_DURATION)
+@register_evaluator(CriterionType.DISEASE_DURATION, reads=())
 def evaluate_disease_duration(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     # Disease duration typically not in structured patient data
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.INSUFFICIENT_DATA,
         reasoning="Disease duration requires clinical notes review",
-        is_required=criterion.is_required,
     )
 
 
-@register_evaluator(CriterionType.NO_CONCURRENT_THERAPY)
+@register_evaluator(CriterionType.NO_CONCURRENT_THERAPY, reads=("prior_treatments", "clinical_markers"))
 def evaluate_no_concurrent_therapy(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     """Evaluate that patient is NOT on a specific therapy.
 
@@ -1015,9 +1054,8 @@ def evaluate_no_concurrent_therapy(criterion: AtomicCriterion, patient: Normaliz
     1. criterion.drug_names against prior_treatments and clinical_markers
     2. Keyword matching for gene therapy, risdiplam, clinical trials
     """
-    name_lower = criterion.name.lower()
-    desc_lower = criterion.description.lower()
-    combined = name_lower + " " + desc_lower
+    cc = compile_criterion(criterion)
+    combined = cc.combined
     markers = patient.clinical_markers
 
     # --- No prior gene therapy ---
@@ -1029,23 +1067,16 @@ def evaluate_no_concurrent_therapy(criterion: AtomicCriterion, patient: Normaliz
             has_gene_therapy = bool(prior_gt) or bool(prior_cart)
             # Also check if any specific drug was received
             if criterion.drug_names:
-                drug_names_lower = {d.lower() for d in criterion.drug_names}
                 for tx in patient.prior_treatments:
-                    if tx.medication_name.lower() in drug_names_lower:
+                    if _drug_name_related(cc, tx.medication_name.lower()):
                         has_gene_therapy = True
                         break
-                    for dn in drug_names_lower:
-                        if dn in tx.medication_name.lower() or tx.medication_name.lower() in dn:
-                            has_gene_therapy = True
-                            break
             met = not has_gene_therapy
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-                evidence=[f"Prior gene therapy: {has_gene_therapy}"],
-                reasoning=f"Gene therapy {'not received' if met else 'previously received'}",
-                is_required=criterion.is_required,
+                evidence=lambda: [f"Prior gene therapy: {has_gene_therapy}"],
+                reasoning=lambda: f"Gene therapy {'not received' if met else 'previously received'}",
             )
 
     # --- No concurrent risdiplam ---
@@ -1053,13 +1084,11 @@ def evaluate_no_concurrent_therapy(criterion: AtomicCriterion, patient: Normaliz
         concurrent = markers.get("concurrent_risdiplam")
         if concurrent is not None:
             met = not concurrent
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-                evidence=[f"Concurrent risdiplam: {concurrent}"],
-                reasoning=f"Risdiplam {'not being used' if met else 'currently in use'}",
-                is_required=criterion.is_required,
+                evidence=lambda: [f"Concurrent risdiplam: {concurrent}"],
+                reasoning=lambda: f"Risdiplam {'not being used' if met else 'currently in use'}",
             )
 
     # --- No clinical trial enrollment ---
@@ -1067,84 +1096,68 @@ def evaluate_no_concurrent_therapy(criterion: AtomicCriterion, patient: Normaliz
         enrolled = markers.get("clinical_trial_enrollment")
         if enrolled is not None:
             met = not enrolled
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.MET if met else CriterionVerdict.NOT_MET,
-                evidence=[f"Clinical trial enrollment: {enrolled}"],
-                reasoning=f"Clinical trial {'not enrolled' if met else 'currently enrolled'}",
-                is_required=criterion.is_required,
+                evidence=lambda: [f"Clinical trial enrollment: {enrolled}"],
+                reasoning=lambda: f"Clinical trial {'not enrolled' if met else 'currently enrolled'}",
             )
 
     # --- Generic drug name exclusion check ---
     if criterion.drug_names:
-        drug_names_lower = {d.lower() for d in criterion.drug_names}
         for tx in patient.prior_treatments:
-            tx_name_lower = tx.medication_name.lower()
             # Skip treatments with clearly-ended outcomes (completed/failed/discontinued)
             if tx.outcome in ("failed", "completed", "inadequate_response", "intolerant", "discontinued_adverse_effects"):
                 continue
-            for dn in drug_names_lower:
-                if dn in tx_name_lower or tx_name_lower in dn:
-                    return CriterionEvaluation(
-                        criterion_id=criterion.criterion_id,
-                        criterion_name=criterion.name,
-                        verdict=CriterionVerdict.NOT_MET,
-                        evidence=[f"Patient on excluded therapy: {tx.medication_name}"],
-                        reasoning=f"Excluded therapy {tx.medication_name} found (outcome: {tx.outcome or 'unknown'})",
-                        is_required=criterion.is_required,
-                    )
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+            if _drug_name_related(cc, tx.medication_name.lower()):
+                return _criterion_result(
+                    criterion,
+                    verdict=CriterionVerdict.NOT_MET,
+                    evidence=lambda: [f"Patient on excluded therapy: {tx.medication_name}"],
+                    reasoning=lambda: f"Excluded therapy {tx.medication_name} found (outcome: {tx.outcome or 'unknown'})",
+                )
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.MET,
             evidence=[f"No excluded therapies found in current treatment"],
             reasoning="None of the excluded drugs found in active/ongoing treatment",
-            is_required=criterion.is_required,
         )
 
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.INSUFFICIENT_DATA,
         reasoning="Concurrent therapy status requires clinical review",
-        is_required=criterion.is_required,
     )
 
 
-@register_evaluator(CriterionType.CONCURRENT_THERAPY)
+@register_evaluator(CriterionType.CONCURRENT_THERAPY, reads=("prior_treatments", "clinical_markers", "gender"))
 def evaluate_concurrent_therapy(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
     """Evaluate that patient IS on a specific concurrent therapy.
 
     Used for requirements like 'must be on combination therapy with X'.
     """
-    name_lower = criterion.name.lower()
-    desc_lower = criterion.description.lower()
-    combined = name_lower + " " + desc_lower
+    cc = compile_criterion(criterion)
+    combined = cc.combined
     markers = patient.clinical_markers
 
     # --- Male testicular suppression ---
     if "testicular" in combined or "steroidogenesis" in combined:
         # For female patients, this criterion is not applicable
         if patient.gender and patient.gender.lower() == "female":
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.NOT_APPLICABLE,
                 evidence=["Patient is female — male suppression not applicable"],
                 reasoning="Male testicular suppression not applicable to female patients",
-                is_required=criterion.is_required,
             )
         # For male patients, check marker
         suppression = markers.get("male_testicular_suppression")
         if suppression is not None:
-            return CriterionEvaluation(
-                criterion_id=criterion.criterion_id,
-                criterion_name=criterion.name,
+            return _criterion_result(
+                criterion,
                 verdict=CriterionVerdict.MET if suppression else CriterionVerdict.NOT_MET,
-                evidence=[f"Male testicular suppression: {suppression}"],
-                reasoning=f"Testicular suppression {'confirmed' if suppression else 'not confirmed'}",
-                is_required=criterion.is_required,
+                evidence=lambda: [f"Male testicular suppression: {suppression}"],
+                reasoning=lambda: f"Testicular suppression {'confirmed' if suppression else 'not confirmed'}",
             )
 
     # --- Combination therapy (aromatase inhibitor or fulvestrant) ---
@@ -1156,32 +1169,26 @@ def evaluate_concurrent_therapy(criterion: AtomicCriterion, patient: NormalizedP
             tx_class = (tx.drug_class or "").lower()
             for kw in combo_keywords:
                 if kw in tx_lower or kw in tx_class:
-                    return CriterionEvaluation(
-                        criterion_id=criterion.criterion_id,
-                        criterion_name=criterion.name,
+                    return _criterion_result(
+                        criterion,
                         verdict=CriterionVerdict.MET,
-                        evidence=[f"Combination therapy with {tx.medication_name}"],
-                        reasoning=f"Patient receiving combination therapy with {tx.medication_name}",
-                        is_required=criterion.is_required,
+                        evidence=lambda: [f"Combination therapy with {tx.medication_name}"],
+                        reasoning=lambda: f"Patient receiving combination therapy with {tx.medication_name}",
                     )
 
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.INSUFFICIENT_DATA,
         reasoning="Concurrent therapy status requires clinical review",
-        is_required=criterion.is_required,
     )
 
 
-@register_evaluator(CriterionType.CUSTOM)
+@register_evaluator(CriterionType.CUSTOM, reads=())
 def evaluate_custom(criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
-    return CriterionEvaluation(
-        criterion_id=criterion.criterion_id,
-        criterion_name=criterion.name,
+    return _criterion_result(
+        criterion,
         verdict=CriterionVerdict.INSUFFICIENT_DATA,
         reasoning="Custom criterion requires manual evaluation",
-        is_required=criterion.is_required,
     )
 
 
@@ -1258,22 +1265,18 @@ def _get_matched_treatment(criterion: AtomicCriterion, patient: NormalizedPatien
     2. Exact drug class match against criterion.drug_classes
     3. Substring match in criterion description/name (min 4 chars to avoid false positives)
     """
-    drug_names_lower = {d.lower() for d in criterion.drug_names}
-    drug_classes_lower = {d.lower() for d in criterion.drug_classes}
-    desc_lower = criterion.description.lower()
-    name_lower = criterion.name.lower()
+    cc = compile_criterion(criterion)
+    drug_classes_lower = cc.drug_classes_lower
+    desc_lower = cc.desc_lower
+    name_lower = cc.name_lower
 
     for tx in patient.prior_treatments:
         tx_name_lower = tx.medication_name.lower()
         tx_class_lower = (tx.drug_class or "").lower()
 
-        # Match by drug name (exact)
-        if tx_name_lower in drug_names_lower:
+        # Match by drug name — exact, or either name contains the other
+        if _drug_name_related(cc, tx_name_lower):
             return tx
-        # Check if any criterion drug name contains or is contained by treatment name
-        for dn in drug_names_lower:
-            if dn in tx_name_lower or tx_name_lower in dn:
-                return tx
         # Match by drug class (exact)
         if tx_class_lower and tx_class_lower in drug_classes_lower:
             return tx
@@ -1288,114 +1291,182 @@ def _get_matched_treatment(criterion: AtomicCriterion, patient: NormalizedPatien
     return None
 
 
+def _drug_name_related(cc: CompiledCriterion, tx_name_lower: str) -> bool:
+    """Whether any criterion drug name contains, or is contained by, a treatment name."""
+    if not cc.drug_names_lower:
+        return False
+    return not cc.drug_names_lower.isdisjoint(cc.drug_matcher.related(tx_name_lower))
+
+
 def _find_lab_result(criterion: AtomicCriterion, patient: NormalizedPatientData):
     """Find a matching lab result by test name or LOINC code."""
-    # Check LOINC codes first (most precise)
-    criterion_loinc = {c.code for c in criterion.clinical_codes if c.system == "LOINC"}
-    for lab in patient.lab_results:
-        if lab.loinc_code and lab.loinc_code in criterion_loinc:
-            return lab
-
-    # Then check by name
-    name_lower = criterion.name.lower()
-    desc_lower = criterion.description.lower()
-    # Meaningful keywords (skip common noise words)
-    noise_words = {"test", "level", "value", "result", "lab", "blood", "serum", "plasma", "the", "and", "for", "with"}
-    for lab in patient.lab_results:
-        lab_name_lower = lab.test_name.lower()
-        # Exact match (handles short names like CRP, ESR, TSH)
-        if lab_name_lower == name_lower:
-            return lab
-        # Direct name containment (if test name is specific enough — min 4 chars to avoid false positives)
-        if len(lab_name_lower) >= 4 and (lab_name_lower in name_lower or lab_name_lower in desc_lower):
-            return lab
-        if len(name_lower) >= 4 and name_lower in lab_name_lower:
-            return lab
-        # Short lab names (< 4 chars like CRP, ESR) — check exact word boundary match
-        if len(lab_name_lower) < 4 and lab_name_lower.isalpha():
-            if lab_name_lower in name_lower.split() or lab_name_lower in desc_lower.split():
-                return lab
-        # Keyword matching — require at least one meaningful keyword match
-        criterion_keywords = {kw for kw in name_lower.split() if len(kw) >= 4 and kw not in noise_words}
-        if criterion_keywords:
-            lab_tokens = set(lab_name_lower.split())
-            if criterion_keywords & lab_tokens:
-                return lab
-    return None
+    cc = compile_criterion(criterion)
+    index = patient.lab_index()
+
+    # Check LOINC codes first (most precise): earliest result carrying any criterion code
+    first = None
+    for code in cc.loinc_codes:
+        positions = index.by_loinc.get(code)
+        if positions and (first is None or positions[0] < first):
+            first = positions[0]
+    if first is not None:
+        return index.results[first]
+
+    # Then check by name. Exact, short-name and keyword matches come straight from
+    # the name/token indexes and bound how far the containment scan has to go.
+    candidates = set()
+    if cc.name_lower in index.by_name:
+        candidates.add(cc.name_lower)
+    for token in cc.short_lab_tokens:
+        if token in index.by_name:
+            candidates.add(token)
+    for keyword in cc.lab_keywords:
+        candidates.update(index.by_token.get(keyword, ()))
+    bound = min((index.by_name[name][0] for name in candidates), default=None)
+
+    for name, positions in index.by_name.items():
+        if bound is not None and positions[0] >= bound:
+            break
+        if _lab_name_matches(cc, name):
+            return index.results[positions[0]]
+    return index.results[bound] if bound is not None else None
+
+
+def _lab_name_matches(cc: CompiledCriterion, lab_name_lower: str) -> bool:
+    """Whether a (lowercased) lab test name matches a criterion by name."""
+    name_lower = cc.name_lower
+    # Exact match (handles short names like CRP, ESR, TSH)
+    if lab_name_lower == name_lower:
+        return True
+    # Direct name containment (if test name is specific enough — min 4 chars to avoid false positives)
+    if len(lab_name_lower) >= 4 and (lab_name_lower in name_lower or lab_name_lower in cc.desc_lower):
+        return True
+    if len(name_lower) >= 4 and name_lower in lab_name_lower:
+        return True
+    # Short lab names (< 4 chars like CRP, ESR) — check exact word boundary match
+    if len(lab_name_lower) < 4 and lab_name_lower.isalpha():
+        if lab_name_lower in cc.name_tokens or lab_name_lower in cc.desc_tokens:
+            return True
+    # Keyword matching — require at least one meaningful keyword match
+    # (noise words already skipped at compile time)
+    if cc.lab_keywords and cc.lab_keywords & set(lab_name_lower.split()):
+        return True
+    return False
 
 
 def _find_screening(criterion: AtomicCriterion, patient: NormalizedPatientData):
     """Find a matching screening by type keywords."""
-    name_lower = criterion.name.lower()
-    desc_lower = criterion.description.lower()
-    combined = name_lower + " " + desc_lower
-
-    for screening in patient.completed_screenings:
-        st_lower = screening.screening_type.lower()
-        if st_lower in combined:
-            return screening
-        # Common mappings
-        if "tb" in combined and st_lower == "tb":
-            return screening
-        if "tuberculosis" in combined and st_lower == "tb":
-            return screening
-        if "hepatitis b" in combined and st_lower == "hepatitis_b":
-            return screening
-        if "hepatitis c" in combined and st_lower == "hepatitis_c":
-            return screening
-        if "hep b" in combined and st_lower == "hepatitis_b":
-            return screening
-        if "hep c" in combined and st_lower == "hepatitis_c":
-            return screening
+    cc = compile_criterion(criterion)
+    combined = cc.combined
+    index = patient.screening_index()
+
+    # Screening types in first-seen order: named in the criterion text, or a
+    # canonical type (tb, hepatitis_b, hepatitis_c) implied by a synonym
+    for st_lower, pos in index.by_type.items():
+        if st_lower in combined or st_lower in cc.screening_types:
+            return index.screenings[pos]
     return None
 
 
 # --- Group and Policy evaluation ---
 
+class EvaluationMemo:
+    """Evaluation-scope memo for one (policy, patient) pair.
+
+    Criteria and subgroups shared between indications, diamond-shaped group
+    DAGs and exclusion triggers are evaluated once; later references reuse the
+    stored result. Group results are only memoized for acyclic plans, since a
+    cyclic group's result depends on the path it was reached by.
+    """
+
+    __slots__ = ("criteria", "groups", "criterion_hits", "group_hits")
+
+    def __init__(self):
+        self.criteria: Dict[str, CriterionEvaluation] = {}
+        self.groups: Dict[str, GroupEvaluation] = {}
+        self.criterion_hits = 0
+        self.group_hits = 0
+
+    def criterion(self, criterion: AtomicCriterion, patient: NormalizedPatientData) -> CriterionEvaluation:
+        result = self.criteria.get(criterion.criterion_id)
+        if result is not None:
+            self.criterion_hits += 1
+            return result
+        result = self.criteria[criterion.criterion_id] = evaluate_criterion(criterion, patient)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "criteria_evaluated": len(self.criteria),
+            "criterion_hits": self.criterion_hits,
+            "groups_evaluated": len(self.groups),
+            "group_hits": self.group_hits,
+        }
+
+
 def evaluate_group(
     group: CriterionGroup,
     policy: DigitizedPolicy,
     patient: NormalizedPatientData,
     _visited: Optional[set] = None,
+    memo: Optional[EvaluationMemo] = None,
 ) -> GroupEvaluation:
     """Evaluate a criterion group recursively with cycle detection."""
-    if _visited is None:
-        _visited = set()
-    if group.group_id in _visited:
-        return GroupEvaluation(
+    plan = compile_policy(policy)
+    return _evaluate_group_plan(
+        plan, plan.group_plan(group), patient, _visited if _visited is not None else set(), memo,
+    )
+
+
+def _evaluate_group_plan(
+    plan: CompiledPolicy,
+    group: GroupPlan,
+    patient: NormalizedPatientData,
+    visited: set,
+    memo: Optional[EvaluationMemo] = None,
+) -> GroupEvaluation:
+    """Evaluate a planned group; children are already resolved by the plan."""
+    share_groups = memo is not None and not plan.has_cycles and plan.groups.get(group.group_id) is group
+    if share_groups:
+        cached = memo.groups.get(group.group_id)
+        if cached is not None:
+            memo.group_hits += 1
+            return cached
+
+    if group.group_id in visited:
+        return _group_result(
             group_id=group.group_id,
-            operator=group.operator.value if isinstance(group.operator, LogicalOperator) else str(group.operator),
+            operator=group.operator_label,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
             reasoning="Circular group reference detected",
         )
-    _visited.add(group.group_id)
-
-    criteria_results = []
-    for cid in group.criteria:
-        criterion = policy.get_criterion(cid)
-        if criterion:
-            criteria_results.append(evaluate_criterion(criterion, patient))
+    visited.add(group.group_id)
 
-    subgroup_results = []
-    for sg_id in group.subgroups:
-        sg = policy.get_group(sg_id)
-        if sg:
-            subgroup_results.append(evaluate_group(sg, policy, patient, _visited))
+    if memo is not None:
+        criteria_results = [memo.criterion(criterion, patient) for criterion in group.criteria]
+    else:
+        criteria_results = [evaluate_criterion(criterion, patient) for criterion in group.criteria]
+    subgroup_results = [
+        _evaluate_group_plan(plan, plan.groups[sg_id], patient, visited, memo) for sg_id in group.subgroups
+    ]
 
     # Allow diamond-pattern DAGs: discard after evaluation so other paths can visit this group
-    _visited.discard(group.group_id)
+    visited.discard(group.group_id)
 
     # Combine verdicts based on operator
     all_verdicts = [r.verdict for r in criteria_results] + [r.verdict for r in subgroup_results]
     verdict = _combine_verdicts(all_verdicts, group.operator, group.negated)
 
-    return GroupEvaluation(
+    result = _group_result(
         group_id=group.group_id,
-        operator=group.operator.value if isinstance(group.operator, LogicalOperator) else str(group.operator),
+        operator=group.operator_label,
         verdict=verdict,
         criteria_results=criteria_results,
         subgroup_results=subgroup_results,
     )
+    if share_groups:
+        memo.groups[group.group_id] = result
+    return result
 
 
 def _combine_verdicts(
@@ -1452,12 +1523,10 @@ def evaluate_criterion(criterion: AtomicCriterion, patient: NormalizedPatientDat
     """Evaluate a single criterion using the registry."""
     evaluator = EVALUATOR_REGISTRY.get(criterion.criterion_type)
     if evaluator is None:
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
-            reasoning=f"No evaluator registered for type '{criterion.criterion_type}'",
-            is_required=criterion.is_required,
+            reasoning=lambda: f"No evaluator registered for type '{criterion.criterion_type}'",
         )
     try:
         return evaluator(criterion, patient)
@@ -1467,12 +1536,10 @@ def evaluate_criterion(criterion: AtomicCriterion, patient: NormalizedPatientDat
             criterion_id=criterion.criterion_id,
             error=str(exc),
         )
-        return CriterionEvaluation(
-            criterion_id=criterion.criterion_id,
-            criterion_name=criterion.name,
+        return _criterion_result(
+            criterion,
             verdict=CriterionVerdict.INSUFFICIENT_DATA,
-            reasoning=f"Evaluation error: {type(exc).__name__}",
-            is_required=criterion.is_required,
+            reasoning=f"Evaluation error: {type(exc).__name__}",  # exc is unbound after the except block
         )
 
 
@@ -1481,28 +1548,35 @@ def evaluate_step_therapy(
     patient: NormalizedPatientData,
 ) -> Dict:
     """Evaluate step therapy requirements."""
-    if not policy.step_therapy_requirements:
+    return _evaluate_step_therapy_plan(compile_policy(policy), patient)
+
+
+def _evaluate_step_therapy_plan(plan: CompiledPolicy, patient: NormalizedPatientData) -> Dict:
+    if not plan.step_therapy:
         return {"required": False, "satisfied": True, "details": []}
 
+    # Policy drug patterns found in each treatment's name or class, one automaton pass each
+    matcher = plan.drug_matcher
+    tx_matches = [
+        matcher.occurring_in(tx.medication_name.lower()) | matcher.occurring_in((tx.drug_class or "").lower())
+        for tx in patient.prior_treatments
+    ]
+
     results = []
     all_satisfied = True
-    for req in policy.step_therapy_requirements:
+    for step in plan.step_therapy:
+        req = step.requirement
         # Check how many required drugs/classes have been tried and failed
         drugs_tried = 0
         drugs_failed = 0
         drug_details = []
 
-        required_items = req.required_drugs + req.required_drug_classes
-
-        for item in required_items:
-            item_lower = item.lower()
+        for item_lower in step.items_lower:
             item_matched = False
-            for tx in patient.prior_treatments:
+            for tx, tx_items in zip(patient.prior_treatments, tx_matches):
                 if item_matched:
                     break
-                tx_name_lower = tx.medication_name.lower()
-                tx_class_lower = (tx.drug_class or "").lower()
-                if item_lower in tx_name_lower or item_lower in tx_class_lower:
+                if item_lower in tx_items:
                     drugs_tried += 1
                     item_matched = True
                     if tx.outcome in ("failed", "inadequate_response", "partial_response", "steroid_dependent"):
@@ -1552,41 +1626,164 @@ def evaluate_step_therapy(
 def evaluate_policy(
     policy: DigitizedPolicy,
     patient: NormalizedPatientData,
+    memo: Optional[EvaluationMemo] = None,
 ) -> PolicyEvaluationResult:
     """
     Evaluate a patient against a digitized policy.
 
     Returns a PolicyEvaluationResult with per-criterion verdicts,
     group evaluations, indication assessments, and gap analysis.
+    Pass an EvaluationMemo to inspect memo hit counts afterwards.
     """
-    indication_evaluations = []
-
-    # If the policy has defined indications, use them
-    indications_to_eval = list(policy.indications)
-
-    # If no indications defined, synthesize one from root approval groups
-    if not indications_to_eval:
-        from backend.models.policy_schema import IndicationCriteria
-        root_group_id = _find_root_approval_group(policy)
-        if root_group_id:
-            indications_to_eval.append(IndicationCriteria(
-                indication_id="AUTO_INITIAL",
-                indication_name=f"{policy.medication_name} - Initial Approval",
-                initial_approval_criteria=root_group_id,
-                initial_approval_duration_months=12,
-            ))
-
-    for indication in indications_to_eval:
+    plan = compile_policy(policy)
+    if memo is None:
+        memo = EvaluationMemo()
+
+    # Indications come from the plan — policy-defined, or synthesized from the
+    # root approval group when the policy defines none
+    group_results = []
+    for indication in plan.indications:
         # Evaluate the root criteria group
-        root_group_id = indication.initial_approval_criteria
-        root_group = policy.get_group(root_group_id)
+        root_group = plan.groups.get(indication.initial_approval_criteria)
+        group_results.append(_evaluate_group_plan(plan, root_group, patient, set(), memo) if root_group else None)
+
+    # Evaluate exclusions
+    exclusion_evaluations = [memo.criterion(criterion, patient) for criterion in plan.exclusion_triggers]
+
+    # Evaluate step therapy
+    step_therapy_result = _evaluate_step_therapy_plan(plan, patient)
+
+    logger.debug("Policy evaluation memo", policy_id=plan.policy_id, **memo.stats())
+    return _assemble_policy_result(plan, patient, group_results, exclusion_evaluations, step_therapy_result)
+
+
+def evaluate_policy_fast(
+    policy: DigitizedPolicy,
+    patient: NormalizedPatientData,
+    memo: Optional[EvaluationMemo] = None,
+) -> PolicyRecord:
+    """
+    Evaluate a patient against a digitized policy, returning slotted records.
+
+    Same logic and verdicts as evaluate_policy, without pydantic validation
+    or eager reasoning text. Convert with PolicyRecord.to_model() for the API.
+    """
+    token = _fast_results.set(True)
+    try:
+        return evaluate_policy(policy, patient, memo)
+    finally:
+        _fast_results.reset(token)
+
+
+def changed_patient_fields(
+    old_patient: NormalizedPatientData,
+    new_patient: NormalizedPatientData,
+) -> Set[str]:
+    """Names of NormalizedPatientData fields whose values differ."""
+    return {
+        name for name in NormalizedPatientData.model_fields
+        if getattr(old_patient, name) != getattr(new_patient, name)
+    }
 
-        group_result = None
-        if root_group:
-            group_result = evaluate_group(root_group, policy, patient)
 
+def reevaluate(
+    previous_result: PolicyEvaluationResult,
+    old_patient: NormalizedPatientData,
+    new_patient: NormalizedPatientData,
+    policy: DigitizedPolicy,
+) -> PolicyEvaluationResult:
+    """
+    Re-evaluate a policy after a patient update, reusing unaffected results.
+
+    previous_result must come from evaluate_policy(policy, old_patient). Only
+    criteria whose evaluator reads a changed patient field are recomputed, and
+    only groups containing them are re-combined. The result is the same as
+    evaluate_policy(policy, new_patient).
+    """
+    plan = compile_policy(policy)
+    if previous_result.policy_id != plan.policy_id or plan.has_cycles:
+        return evaluate_policy(policy, new_patient)
+
+    changed = changed_patient_fields(old_patient, new_patient)
+    if not changed:
+        return previous_result
+
+    # Previous criterion and group results, by ID
+    previous_criteria: Dict[str, CriterionEvaluation] = {
+        e.criterion_id: e for e in previous_result.exclusion_evaluations
+    }
+    previous_groups: Dict[str, GroupEvaluation] = {}
+    stack = [
+        ind.approval_criteria_result for ind in previous_result.indication_evaluations
+        if ind.approval_criteria_result is not None
+    ]
+    while stack:
+        group_result = stack.pop()
+        if group_result.group_id in previous_groups:
+            continue
+        previous_groups[group_result.group_id] = group_result
+        for criterion_result in group_result.criteria_results:
+            previous_criteria.setdefault(criterion_result.criterion_id, criterion_result)
+        stack.extend(group_result.subgroup_results)
+
+    # Seed the memo with every result the change cannot affect
+    memo = EvaluationMemo()
+    dirty_criteria = set()
+    for cid, criterion in plan.criteria.items():
+        prior = previous_criteria.get(cid)
+        if prior is not None and not (criterion_dependencies(criterion.criterion_type) & changed):
+            memo.criteria[cid] = prior
+        else:
+            dirty_criteria.add(cid)
+    dirty_groups = set()
+    for gid in plan.topo_order:
+        group = plan.groups[gid]
+        if (
+            gid not in previous_groups
+            or any(c.criterion_id in dirty_criteria for c in group.criteria)
+            or any(sg in dirty_groups for sg in group.subgroups)
+        ):
+            dirty_groups.add(gid)
+        else:
+            memo.groups[gid] = previous_groups[gid]
+
+    group_results = []
+    for indication in plan.indications:
+        root_group = plan.groups.get(indication.initial_approval_criteria)
+        group_results.append(_evaluate_group_plan(plan, root_group, new_patient, set(), memo) if root_group else None)
+    exclusion_evaluations = [memo.criterion(criterion, new_patient) for criterion in plan.exclusion_triggers]
+
+    if "prior_treatments" in changed or previous_result.step_therapy_evaluation is None:
+        step_therapy_result = _evaluate_step_therapy_plan(plan, new_patient)
+    else:
+        step_therapy_result = previous_result.step_therapy_evaluation
+
+    logger.debug(
+        "Incremental policy re-evaluation",
+        policy_id=plan.policy_id,
+        changed_fields=sorted(changed),
+        criteria_recomputed=len(dirty_criteria & set(memo.criteria)),
+        groups_recombined=len(dirty_groups & set(memo.groups)),
+    )
+    return _assemble_policy_result(plan, new_patient, group_results, exclusion_evaluations, step_therapy_result)
+
+
+def _assemble_policy_result(
+    plan: CompiledPolicy,
+    patient: NormalizedPatientData,
+    group_results: List[Optional[GroupEvaluation]],
+    exclusion_evaluations: List[CriterionEvaluation],
+    step_therapy_result: Dict,
+) -> PolicyEvaluationResult:
+    """Build indication summaries, readiness, overall verdict and gaps.
+
+    group_results holds the root group evaluation for each plan indication
+    (None when the indication's root group does not exist).
+    """
+    indication_evaluations = []
+    for indication, group_result in zip(plan.indications, group_results):
         # Collect all criteria evaluations for this indication
-        all_criteria = _collect_all_criteria_evals(group_result) if group_result else []
+        all_criteria = collect_all_criteria_evals(group_result) if group_result else []
         met_count = sum(1 for c in all_criteria if c.verdict == CriterionVerdict.MET)
         total_count = len(all_criteria)
         unmet = [c for c in all_criteria if c.verdict == CriterionVerdict.NOT_MET]
@@ -1594,7 +1791,7 @@ def evaluate_policy(
 
         overall = group_result.verdict if group_result else CriterionVerdict.INSUFFICIENT_DATA
 
-        indication_evaluations.append(IndicationEvaluation(
+        indication_evaluations.append(_indication_result(
             indication_id=indication.indication_id,
             indication_name=indication.indication_name,
             overall_verdict=overall,
@@ -1605,22 +1802,10 @@ def evaluate_policy(
             insufficient_criteria=insufficient,
         ))
 
-    # Evaluate exclusions
-    exclusion_evaluations = []
-    for excl in policy.exclusions:
-        for trigger_id in excl.trigger_criteria:
-            criterion = policy.get_criterion(trigger_id)
-            if criterion:
-                eval_result = evaluate_criterion(criterion, patient)
-                exclusion_evaluations.append(eval_result)
-
-    # Evaluate step therapy
-    step_therapy_result = evaluate_step_therapy(policy, patient)
-
     # Calculate overall readiness
     all_evals = []
     for ie in indication_evaluations:
-        all_evals.extend(_collect_all_criteria_evals(ie.approval_criteria_result))
+        all_evals.extend(collect_all_criteria_evals(ie.approval_criteria_result))
 
     total = len(all_evals)
     met = sum(1 for e in all_evals if e.verdict == CriterionVerdict.MET)
@@ -1683,8 +1868,8 @@ def evaluate_policy(
             "action": "Review step therapy: " + step_therapy_result.get("reason", "requirements may not be fully satisfied"),
         })
 
-    return PolicyEvaluationResult(
-        policy_id=policy.policy_id,
+    return _policy_result(
+        policy_id=plan.policy_id,
         patient_id=patient.patient_id or "unknown",
         indication_evaluations=indication_evaluations,
         exclusion_evaluations=exclusion_evaluations,
@@ -1695,32 +1880,11 @@ def evaluate_policy(
     )
 
 
-def _find_root_approval_group(policy: DigitizedPolicy) -> Optional[str]:
-    """Find the root initial approval group in a policy that has no indications.
-
-    Looks for groups named like 'INITIAL_APPROVAL', 'INITIAL_APPROVAL_GROUP', etc.
-    """
-    approval_keywords = ["initial_approval", "approval_group", "root"]
-    for gid, group in policy.criterion_groups.items():
-        gid_lower = gid.lower()
-        for kw in approval_keywords:
-            if kw in gid_lower:
-                return gid
-    # Fallback: return the group with the most criteria/subgroups
-    if policy.criterion_groups:
-        best_gid = max(
-            policy.criterion_groups,
-            key=lambda gid: len(policy.criterion_groups[gid].criteria) + len(policy.criterion_groups[gid].subgroups),
-        )
-        return best_gid
-    return None
-
-
-def _collect_all_criteria_evals(group_result: Optional[GroupEvaluation]) -> List[CriterionEvaluation]:
+def collect_all_criteria_evals(group_result: Optional[GroupEvaluation]) -> List[CriterionEvaluation]:
     """Recursively collect all CriterionEvaluation from a group result."""
     if group_result is None:
         return []
     results = list(group_result.criteria_results)
     for sg in group_result.subgroup_results:
-        results.extend(_collect_all_criteria_evals(sg))
+        results.extend(collect_all_criteria_evals(sg))
     return results
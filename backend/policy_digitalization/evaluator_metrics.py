@@ -0,0 +1,155 @@
+"""Evaluator Metrics — per-criterion-type timing and verdict instrumentation.
+
+instrument_evaluators() wraps every function in EVALUATOR_REGISTRY so each
+call records its latency, verdict and any exception against the criterion
+type it was dispatched for; instrument_evaluators(False) restores the
+originals. Off by default (see Settings.evaluator_metrics_enabled), so the
+uninstrumented registry pays nothing.
+
+Counters are per process: evaluation matrix workers keep their own, and the
+vectorized batch paths (age, gender, coded diagnosis, lab value) bypass the
+registry entirely.
+"""
+
+import json
+import math
+import threading
+import time
+from collections import Counter, deque
+from functools import wraps
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional
+
+from backend.policy_digitalization.evaluator import EVALUATOR_REGISTRY, CriterionEvaluatorFn
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Recent latencies kept per criterion type for the p95 estimate
+LATENCY_SAMPLE_SIZE = 2048
+
+
+class CriterionTypeStats:
+    """Counters for one criterion type."""
+
+    __slots__ = ("calls", "total_seconds", "max_seconds", "exceptions", "verdicts", "_latencies")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.exceptions = 0
+        self.verdicts: Counter = Counter()
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+
+    def p95_seconds(self) -> float:
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "exceptions": self.exceptions,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "mean_ms": round(self.total_seconds * 1000 / self.calls, 4) if self.calls else 0.0,
+            "p95_ms": round(self.p95_seconds() * 1000, 4),
+            "max_ms": round(self.max_seconds * 1000, 4),
+            "verdicts": dict(self.verdicts),
+        }
+
+
+class EvaluatorMetrics:
+    """Thread-safe per-criterion-type counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, CriterionTypeStats] = {}
+
+    def record(self, criterion_type: str, seconds: float, verdict: Optional[str] = None, failed: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.get(criterion_type)
+            if stats is None:
+                stats = self._stats[criterion_type] = CriterionTypeStats()
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats._latencies.append(seconds)
+            if failed:
+                stats.exceptions += 1
+            elif verdict is not None:
+                stats.verdicts[verdict] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-type stats, slowest cumulative time first."""
+        with self._lock:
+            rows = {ct: stats.to_dict() for ct, stats in self._stats.items()}
+        return dict(sorted(rows.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+EVALUATOR_METRICS = EvaluatorMetrics()
+
+# Registry entries as they were before instrumentation, by criterion type
+_uninstrumented: Dict[str, CriterionEvaluatorFn] = {}
+
+
+def _instrumented(criterion_type: str, fn: CriterionEvaluatorFn) -> CriterionEvaluatorFn:
+    @wraps(fn)
+    def wrapper(criterion, patient):
+        start = time.perf_counter()
+        try:
+            result = fn(criterion, patient)
+        except Exception:
+            EVALUATOR_METRICS.record(criterion_type, time.perf_counter() - start, failed=True)
+            raise
+        EVALUATOR_METRICS.record(criterion_type, time.perf_counter() - start, verdict=result.verdict.value)
+        return result
+    return wrapper
+
+
+def instrument_evaluators(enabled: bool = True) -> None:
+    """Wrap (or unwrap) every registered evaluator with metrics collection."""
+    if enabled:
+        for ct, fn in EVALUATOR_REGISTRY.items():
+            if ct not in _uninstrumented:
+                _uninstrumented[ct] = fn
+                EVALUATOR_REGISTRY[ct] = _instrumented(ct, fn)
+        logger.info("Evaluator instrumentation enabled", criterion_types=len(_uninstrumented))
+    else:
+        EVALUATOR_REGISTRY.update(_uninstrumented)
+        _uninstrumented.clear()
+
+
+def evaluators_instrumented() -> bool:
+    return bool(_uninstrumented)
+
+
+def dump_evaluator_metrics(path: Optional[Path] = None, reset: bool = False) -> Dict[str, Any]:
+    """
+    Snapshot the evaluator metrics, optionally writing them to a JSON file.
+
+    Args:
+        path: File to write the snapshot to
+        reset: Clear the counters after taking the snapshot
+
+    Returns:
+        {"instrumented": bool, "criterion_types": {type: stats}}
+    """
+    report = {
+        "instrumented": evaluators_instrumented(),
+        "criterion_types": EVALUATOR_METRICS.snapshot(),
+    }
+    if reset:
+        EVALUATOR_METRICS.reset()
+    if path is not None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info("Evaluator metrics written", path=str(path), criterion_types=len(report["criterion_types"]))
+    return report
@@ -0,0 +1,161 @@
+"""Extraction Cache — persistent, content-addressed cache of Pass 1 results.
+
+A Pass 1 extraction is a pure function of the policy document, the extraction
+prompt template, the model and the version hint, so its RawExtractionResult is
+stored on disk under a hash of those four. Re-uploads, file watcher
+re-triggers and precompute runs over unchanged documents then skip the LLM.
+
+Entries live as one JSON file each under Settings.extraction_cache_dir, which
+is outside the database so `precompute_demo_data.py --fresh` keeps them. The
+least recently used entries are evicted beyond extraction_cache_max_entries.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from backend.policy_digitalization.extractor import RawExtractionResult
+from backend.config.logging_config import get_logger
+from backend.config.settings import get_settings
+
+logger = get_logger(__name__)
+
+# Bump when the cached entry format changes
+CACHE_FORMAT_VERSION = 1
+
+
+def extraction_cache_key(document_hash: str, prompt_hash: str, model: str, version_hint: str = "") -> str:
+    """Content address of one extraction."""
+    parts = [str(CACHE_FORMAT_VERSION), document_hash, prompt_hash, model or "", version_hint or ""]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """On-disk cache of RawExtractionResult keyed by extraction_cache_key()."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: Optional[int] = None):
+        settings = get_settings()
+        self.cache_dir = Path(cache_dir or settings.extraction_cache_dir)
+        self.max_entries = settings.extraction_cache_max_entries if max_entries is None else max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[RawExtractionResult]:
+        """Cached result for key, or None. A hit marks the entry as recently used."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            result = RawExtractionResult(**{**entry["result"], "from_cache": True})
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Discarding unreadable extraction cache entry", key=key[:16], error=str(e))
+            self.invalidate(key)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: RawExtractionResult, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Store a result, then evict the least recently used entries beyond max_entries."""
+        entry = {
+            "key": key,
+            "cached_at": datetime.now(timezone.utc).isoformat(),
+            "metadata": metadata or {},
+            "result": result.model_dump(mode="json", exclude={"from_cache"}),
+        }
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        self.evict()
+
+    def invalidate(self, key: str) -> bool:
+        """Remove one entry; returns whether it existed."""
+        try:
+            self._path(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def evict(self, max_entries: Optional[int] = None) -> int:
+        """Remove least recently used entries beyond max_entries (0 = unbounded); returns the number removed."""
+        limit = self.max_entries if max_entries is None else max_entries
+        if not limit or not self.cache_dir.exists():
+            return 0
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    entries.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    continue
+            if len(entries) <= limit:
+                return 0
+            entries.sort()
+            removed = 0
+            for _, path in entries[:len(entries) - limit]:
+                try:
+                    path.unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    continue
+        logger.info("Evicted extraction cache entries", removed=removed, limit=limit)
+        return removed
+
+    def clear(self, older_than_days: Optional[float] = None) -> int:
+        """Remove all entries, or only those not used within older_than_days; returns the number removed."""
+        if not self.cache_dir.exists():
+            return 0
+        cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+        removed = 0
+        with self._lock:
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    if cutoff is None or path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        removed += 1
+                except FileNotFoundError:
+                    continue
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        entries = list(self.cache_dir.glob("*.json")) if self.cache_dir.exists() else []
+        return {
+            "entries": len(entries),
+            "bytes": sum(p.stat().st_size for p in entries if p.exists()),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Global instance
+_extraction_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get or create the global extraction cache."""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache()
+    return _extraction_cache
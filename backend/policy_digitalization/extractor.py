@@ -1,21 +1,37 @@
 """Pass 1: Gemini Policy Extractor — extracts structured criteria from policy documents."""
 
+import asyncio
 import hashlib
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Set, Tuple
 
 from pydantic import BaseModel, Field
 
-from backend.models.enums import TaskCategory
-from backend.reasoning.llm_gateway import get_llm_gateway
+from backend.models.enums import LLMProvider, TaskCategory
+from backend.reasoning.llm_gateway import TASK_MODEL_ROUTING, get_llm_gateway
 from backend.reasoning.prompt_loader import get_prompt_loader
-from backend.reasoning.json_utils import extract_json_from_text
+from backend.reasoning.json_utils import IncrementalJSONMemberParser, extract_json_from_text
+from backend.reasoning.gemini_file_cache import get_gemini_file_cache, sha256_file
+from backend.reasoning.usage_tracking import record_cache_hit, record_llm_attempt, record_llm_usage
 from backend.policy_digitalization.exceptions import ExtractionError
+from backend.policy_digitalization.chunked_extraction import (
+    HEADER_CONTEXT_CHARS,
+    chunk_directive,
+    chunk_document,
+    merge_chunk_extractions,
+    split_policy_sections,
+)
 from backend.config.logging_config import get_logger
+from backend.config.settings import get_settings
 
 logger = get_logger(__name__)
 
+EXTRACTION_PROMPT = "policy_digitalization/extraction_pass1.txt"
+
+# Called with (criterion_id, criterion_data) as each atomic criterion finishes streaming
+CriterionCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
 
 class RawExtractionResult(BaseModel):
     """Result of Pass 1 extraction."""
@@ -25,6 +41,9 @@ class RawExtractionResult(BaseModel):
     extraction_model: Optional[str] = None
     extraction_timestamp: str = ""
     sections_identified: list = Field(default_factory=list)
+    from_cache: bool = False
+    chunks_total: int = 1
+    chunks_failed: List[int] = Field(default_factory=list)  # 1-based parts missing from a chunked extraction
 
 
 class GeminiPolicyExtractor:
@@ -35,30 +54,129 @@ class GeminiPolicyExtractor:
         self.prompt_loader = get_prompt_loader()
         logger.info("GeminiPolicyExtractor initialized")
 
-    async def extract_from_text(
-        self, policy_text: str, policy_id: str = "UNKNOWN", version_hint: str = ""
-    ) -> RawExtractionResult:
-        """
-        Extract structured criteria from policy text.
+    def _cache_key(self, document_hash: str, model: str, version_hint: str) -> Optional[str]:
+        """Extraction cache key, or None when the cache is disabled."""
+        from backend.policy_digitalization.extraction_cache import extraction_cache_key
 
-        Uses DATA_EXTRACTION task category → Gemini primary, Azure fallback.
+        if not get_settings().extraction_cache_enabled:
+            return None
+        prompt_hash = self.prompt_loader.template_hash(EXTRACTION_PROMPT)
+        return extraction_cache_key(document_hash, prompt_hash, model, version_hint)
 
-        Args:
-            policy_text: Raw policy text to extract from
-            policy_id: Identifier for the policy
-            version_hint: Optional directive for multi-version documents (e.g.,
-                "This document contains multiple policy versions. Extract ONLY
-                the 2025 policy version.")
+    @staticmethod
+    def _cached(cache_key: Optional[str], force_refresh: bool) -> Optional[RawExtractionResult]:
+        from backend.policy_digitalization.extraction_cache import get_extraction_cache
+
+        if cache_key is None or force_refresh:
+            return None
+        cached = get_extraction_cache().get(cache_key)
+        if cached is not None:
+            record_cache_hit()
+            logger.info(
+                "Pass 1 extraction served from cache",
+                source_hash=cached.source_hash,
+                criteria_count=len(cached.extracted_data.get("atomic_criteria", {})),
+            )
+        return cached
+
+    @staticmethod
+    def _store(cache_key: Optional[str], result: RawExtractionResult, version_hint: str) -> None:
+        from backend.policy_digitalization.extraction_cache import get_extraction_cache
+
+        if cache_key is None or result.chunks_failed:
+            return
+        # Empty extractions are rejected by the pipeline; don't pin them
+        if not result.extracted_data.get("atomic_criteria") and not result.extracted_data.get("indications"):
+            return
+        try:
+            get_extraction_cache().put(cache_key, result, {"version_hint": version_hint})
+        except OSError as e:
+            logger.warning("Could not cache Pass 1 extraction", error=str(e))
+
+    @staticmethod
+    def _text_extraction_model() -> str:
+        """Identifier of the models the gateway routes text extraction to."""
+        providers = TASK_MODEL_ROUTING.get(TaskCategory.DATA_EXTRACTION, [])
+        return "+".join(p.value for p in providers) + f":{get_settings().gemini_model}"
+
+    @staticmethod
+    async def _emit(
+        on_criterion: CriterionCallback, sent: Set[str], criterion_id: str, criterion_data: Any
+    ) -> bool:
+        """Hand a criterion to on_criterion once per extraction; returns whether it was handed over."""
+        if not isinstance(criterion_data, dict) or criterion_id in sent:
+            return False
+        sent.add(criterion_id)
+        try:
+            await on_criterion(criterion_id, criterion_data)
+        except Exception as e:
+            logger.warning("Streamed criterion callback failed", criterion_id=criterion_id, error=str(e))
+        return True
+
+    async def _emit_remaining(
+        self, extracted_data: Dict[str, Any], on_criterion: CriterionCallback, sent: Set[str]
+    ) -> None:
+        """After a fallback call, hand over the criteria the failed stream never completed."""
+        criteria = extracted_data.get("atomic_criteria")
+        if not isinstance(criteria, dict):
+            return
+        for criterion_id, criterion_data in criteria.items():
+            await self._emit(on_criterion, sent, criterion_id, criterion_data)
+
+    async def _stream_extraction(
+        self, contents: Any, model_name: str, on_criterion: CriterionCallback, sent: Set[str]
+    ) -> Dict[str, Any]:
+        """
+        Stream an extraction from Gemini, handing each completed atomic criterion to on_criterion.
+
+        IDs already in sent are not handed over again; sent is updated as the
+        stream progresses, so it stays accurate when the stream fails.
         """
-        logger.info("Starting Pass 1 extraction from text", policy_id=policy_id, text_length=len(policy_text))
+        parser = IncrementalJSONMemberParser("atomic_criteria")
+        streamed = 0
+        async for text in self.llm_gateway.gemini_client.generate_stream(
+            contents, temperature=0.1, model_name=model_name,
+        ):
+            for criterion_id, criterion_data in parser.feed(text):
+                if await self._emit(on_criterion, sent, criterion_id, criterion_data):
+                    streamed += 1
+        logger.info("Pass 1 extraction streamed", criteria_streamed=streamed, length=len(parser.text))
+        return extract_json_from_text(parser.text)
 
-        doc_hash = hashlib.sha256(policy_text.encode()).hexdigest()[:16]
+    async def _extract_document(
+        self, policy_document: str, version_hint: str, on_criterion: Optional[CriterionCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        One extraction LLM call over policy text; returns the parsed extraction.
 
+        With on_criterion, and Gemini as the primary extraction provider, the
+        response is streamed and parsed incrementally. A failed stream falls
+        back to a regular gateway call (with provider fallback); only the
+        criteria the stream had not handed over are passed to on_criterion then.
+        """
         prompt = self.prompt_loader.load(
-            "policy_digitalization/extraction_pass1.txt",
-            {"policy_document": policy_text, "version_hint": version_hint}
+            EXTRACTION_PROMPT,
+            {"policy_document": policy_document, "version_hint": version_hint}
         )
 
+        sent: Set[str] = set()
+        providers = TASK_MODEL_ROUTING.get(TaskCategory.DATA_EXTRACTION, [])
+        if on_criterion is not None and providers[:1] == [LLMProvider.GEMINI]:
+            try:
+                return await self._stream_extraction(prompt, get_settings().gemini_model, on_criterion, sent)
+            except Exception as e:
+                logger.warning(
+                    "Streaming extraction failed, retrying without streaming",
+                    criteria_streamed=len(sent), error=str(e),
+                )
+
+        extracted_data = await self._generate_extraction(prompt)
+        if on_criterion is not None:
+            await self._emit_remaining(extracted_data, on_criterion, sent)
+        return extracted_data
+
+    async def _generate_extraction(self, prompt: str) -> Dict[str, Any]:
+        """Non-streaming gateway extraction call; returns the parsed extraction."""
         result = await self.llm_gateway.generate(
             task_category=TaskCategory.DATA_EXTRACTION,
             prompt=prompt,
@@ -68,92 +186,227 @@ class GeminiPolicyExtractor:
 
         # The gateway returns parsed dict or raw text
         if isinstance(result, str):
-            extracted_data = extract_json_from_text(result)
-        elif isinstance(result, dict):
+            return extract_json_from_text(result)
+        if isinstance(result, dict):
             # Check if the actual data is nested under a key
             if "content" in result and isinstance(result["content"], str):
-                extracted_data = extract_json_from_text(result["content"])
-            elif "atomic_criteria" in result:
-                extracted_data = result
-            else:
-                extracted_data = result
+                return extract_json_from_text(result["content"])
+            return result
+        raise ExtractionError(f"Unexpected result type from LLM: {type(result)}")
+
+    async def _extract_chunks(
+        self, chunks: List[str], policy_id: str, version_hint: str,
+        on_criterion: Optional[CriterionCallback] = None,
+    ) -> Tuple[Dict[str, Any], List[int]]:
+        """Extract chunks concurrently and merge them; returns (merged data, failed 1-based parts)."""
+        semaphore = asyncio.Semaphore(max(1, get_settings().extraction_chunk_concurrency))
+        header = chunks[0][:HEADER_CONTEXT_CHARS]
+        total = len(chunks)
+
+        async def extract_chunk(index: int, chunk: str) -> Optional[Dict[str, Any]]:
+            hint = f"{version_hint}\n\n{chunk_directive(index, total)}".strip()
+            async with semaphore:
+                try:
+                    return await self._extract_document(
+                        chunk_document(chunk, index, total, header), hint, on_criterion,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Pass 1 chunk extraction failed",
+                        policy_id=policy_id, part=index + 1, total=total, error=str(e),
+                    )
+                    return None
+
+        results = await asyncio.gather(*(extract_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+        failed = [i + 1 for i, data in enumerate(results) if data is None]
+        if len(failed) == total:
+            raise ExtractionError(f"All {total} chunks of policy {policy_id} failed extraction")
+        return merge_chunk_extractions(results), failed
+
+    async def extract_from_text(
+        self, policy_text: str, policy_id: str = "UNKNOWN", version_hint: str = "",
+        force_refresh: bool = False, chunked: Optional[bool] = None,
+        on_criterion: Optional[CriterionCallback] = None,
+    ) -> RawExtractionResult:
+        """
+        Extract structured criteria from policy text.
+
+        Uses DATA_EXTRACTION task category → Gemini primary, Azure fallback.
+
+        Args:
+            policy_text: Raw policy text to extract from
+            policy_id: Identifier for the policy
+            version_hint: Optional directive for multi-version documents (e.g.,
+                "This document contains multiple policy versions. Extract ONLY
+                the 2025 policy version.")
+            force_refresh: Ignore any cached extraction and call the LLM
+            chunked: Split the document at section boundaries and extract the
+                chunks concurrently. Defaults to True for texts longer than
+                Settings.extraction_chunking_threshold_chars.
+            on_criterion: Stream the extraction and await this with each atomic
+                criterion as soon as it is complete (criterion IDs are the
+                per-chunk IDs, before merging). Each is handed over once per
+                chunk, also when a failed stream falls back to a regular call.
+                Not called for cached extractions.
+        """
+        settings = get_settings()
+        if chunked is None:
+            chunked = len(policy_text) > settings.extraction_chunking_threshold_chars
+        max_chars = settings.extraction_chunk_max_chars
+        chunks = split_policy_sections(policy_text, max_chars) if chunked else [policy_text]
+
+        full_hash = hashlib.sha256(policy_text.encode()).hexdigest()
+        doc_hash = full_hash[:16]
+        model_id = self._text_extraction_model()
+        if len(chunks) > 1:
+            model_id += f":chunked-{max_chars}"
+        cache_key = self._cache_key(full_hash, model_id, version_hint)
+        cached = self._cached(cache_key, force_refresh)
+        if cached is not None:
+            return cached
+
+        logger.info(
+            "Starting Pass 1 extraction from text",
+            policy_id=policy_id, text_length=len(policy_text), chunks=len(chunks),
+        )
+
+        failed: List[int] = []
+        if len(chunks) > 1:
+            extracted_data, failed = await self._extract_chunks(chunks, policy_id, version_hint, on_criterion)
         else:
-            raise ExtractionError(f"Unexpected result type from LLM: {type(result)}")
+            extracted_data = await self._extract_document(policy_text, version_hint, on_criterion)
 
         logger.info(
             "Pass 1 extraction complete",
             criteria_count=len(extracted_data.get("atomic_criteria", {})),
             groups_count=len(extracted_data.get("criterion_groups", {})),
             indications_count=len(extracted_data.get("indications", [])),
+            chunks=len(chunks),
+            chunks_failed=failed,
         )
 
-        return RawExtractionResult(
+        raw = RawExtractionResult(
             extracted_data=extracted_data,
             source_hash=doc_hash,
             source_type="text",
             extraction_model="gemini",
             extraction_timestamp=datetime.now(timezone.utc).isoformat(),
             sections_identified=extracted_data.get("sections_identified", []),
+            chunks_total=len(chunks),
+            chunks_failed=failed,
         )
+        self._store(cache_key, raw, version_hint)
+        return raw
 
-    async def extract_from_pdf(self, pdf_path: str, version_hint: str = "") -> RawExtractionResult:
+    async def extract_from_pdf(
+        self, pdf_path: str, version_hint: str = "", force_refresh: bool = False,
+        on_criterion: Optional[CriterionCallback] = None,
+    ) -> RawExtractionResult:
         """
         Extract structured criteria from a PDF policy document.
 
-        Uploads PDF to Gemini for extraction.
+        Uploads PDF to Gemini for extraction. The upload runs off the event
+        loop and its file handle is reused for the same document until it expires.
 
         Args:
             pdf_path: Path to the PDF file
             version_hint: Optional directive for multi-version documents
+            force_refresh: Ignore any cached extraction and call the LLM
+            on_criterion: Stream the extraction and await this with each atomic
+                criterion as soon as it is complete. A failed stream falls back
+                to a regular call, after which the criteria the stream did not
+                hand over are passed. Not called for cached extractions.
         """
-        import google.generativeai as genai
-        from backend.config.settings import get_settings
-
         pdf_path = Path(pdf_path)
         if not pdf_path.exists():
             raise ExtractionError(f"Policy PDF not found: {pdf_path}")
 
-        logger.info("Starting Pass 1 extraction from PDF", path=str(pdf_path))
-
-        # Calculate hash
-        sha256 = hashlib.sha256()
-        with open(pdf_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256.update(chunk)
-        doc_hash = sha256.hexdigest()[:16]
+        full_hash = await asyncio.to_thread(sha256_file, pdf_path)
+        doc_hash = full_hash[:16]
 
-        # Configure Gemini and upload PDF
         settings = get_settings()
+        model_name = settings.gemini_model or "gemini-3-pro-preview"
+        cache_key = self._cache_key(full_hash, f"pdf:{model_name}", version_hint)
+        cached = self._cached(cache_key, force_refresh)
+        if cached is not None:
+            return cached
+
+        import google.generativeai as genai
+
+        logger.info("Starting Pass 1 extraction from PDF", path=str(pdf_path))
+
+        # Configure Gemini and upload PDF (or reuse the live handle for this document)
         genai.configure(api_key=settings.gemini_api_key)
-        uploaded_file = genai.upload_file(str(pdf_path))
+        file_cache = get_gemini_file_cache()
+        uploaded_file = await file_cache.get_or_upload(pdf_path, sha256=full_hash)
 
         prompt = self.prompt_loader.load(
-            "policy_digitalization/extraction_pass1.txt",
+            EXTRACTION_PROMPT,
             {"policy_document": "[PDF DOCUMENT ATTACHED]", "version_hint": version_hint}
         )
 
-        model = genai.GenerativeModel(settings.gemini_model or "gemini-3-pro-preview")
-        response = await model.generate_content_async(
-            [uploaded_file, prompt],
-            generation_config=genai.GenerationConfig(
-                temperature=0.1,
-                max_output_tokens=65536,
-            ),
-            request_options={"timeout": 300}
-        )
+        extracted_data: Optional[Dict[str, Any]] = None
+        sent: Set[str] = set()
+        if on_criterion is not None:
+            try:
+                extracted_data = await self._stream_extraction(
+                    [uploaded_file, prompt], model_name, on_criterion, sent,
+                )
+            except Exception as e:
+                logger.warning(
+                    "Streaming PDF extraction failed, retrying without streaming",
+                    criteria_streamed=len(sent), error=str(e),
+                )
+                # The handle may have been deleted remotely; upload afresh for the retry
+                file_cache.invalidate(full_hash)
+                uploaded_file = await file_cache.get_or_upload(pdf_path, sha256=full_hash)
 
-        extracted_data = extract_json_from_text(response.text)
+        if extracted_data is None:
+            extracted_data = await self._generate_pdf_extraction(model_name, uploaded_file, prompt, full_hash)
+            if on_criterion is not None:
+                await self._emit_remaining(extracted_data, on_criterion, sent)
 
         logger.info(
             "Pass 1 PDF extraction complete",
             criteria_count=len(extracted_data.get("atomic_criteria", {})),
         )
 
-        return RawExtractionResult(
+        raw = RawExtractionResult(
             extracted_data=extracted_data,
             source_hash=doc_hash,
             source_type="pdf",
-            extraction_model=settings.gemini_model or "gemini-3-pro-preview",
+            extraction_model=model_name,
             extraction_timestamp=datetime.now(timezone.utc).isoformat(),
             sections_identified=extracted_data.get("sections_identified", []),
         )
+        self._store(cache_key, raw, version_hint)
+        return raw
+
+    @staticmethod
+    async def _generate_pdf_extraction(
+        model_name: str, uploaded_file: Any, prompt: str, full_hash: str
+    ) -> Dict[str, Any]:
+        """Non-streaming Gemini extraction over an uploaded PDF; returns the parsed extraction."""
+        import google.generativeai as genai
+
+        model = genai.GenerativeModel(model_name)
+        record_llm_attempt()
+        try:
+            response = await model.generate_content_async(
+                [uploaded_file, prompt],
+                generation_config=genai.GenerationConfig(
+                    temperature=0.1,
+                    max_output_tokens=65536,
+                ),
+                request_options={"timeout": 300}
+            )
+        except Exception:
+            # The handle may have been deleted remotely; upload afresh next time
+            get_gemini_file_cache().invalidate(full_hash)
+            raise
+        usage = getattr(response, "usage_metadata", None)
+        record_llm_usage(
+            "gemini", model_name,
+            getattr(usage, "prompt_token_count", 0), getattr(usage, "candidates_token_count", 0),
+        )
+        return extract_json_from_text(response.text)
@@ -157,11 +157,15 @@ class PolicyFileWatcher:
                 else:
                     source = filepath
 
+                # Determine next version label
+                next_version = f"v{len(versions) + 1}"
+
                 result = await pipeline.digitalize_policy(
                     source=source,
                     source_type=source_type,
                     payer_name=payer,
                     medication_name=medication,
+                    version_label=next_version,
                 )
 
                 if not result.policy:
@@ -174,9 +178,7 @@ class PolicyFileWatcher:
                 policy.medication_name = medication
                 policy.source_document_hash = file_hash[:16]
 
-                # Determine next version label
-                next_version = f"v{len(versions) + 1}"
-                await repo.store_version(policy, next_version)
+                await repo.store_version(policy, next_version, pipeline_metrics=result.metrics)
 
                 logger.info(
                     "Policy digitalized and stored",
@@ -0,0 +1,294 @@
+"""Incremental Pass 2 — validate only what a new policy version changed.
+
+An amendment usually touches a handful of criteria, yet full Pass 2 sends every
+criterion and the whole policy text to Claude. When a previous version of the
+policy is stored, it is diffed (PolicyDiffer) against the new Pass 1 extraction:
+
+- added and modified criteria are validated, against only the policy sections
+  their source excerpts come from (plus the document header);
+- added and modified criterion groups, indications, step therapy requirements
+  and exclusions are sent along with them (see STRUCTURE_ID_FIELDS);
+- unchanged criteria — every field except provenance and validation output
+  identical to the stored criterion (see UNCOMPARED_FIELDS) — are not sent, and
+  keep the previous version's verdict (see CARRIED_OVER_FIELDS).
+
+The base is the version stored immediately before the one being digitalized
+(DigitalizationPipeline.load_base_version). Values Pass 2 corrected in the
+base differ from a fresh Pass 1 extraction, so those criteria are re-validated.
+
+Incremental validation is not used when too large a share of the criteria
+changed (Settings.incremental_validation_max_changed_ratio) or when criteria or
+structures of the base are missing from the new extraction, since only a full
+completeness check can tell whether Pass 1 dropped them. It falls back to the
+full policy text when a changed item's source cannot be located. When nothing
+changed, Pass 2 is skipped rather than reported valid.
+"""
+
+import copy
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from backend.models.policy_schema import DigitizedPolicy
+from backend.policy_digitalization.chunked_extraction import split_sections
+from backend.policy_digitalization.differ import ChangeType, PolicyDiffer, PolicyDiffResult
+from backend.policy_digitalization.reference_validator import policy_from_extraction
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Criterion fields not compared with the previous version: provenance, which moves with
+# the document's layout, and what Pass 2/3 record about a criterion rather than its content
+UNCOMPARED_FIELDS = frozenset({
+    "policy_text", "source_text_excerpt", "source_page", "source_section",
+    "validation_status", "codes_validated",
+})
+
+# Taken from the previous version for unchanged criteria (their compared content is identical)
+CARRIED_OVER_FIELDS = ("validation_status",)
+
+# Policy structures diffed alongside the criteria: extraction key -> ID field of its entries
+# (criterion groups are keyed by ID)
+STRUCTURE_ID_FIELDS = {
+    "criterion_groups": "group_id",
+    "indications": "indication_id",
+    "step_therapy_requirements": "requirement_id",
+    "exclusions": "exclusion_id",
+}
+
+# Leading characters of a source excerpt searched for in the policy sections
+_EXCERPT_PROBE_CHARS = 80
+_MIN_PROBE_CHARS = 20
+
+
+class IncrementalValidationPlan(BaseModel):
+    """Which criteria and structures Pass 2 re-validates for a new version, and against which text."""
+    base_version: Optional[str] = None
+    changed_ids: List[str] = Field(default_factory=list)  # Added or modified since base_version
+    unchanged_ids: List[str] = Field(default_factory=list)
+    # Added or modified criterion groups, indications, step therapy requirements and
+    # exclusions, by extraction key (see STRUCTURE_ID_FIELDS)
+    changed_structures: Dict[str, List[str]] = Field(default_factory=dict)
+    policy_excerpt: str = ""  # Source sections of the changed items (or the full text)
+    full_text_fallback: bool = False
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.changed_ids) or any(self.changed_structures.values())
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def source_sections(policy_text: str, criteria: Iterable[Dict[str, Any]]) -> Optional[str]:
+    """
+    Policy sections containing the source excerpts of the given criteria, in
+    document order and preceded by the document header. None when any
+    criterion's source cannot be located.
+    """
+    sections = split_sections(policy_text)
+    if not sections:
+        return None
+    normalized = [_normalize(section) for section in sections]
+    selected = {0}
+    for criterion in criteria:
+        probes = [
+            _normalize(str(criterion.get(field) or ""))[:_EXCERPT_PROBE_CHARS]
+            for field in ("source_text_excerpt", "policy_text")
+        ]
+        probes = [p for p in probes if len(p) >= _MIN_PROBE_CHARS]
+        hits = [i for i, section in enumerate(normalized) if any(p in section for p in probes)]
+        if not hits:
+            return None
+        selected.update(hits)
+
+    parts: List[str] = []
+    previous = -1
+    for i in sorted(selected):
+        if previous >= 0 and i != previous + 1:
+            parts.append("[...]\n")
+        parts.append(sections[i])
+        previous = i
+    return "".join(parts)
+
+
+def _comparable(item: BaseModel) -> Dict[str, Any]:
+    """A criterion's (or policy structure's) compared fields, with list order ignored."""
+    values = item.model_dump(mode="json", exclude=set(UNCOMPARED_FIELDS))
+    return {
+        field: sorted(json.dumps(v, sort_keys=True) for v in value) if isinstance(value, list) else value
+        for field, value in values.items()
+    }
+
+
+def _structures_by_id(policy: DigitizedPolicy, key: str) -> Dict[str, BaseModel]:
+    items = getattr(policy, key)
+    if isinstance(items, dict):
+        return dict(items)
+    return {getattr(item, STRUCTURE_ID_FIELDS[key]): item for item in items}
+
+
+def _structure_changes(
+    previous: DigitizedPolicy, new_policy: DigitizedPolicy, diff: PolicyDiffResult,
+) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """(added or modified, removed) IDs of each policy structure, by extraction key."""
+    differ_changes = {
+        "indications": [(c.indication_id, c.change_type) for c in diff.indication_changes],
+        "step_therapy_requirements": [(c.criterion_id, c.change_type) for c in diff.step_therapy_changes],
+        "exclusions": [(c.criterion_id, c.change_type) for c in diff.exclusion_changes],
+    }
+    changed: Dict[str, List[str]] = {}
+    removed: Dict[str, List[str]] = {}
+    for key in STRUCTURE_ID_FIELDS:
+        old = _structures_by_id(previous, key)
+        new = _structures_by_id(new_policy, key)
+        ids = {
+            sid for sid, change_type in differ_changes.get(key, [])
+            if change_type in (ChangeType.ADDED, ChangeType.MODIFIED)
+        }
+        ids.update(new.keys() - old.keys())
+        # As for criteria, PolicyDiffer only compares some of each structure's fields
+        ids.update(sid for sid in old.keys() & new.keys() if _comparable(old[sid]) != _comparable(new[sid]))
+        changed[key] = sorted(ids)
+        removed[key] = sorted(old.keys() - new.keys())
+    return changed, removed
+
+
+def plan_incremental_validation(
+    extracted_data: Dict[str, Any],
+    previous: DigitizedPolicy,
+    policy_text: str,
+    max_changed_ratio: float,
+) -> Optional[IncrementalValidationPlan]:
+    """
+    Diff the new extraction's criteria and structures against the previous version.
+
+    Returns None when incremental validation is not worthwhile or not safe: the
+    previous version has no criteria, too many criteria changed, or criteria or
+    structures of the previous version are missing from the new extraction.
+    """
+    new_data = extracted_data.get("atomic_criteria") or {}
+    if not previous.atomic_criteria or not new_data:
+        return None
+
+    try:
+        new_policy = policy_from_extraction(extracted_data)
+    except Exception as e:
+        logger.warning("Could not build policy from extraction for incremental validation", error=str(e))
+        return None
+    new_criteria = new_policy.atomic_criteria
+    unparseable = [cid for cid in new_data if cid not in new_criteria]
+
+    diff = PolicyDiffer().diff(previous, new_policy)
+    changes = diff.criterion_changes
+    changed_ids = [c.criterion_id for c in changes if c.change_type in (ChangeType.ADDED, ChangeType.MODIFIED)]
+    changed_ids += unparseable
+    # PolicyDiffer only compares the fields that affect evaluation; any other difference
+    # (description, allowed_values, ...) still needs validating
+    unchanged_ids: List[str] = []
+    for change in changes:
+        if change.change_type != ChangeType.UNCHANGED:
+            continue
+        cid = change.criterion_id
+        if _comparable(new_criteria[cid]) == _comparable(previous.atomic_criteria[cid]):
+            unchanged_ids.append(cid)
+        else:
+            changed_ids.append(cid)
+    changed_ids.sort()
+    unchanged_ids.sort()
+    removed_ids = sorted(c.criterion_id for c in changes if c.change_type == ChangeType.REMOVED)
+    changed_structures, removed_structures = _structure_changes(previous, new_policy, diff)
+
+    # A criterion missing from the new extraction may have been dropped by Pass 1 (e.g.
+    # one the base's Pass 2 added as missing) — only a full completeness check can tell
+    removed_structures = {key: ids for key, ids in removed_structures.items() if ids}
+    if removed_ids or removed_structures:
+        logger.info(
+            "Criteria or structures removed since base version; validating in full",
+            removed_criteria=removed_ids, removed_structures=removed_structures, base_version=previous.version,
+        )
+        return None
+
+    if len(changed_ids) > max_changed_ratio * len(new_data):
+        logger.info(
+            "Too many criteria changed for incremental validation",
+            changed=len(changed_ids), total=len(new_data), base_version=previous.version,
+        )
+        return None
+
+    plan = IncrementalValidationPlan(
+        base_version=previous.version,
+        changed_ids=changed_ids,
+        unchanged_ids=unchanged_ids,
+        changed_structures=changed_structures,
+    )
+    excerpt = _changed_sources(extracted_data, plan, policy_text) if plan.has_changes else ""
+    plan.policy_excerpt = policy_text if excerpt is None else excerpt
+    plan.full_text_fallback = excerpt is None
+    return plan
+
+
+def _changed_sources(
+    extracted_data: Dict[str, Any], plan: IncrementalValidationPlan, policy_text: str,
+) -> Optional[str]:
+    """Source sections of what the plan re-validates; None when the full text is needed."""
+    # Indications and step therapy requirements record no source text to locate
+    if plan.changed_structures.get("indications") or plan.changed_structures.get("step_therapy_requirements"):
+        return None
+    criteria = extracted_data.get("atomic_criteria") or {}
+    groups = extracted_data.get("criterion_groups") or {}
+    member_ids = set(plan.changed_ids)
+    for gid in plan.changed_structures.get("criterion_groups", []):
+        member_ids.update(groups.get(gid, {}).get("criteria") or [])
+    sources = [criteria[cid] for cid in sorted(member_ids) if cid in criteria]
+    sources += changed_items(extracted_data, plan, "exclusions")
+    return source_sections(policy_text, sources) if sources else None
+
+
+def changed_items(extracted_data: Dict[str, Any], plan: IncrementalValidationPlan, key: str) -> List[Dict[str, Any]]:
+    """Entries of an extraction list (indications, exclusions, ...) the plan re-validates."""
+    ids = set(plan.changed_structures.get(key, []))
+    return [
+        item for item in extracted_data.get(key) or []
+        if isinstance(item, dict) and item.get(STRUCTURE_ID_FIELDS[key]) in ids
+    ]
+
+
+def changed_extraction(extracted_data: Dict[str, Any], plan: IncrementalValidationPlan) -> Dict[str, Any]:
+    """
+    The part of the extraction sent to incremental Pass 2: changed criteria, the
+    groups using them or changed themselves, and changed indications, step therapy
+    requirements and exclusions.
+    """
+    changed = set(plan.changed_ids)
+    changed_groups = set(plan.changed_structures.get("criterion_groups", []))
+    criteria = extracted_data.get("atomic_criteria") or {}
+    groups = extracted_data.get("criterion_groups") or {}
+    return {
+        "atomic_criteria": {cid: criteria[cid] for cid in plan.changed_ids if cid in criteria},
+        "criterion_groups": {
+            gid: group for gid, group in groups.items()
+            if isinstance(group, dict) and (gid in changed_groups or changed & set(group.get("criteria") or []))
+        },
+        **{key: changed_items(extracted_data, plan, key) for key in STRUCTURE_ID_FIELDS if key != "criterion_groups"},
+    }
+
+
+def carry_over_unchanged(
+    extracted_data: Dict[str, Any],
+    previous: DigitizedPolicy,
+    unchanged_ids: Iterable[str],
+) -> Dict[str, Any]:
+    """Copy of the extraction with unchanged criteria taking the previous version's verdict."""
+    data = copy.deepcopy(extracted_data)
+    criteria = data.get("atomic_criteria") or {}
+    for cid in unchanged_ids:
+        old = previous.atomic_criteria.get(cid)
+        if old is None or cid not in criteria:
+            continue
+        old_values = old.model_dump(mode="json", include=set(CARRIED_OVER_FIELDS))
+        criteria[cid].update({k: v for k, v in old_values.items() if v is not None})
+    return data
@@ -0,0 +1,162 @@
+"""Compiled matchers used by the deterministic evaluator.
+
+Matchers are built once per compiled criterion (or policy) and answer
+membership questions without rescanning the criterion's code lists.
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Key marking the end of a criterion code inside a trie node
+_TERMINAL = ""
+
+
+class ICD10PrefixTrie:
+    """Prefix trie over normalized ICD-10 criterion codes.
+
+    A patient code matches when it equals a criterion code or extends one
+    (criterion K50 matches patient K5010, never the reverse).
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, codes: Iterable[str] = ()):
+        self._root: Dict[str, dict] = {}
+        self._size = 0
+        for code in codes:
+            self.add(code)
+
+    def add(self, code: str) -> None:
+        """Add a normalized (uppercase, dot-free) criterion code."""
+        node = self._root
+        for ch in code:
+            node = node.setdefault(ch, {})
+        if _TERMINAL not in node:
+            node[_TERMINAL] = {}
+            self._size += 1
+
+    def matches(self, code: str) -> bool:
+        """Whether a normalized patient code falls under any criterion code."""
+        node = self._root
+        if _TERMINAL in node:
+            return True
+        for ch in code:
+            node = node.get(ch)
+            if node is None:
+                return False
+            if _TERMINAL in node:
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton reporting which patterns occur in a text."""
+
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[FrozenSet[str]] = [frozenset()]
+        outputs: List[Set[str]] = [set()]
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(pattern)
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt] |= outputs[self._fail[nxt]]
+        # Patterns ending at the root (the empty string) occur in every text
+        root_out = outputs[0]
+        self._out = [frozenset(o | root_out) for o in outputs]
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """All patterns occurring anywhere in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(out[0])
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return frozenset(found)
+
+
+class DrugMatcher:
+    """Multi-pattern drug name matcher shared by the criteria of a policy.
+
+    Built from every drug name, drug class and step therapy item the policy
+    mentions (all lowercase). For a lowercase treatment string it answers, in
+    one automaton pass, which patterns occur inside it — and, via a substring
+    index, which patterns contain it. Results are cached per string, since
+    the same treatment names recur across criteria and patients.
+    """
+
+    MAX_CACHED_TEXTS = 4096
+
+    __slots__ = ("patterns", "_automaton", "_containing", "_cache")
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.patterns: FrozenSet[str] = frozenset(patterns)
+        self._automaton: Optional[AhoCorasick] = None
+        self._containing: Dict[str, FrozenSet[str]] = {}
+        self._cache: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {}
+
+    def _build(self) -> None:
+        containing: Dict[str, Set[str]] = {}
+        for pattern in self.patterns:
+            for start in range(len(pattern) + 1):
+                for end in range(start, len(pattern) + 1):
+                    containing.setdefault(pattern[start:end], set()).add(pattern)
+        self._containing = {sub: frozenset(owners) for sub, owners in containing.items()}
+        self._automaton = AhoCorasick(self.patterns)
+
+    def _scan(self, text: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached
+        if self._automaton is None:
+            self._build()
+        result = (self._automaton.find(text), self._containing.get(text, frozenset()))
+        if len(self._cache) >= self.MAX_CACHED_TEXTS:
+            self._cache.clear()
+        self._cache[text] = result
+        return result
+
+    def occurring_in(self, text: str) -> FrozenSet[str]:
+        """Patterns that occur inside text."""
+        if not self.patterns:
+            return frozenset()
+        return self._scan(text)[0]
+
+    def related(self, text: str) -> FrozenSet[str]:
+        """Patterns that occur inside text or contain it."""
+        if not self.patterns:
+            return frozenset()
+        occurring, containing = self._scan(text)
+        return occurring | containing if containing else occurring
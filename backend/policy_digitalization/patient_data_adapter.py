@@ -5,9 +5,9 @@ evaluator-friendly NormalizedPatientData structure.
 """
 
 from datetime import date, datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class NormalizedTreatment(BaseModel):
@@ -63,6 +63,76 @@ class NormalizedGeneticTest(BaseModel):
     result: Optional[str] = None
     pathogenic: Optional[bool] = None
 
+class LabResultIndex:
+    """Lookup tables over a patient's lab results.
+
+    Positions refer to the indexed list and are kept in list order, so the
+    first position of a key is the first matching result. The index stays
+    valid while the list's keys (see key()) are unchanged; other fields are
+    read from the list itself.
+    """
+
+    __slots__ = ("results", "keys", "by_loinc", "by_name", "by_token")
+
+    def __init__(self, results: List[NormalizedLabResult]):
+        self.results = results
+        self.keys = self.key(results)
+        self.by_loinc: Dict[str, List[int]] = {}
+        self.by_name: Dict[str, List[int]] = {}  # lowercase test name -> positions, in first-seen order
+        self.by_token: Dict[str, Set[str]] = {}  # name token -> lowercase test names
+        for pos, lab in enumerate(results):
+            if lab.loinc_code:
+                self.by_loinc.setdefault(lab.loinc_code, []).append(pos)
+            name = lab.test_name.lower()
+            positions = self.by_name.get(name)
+            if positions is None:
+                positions = self.by_name[name] = []
+                for token in name.split():
+                    self.by_token.setdefault(token, set()).add(name)
+            positions.append(pos)
+
+    @staticmethod
+    def key(results: List[NormalizedLabResult]) -> tuple:
+        """The indexed fields of each result, in list order."""
+        return tuple((lab.test_name, lab.loinc_code) for lab in results)
+
+
+class ScreeningIndex:
+    """Lowercase screening type -> first position in the screenings list."""
+
+    __slots__ = ("screenings", "keys", "by_type")
+
+    def __init__(self, screenings: List[NormalizedScreening]):
+        self.screenings = screenings
+        self.keys = self.key(screenings)
+        self.by_type: Dict[str, int] = {}
+        for pos, screening in enumerate(screenings):
+            self.by_type.setdefault(screening.screening_type.lower(), pos)
+
+    @staticmethod
+    def key(screenings: List[NormalizedScreening]) -> tuple:
+        return tuple(screening.screening_type for screening in screenings)
+
+
+class _DerivedIndexes:
+    """Holder for lookup indexes derived from a patient's fields.
+
+    Derived data never affects model equality, and is not pickled.
+    """
+
+    __slots__ = ("lab", "screening")
+
+    def __init__(self):
+        self.lab: Optional[LabResultIndex] = None
+        self.screening: Optional[ScreeningIndex] = None
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _DerivedIndexes)
+
+    def __reduce__(self):
+        return (_DerivedIndexes, ())
+
+
 class NormalizedPatientData(BaseModel):
     """Flat, evaluator-friendly patient data."""
     patient_id: Optional[str] = None
@@ -105,6 +175,31 @@ class NormalizedPatientData(BaseModel):
     #   concurrent_risdiplam, disease_status, lines_of_therapy
     clinical_markers: Dict[str, Any] = Field(default_factory=dict)
 
+    _indexes: _DerivedIndexes = PrivateAttr(default_factory=_DerivedIndexes)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "NormalizedPatientData":
+        copied = super().model_copy(update=update, deep=deep)
+        copied._indexes = _DerivedIndexes()  # A shallow copy would share the holder
+        return copied
+
+    def lab_index(self) -> LabResultIndex:
+        """Lab result lookup index, rebuilt when lab_results is replaced or an indexed field changes."""
+        index = self._indexes.lab
+        if index is None or index.results is not self.lab_results or index.keys != LabResultIndex.key(self.lab_results):
+            index = self._indexes.lab = LabResultIndex(self.lab_results)
+        return index
+
+    def screening_index(self) -> ScreeningIndex:
+        """Screening lookup index, rebuilt when completed_screenings is replaced or a screening type changes."""
+        index = self._indexes.screening
+        if (
+            index is None
+            or index.screenings is not self.completed_screenings
+            or index.keys != ScreeningIndex.key(self.completed_screenings)
+        ):
+            index = self._indexes.screening = ScreeningIndex(self.completed_screenings)
+        return index
+
 
 def _calculate_age(dob_str: str) -> Optional[int]:
     """Calculate age from date of birth string."""
@@ -239,6 +334,10 @@ def normalize_patient_data(raw: Dict[str, Any]) -> NormalizedPatientData:
     if prescriber.get("rems_certified_facility"):
         result.clinical_markers["rems_enrolled"] = True
 
+    # Lookup indexes for the evaluator
+    result.lab_index()
+    result.screening_index()
+
     return result
 
 
@@ -7,22 +7,26 @@ Store: Persist to PolicyCacheModel.parsed_criteria
 """
 
 import json
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from pathlib import Path
 
 from pydantic import BaseModel, Field
 
 from backend.models.policy_schema import DigitizedPolicy
-from backend.policy_digitalization.extractor import GeminiPolicyExtractor, RawExtractionResult
+from backend.policy_digitalization.extractor import CriterionCallback, GeminiPolicyExtractor, RawExtractionResult
 from backend.policy_digitalization.validator import ClaudePolicyValidator, ValidatedExtractionResult
-from backend.policy_digitalization.reference_validator import ReferenceDataValidator
+from backend.policy_digitalization.reference_validator import ICD10CodePrefetcher, ReferenceDataValidator
 from backend.policy_digitalization.policy_repository import get_policy_repository
+from backend.policy_digitalization.pipeline_metrics import PipelineMetrics
 from backend.policy_digitalization.exceptions import ExtractionError, PolicyNotFoundError
 from backend.config.logging_config import get_logger
 from backend.config.settings import get_settings
 
 logger = get_logger(__name__)
 
+# Awaited with progress events (e.g. {"event": "criterion_extracted", ...}) during a run
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
 def _load_medication_aliases() -> dict:
     """Load medication name aliases from config file."""
     config_path = Path("data/config/medication_aliases.json")
@@ -39,6 +43,17 @@ def _load_medication_aliases() -> dict:
 MEDICATION_NAME_ALIASES = _load_medication_aliases()
 
 
+def version_year_hint(version_year: Optional[int]) -> str:
+    """Pass 1 directive to extract only one year's version of a multi-version document."""
+    if not version_year:
+        return ""
+    return (
+        f"This document contains multiple policy versions. "
+        f"Extract ONLY the {version_year} policy version. "
+        f"Ignore criteria, dates, and requirements from other versions."
+    )
+
+
 class DigitalizationResult(BaseModel):
     """Result of the full digitalization pipeline."""
     policy: Optional[dict] = None  # DigitizedPolicy as dict for JSON serialization
@@ -52,6 +67,15 @@ class DigitalizationResult(BaseModel):
     indications_count: int = 0
     stored: bool = False
     cache_id: Optional[str] = None
+    extraction_cached: bool = False
+    extraction_chunks: int = 1
+    extraction_chunks_failed: List[int] = Field(default_factory=list)
+    incremental_validation: bool = False
+    base_version: Optional[str] = None  # Stored version Pass 2 diffed against
+    criteria_validated: int = 0
+    criteria_carried_over: int = 0
+    criteria_streamed: int = 0  # Criteria handed to Pass 3 prefetch while Pass 1 was still running
+    metrics: Optional[dict] = None  # PipelineMetrics record: per-pass time, tokens, cost, retries, cache hits
 
 
 class PolicyDigitalizationPipeline:
@@ -73,6 +97,11 @@ class PolicyDigitalizationPipeline:
         medication_name: Optional[str] = None,
         skip_store: bool = False,
         version_hint: str = "",
+        force_refresh: bool = False,
+        incremental_validation: bool = True,
+        stream_extraction: Optional[bool] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        version_label: Optional[str] = None,
     ) -> DigitalizationResult:
         """
         Run the full 3-pass pipeline.
@@ -85,59 +114,70 @@ class PolicyDigitalizationPipeline:
             medication_name: Override medication name for storage key
             skip_store: Skip storing the result in the repository
             version_hint: Directive for multi-version docs (e.g., extract only 2025 version)
+            force_refresh: Re-run Pass 1 even if a cached extraction exists
+            incremental_validation: When a version of this payer/medication is already
+                stored, Pass 2 validates only the criteria changed since that version
+            stream_extraction: Stream Pass 1 and start Pass 3 ICD-10 lookups for each
+                criterion as it completes (default: Settings.extraction_streaming_enabled)
+            progress_callback: Awaited with a criterion_extracted event per streamed criterion
+            version_label: Version the result will be stored under (default "latest");
+                incremental Pass 2 diffs against the version stored before it
 
         Returns:
             DigitalizationResult with the digitized policy
         """
         logger.info("Starting digitalization pipeline", source_type=source_type)
 
-        # Pass 1: Extract
-        if source_type == "pdf":
-            raw = await self.extractor.extract_from_pdf(source, version_hint=version_hint)
-            policy_text = self._load_policy_text_for_pdf(source)
-        else:
-            raw = await self.extractor.extract_from_text(source, version_hint=version_hint)
-            policy_text = source
-
-        passes_completed = 1
-
-        # Guard against empty extraction
-        if not raw.extracted_data.get("atomic_criteria") and not raw.extracted_data.get("indications"):
-            raise ExtractionError(
-                f"Pass 1 returned empty extraction (no criteria or indications). "
-                f"Source length: {len(source)} chars, model: {raw.extraction_model}"
+        if stream_extraction is None:
+            stream_extraction = get_settings().extraction_streaming_enabled
+        prefetcher: Optional[ICD10CodePrefetcher] = None
+        on_criterion: Optional[CriterionCallback] = None
+        streamed = 0
+        if stream_extraction:
+            prefetcher = ICD10CodePrefetcher()
+
+            async def on_criterion(criterion_id: str, criterion_data: Dict[str, Any]) -> None:
+                nonlocal streamed
+                streamed += 1
+                prefetcher.add(criterion_data)
+                if progress_callback:
+                    await progress_callback({
+                        "event": "criterion_extracted",
+                        "criterion_id": criterion_id,
+                        "criteria_extracted": streamed,
+                    })
+
+        metrics = PipelineMetrics()
+        with metrics.track("extraction"):
+            raw = await self.run_extraction(
+                source, source_type, version_hint=version_hint, force_refresh=force_refresh,
+                on_criterion=on_criterion,
             )
+        passes_completed = 1
 
-        # Pass 2: Validate (unless skipped)
-        if skip_validation:
-            validated = ValidatedExtractionResult(
-                extracted_data=raw.extracted_data,
-                validation_status="skipped",
-                quality_score=0.7,
+        previous = None
+        if incremental_validation and not skip_validation and payer_name and medication_name:
+            previous = await self.load_base_version(payer_name, medication_name, version_label or "latest")
+        with metrics.track("validation"):
+            validated = await self.run_validation(
+                raw, self.policy_text_for(source, source_type), skip_validation, previous=previous,
             )
-        else:
-            validated = await self.validator.validate_extraction(raw, policy_text)
+        if not skip_validation:
             passes_completed = 2
 
-        # Pass 3: Reference validation + build DigitizedPolicy
-        policy = await self.reference_validator.validate_codes(validated)
+        with metrics.track("reference"):
+            if prefetcher is not None:
+                await prefetcher.wait()
+            policy = await self.run_reference_validation(
+                validated, raw, payer_name=payer_name, medication_name=medication_name,
+            )
         passes_completed = 3
-
-        # Add extraction metadata
-        policy.extraction_timestamp = raw.extraction_timestamp
-        policy.extraction_model = raw.extraction_model
-        policy.source_document_hash = raw.source_hash
-
-        # Override payer/medication names so the DB key matches the caller's lookup key
-        if payer_name:
-            policy.payer_name = payer_name
-        if medication_name:
-            policy.medication_name = medication_name
+        metrics_record = metrics.to_record()
 
         # Store in repository (skip when caller handles storage, e.g. upload endpoint)
         cache_id = None
         if not skip_store:
-            cache_id = await self.repository.store(policy)
+            cache_id = await self.repository.store(policy, pipeline_metrics=metrics_record)
 
         policy_dict = policy.model_dump(mode="json")
 
@@ -147,6 +187,8 @@ class PolicyDigitalizationPipeline:
             criteria=len(policy.atomic_criteria),
             indications=len(policy.indications),
             quality=policy.extraction_quality,
+            seconds=metrics_record["totals"]["seconds"],
+            cost_usd=metrics_record["totals"]["cost_usd"],
         )
 
         return DigitalizationResult(
@@ -161,8 +203,125 @@ class PolicyDigitalizationPipeline:
             indications_count=len(policy.indications),
             stored=not skip_store,
             cache_id=cache_id,
+            extraction_cached=raw.from_cache,
+            extraction_chunks=raw.chunks_total,
+            extraction_chunks_failed=raw.chunks_failed,
+            incremental_validation=validated.incremental,
+            base_version=validated.base_version,
+            criteria_validated=validated.criteria_validated,
+            criteria_carried_over=validated.criteria_carried_over,
+            criteria_streamed=streamed,
+            metrics=metrics_record,
         )
 
+    async def run_extraction(
+        self,
+        source: str,
+        source_type: str = "text",
+        version_hint: str = "",
+        force_refresh: bool = False,
+        on_criterion: Optional[CriterionCallback] = None,
+    ) -> RawExtractionResult:
+        """
+        Pass 1: extract structured criteria; raises ExtractionError on an empty extraction.
+
+        With on_criterion the response is streamed and each atomic criterion is
+        handed over as soon as it is complete.
+        """
+        if source_type == "pdf":
+            raw = await self.extractor.extract_from_pdf(
+                source, version_hint=version_hint, force_refresh=force_refresh, on_criterion=on_criterion,
+            )
+        else:
+            raw = await self.extractor.extract_from_text(
+                source, version_hint=version_hint, force_refresh=force_refresh, on_criterion=on_criterion,
+            )
+
+        # Guard against empty extraction
+        if not raw.extracted_data.get("atomic_criteria") and not raw.extracted_data.get("indications"):
+            raise ExtractionError(
+                f"Pass 1 returned empty extraction (no criteria or indications). "
+                f"Source length: {len(source)} chars, model: {raw.extraction_model}"
+            )
+        if raw.chunks_failed:
+            logger.warning(
+                "Pass 1 extraction is partial",
+                chunks_failed=raw.chunks_failed, chunks_total=raw.chunks_total,
+            )
+        return raw
+
+    def policy_text_for(self, source: str, source_type: str) -> str:
+        """Original policy text that Pass 2 validates against."""
+        return self._load_policy_text_for_pdf(source) if source_type == "pdf" else source
+
+    async def run_validation(
+        self,
+        raw: RawExtractionResult,
+        policy_text: str,
+        skip_validation: bool = False,
+        previous: Optional[DigitizedPolicy] = None,
+    ) -> ValidatedExtractionResult:
+        """
+        Pass 2: validate the extraction against the policy text (unless skipped).
+
+        With previous (the version stored before this one), only changed criteria are validated.
+        """
+        if skip_validation:
+            return ValidatedExtractionResult(
+                extracted_data=raw.extracted_data,
+                validation_status="skipped",
+                quality_score=0.7,
+            )
+        return await self.validator.validate_extraction(raw, policy_text, previous=previous)
+
+    async def load_base_version(
+        self, payer_name: str, medication_name: str, version_label: str,
+    ) -> Optional[DigitizedPolicy]:
+        """
+        Base for incremental Pass 2 when storing version_label (None if unavailable).
+
+        That is the version stored immediately before version_label — or the most
+        recent version when version_label is new. Never version_label itself, so
+        re-digitalizing a version always validates it against its predecessor.
+        """
+        try:
+            versions = [v.version for v in await self.repository.list_versions(payer_name, medication_name)]
+            if version_label in versions:
+                versions = versions[versions.index(version_label) + 1:]
+            if not versions:
+                return None
+            base = await self.repository.load_version(payer_name, medication_name, versions[0])
+            # load() falls back to another version when the chosen row is unreadable
+            return base if base is not None and (base.version or "latest") == versions[0] else None
+        except Exception as e:
+            logger.warning(
+                "Could not load base version for incremental validation",
+                payer=payer_name, medication=medication_name, error=str(e),
+            )
+            return None
+
+    async def run_reference_validation(
+        self,
+        validated: ValidatedExtractionResult,
+        raw: RawExtractionResult,
+        payer_name: Optional[str] = None,
+        medication_name: Optional[str] = None,
+    ) -> DigitizedPolicy:
+        """Pass 3: reference validation + build the DigitizedPolicy with extraction metadata."""
+        policy = await self.reference_validator.validate_codes(validated)
+
+        # Add extraction metadata
+        policy.extraction_timestamp = raw.extraction_timestamp
+        policy.extraction_model = raw.extraction_model
+        policy.source_document_hash = raw.source_hash
+
+        # Override payer/medication names so the DB key matches the caller's lookup key
+        if payer_name:
+            policy.payer_name = payer_name
+        if medication_name:
+            policy.medication_name = medication_name
+        return policy
+
     async def get_or_digitalize(
         self,
         payer_name: str,
@@ -259,6 +418,8 @@ class PolicyDigitalizationPipeline:
         version_label: str,
         version_year: Optional[int] = None,
         skip_validation: bool = False,
+        force_refresh: bool = False,
+        incremental_validation: bool = True,
     ) -> DigitalizationResult:
         """
         Digitalize a specific version of a policy and store it with a version label.
@@ -274,18 +435,12 @@ class PolicyDigitalizationPipeline:
             version_label: Version label (e.g., "v1", "v2", "2024", "2025")
             version_year: If set, instructs LLM to extract only this year's version
             skip_validation: Skip Pass 2 Claude validation
+            force_refresh: Re-run Pass 1 even if a cached extraction exists
+            incremental_validation: Validate only criteria changed since the version stored before version_label
 
         Returns:
             DigitalizationResult
         """
-        version_hint = ""
-        if version_year:
-            version_hint = (
-                f"This document contains multiple policy versions. "
-                f"Extract ONLY the {version_year} policy version. "
-                f"Ignore criteria, dates, and requirements from other versions."
-            )
-
         result = await self.digitalize_policy(
             source=source,
             source_type=source_type,
@@ -293,14 +448,19 @@ class PolicyDigitalizationPipeline:
             payer_name=payer_name,
             medication_name=medication_name,
             skip_store=True,
-            version_hint=version_hint,
+            version_hint=version_year_hint(version_year),
+            force_refresh=force_refresh,
+            incremental_validation=incremental_validation,
+            version_label=version_label,
         )
 
         # Store as versioned entry
         if result.policy:
             from backend.models.policy_schema import DigitizedPolicy
             policy = DigitizedPolicy(**result.policy)
-            cache_id = await self.repository.store_version(policy, version_label)
+            cache_id = await self.repository.store_version(
+                policy, version_label, pipeline_metrics=result.metrics,
+            )
             result.stored = True
             result.cache_id = cache_id
             logger.info(
@@ -0,0 +1,119 @@
+"""Digitalization Ledger — per-pass wall time, tokens, cost, retries and cache hits.
+
+Each pipeline run fills a PipelineMetrics: every pass runs inside
+PipelineMetrics.track(name), which times it and collects the LLM usage the
+clients report (see backend/reasoning/usage_tracking.py). The ledger is stored
+with the policy's PolicyCacheModel row (pipeline_metrics column) and
+aggregated across rows by aggregate_pipeline_metrics() for
+GET /policies/pipeline-metrics.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+from backend.reasoning.usage_tracking import LLMUsage, track_llm_usage
+
+# Passes in pipeline order
+PASS_NAMES = ("extraction", "validation", "reference")
+
+_TOTAL_FIELDS = ("seconds", "llm_calls", "retries", "input_tokens", "output_tokens", "cost_usd", "cache_hits")
+
+
+class PassMetrics(LLMUsage):
+    """Ledger entry of one pass."""
+    seconds: float = 0.0
+    retries: int = 0  # Provider attempts beyond the successful calls (retries and fallbacks)
+
+
+class PipelineMetrics(BaseModel):
+    """Ledger of one digitalization run, by pass name."""
+    passes: Dict[str, PassMetrics] = Field(default_factory=dict)
+
+    @contextmanager
+    def track(self, pass_name: str) -> Iterator[PassMetrics]:
+        """Time a pass and attribute the LLM calls made inside the block to it."""
+        metrics = self.passes.setdefault(pass_name, PassMetrics())
+        start = time.perf_counter()
+        try:
+            with track_llm_usage(metrics):
+                yield metrics
+        finally:
+            metrics.seconds = round(metrics.seconds + time.perf_counter() - start, 3)
+            metrics.retries = max(0, metrics.attempts - metrics.llm_calls)
+
+    def totals(self) -> Dict[str, Any]:
+        totals: Dict[str, Any] = {field: 0 for field in _TOTAL_FIELDS}
+        for metrics in self.passes.values():
+            for field in _TOTAL_FIELDS:
+                totals[field] += getattr(metrics, field)
+        totals["seconds"] = round(totals["seconds"], 3)
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        return totals
+
+    def to_record(self) -> Dict[str, Any]:
+        """JSON stored in PolicyCacheModel.pipeline_metrics."""
+        return {**self.model_dump(mode="json"), "totals": self.totals()}
+
+
+def aggregate_pipeline_metrics(
+    rows: Iterable[Dict[str, Any]],
+    top: int = 10,
+) -> Dict[str, Any]:
+    """
+    Aggregate stored ledgers.
+
+    Args:
+        rows: Dicts with payer_name, medication_name, policy_version, cached_at
+            and pipeline_metrics (a PipelineMetrics.to_record())
+        top: Number of policies listed as slowest / most expensive
+    """
+    per_pass: Dict[str, Dict[str, Any]] = {}
+    policies: List[Dict[str, Any]] = []
+    runs = 0
+    for row in rows:
+        record: Optional[Dict[str, Any]] = row.get("pipeline_metrics")
+        if not record:
+            continue
+        runs += 1
+        metrics = PipelineMetrics(passes=record.get("passes") or {})
+        for name, pass_metrics in metrics.passes.items():
+            agg = per_pass.setdefault(name, {"runs": 0, **{field: 0 for field in _TOTAL_FIELDS}})
+            agg["runs"] += 1
+            for field in _TOTAL_FIELDS:
+                agg[field] += getattr(pass_metrics, field)
+        totals = metrics.totals()
+        policies.append({
+            "payer_name": row.get("payer_name"),
+            "medication_name": row.get("medication_name"),
+            "policy_version": row.get("policy_version"),
+            "cached_at": row.get("cached_at"),
+            "seconds": totals["seconds"],
+            "cost_usd": totals["cost_usd"],
+            "input_tokens": totals["input_tokens"],
+            "output_tokens": totals["output_tokens"],
+            "retries": totals["retries"],
+        })
+
+    order = {name: i for i, name in enumerate(PASS_NAMES)}
+    passes = {}
+    for name in sorted(per_pass, key=lambda n: (order.get(n, len(order)), n)):
+        agg = per_pass[name]
+        agg["seconds"] = round(agg["seconds"], 3)
+        agg["cost_usd"] = round(agg["cost_usd"], 6)
+        agg["mean_seconds"] = round(agg["seconds"] / agg["runs"], 3)
+        agg["mean_cost_usd"] = round(agg["cost_usd"] / agg["runs"], 6)
+        passes[name] = agg
+
+    total_seconds = sum(p["seconds"] for p in policies)
+    total_cost = sum(p["cost_usd"] for p in policies)
+    return {
+        "runs": runs,
+        "total_seconds": round(total_seconds, 3),
+        "total_cost_usd": round(total_cost, 6),
+        "passes": passes,
+        "slowest": sorted(policies, key=lambda p: p["seconds"], reverse=True)[:top],
+        "most_expensive": sorted(policies, key=lambda p: p["cost_usd"], reverse=True)[:top],
+    }
@@ -1,9 +1,17 @@
-"""Policy Repository — stores and retrieves digitized policies from PolicyCacheModel."""
+"""Policy Repository — stores and retrieves digitized policies from PolicyCacheModel.
+
+Parsed DigitizedPolicy objects are kept in an in-process LRU keyed by
+(payer, medication, version, content_hash). Loads read the row's key columns
+first and only fetch and validate parsed_criteria on a miss; a row rewritten
+by another process has a new content hash, so it is never served stale.
+Cached policies are shared between callers and must be treated as read-only.
+"""
 
 import json
 import hashlib
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from uuid import uuid4
 
 from backend.models.policy_schema import DigitizedPolicy
@@ -11,9 +19,19 @@ from backend.storage.database import get_db
 from backend.storage.models import PolicyCacheModel
 from backend.policy_digitalization.exceptions import PolicyNotFoundError
 from backend.config.logging_config import get_logger
+from backend.config.settings import get_settings
 
 logger = get_logger(__name__)
 
+# Columns identifying a stored policy (and its LRU entry) without the JSON blobs
+_POLICY_KEY_COLUMNS = (
+    PolicyCacheModel.id,
+    PolicyCacheModel.payer_name,
+    PolicyCacheModel.medication_name,
+    PolicyCacheModel.policy_version,
+    PolicyCacheModel.content_hash,
+)
+
 
 class PolicyVersionInfo:
     """Lightweight version info for listing."""
@@ -41,10 +59,71 @@ class PolicyVersionInfo:
 class PolicyRepository:
     """Async repository for digitized policies — populates PolicyCacheModel.parsed_criteria."""
 
-    async def store(self, policy: DigitizedPolicy) -> str:
-        """Store a digitized policy, populating parsed_criteria."""
+    def __init__(self, cache_size: Optional[int] = None):
+        self.cache_size = get_settings().policy_cache_max_entries if cache_size is None else cache_size
+        self._policies: "OrderedDict[Tuple[str, str, str, str], DigitizedPolicy]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _evict(self, payer: str, medication: str) -> None:
+        """Drop cached policies of a payer/medication (all versions)."""
+        for key in [k for k in self._policies if k[0] == payer and k[1] == medication]:
+            del self._policies[key]
+
+    def _remember(self, key: Tuple[str, str, str, str], policy: DigitizedPolicy) -> None:
+        if self.cache_size <= 0:
+            return
+        self._policies[key] = policy
+        self._policies.move_to_end(key)
+        while len(self._policies) > self.cache_size:
+            self._policies.popitem(last=False)
+
+    async def _policy_for_row(self, session, row: Any) -> Optional[DigitizedPolicy]:
+        """
+        Parsed policy of a (id, payer_name, medication_name, policy_version, content_hash) row.
+
+        Served from the LRU when the content hash matches; otherwise
+        parsed_criteria is fetched and validated. None if missing or corrupted.
+        """
         from sqlalchemy import select
 
+        key = (row.payer_name, row.medication_name, row.policy_version or "latest", row.content_hash)
+        policy = self._policies.get(key)
+        if policy is not None:
+            self._policies.move_to_end(key)
+            self.cache_hits += 1
+            return policy
+
+        self.cache_misses += 1
+        result = await session.execute(
+            select(PolicyCacheModel.parsed_criteria).where(PolicyCacheModel.id == row.id)
+        )
+        parsed_criteria = result.scalar_one_or_none()
+        if not parsed_criteria:
+            return None
+        try:
+            policy = DigitizedPolicy(**parsed_criteria)
+        except Exception as e:
+            logger.warning(
+                "Corrupted cached policy, skipping",
+                payer=row.payer_name, medication=row.medication_name, version=row.policy_version, error=str(e),
+            )
+            return None
+        self._remember(key, policy)
+        return policy
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._policies),
+            "max_entries": self.cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+        }
+
+    async def store(self, policy: DigitizedPolicy, pipeline_metrics: Optional[dict] = None) -> str:
+        """Store a digitized policy, populating parsed_criteria (and the run's ledger, if given)."""
+        from sqlalchemy import select, update
+
         policy_dict = policy.model_dump(mode="json")
         content_hash = hashlib.sha256(
             json.dumps(policy_dict, sort_keys=True, default=str).encode()
@@ -55,20 +134,27 @@ class PolicyRepository:
         version = policy.version or "latest"
 
         async with get_db() as session:
-            # Check for existing entry
-            stmt = select(PolicyCacheModel).where(
+            # Check for existing entry (ID only; its blobs are overwritten)
+            stmt = select(PolicyCacheModel.id).where(
                 PolicyCacheModel.payer_name == payer,
                 PolicyCacheModel.medication_name == medication,
                 PolicyCacheModel.policy_version == version,
             )
             result = await session.execute(stmt)
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                existing.parsed_criteria = policy_dict
-                existing.content_hash = content_hash
-                existing.cached_at = datetime.now(timezone.utc)
-                cache_id = existing.id
+            existing_id = result.scalar_one_or_none()
+
+            if existing_id:
+                await session.execute(
+                    update(PolicyCacheModel)
+                    .where(PolicyCacheModel.id == existing_id)
+                    .values(
+                        parsed_criteria=policy_dict,
+                        content_hash=content_hash,
+                        cached_at=datetime.now(timezone.utc),
+                        pipeline_metrics=pipeline_metrics,
+                    )
+                )
+                cache_id = existing_id
             else:
                 cache_id = str(uuid4())
                 entry = PolicyCacheModel(
@@ -79,10 +165,12 @@ class PolicyRepository:
                     content_hash=content_hash,
                     policy_text=json.dumps(policy_dict, default=str),
                     parsed_criteria=policy_dict,
+                    pipeline_metrics=pipeline_metrics,
                 )
                 session.add(entry)
             # get_db() auto-commits on success
 
+        self._evict(payer, medication)
         logger.info("Policy stored", payer=payer, medication=medication, version=version)
         return cache_id
 
@@ -103,56 +191,68 @@ class PolicyRepository:
         Checks brand/generic aliases when the primary medication name
         is not found.  Falls back to the most recent version if the
         requested version (typically 'latest') is not found.
+
+        One query fetches the key columns of every candidate row (primary
+        and alias) in preference order: exact version before other versions,
+        primary name before alias, newest first. parsed_criteria is only
+        fetched for the chosen row, and only when it is not in the LRU.
         """
-        from sqlalchemy import select
+        from sqlalchemy import case, select
 
         payer = payer_name.lower().replace(" ", "_")
         medication = medication_name.lower().replace(" ", "_")
         med_keys = self._medication_keys(medication)
 
+        stmt = (
+            select(*_POLICY_KEY_COLUMNS)
+            .where(
+                PolicyCacheModel.payer_name == payer,
+                PolicyCacheModel.medication_name.in_(med_keys),
+            )
+            .order_by(
+                case((PolicyCacheModel.policy_version == version, 0), else_=1),
+                case((PolicyCacheModel.medication_name == medication, 0), else_=1),
+                PolicyCacheModel.cached_at.desc(),
+            )
+        )
         async with get_db() as session:
-            # Exact version match (try primary + alias)
-            for mk in med_keys:
-                stmt = select(PolicyCacheModel).where(
-                    PolicyCacheModel.payer_name == payer,
-                    PolicyCacheModel.medication_name == mk,
-                    PolicyCacheModel.policy_version == version,
-                )
-                result = await session.execute(stmt)
-                entry = result.scalar_one_or_none()
-                if entry and entry.parsed_criteria:
-                    try:
-                        return DigitizedPolicy(**entry.parsed_criteria)
-                    except Exception as e:
-                        logger.warning(
-                            "Corrupted cached policy, trying next",
-                            payer=payer, medication=mk, error=str(e)
-                        )
-
-            # Fallback: most recent row for primary + alias
-            for mk in med_keys:
-                stmt = (
-                    select(PolicyCacheModel)
-                    .where(
-                        PolicyCacheModel.payer_name == payer,
-                        PolicyCacheModel.medication_name == mk,
-                    )
-                    .order_by(PolicyCacheModel.cached_at.desc())
-                    .limit(1)
-                )
-                result = await session.execute(stmt)
-                entry = result.scalar_one_or_none()
-                if entry and entry.parsed_criteria:
-                    try:
-                        return DigitizedPolicy(**entry.parsed_criteria)
-                    except Exception as e:
-                        logger.warning(
-                            "Corrupted cached policy, treating as cache miss",
-                            payer=payer, medication=mk, error=str(e)
-                        )
-
+            rows = (await session.execute(stmt)).all()
+            # Later rows are only needed when an earlier one is corrupted
+            for row in rows:
+                policy = await self._policy_for_row(session, row)
+                if policy is not None:
+                    return policy
             return None
 
+    async def load_all(self) -> List[DigitizedPolicy]:
+        """Load every cached policy, one per payer/medication.
+
+        Prefers the 'latest' version row, falling back to the most recent row,
+        the same choice load() makes for a single policy.
+        """
+        from sqlalchemy import select
+
+        async with get_db() as session:
+            stmt = (
+                select(*_POLICY_KEY_COLUMNS)
+                .where(PolicyCacheModel.parsed_criteria.isnot(None))
+                .order_by(PolicyCacheModel.cached_at.desc())
+            )
+            rows = (await session.execute(stmt)).all()
+
+            chosen = {}
+            for row in rows:
+                key = (row.payer_name, row.medication_name)
+                if key not in chosen or (row.policy_version == "latest" and chosen[key].policy_version != "latest"):
+                    chosen[key] = row
+
+            policies = []
+            for row in chosen.values():
+                policy = await self._policy_for_row(session, row)
+                if policy is not None:
+                    policies.append(policy)
+        return policies
+
     async def invalidate(self, payer_name: str, medication_name: str) -> bool:
         """Invalidate cached policy."""
         from sqlalchemy import delete
@@ -168,6 +268,7 @@ class PolicyRepository:
             result = await session.execute(stmt)
             deleted = result.rowcount > 0
 
+        self._evict(payer, medication)
         logger.info("Policy cache invalidated", payer=payer, medication=medication, deleted=deleted)
         return deleted
 
@@ -178,12 +279,13 @@ class PolicyRepository:
         source_filename: Optional[str] = None,
         upload_notes: Optional[str] = None,
         amendment_date: Optional[datetime] = None,
+        pipeline_metrics: Optional[dict] = None,
     ) -> str:
         """Store a specific version of a digitized policy with amendment metadata."""
         from sqlalchemy import select, update
 
         policy.version = version_label
-        cache_id = await self.store(policy)
+        cache_id = await self.store(policy, pipeline_metrics=pipeline_metrics)
 
         payer = policy.payer_name.lower().replace(" ", "_")
         medication = policy.medication_name.lower().replace(" ", "_")
@@ -228,7 +330,7 @@ class PolicyRepository:
 
     async def list_versions(self, payer: str, medication: str) -> List[PolicyVersionInfo]:
         """List all stored versions for a payer/medication (includes brand/generic alias)."""
-        from sqlalchemy import select, or_
+        from sqlalchemy import select
 
         payer_key = payer.lower().replace(" ", "_")
         med_key = medication.lower().replace(" ", "_")
@@ -236,15 +338,24 @@ class PolicyRepository:
 
         async with get_db() as session:
             stmt = (
-                select(PolicyCacheModel)
+                select(
+                    PolicyCacheModel.id,
+                    PolicyCacheModel.policy_version,
+                    PolicyCacheModel.cached_at,
+                    PolicyCacheModel.content_hash,
+                    PolicyCacheModel.source_filename,
+                    PolicyCacheModel.upload_notes,
+                    PolicyCacheModel.amendment_date,
+                    PolicyCacheModel.parent_version_id,
+                )
                 .where(
                     PolicyCacheModel.payer_name == payer_key,
-                    or_(*[PolicyCacheModel.medication_name == mk for mk in med_keys]),
+                    PolicyCacheModel.medication_name.in_(med_keys),
                 )
                 .order_by(PolicyCacheModel.cached_at.desc())
             )
             result = await session.execute(stmt)
-            entries = result.scalars().all()
+            entries = result.all()
 
             # Deduplicate by version label (prefer the primary medication key)
             seen_versions = set()
@@ -275,6 +386,49 @@ class PolicyRepository:
         """Load a specific version."""
         return await self.load(payer, medication, version)
 
+    async def list_pipeline_metrics(
+        self,
+        payer: Optional[str] = None,
+        medication: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[dict]:
+        """Stored digitalization ledgers, most recent first (rows without one are skipped)."""
+        from sqlalchemy import select
+
+        stmt = (
+            select(
+                PolicyCacheModel.payer_name,
+                PolicyCacheModel.medication_name,
+                PolicyCacheModel.policy_version,
+                PolicyCacheModel.cached_at,
+                PolicyCacheModel.pipeline_metrics,
+            )
+            .where(PolicyCacheModel.pipeline_metrics.isnot(None))
+            .order_by(PolicyCacheModel.cached_at.desc())
+            .limit(limit)
+        )
+        if payer:
+            stmt = stmt.where(PolicyCacheModel.payer_name == payer.lower().replace(" ", "_"))
+        if medication:
+            from sqlalchemy import or_
+            med_keys = self._medication_keys(medication.lower().replace(" ", "_"))
+            stmt = stmt.where(or_(*[PolicyCacheModel.medication_name == mk for mk in med_keys]))
+
+        async with get_db() as session:
+            rows = (await session.execute(stmt)).all()
+
+        return [
+            {
+                "payer_name": row.payer_name,
+                "medication_name": row.medication_name,
+                "policy_version": row.policy_version or "latest",
+                "cached_at": row.cached_at.isoformat() if row.cached_at else None,
+                "pipeline_metrics": row.pipeline_metrics,
+            }
+            for row in rows
+            if row.pipeline_metrics
+        ]
+
 
 # Global instance
 _policy_repository: Optional[PolicyRepository] = None
@@ -1,10 +1,13 @@
 """Pass 3: Reference Data Validator — validates clinical codes against external databases."""
 
+import asyncio
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Set
 
 from backend.policy_digitalization.validator import ValidatedExtractionResult
-from backend.models.policy_schema import DigitizedPolicy, CriterionProvenance, ExtractionConfidence
+from backend.models.policy_schema import (
+    AtomicCriterion, ClinicalCode, CriterionProvenance, CriterionType, DigitizedPolicy, ExtractionConfidence,
+)
 from backend.policy_digitalization.exceptions import ValidationError
 from backend.config.logging_config import get_logger
 
@@ -18,6 +21,85 @@ CPT_PATTERN = re.compile(r'^\d{5}$')
 NDC_PATTERN = re.compile(r'^\d{5}-\d{4}-\d{2}$|^\d{11}$')
 LOINC_PATTERN = re.compile(r'^\d{1,7}-\d$')
 
+_VALID_CRITERION_TYPES = {e.value for e in CriterionType}
+
+
+def parse_atomic_criterion(cid: str, cdata: Dict[str, Any]) -> AtomicCriterion:
+    """Build an AtomicCriterion from extracted criterion data; raises if it cannot be parsed."""
+    raw_type = cdata.get("criterion_type", "custom")
+    if raw_type not in _VALID_CRITERION_TYPES:
+        logger.warning("Unknown criterion_type, falling back to custom", criterion_id=cid, raw_type=raw_type)
+        raw_type = "custom"
+    return AtomicCriterion(
+        criterion_id=cdata.get("criterion_id", cid),
+        criterion_type=raw_type,
+        name=cdata.get("name", ""),
+        description=cdata.get("description", ""),
+        policy_text=cdata.get("policy_text", ""),
+        clinical_codes=[ClinicalCode(**c) for c in cdata.get("clinical_codes", [])],
+        comparison_operator=cdata.get("comparison_operator"),
+        threshold_value=cdata.get("threshold_value"),
+        threshold_value_upper=cdata.get("threshold_value_upper"),
+        threshold_unit=cdata.get("threshold_unit"),
+        allowed_values=cdata.get("allowed_values", []),
+        drug_names=cdata.get("drug_names", []),
+        drug_classes=cdata.get("drug_classes", []),
+        evidence_types=cdata.get("evidence_types", []),
+        is_required=cdata.get("is_required", True),
+        category=cdata.get("category", "documentation"),
+        source_section=cdata.get("source_section"),
+        source_page=cdata.get("source_page"),
+        source_text_excerpt=cdata.get("source_text_excerpt", ""),
+        extraction_confidence=cdata.get("extraction_confidence", "medium"),
+        validation_status=cdata.get("validation_status"),
+        patient_data_path=cdata.get("patient_data_path"),
+        evaluation_strategy=cdata.get("evaluation_strategy"),
+        codes_validated=cdata.get("codes_validated", False),
+        minimum_duration_days=cdata.get("minimum_duration_days"),
+    )
+
+
+class ICD10CodePrefetcher:
+    """
+    Resolves the ICD-10 codes of criteria as Pass 1 streams them.
+
+    The validator caches definitive answers (local table / remote cache), so
+    when Pass 3 runs after extraction and Pass 2, its batch lookup finds the
+    codes already resolved. Best-effort: lookup failures are left to Pass 3.
+    """
+
+    def __init__(self, concurrency: int = 4):
+        self._seen: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    def add(self, criterion_data: Dict[str, Any]) -> None:
+        """Schedule lookups for the criterion's ICD-10 codes not seen before."""
+        codes = []
+        for code_entry in criterion_data.get("clinical_codes") or []:
+            if not isinstance(code_entry, dict) or not str(code_entry.get("system", "")).upper().startswith("ICD"):
+                continue
+            code = str(code_entry.get("code", "")).strip()
+            if code and code not in self._seen:
+                self._seen.add(code)
+                codes.append(code)
+        if codes:
+            self._tasks.append(asyncio.create_task(self._resolve(codes)))
+
+    async def _resolve(self, codes: List[str]) -> None:
+        try:
+            from backend.mcp.icd10_validator import get_icd10_validator
+            async with self._semaphore:
+                await get_icd10_validator().validate_batch(codes)
+        except Exception as e:
+            logger.debug("ICD-10 prefetch failed", codes=codes, error=str(e))
+
+    async def wait(self) -> int:
+        """Wait for scheduled lookups; returns the number of codes prefetched."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+        return len(self._seen)
+
 
 class ReferenceDataValidator:
     """Validates clinical codes in extracted data using format validation and MCP validators."""
@@ -161,7 +243,12 @@ class ReferenceDataValidator:
     async def _mcp_validate_icd10(
         self, data: Dict[str, Any], provenances: Dict[str, CriterionProvenance]
     ):
-        """Attempt to validate ICD-10 codes via MCP validator (best-effort)."""
+        """
+        Attempt to validate ICD-10 codes via MCP validator (best-effort).
+
+        Each distinct code is checked once; the validator resolves it from the
+        local ICD-10-CM table and only queries the NLM service for misses.
+        """
         try:
             from backend.mcp.icd10_validator import get_icd10_validator
             validator = get_icd10_validator()
@@ -201,49 +288,16 @@ class ReferenceDataValidator:
     ) -> DigitizedPolicy:
         """Build DigitizedPolicy from validated extraction data."""
         from backend.models.policy_schema import (
-            AtomicCriterion, CriterionGroup, IndicationCriteria,
-            ExclusionCriteria, StepTherapyRequirement, ClinicalCode,
-            DosingRequirement, CriterionType,
+            CriterionGroup, IndicationCriteria,
+            ExclusionCriteria, StepTherapyRequirement,
+            DosingRequirement,
         )
 
-        valid_criterion_types = {e.value for e in CriterionType}
-
         # Parse atomic criteria — tolerate individual failures
         atomic_criteria = {}
         for cid, cdata in data.get("atomic_criteria", {}).items():
             try:
-                clinical_codes = [ClinicalCode(**c) for c in cdata.get("clinical_codes", [])]
-                raw_type = cdata.get("criterion_type", "custom")
-                if raw_type not in valid_criterion_types:
-                    logger.warning("Unknown criterion_type, falling back to custom", criterion_id=cid, raw_type=raw_type)
-                    raw_type = "custom"
-                atomic_criteria[cid] = AtomicCriterion(
-                    criterion_id=cdata.get("criterion_id", cid),
-                    criterion_type=raw_type,
-                    name=cdata.get("name", ""),
-                    description=cdata.get("description", ""),
-                    policy_text=cdata.get("policy_text", ""),
-                    clinical_codes=clinical_codes,
-                    comparison_operator=cdata.get("comparison_operator"),
-                    threshold_value=cdata.get("threshold_value"),
-                    threshold_value_upper=cdata.get("threshold_value_upper"),
-                    threshold_unit=cdata.get("threshold_unit"),
-                    allowed_values=cdata.get("allowed_values", []),
-                    drug_names=cdata.get("drug_names", []),
-                    drug_classes=cdata.get("drug_classes", []),
-                    evidence_types=cdata.get("evidence_types", []),
-                    is_required=cdata.get("is_required", True),
-                    category=cdata.get("category", "documentation"),
-                    source_section=cdata.get("source_section"),
-                    source_page=cdata.get("source_page"),
-                    source_text_excerpt=cdata.get("source_text_excerpt", ""),
-                    extraction_confidence=cdata.get("extraction_confidence", "medium"),
-                    validation_status=cdata.get("validation_status"),
-                    patient_data_path=cdata.get("patient_data_path"),
-                    evaluation_strategy=cdata.get("evaluation_strategy"),
-                    codes_validated=cdata.get("codes_validated", False),
-                    minimum_duration_days=cdata.get("minimum_duration_days"),
-                )
+                atomic_criteria[cid] = parse_atomic_criterion(cid, cdata)
             except Exception as e:
                 logger.warning("Skipping unparseable criterion", criterion_id=cid, error=str(e))
 
@@ -389,3 +443,8 @@ class ReferenceDataValidator:
             extraction_quality=quality,
             provenances=provenances,
         )
+
+
+def policy_from_extraction(data: Dict[str, Any]) -> DigitizedPolicy:
+    """DigitizedPolicy built from extraction data the way Pass 3 builds it, without validating codes."""
+    return ReferenceDataValidator()._build_policy(data, ValidatedExtractionResult(extracted_data=data), {})
@@ -6,12 +6,14 @@ from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 
 from backend.models.enums import TaskCategory
+from backend.models.policy_schema import DigitizedPolicy
 from backend.reasoning.llm_gateway import get_llm_gateway
 from backend.reasoning.prompt_loader import get_prompt_loader
 from backend.reasoning.json_utils import extract_json_from_text
 from backend.policy_digitalization.extractor import RawExtractionResult
 from backend.policy_digitalization.exceptions import ValidationError
 from backend.config.logging_config import get_logger
+from backend.config.settings import get_settings
 
 logger = get_logger(__name__)
 
@@ -25,6 +27,15 @@ class ValidatedExtractionResult(BaseModel):
     missing_criteria_added: List[Dict] = Field(default_factory=list)
     confidence_overrides: List[Dict] = Field(default_factory=list)
     overall_assessment: str = ""
+    # Incremental validation (only criteria changed since base_version were sent to the validator)
+    incremental: bool = False
+    base_version: Optional[str] = None
+    criteria_validated: int = 0
+    criteria_carried_over: int = 0
+
+
+# Lowest quality_score in each Pass 3 extraction_quality band
+_QUALITY_BAND_FLOOR = {"good": 0.8, "needs_review": 0.5, "poor": 0.0}
 
 
 class ClaudePolicyValidator:
@@ -39,12 +50,28 @@ class ClaudePolicyValidator:
         self,
         raw: RawExtractionResult,
         policy_text: str,
+        previous: Optional[DigitizedPolicy] = None,
     ) -> ValidatedExtractionResult:
         """
         Validate Pass 1 extraction against original policy text.
 
         Uses POLICY_REASONING task category → Claude ONLY, no fallback.
+
+        When previous (the version of the same policy stored before this one) is
+        given, only criteria and structures added or modified since then are
+        validated, against their source sections; unchanged criteria keep the
+        previous version's verdict (see incremental_validation.py).
         """
+        settings = get_settings()
+        if previous is not None and settings.incremental_validation_enabled:
+            from backend.policy_digitalization.incremental_validation import plan_incremental_validation
+
+            plan = plan_incremental_validation(
+                raw.extracted_data, previous, policy_text, settings.incremental_validation_max_changed_ratio,
+            )
+            if plan is not None:
+                return await self._validate_incremental(raw, plan, previous)
+
         logger.info("Starting Pass 2 validation")
 
         # Serialize extracted data for the prompt
@@ -57,7 +84,87 @@ class ClaudePolicyValidator:
                 "policy_document": policy_text,
             }
         )
+        validation_data = await self._generate(prompt)
+
+        # Apply corrections to extracted data
+        corrected_data = self._apply_corrections(raw.extracted_data, validation_data)
+        return self._result(corrected_data, validation_data)
+
+    async def _validate_incremental(
+        self,
+        raw: RawExtractionResult,
+        plan,
+        previous: DigitizedPolicy,
+    ) -> ValidatedExtractionResult:
+        """Validate only the criteria and structures changed since plan.base_version (an IncrementalValidationPlan)."""
+        from backend.policy_digitalization.incremental_validation import carry_over_unchanged, changed_extraction
+
+        data = carry_over_unchanged(raw.extracted_data, previous, plan.unchanged_ids)
+        incremental = {
+            "incremental": True,
+            "base_version": plan.base_version,
+            "criteria_validated": len(plan.changed_ids),
+            "criteria_carried_over": len(plan.unchanged_ids),
+        }
+
+        if not plan.has_changes:
+            # Nothing was validated: report the pass as skipped, not as valid
+            logger.info(
+                "Pass 2 skipped — nothing changed since base version",
+                base_version=plan.base_version, carried_over=len(plan.unchanged_ids),
+            )
+            return ValidatedExtractionResult(
+                extracted_data=data,
+                validation_status="skipped",
+                quality_score=_QUALITY_BAND_FLOOR.get(previous.extraction_quality or "", 0.5),
+                overall_assessment=(
+                    f"Nothing changed since version {plan.base_version}; not re-validated, "
+                    "prior validation carried over."
+                ),
+                **incremental,
+            )
 
+        logger.info(
+            "Starting incremental Pass 2 validation",
+            base_version=plan.base_version,
+            changed=len(plan.changed_ids),
+            unchanged=len(plan.unchanged_ids),
+            changed_structures={k: len(v) for k, v in plan.changed_structures.items() if v},
+            full_text_fallback=plan.full_text_fallback,
+        )
+
+        criteria = raw.extracted_data.get("atomic_criteria") or {}
+        unchanged = [
+            {"criterion_id": cid, "name": criteria[cid].get("name", "")}
+            for cid in plan.unchanged_ids if cid in criteria
+        ]
+        prompt = self.prompt_loader.load(
+            "policy_digitalization/validation_pass2_incremental.txt",
+            {
+                "extracted_data": json.dumps(changed_extraction(raw.extracted_data, plan), indent=2, default=str),
+                "unchanged_criteria": json.dumps(unchanged, indent=2),
+                "policy_document": plan.policy_excerpt,
+            }
+        )
+        validation_data = await self._generate(prompt)
+
+        # Criteria outside the changed set were not shown with their full data — keep their carried-over values
+        changed = set(plan.changed_ids)
+        for key in ("corrections", "confidence_overrides"):
+            entries = validation_data.get(key, [])
+            kept = [e for e in entries if e.get("criterion_id") in changed]
+            if len(kept) != len(entries):
+                logger.warning(
+                    "Ignoring incremental validation entries for unchanged criteria",
+                    field=key, ignored=len(entries) - len(kept),
+                )
+            validation_data[key] = kept
+
+        corrected_data = self._apply_corrections(data, validation_data)
+        return self._result(corrected_data, validation_data, **incremental)
+
+    async def _generate(self, prompt: str) -> Dict[str, Any]:
+        """Run the validation prompt and parse the JSON response."""
         result = await self.llm_gateway.generate(
             task_category=TaskCategory.POLICY_REASONING,
             prompt=prompt,
@@ -67,24 +174,23 @@ class ClaudePolicyValidator:
 
         # Parse validation response
         if isinstance(result, str):
-            validation_data = extract_json_from_text(result)
+            return extract_json_from_text(result)
         elif isinstance(result, dict):
             if "content" in result and isinstance(result["content"], str):
-                validation_data = extract_json_from_text(result["content"])
-            else:
-                validation_data = result
-        else:
-            raise ValidationError(f"Unexpected result type: {type(result)}")
-
-        # Apply corrections to extracted data
-        corrected_data = self._apply_corrections(raw.extracted_data, validation_data)
+                return extract_json_from_text(result["content"])
+            return result
+        raise ValidationError(f"Unexpected result type: {type(result)}")
 
+    def _result(
+        self, corrected_data: Dict[str, Any], validation_data: Dict[str, Any], **extra: Any
+    ) -> ValidatedExtractionResult:
         logger.info(
             "Pass 2 validation complete",
             status=validation_data.get("validation_status", "unknown"),
             quality=validation_data.get("quality_score", 0),
             corrections=len(validation_data.get("corrections", [])),
             missing_added=len(validation_data.get("completeness", {}).get("missing_criteria", [])),
+            incremental=extra.get("incremental", False),
         )
 
         return ValidatedExtractionResult(
@@ -95,6 +201,7 @@ class ClaudePolicyValidator:
             missing_criteria_added=validation_data.get("completeness", {}).get("missing_criteria", []),
             confidence_overrides=validation_data.get("confidence_overrides", []),
             overall_assessment=validation_data.get("overall_assessment", ""),
+            **extra,
         )
 
     # Fields that Claude validation is allowed to correct
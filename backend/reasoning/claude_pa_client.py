@@ -8,6 +8,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 from backend.config.settings import get_settings
 from backend.config.logging_config import get_logger
 from backend.reasoning.json_utils import extract_json_from_text
+from backend.reasoning.usage_tracking import record_llm_attempt, record_llm_usage
 
 logger = get_logger(__name__)
 
@@ -45,13 +46,20 @@ class ClaudePAClient:
     )
     async def _make_api_call(self, temperature: float, system: str, prompt: str):
         """Inner method that tenacity retries on transient errors."""
-        return await self.client.messages.create(
+        record_llm_attempt()
+        message = await self.client.messages.create(
             model=self.model,
             max_tokens=self.max_tokens,
             temperature=temperature,
             system=system,
             messages=[{"role": "user", "content": prompt}]
         )
+        usage = getattr(message, "usage", None)
+        record_llm_usage(
+            "claude", self.model,
+            getattr(usage, "input_tokens", 0), getattr(usage, "output_tokens", 0),
+        )
+        return message
 
     async def analyze_policy(
         self,
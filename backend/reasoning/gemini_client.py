@@ -1,6 +1,6 @@
 """Gemini client for general tasks - primary model with Azure fallback."""
 import json
-from typing import Dict, Any, Optional, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
 import google.generativeai as genai
 from google.api_core.exceptions import (
@@ -14,6 +14,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 from backend.config.settings import get_settings
 from backend.config.logging_config import get_logger
 from backend.reasoning.json_utils import extract_json_from_text
+from backend.reasoning.usage_tracking import record_llm_attempt, record_llm_usage
 
 logger = get_logger(__name__)
 
@@ -71,6 +72,7 @@ class GeminiClient:
             GeminiError: If generation fails
         """
         logger.info("Generating with Gemini", model=self.model_name)
+        record_llm_attempt()
 
         try:
             generation_config = genai.GenerationConfig(
@@ -97,6 +99,12 @@ class GeminiClient:
                     request_options={"timeout": 300}
                 )
 
+            usage = getattr(response, "usage_metadata", None)
+            record_llm_usage(
+                "gemini", self.model_name,
+                getattr(usage, "prompt_token_count", 0), getattr(usage, "candidates_token_count", 0),
+            )
+
             if not response.text:
                 raise GeminiError("Empty response from Gemini")
 
@@ -113,6 +121,76 @@ class GeminiClient:
             logger.error("Gemini generation failed", error=str(e))
             raise GeminiError(f"Gemini generation failed: {e}") from e
 
+    async def generate_stream(
+        self,
+        prompt: Union[str, List[Any]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.3,
+        model_name: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Generate content using Gemini, yielding the response text as it arrives.
+
+        Not retried: a failure after the first chunk cannot be replayed, so
+        callers fall back to generate() themselves.
+
+        Args:
+            prompt: The generation prompt (or content parts, e.g. [uploaded_file, prompt])
+            system_prompt: Optional system instruction
+            temperature: Temperature for generation
+            model_name: Model override (defaults to Settings.gemini_model)
+
+        Yields:
+            Response text chunks
+
+        Raises:
+            GeminiError: If generation fails or returns no text
+        """
+        model_name = model_name or self.model_name
+        logger.info("Streaming with Gemini", model=model_name)
+        record_llm_attempt()
+
+        try:
+            if system_prompt or model_name != self.model_name:
+                model = genai.GenerativeModel(model_name, system_instruction=system_prompt)
+            else:
+                model = self.model
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=genai.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=self.max_output_tokens,
+                ),
+                stream=True,
+                request_options={"timeout": 300},
+            )
+
+            length = 0
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. the final finish-reason chunk)
+                    continue
+                if text:
+                    length += len(text)
+                    yield text
+
+            usage = getattr(response, "usage_metadata", None)
+            record_llm_usage(
+                "gemini", model_name,
+                getattr(usage, "prompt_token_count", 0), getattr(usage, "candidates_token_count", 0),
+            )
+            if not length:
+                raise GeminiError("Empty response from Gemini")
+            logger.debug("Gemini stream complete", length=length)
+
+        except GeminiError:
+            raise
+        except Exception as e:
+            logger.error("Gemini streaming failed", error=str(e))
+            raise GeminiError(f"Gemini streaming failed: {e}") from e
+
     async def summarize(self, text: str, max_length: int = 500) -> str:
         """
         Summarize text using Gemini.
@@ -0,0 +1,137 @@
+"""Gemini File Cache — non-blocking uploads with reusable remote file handles.
+
+genai.upload_file is a blocking HTTP call; running it inside the async
+pipeline stalls every other request on the worker for the whole upload. This
+cache runs uploads in a worker thread and keeps the returned handle, keyed by
+the document's SHA-256, until shortly before Gemini expires it (files live 48
+hours). Concurrent requests for the same document share a single upload.
+"""
+
+import asyncio
+import hashlib
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from backend.reasoning.usage_tracking import record_cache_hit
+from backend.config.logging_config import get_logger
+from backend.config.settings import get_settings
+
+logger = get_logger(__name__)
+
+# Gemini deletes uploaded files after 48 hours
+DEFAULT_FILE_TTL = timedelta(hours=48)
+# Stop reusing a handle this long before it expires
+EXPIRY_MARGIN = timedelta(hours=1)
+
+
+def sha256_file(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _expiration(uploaded: Any) -> datetime:
+    expires = getattr(uploaded, "expiration_time", None)
+    if isinstance(expires, datetime):
+        return expires if expires.tzinfo else expires.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) + DEFAULT_FILE_TTL
+
+
+class GeminiFileCache:
+    """Uploaded Gemini file handles by document SHA-256."""
+
+    def __init__(self):
+        self._files: Dict[str, Tuple[Any, datetime]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._configured = False
+        self.uploads = 0
+        self.reuses = 0
+
+    def _genai(self):
+        import google.generativeai as genai
+
+        if not self._configured:
+            genai.configure(api_key=get_settings().gemini_api_key)
+            self._configured = True
+        return genai
+
+    def _valid(self, sha256: str) -> Optional[Any]:
+        entry = self._files.get(sha256)
+        if entry is None:
+            return None
+        uploaded, expires_at = entry
+        if datetime.now(timezone.utc) >= expires_at - EXPIRY_MARGIN:
+            del self._files[sha256]
+            return None
+        return uploaded
+
+    async def get_or_upload(self, path: Path, sha256: Optional[str] = None, mime_type: str = "application/pdf") -> Any:
+        """Remote handle for a local file, uploading it (off the event loop) if needed."""
+        path = Path(path)
+        if sha256 is None:
+            sha256 = await asyncio.to_thread(sha256_file, path)
+        return await self._get(sha256, lambda: self._upload_path(path, mime_type))
+
+    async def get_or_upload_bytes(self, content: bytes, suffix: str = ".pdf", mime_type: str = "application/pdf") -> Any:
+        """Remote handle for in-memory file content, uploading it (off the event loop) if needed."""
+        sha256 = hashlib.sha256(content).hexdigest()
+        return await self._get(sha256, lambda: self._upload_bytes(content, suffix, mime_type))
+
+    async def _get(self, sha256: str, upload) -> Any:
+        uploaded = self._valid(sha256)
+        if uploaded is not None:
+            self.reuses += 1
+            record_cache_hit()
+            return uploaded
+
+        lock = self._locks.setdefault(sha256, asyncio.Lock())
+        async with lock:
+            # Another request may have uploaded it while we waited
+            uploaded = self._valid(sha256)
+            if uploaded is not None:
+                self.reuses += 1
+                record_cache_hit()
+                return uploaded
+            uploaded = await asyncio.to_thread(upload)
+            self._files[sha256] = (uploaded, _expiration(uploaded))
+            self.uploads += 1
+            logger.info(
+                "Uploaded file to Gemini",
+                sha256=sha256[:16], name=getattr(uploaded, "name", None),
+            )
+            return uploaded
+
+    def _upload_path(self, path: Path, mime_type: str) -> Any:
+        return self._genai().upload_file(str(path), mime_type=mime_type)
+
+    def _upload_bytes(self, content: bytes, suffix: str, mime_type: str) -> Any:
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            tmp.write(content)
+            tmp_path = Path(tmp.name)
+        try:
+            return self._upload_path(tmp_path, mime_type)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def invalidate(self, sha256: str) -> None:
+        """Forget a handle, e.g. after Gemini rejected it."""
+        self._files.pop(sha256, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"cached": len(self._files), "uploads": self.uploads, "reuses": self.reuses}
+
+
+# Global instance
+_gemini_file_cache: Optional[GeminiFileCache] = None
+
+
+def get_gemini_file_cache() -> GeminiFileCache:
+    """Get or create the global Gemini file cache."""
+    global _gemini_file_cache
+    if _gemini_file_cache is None:
+        _gemini_file_cache = GeminiFileCache()
+    return _gemini_file_cache
@@ -1,7 +1,7 @@
 """Shared JSON extraction utility for LLM response parsing."""
 import json
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 from backend.config.logging_config import get_logger
 
@@ -80,3 +80,105 @@ def extract_json_from_text(text: str) -> Dict[str, Any]:
 
     json_text = text[first_brace:last_brace + 1]
     return json.loads(json_text)
+
+
+class IncrementalJSONMemberParser:
+    """
+    Parse the members of one top-level JSON object field while the text streams in.
+
+    For a response shaped like {"atomic_criteria": {"C1": {...}, "C2": {...}}, ...}
+    and member_field="atomic_criteria", feed() returns ("C1", {...}) as soon as
+    C1's value is complete, without waiting for the rest of the document. Text
+    before the first "{" (e.g. a markdown fence) is ignored. Members that fail to
+    parse are skipped; the complete response should still be parsed with
+    extract_json_from_text() once it has arrived.
+    """
+
+    def __init__(self, member_field: str):
+        self.member_field = member_field
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string: Dict[int, str] = {}  # Depth -> raw text of the last string closed there
+        self._keys: Dict[int, Optional[str]] = {}  # Depth -> key of the value being read there
+        self._in_field = False
+        self._value_start = -1
+        self._done = False
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return self._buffer
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Append streamed text; returns the (key, value) members completed by it."""
+        self._buffer += chunk
+        completed: List[Tuple[str, Any]] = []
+        buffer = self._buffer
+
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._done:
+                break
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string[self._depth] = buffer[self._string_start:i + 1]
+                continue
+
+            if self._in_field and self._depth == 2 and self._value_start == -1 and self._keys.get(2) is not None:
+                if not char.isspace():
+                    self._value_start = i
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == ":":
+                try:
+                    self._keys[self._depth] = json.loads(self._last_string.get(self._depth, '""'))
+                except json.JSONDecodeError:
+                    self._keys[self._depth] = None
+            elif char in "{[":
+                self._depth += 1
+                if char == "{" and self._depth == 2 and self._keys.get(1) == self.member_field:
+                    self._in_field = True
+                    self._keys[2] = None
+            elif char in "}]":
+                if self._in_field and self._depth == 2:
+                    # End of the member field; a pending scalar member ends here
+                    self._complete(buffer, i, completed)
+                    self._in_field = False
+                self._depth -= 1
+                if self._in_field and self._depth == 2:
+                    # A container member value just closed
+                    self._complete(buffer, i + 1, completed)
+                if self._depth == 0:
+                    self._done = True
+            elif char == "," and self._depth == 2 and self._in_field:
+                self._complete(buffer, i, completed)
+
+        self._pos = len(buffer)
+        return completed
+
+    def _complete(self, buffer: str, end: int, completed: List[Tuple[str, Any]]) -> None:
+        key = self._keys.get(2)
+        if key is not None and self._value_start != -1:
+            try:
+                completed.append((key, json.loads(buffer[self._value_start:end])))
+            except json.JSONDecodeError:
+                logger.debug("Skipping unparseable streamed member", key=key)
+        self._keys[2] = None
+        self._value_start = -1
@@ -7,6 +7,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 
 from backend.config.settings import get_settings
 from backend.config.logging_config import get_logger
+from backend.reasoning.usage_tracking import record_llm_attempt, record_llm_usage
 
 logger = get_logger(__name__)
 
@@ -64,6 +65,7 @@ class AzureOpenAIClient:
             AzureOpenAIError: If generation fails
         """
         logger.info("Generating with Azure OpenAI", deployment=self.deployment)
+        record_llm_attempt()
 
         try:
             messages = []
@@ -84,6 +86,11 @@ class AzureOpenAIClient:
                 request_params["temperature"] = temperature
 
             response = await self.client.chat.completions.create(**request_params)
+            usage = getattr(response, "usage", None)
+            record_llm_usage(
+                "azure_openai", self.deployment,
+                getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0),
+            )
 
             if not response.choices:
                 raise AzureOpenAIError("No choices in Azure OpenAI response")
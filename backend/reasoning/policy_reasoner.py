@@ -1,6 +1,6 @@
 """Policy Reasoner - Analyzes payer policies using LLM."""
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 from backend.models.coverage import CoverageAssessment, CriterionAssessment, DocumentationGap
@@ -122,7 +122,8 @@ class PolicyReasoner:
         each criterion by ID, producing per-criterion assessments.
 
         Args:
-            patient_info: Patient demographic and clinical data
+            patient_info: Patient demographic and clinical data; its patient_id
+                selects the stored record used for deterministic pre-evaluation
             medication_info: Medication request details
             payer_name: Name of the payer
             digitized_policy: Optional pre-loaded DigitizedPolicy to use instead
@@ -169,6 +170,42 @@ class PolicyReasoner:
                     error=str(e), error_type=type(e).__name__, payer=payer_name,
                 )
 
+        # Deterministic-first: run the evaluator and skip the LLM when it is decisive.
+        # Without the patient's stored record neither the fast path nor the resolved
+        # criteria are used.
+        resolved_criteria: Dict[str, CriterionAssessment] = {}
+        settings = get_settings()
+        if digitized_policy and policy_criteria_context and settings.coverage_fast_path_enabled:
+            evaluation = self._evaluate_deterministically(patient_info, digitized_policy, payer_name)
+            if evaluation is not None:
+                if self._is_decisive(evaluation):
+                    assessment = self._build_deterministic_assessment(
+                        evaluation=evaluation,
+                        payer_name=payer_name,
+                        policy_text=policy_text,
+                        medication_name=medication_info.get("medication_name", "unknown"),
+                        digitized_policy=digitized_policy,
+                    )
+                    logger.info(
+                        "Coverage assessment decided deterministically, LLM skipped",
+                        payer=payer_name,
+                        verdict=evaluation.overall_verdict.value,
+                        status=assessment.coverage_status.value,
+                        likelihood=assessment.approval_likelihood,
+                    )
+                    return assessment
+
+                if settings.coverage_escalate_ambiguous_only:
+                    resolved_criteria = self._resolved_criteria(evaluation, digitized_policy)
+                    if resolved_criteria:
+                        policy_criteria_context += "\n\n" + self._format_resolved_criteria(resolved_criteria)
+                        logger.info(
+                            "Escalating ambiguous criteria to LLM",
+                            payer=payer_name,
+                            resolved=len(resolved_criteria),
+                            total=len(digitized_policy.atomic_criteria),
+                        )
+
         if not policy_criteria_context:
             policy_criteria_context = (
                 "[No structured policy criteria available. "
@@ -208,6 +245,7 @@ class PolicyReasoner:
             policy_text=policy_text,
             medication_name=medication_info.get("medication_name", "unknown"),
             digitized_policy=digitized_policy,
+            resolved_criteria=resolved_criteria,
         )
 
         logger.info(
@@ -219,6 +257,238 @@ class PolicyReasoner:
 
         return assessment
 
+    def _evaluate_deterministically(self, patient_info: Dict[str, Any], digitized_policy, payer_name: str):
+        """
+        Run the deterministic evaluator on the patient's full record; None if it cannot run.
+
+        Callers pass a partial patient_info (a few sections, reshaped for the
+        prompt), which would make criteria it omits look NOT_MET or
+        INSUFFICIENT_DATA. The evaluator therefore reads the stored record of
+        patient_info["patient_id"], and does not run without one.
+        """
+        from backend.policy_digitalization.evaluator import evaluate_policy
+        from backend.storage.patient_store import get_patient_store
+
+        patient_id = patient_info.get("patient_id")
+        try:
+            patient = get_patient_store().get_normalized(patient_id) if patient_id else None
+            if patient is None:
+                logger.info(
+                    "No stored patient record, skipping deterministic pre-evaluation",
+                    payer=payer_name, patient_id=patient_id,
+                )
+                return None
+            return evaluate_policy(digitized_policy, patient)
+        except Exception as e:
+            logger.warning(
+                "Deterministic pre-evaluation failed, using LLM assessment",
+                payer=payer_name, error=str(e), error_type=type(e).__name__,
+            )
+            return None
+
+    def _deciding_indications(self, evaluation) -> list:
+        """Indications that determine the overall verdict (the MET ones, or all of them)."""
+        from backend.policy_digitalization.evaluator import CriterionVerdict
+
+        if evaluation.overall_verdict == CriterionVerdict.MET:
+            return [ie for ie in evaluation.indication_evaluations if ie.overall_verdict == CriterionVerdict.MET]
+        return list(evaluation.indication_evaluations)
+
+    def _is_decisive(self, evaluation) -> bool:
+        """
+        Whether a deterministic evaluation can stand in for the LLM assessment.
+
+        Decisive when the overall verdict is one of coverage_fast_path_verdicts,
+        the deciding indications have at most coverage_fast_path_max_insufficient
+        INSUFFICIENT_DATA criteria, and — for MET — every exclusion trigger has
+        one of coverage_fast_path_exclusion_verdicts and the deciding
+        indications' step therapy is satisfied.
+        """
+        from backend.policy_digitalization.evaluator import CriterionVerdict
+
+        settings = get_settings()
+        verdict = evaluation.overall_verdict
+        if verdict.value not in settings.coverage_fast_path_verdicts:
+            return False
+        if verdict not in (CriterionVerdict.MET, CriterionVerdict.NOT_MET):
+            return False
+
+        deciding = self._deciding_indications(evaluation)
+        if not deciding:
+            return False
+
+        if verdict == CriterionVerdict.MET:
+            # Exclusions don't change the evaluator verdict, so they are checked here
+            if any(
+                exclusion.verdict.value not in settings.coverage_fast_path_exclusion_verdicts
+                for exclusion in evaluation.exclusion_evaluations
+            ):
+                return False
+            if not self._step_therapy_satisfied(evaluation, deciding):
+                return False
+
+        insufficient = {ic.criterion_id for ie in deciding for ic in ie.insufficient_criteria}
+        return len(insufficient) <= settings.coverage_fast_path_max_insufficient
+
+    def _step_therapy_satisfied(self, evaluation, deciding) -> bool:
+        """Whether the step therapy requirements of the deciding indications are satisfied.
+
+        Requirements naming none of the evaluated indications apply to all of them.
+        """
+        step_therapy = evaluation.step_therapy_evaluation or {}
+        details = step_therapy.get("details") or []
+        if not details:
+            return step_therapy.get("satisfied", True)
+        deciding_names = {ie.indication_name.lower() for ie in deciding}
+        all_names = {ie.indication_name.lower() for ie in evaluation.indication_evaluations}
+        return all(
+            requirement.get("satisfied", False)
+            for requirement in details
+            if (requirement.get("indication") or "").lower() in deciding_names
+            or (requirement.get("indication") or "").lower() not in all_names
+        )
+
+    def _criterion_assessment(self, criterion_eval, digitized_policy) -> CriterionAssessment:
+        """Convert a deterministic CriterionEvaluation into a CriterionAssessment."""
+        from backend.policy_digitalization.evaluator import CriterionVerdict
+
+        criterion = digitized_policy.atomic_criteria.get(criterion_eval.criterion_id)
+        is_met = criterion_eval.verdict == CriterionVerdict.MET
+        gaps = []
+        if criterion_eval.verdict == CriterionVerdict.INSUFFICIENT_DATA:
+            gaps.append(f"Obtain documentation for: {criterion_eval.criterion_name}")
+        elif not is_met and criterion_eval.is_required:
+            gaps.append(f"Address unmet criterion: {criterion_eval.criterion_name}")
+        return CriterionAssessment(
+            criterion_id=criterion_eval.criterion_id,
+            criterion_name=criterion_eval.criterion_name,
+            criterion_description=criterion.description if criterion else "",
+            is_met=is_met,
+            confidence=criterion_eval.confidence,
+            supporting_evidence=list(criterion_eval.evidence),
+            gaps=gaps,
+            reasoning=f"[DETERMINISTIC] {criterion_eval.reasoning}",
+        )
+
+    def _resolved_criteria(self, evaluation, digitized_policy) -> Dict[str, CriterionAssessment]:
+        """Criteria the evaluator resolved to MET or NOT_MET, keyed by criterion_id."""
+        from backend.policy_digitalization.evaluator import CriterionVerdict, collect_all_criteria_evals
+
+        resolved: Dict[str, CriterionAssessment] = {}
+        for ie in evaluation.indication_evaluations:
+            for ce in collect_all_criteria_evals(ie.approval_criteria_result):
+                if ce.verdict in (CriterionVerdict.MET, CriterionVerdict.NOT_MET) and ce.criterion_id not in resolved:
+                    resolved[ce.criterion_id] = self._criterion_assessment(ce, digitized_policy)
+        return resolved
+
+    def _format_resolved_criteria(self, resolved_criteria: Dict[str, CriterionAssessment]) -> str:
+        """Prompt section listing deterministically resolved criteria as final."""
+        lines = [
+            "### Deterministic Pre-Evaluation (Final)",
+            "The following criteria were resolved by rule-based evaluation of structured patient data.",
+            "Treat these verdicts as final. Do NOT re-evaluate them; evaluate every other criterion above.",
+        ]
+        for cid, assessment in resolved_criteria.items():
+            verdict = "MET" if assessment.is_met else "NOT MET"
+            lines.append(f"- **{cid}**: {verdict}")
+        return "\n".join(lines)
+
+    def _build_deterministic_assessment(
+        self,
+        evaluation,
+        payer_name: str,
+        policy_text: str,
+        medication_name: str,
+        digitized_policy,
+    ) -> CoverageAssessment:
+        """Build a CoverageAssessment from a decisive deterministic evaluation."""
+        from uuid import uuid4
+        from backend.policy_digitalization.evaluator import CriterionVerdict, collect_all_criteria_evals
+
+        deciding = self._deciding_indications(evaluation)
+        is_met = evaluation.overall_verdict == CriterionVerdict.MET
+
+        criteria: List[CriterionAssessment] = []
+        seen = set()
+        for ie in deciding:
+            for ce in collect_all_criteria_evals(ie.approval_criteria_result):
+                if ce.criterion_id not in seen:
+                    seen.add(ce.criterion_id)
+                    criteria.append(self._criterion_assessment(ce, digitized_policy))
+
+        deciding_names = {ie.indication_name for ie in deciding}
+        step_therapy_satisfied = self._step_therapy_satisfied(evaluation, deciding)
+        gaps = []
+        for g in evaluation.gaps:
+            if g.get("gap_type") == "step_therapy_review":
+                if step_therapy_satisfied:
+                    continue
+            elif g.get("indication") not in deciding_names:
+                continue
+            gaps.append(DocumentationGap(
+                gap_id=f"{g.get('criterion_id', 'gap')}_{len(gaps) + 1}",
+                gap_type=g.get("gap_type", "other"),
+                description=g.get("action", ""),
+                required_for=[g["criterion_id"]] if g.get("criterion_id") else [],
+                priority="high" if g.get("gap_type") == "not_met" else "medium",
+                suggested_action=g.get("action", ""),
+            ))
+
+        if is_met:
+            # Tolerated exclusion triggers the evaluator could not resolve (see _is_decisive)
+            for exclusion in evaluation.exclusion_evaluations:
+                if exclusion.verdict != CriterionVerdict.INSUFFICIENT_DATA:
+                    continue
+                action = f"Confirm exclusion does not apply: {exclusion.criterion_name}"
+                gaps.append(DocumentationGap(
+                    gap_id=f"{exclusion.criterion_id}_{len(gaps) + 1}",
+                    gap_type="exclusion_review",
+                    description=action,
+                    required_for=[exclusion.criterion_id],
+                    priority="medium",
+                    suggested_action=action,
+                ))
+
+        settings = get_settings()
+        raw_likelihood = settings.coverage_fast_path_met_likelihood if is_met else evaluation.overall_readiness
+        approval_likelihood = self._validate_approval_likelihood(
+            raw_likelihood, criteria, payer_name, digitized_policy=digitized_policy,
+        )
+        coverage_status = self._apply_conservative_status_mapping(
+            CoverageStatus.COVERED.value if is_met else CoverageStatus.NOT_COVERED.value,
+            approval_likelihood,
+        )
+
+        step_therapy = evaluation.step_therapy_evaluation or {}
+        step_therapy_options = []
+        for req in digitized_policy.step_therapy_requirements or []:
+            step_therapy_options.extend(req.required_drugs or [])
+
+        met_count = sum(1 for c in criteria if c.is_met)
+        indication_list = ", ".join(sorted(deciding_names))
+        return CoverageAssessment(
+            assessment_id=str(uuid4()),
+            payer_name=payer_name,
+            policy_name=f"{payer_name} Policy",
+            medication_name=medication_name,
+            coverage_status=coverage_status,
+            approval_likelihood=approval_likelihood,
+            approval_likelihood_reasoning=(
+                f"Deterministic evaluation {evaluation.overall_verdict.value.upper()} for "
+                f"{indication_list}: {met_count}/{len(criteria)} criteria met. LLM assessment not required."
+            ),
+            criteria_assessments=criteria,
+            criteria_met_count=met_count,
+            criteria_total_count=len(criteria),
+            documentation_gaps=gaps,
+            recommendations=list(dict.fromkeys(g.suggested_action for g in gaps if g.suggested_action)),
+            step_therapy_required=step_therapy.get("required", False),
+            step_therapy_options=step_therapy_options,
+            step_therapy_satisfied=step_therapy_satisfied,
+            raw_policy_text=policy_text,
+            llm_raw_response=None,
+        )
+
     def _format_policy_criteria(self, digitized_policy) -> str:
         """Format digitized policy criteria as structured context for the LLM prompt.
 
@@ -344,8 +614,13 @@ class PolicyReasoner:
         policy_text: str,
         medication_name: str,
         digitized_policy=None,
+        resolved_criteria: Optional[Dict[str, CriterionAssessment]] = None,
     ) -> CoverageAssessment:
-        """Parse LLM response into CoverageAssessment with criterion_id validation."""
+        """Parse LLM response into CoverageAssessment with criterion_id validation.
+
+        resolved_criteria holds deterministically resolved criteria; they
+        replace any LLM assessment of the same criterion_id.
+        """
         from uuid import uuid4
 
         # Validate the LLM returned usable data
@@ -368,6 +643,8 @@ class PolicyReasoner:
         matched_ids = set()
         for c in raw_criteria:
             cid = c.get("criterion_id", "")
+            if resolved_criteria and cid in resolved_criteria:
+                continue
 
             # Validate criterion_id against known policy criteria
             if known_criterion_ids and cid:
@@ -401,6 +678,10 @@ class PolicyReasoner:
                 reasoning=c.get("reasoning", "")
             ))
 
+        if resolved_criteria:
+            criteria.extend(resolved_criteria.values())
+            matched_ids.update(cid for cid in resolved_criteria if cid in known_criterion_ids)
+
         # Enforce coverage of known criteria — downgrade status if too many are missing
         if known_criterion_ids:
             missing_from_response = known_criterion_ids - matched_ids
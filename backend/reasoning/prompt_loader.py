@@ -122,6 +122,19 @@ class PromptLoader:
         raw_prompt = self._load_raw_prompt(prompt_path)
         return re.findall(r"\{(\w+)\}", raw_prompt)
 
+    def template_hash(self, prompt_path: str) -> str:
+        """
+        Content hash of a prompt template, before variable substitution.
+
+        Args:
+            prompt_path: Relative path to prompt file
+
+        Returns:
+            Hex SHA-256 of the raw template
+        """
+        import hashlib
+        return hashlib.sha256(self._load_raw_prompt(prompt_path).encode("utf-8")).hexdigest()
+
     def clear_cache(self) -> None:
         """Clear the prompt cache."""
         self._load_raw_prompt.cache_clear()
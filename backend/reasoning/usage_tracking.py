@@ -0,0 +1,78 @@
+"""LLM usage tracking — token, attempt, cost and cache-hit counters for a unit of work.
+
+A caller opens track_llm_usage(usage) around the work it wants to account for;
+the LLM clients report every provider attempt and the token usage of every
+successful call into whichever LLMUsage is active in the current context.
+Tasks spawned inside the block (asyncio.gather of chunk extractions, etc.)
+inherit the context, so their calls are counted too. Outside a tracking block
+the record_* functions do nothing.
+
+Costs are estimates from Settings.llm_cost_per_million_tokens.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+from backend.config.settings import get_settings
+
+
+class LLMUsage(BaseModel):
+    """Accumulated LLM usage of one unit of work."""
+    llm_calls: int = 0  # Successful calls
+    attempts: int = 0  # Provider attempts, including retries and fallbacks
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    cache_hits: int = 0
+    models: List[str] = Field(default_factory=list)
+
+
+_current_usage: ContextVar[Optional[LLMUsage]] = ContextVar("llm_usage", default=None)
+
+
+@contextmanager
+def track_llm_usage(usage: LLMUsage) -> Iterator[LLMUsage]:
+    """Attribute LLM calls made inside the block to usage."""
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+def estimate_cost(provider: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimated USD cost of a call."""
+    rates: Dict[str, float] = get_settings().llm_cost_per_million_tokens.get(provider, {})
+    return (input_tokens * rates.get("input", 0.0) + output_tokens * rates.get("output", 0.0)) / 1_000_000
+
+
+def record_llm_attempt() -> None:
+    """Count one provider attempt (call it once per try, before the request)."""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.attempts += 1
+
+
+def record_llm_usage(provider: str, model: str, input_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+    """Count one successful call and its token usage."""
+    usage = _current_usage.get()
+    if usage is None:
+        return
+    input_tokens = input_tokens or 0
+    output_tokens = output_tokens or 0
+    usage.llm_calls += 1
+    usage.input_tokens += input_tokens
+    usage.output_tokens += output_tokens
+    usage.cost_usd = round(usage.cost_usd + estimate_cost(provider, input_tokens, output_tokens), 6)
+    if model and model not in usage.models:
+        usage.models.append(model)
+
+
+def record_cache_hit(count: int = 1) -> None:
+    """Count work served from a cache instead of a model or service call."""
+    usage = _current_usage.get()
+    if usage is not None and count:
+        usage.cache_hits += count
@@ -2,6 +2,13 @@
 from .database import get_db, init_db, AsyncSessionLocal
 from .case_repository import CaseRepository
 from .audit_logger import AuditLogger
+from .patient_store import PatientStore, get_patient_store
+from .population_index import (
+    PatientPopulationIndex,
+    CaseCohortIndex,
+    get_patient_population_index,
+    get_case_cohort_index,
+)
 
 __all__ = [
     "get_db",
@@ -9,4 +16,10 @@ __all__ = [
     "AsyncSessionLocal",
     "CaseRepository",
     "AuditLogger",
+    "PatientStore",
+    "get_patient_store",
+    "PatientPopulationIndex",
+    "CaseCohortIndex",
+    "get_patient_population_index",
+    "get_case_cohort_index",
 ]
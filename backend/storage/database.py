@@ -74,7 +74,7 @@ AsyncSessionLocal = get_session_factory
 
 
 async def _ensure_amendment_columns(engine) -> None:
-    """Add amendment columns to policy_cache if they don't exist (PostgreSQL)."""
+    """Add amendment and ledger columns to policy_cache if they don't exist (PostgreSQL)."""
     from sqlalchemy import text
 
     async with engine.begin() as conn:
@@ -83,6 +83,7 @@ async def _ensure_amendment_columns(engine) -> None:
             ("upload_notes", "TEXT"),
             ("amendment_date", "TIMESTAMPTZ"),
             ("parent_version_id", "VARCHAR(36)"),
+            ("pipeline_metrics", "JSON"),
         ]:
             try:
                 await conn.execute(text(
@@ -92,6 +93,22 @@ async def _ensure_amendment_columns(engine) -> None:
                 logger.debug(f"Column {col} may already exist: {e}")
 
 
+async def _ensure_policy_cache_indexes(engine) -> None:
+    """Create policy_cache indexes added after the table (create_all skips existing tables)."""
+    from sqlalchemy import text
+
+    async with engine.begin() as conn:
+        try:
+            await conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_policy_cache_payer_med_version_cached "
+                "ON policy_cache (payer_name, medication_name, policy_version, cached_at)"
+            ))
+            # Superseded by the index above (same leading columns)
+            await conn.execute(text("DROP INDEX IF EXISTS ix_policy_cache_payer_med_version"))
+        except Exception as e:
+            logger.debug(f"Could not update policy_cache indexes: {e}")
+
+
 async def init_db() -> None:
     """Initialize the database, creating all tables."""
     from backend.storage.models import Base as ModelsBase
@@ -100,6 +117,7 @@ async def init_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(ModelsBase.metadata.create_all)
     await _ensure_amendment_columns(engine)
+    await _ensure_policy_cache_indexes(engine)
     logger.info("Database initialized")
 
 
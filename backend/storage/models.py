@@ -209,6 +209,9 @@ class PolicyCacheModel(Base):
     amendment_date = Column(DateTime(timezone=True), nullable=True)
     parent_version_id = Column(String(36), nullable=True)
 
+    # Digitalization ledger (PipelineMetrics record: per-pass time, tokens, cost)
+    pipeline_metrics = Column(JSON, nullable=True)
+
     # Policy content
     policy_text = Column(Text, nullable=False)
     parsed_criteria = Column(JSON, nullable=True)
@@ -216,7 +219,11 @@ class PolicyCacheModel(Base):
     # Indexes
     __table_args__ = (
         Index('ix_policy_cache_payer_med', 'payer_name', 'medication_name'),
-        Index('ix_policy_cache_payer_med_version', 'payer_name', 'medication_name', 'policy_version'),
+        # Covers exact-version lookups and newest-first scans of a payer/medication
+        Index(
+            'ix_policy_cache_payer_med_version_cached',
+            'payer_name', 'medication_name', 'policy_version', 'cached_at',
+        ),
     )
 
     def to_dict(self) -> dict:
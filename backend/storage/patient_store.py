@@ -0,0 +1,194 @@
+"""Patient Store — cached access to patient JSON files.
+
+Patient files under data/patients are read by the intake agent, the policy
+analyzer, the patient routes and the impact endpoint, often several times per
+case run. PatientStore keeps each file's parsed dict (and, on demand, its
+NormalizedPatientData) in memory and revalidates on every access:
+
+- unchanged mtime and size: served from memory
+- changed mtime, same content hash (e.g. touched or rewritten as-is): kept
+- changed content: re-parsed, normalized data dropped
+
+save() writes through the cache, so PATCH corrections are visible at once.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import pickle
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.config.logging_config import get_logger
+from backend.config.settings import get_settings
+
+logger = get_logger(__name__)
+
+
+class PatientRecord:
+    """One cached patient file."""
+
+    __slots__ = ("mtime_ns", "size", "digest", "raw", "_pickled", "normalized", "normalized_on")
+
+    def __init__(self, mtime_ns: int, size: int, digest: str, raw: Dict[str, Any]):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.raw = raw
+        self._pickled: Optional[bytes] = None
+        self.normalized = None
+        # Normalized age is computed from today's date, so the cache is per-day
+        self.normalized_on: Optional[date] = None
+
+    def copy_raw(self) -> Dict[str, Any]:
+        # Unpickling is cheaper than both deepcopy and re-parsing the JSON
+        if self._pickled is None:
+            self._pickled = pickle.dumps(self.raw, protocol=pickle.HIGHEST_PROTOCOL)
+        return pickle.loads(self._pickled)
+
+
+class PatientStore:
+    """Cached, self-invalidating reader/writer for patient JSON files."""
+
+    def __init__(self, patients_dir: Optional[Path] = None):
+        self.patients_dir = Path(patients_dir or get_settings().patients_dir)
+        self._records: Dict[str, PatientRecord] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.reads = 0
+
+    def path_for(self, patient_id: str) -> Path:
+        """Patient file path; raises ValueError if it escapes the patients directory."""
+        path = (self.patients_dir / f"{patient_id}.json").resolve()
+        try:
+            path.relative_to(self.patients_dir.resolve())
+        except ValueError:
+            raise ValueError(f"Invalid patient ID: {patient_id}")
+        return path
+
+    def list_ids(self) -> List[str]:
+        """IDs of all patient files, sorted."""
+        if not self.patients_dir.exists():
+            return []
+        return sorted(path.stem for path in self.patients_dir.glob("*.json"))
+
+    def _record(self, patient_id: str) -> Optional[PatientRecord]:
+        path = self.path_for(patient_id)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._records.pop(patient_id, None)
+            return None
+
+        with self._lock:
+            record = self._records.get(patient_id)
+        if record is not None and record.mtime_ns == stat.st_mtime_ns and record.size == stat.st_size:
+            self.hits += 1
+            return record
+
+        with open(path, "rb") as f:
+            content = f.read()
+        self.reads += 1
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        if record is not None and record.digest == digest:
+            record.mtime_ns, record.size = stat.st_mtime_ns, stat.st_size
+            return record
+
+        record = PatientRecord(stat.st_mtime_ns, stat.st_size, digest, json.loads(content))
+        with self._lock:
+            self._records[patient_id] = record
+        logger.debug("Patient data loaded", patient_id=patient_id)
+        return record
+
+    def get_raw(self, patient_id: str, copy: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Parsed patient JSON, or None if the file does not exist.
+
+        Args:
+            patient_id: Patient identifier (file stem)
+            copy: Return a private copy. Pass False only for read-only use;
+                the shared dict must not be mutated.
+        """
+        record = self._record(patient_id)
+        if record is None:
+            return None
+        return record.copy_raw() if copy else record.raw
+
+    def digest(self, patient_id: str) -> Optional[str]:
+        """Content hash of a patient file, or None if it does not exist."""
+        record = self._record(patient_id)
+        return record.digest if record is not None else None
+
+    def get_normalized(self, patient_id: str):
+        """
+        NormalizedPatientData for a patient, or None if the file does not exist.
+
+        The instance is shared; treat it as read-only.
+        """
+        from backend.policy_digitalization.patient_data_adapter import normalize_patient_data
+
+        record = self._record(patient_id)
+        if record is None:
+            return None
+        today = date.today()
+        if record.normalized is None or record.normalized_on != today:
+            record.normalized = normalize_patient_data(record.raw)
+            record.normalized_on = today
+        return record.normalized
+
+    def save(self, patient_id: str, data: Dict[str, Any]) -> None:
+        """Write patient JSON and refresh the cached record."""
+        path = self.path_for(patient_id)
+        content = json.dumps(data, indent=2).encode("utf-8")
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+        stat = path.stat()
+        record = PatientRecord(
+            stat.st_mtime_ns, stat.st_size,
+            hashlib.blake2b(content, digest_size=16).hexdigest(),
+            json.loads(content),
+        )
+        with self._lock:
+            self._records[patient_id] = record
+
+    def invalidate(self, patient_id: Optional[str] = None) -> None:
+        """Drop one cached patient, or all of them."""
+        with self._lock:
+            if patient_id is None:
+                self._records.clear()
+            else:
+                self._records.pop(patient_id, None)
+
+    async def load_many(self, patient_ids: Optional[List[str]] = None, copy: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Raw patient data for the given IDs (default: all), loaded concurrently; missing IDs are omitted."""
+        ids = self.list_ids() if patient_ids is None else list(patient_ids)
+        results = await asyncio.gather(*(asyncio.to_thread(self.get_raw, pid, copy) for pid in ids))
+        return {pid: data for pid, data in zip(ids, results) if data is not None}
+
+    async def load_many_normalized(self, patient_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """NormalizedPatientData for the given IDs (default: all), loaded concurrently; missing IDs are omitted."""
+        ids = self.list_ids() if patient_ids is None else list(patient_ids)
+        results = await asyncio.gather(*(asyncio.to_thread(self.get_normalized, pid) for pid in ids))
+        return {pid: patient for pid, patient in zip(ids, results) if patient is not None}
+
+    def stats(self) -> Dict[str, int]:
+        return {"cached": len(self._records), "hits": self.hits, "reads": self.reads}
+
+
+# Global instance
+_patient_store: Optional[PatientStore] = None
+
+
+def get_patient_store() -> PatientStore:
+    """Get or create the global patient store for the configured patients directory."""
+    global _patient_store
+    if _patient_store is None:
+        _patient_store = PatientStore()
+    return _patient_store
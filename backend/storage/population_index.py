@@ -0,0 +1,244 @@
+"""Population Index — secondary indexes over patients and active cases.
+
+PatientPopulationIndex maps payer -> medication -> patient IDs, and ICD-10
+family -> patient IDs, over the patient files in the PatientStore. refresh()
+re-indexes only files whose content hash changed (unchanged files cost one
+stat), and drops deleted ones.
+
+CaseCohortIndex maps payer -> medication -> case IDs for cases that are not
+completed or failed. refresh() fetches only cases updated since the last
+refresh; lookups then load just the matching rows, so deleted cases simply
+drop out.
+
+Keys are lowercase payer and medication names (brand and generic) and
+uppercase, dot-free three-character ICD-10 families.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.storage.models import CaseModel
+from backend.storage.patient_store import PatientStore, get_patient_store
+from backend.config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Case stages that no longer take part in impact analysis
+TERMINAL_CASE_STAGES = ("completed", "failed")
+
+
+def icd10_family(code: Optional[str]) -> str:
+    """Three-character ICD-10 family of a code ("K50.112" -> "K50")."""
+    return (code or "").replace(".", "").strip().upper()[:3]
+
+
+def _patient_keys(data: Dict[str, Any]) -> Tuple[str, Set[str], Set[str]]:
+    """(payer, medication names, ICD-10 families) for one raw patient record."""
+    insurance = data.get("insurance") or {}
+    primary = (insurance.get("primary") or {}) if isinstance(insurance, dict) else {}
+    payer = (primary.get("payer_name") or "").lower()
+
+    med_req = data.get("medication_request") or {}
+    medications = {
+        name.lower()
+        for name in (med_req.get("brand_name"), med_req.get("medication_name"))
+        if name
+    }
+
+    diagnoses = data.get("diagnoses") or []
+    if isinstance(diagnoses, dict):
+        diagnoses = [d for d in diagnoses.values() if isinstance(d, dict)]
+    families = {icd10_family(d.get("icd10_code")) for d in diagnoses if isinstance(d, dict)}
+    families.discard("")
+    return payer, medications, families
+
+
+class _PayerMedicationIndex:
+    """payer -> medication -> member IDs, with per-member keys for removal."""
+
+    def __init__(self):
+        self.by_payer: Dict[str, Dict[str, Set[str]]] = {}
+        self.keys: Dict[str, frozenset] = {}
+
+    def add(self, member_id: str, pairs: Iterable[Tuple[str, str]]) -> None:
+        """Index a member under (payer, medication) pairs, replacing its previous keys."""
+        self.remove(member_id)
+        pairs = frozenset(pairs)
+        self.keys[member_id] = pairs
+        for payer, medication in pairs:
+            self.by_payer.setdefault(payer, {}).setdefault(medication, set()).add(member_id)
+
+    def remove(self, member_id: str) -> None:
+        for payer, medication in self.keys.pop(member_id, ()):
+            by_medication = self.by_payer[payer]
+            members = by_medication[medication]
+            members.discard(member_id)
+            if not members:
+                del by_medication[medication]
+                if not by_medication:
+                    del self.by_payer[payer]
+
+    def lookup(self, payer: Optional[str] = None, medication: Optional[str] = None) -> Set[str]:
+        payers = [self.by_payer.get(payer.lower(), {})] if payer else list(self.by_payer.values())
+        found: Set[str] = set()
+        for by_medication in payers:
+            if medication:
+                found |= by_medication.get(medication.lower(), set())
+            else:
+                for members in by_medication.values():
+                    found |= members
+        return found
+
+
+class PatientPopulationIndex:
+    """Secondary indexes over the patient files in a PatientStore."""
+
+    def __init__(self, store: Optional[PatientStore] = None):
+        self.store = store or get_patient_store()
+        self._lock = threading.Lock()
+        self._payer_medication = _PayerMedicationIndex()
+        self._by_icd_family: Dict[str, Set[str]] = {}
+        self._families: Dict[str, Set[str]] = {}
+        self._digests: Dict[str, str] = {}
+
+    def refresh(self) -> int:
+        """Re-index new or changed patient files and drop deleted ones; returns the number re-indexed."""
+        ids = self.store.list_ids()
+        reindexed = 0
+        with self._lock:
+            for patient_id in set(self._digests) - set(ids):
+                self._remove(patient_id)
+            for patient_id in ids:
+                try:
+                    digest = self.store.digest(patient_id)
+                    if digest is None:
+                        self._remove(patient_id)
+                        continue
+                    if self._digests.get(patient_id) == digest:
+                        continue
+                    data = self.store.get_raw(patient_id, copy=False)
+                except Exception as e:
+                    logger.warning("Failed to index patient file", patient_id=patient_id, error=str(e))
+                    self._remove(patient_id)
+                    continue
+                self._add(patient_id, digest, data)
+                reindexed += 1
+        if reindexed:
+            logger.debug("Patient population index refreshed", reindexed=reindexed, patients=len(self._digests))
+        return reindexed
+
+    def _add(self, patient_id: str, digest: str, data: Dict[str, Any]) -> None:
+        self._remove(patient_id)
+        payer, medications, families = _patient_keys(data)
+        # Patients without a medication request still count under their payer
+        self._payer_medication.add(patient_id, [(payer, medication) for medication in medications or {""}])
+        for family in families:
+            self._by_icd_family.setdefault(family, set()).add(patient_id)
+        self._families[patient_id] = families
+        self._digests[patient_id] = digest
+
+    def _remove(self, patient_id: str) -> None:
+        self._payer_medication.remove(patient_id)
+        for family in self._families.pop(patient_id, set()):
+            members = self._by_icd_family.get(family)
+            if members is not None:
+                members.discard(patient_id)
+                if not members:
+                    del self._by_icd_family[family]
+        self._digests.pop(patient_id, None)
+
+    def patient_ids(
+        self,
+        payer: Optional[str] = None,
+        medication: Optional[str] = None,
+        icd10_family: Optional[str] = None,
+    ) -> List[str]:
+        """Sorted IDs of patients matching every given key (all patients when none are given)."""
+        self.refresh()
+        with self._lock:
+            if payer or medication:
+                found = self._payer_medication.lookup(payer, medication)
+            else:
+                found = set(self._digests)  # Includes patients with no medication request
+            if icd10_family:
+                found &= self._by_icd_family.get(icd10_family.replace(".", "").upper()[:3], set())
+        return sorted(found)
+
+    def summary(self) -> Dict[str, Any]:
+        """Patient counts per payer/medication and per ICD-10 family."""
+        self.refresh()
+        with self._lock:
+            return {
+                "patients": len(self._digests),
+                "by_payer": {
+                    payer: {medication: len(ids) for medication, ids in sorted(by_medication.items())}
+                    for payer, by_medication in sorted(self._payer_medication.by_payer.items())
+                },
+                "by_icd10_family": {family: len(ids) for family, ids in sorted(self._by_icd_family.items())},
+            }
+
+
+class CaseCohortIndex:
+    """payer -> medication -> IDs of active (non-terminal) cases."""
+
+    def __init__(self):
+        self._index = _PayerMedicationIndex()
+        self._watermark = None
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """Index cases updated since the last refresh; returns the number seen."""
+        query = select(
+            CaseModel.id, CaseModel.stage, CaseModel.medication_data, CaseModel.payer_states, CaseModel.updated_at,
+        )
+        if self._watermark is not None:
+            # >= so rows sharing the watermark timestamp are never missed; re-indexing is idempotent
+            query = query.where(CaseModel.updated_at >= self._watermark)
+        rows = (await session.execute(query)).all()
+
+        for case_id, stage, medication_data, payer_states, updated_at in rows:
+            if stage in TERMINAL_CASE_STAGES:
+                self._index.remove(case_id)
+            else:
+                medication = ((medication_data or {}).get("medication_name") or "").lower()
+                self._index.add(case_id, [(payer.lower(), medication) for payer in (payer_states or {})])
+            if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+                self._watermark = updated_at
+        return len(rows)
+
+    async def active_cases(self, session: AsyncSession, payer: str, medication: str) -> List[CaseModel]:
+        """Active cases for a payer/medication pair, loading only the matching rows."""
+        await self.refresh(session)
+        case_ids = self._index.lookup(payer, medication)
+        if not case_ids:
+            return []
+        result = await session.execute(
+            select(CaseModel)
+            .where(CaseModel.id.in_(case_ids))
+            .where(CaseModel.stage.notin_(TERMINAL_CASE_STAGES))
+            .order_by(CaseModel.updated_at.desc())
+        )
+        return list(result.scalars().all())
+
+
+# Global instances
+_patient_population_index: Optional[PatientPopulationIndex] = None
+_case_cohort_index: Optional[CaseCohortIndex] = None
+
+
+def get_patient_population_index() -> PatientPopulationIndex:
+    """Get or create the global patient population index."""
+    global _patient_population_index
+    if _patient_population_index is None:
+        _patient_population_index = PatientPopulationIndex()
+    return _patient_population_index
+
+
+def get_case_cohort_index() -> CaseCohortIndex:
+    """Get or create the global active-case cohort index."""
+    global _case_cohort_index
+    if _case_cohort_index is None:
+        _case_cohort_index = CaseCohortIndex()
+    return _case_cohort_index
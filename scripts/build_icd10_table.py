@@ -0,0 +1,72 @@
+"""
+Build the ICD-10-CM Code Table — converts a CMS code order file into the bundled table.
+
+Download the "Code Descriptions in Tabular Order" archive for a fiscal year from
+https://www.cms.gov/medicare/coding-billing/icd-10-codes and pass its
+icd10cm_order_<year>.txt. The result replaces data/reference/icd10cm_codes.tsv
+and is marked complete, so Pass 3 and the validation API resolve every ICD-10-CM
+code offline (codes missing from it are reported invalid).
+
+Usage:
+  source venv/bin/activate
+  python scripts/build_icd10_table.py icd10cm_order_2026.txt --release FY2026 [--output PATH]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def parse_order_line(line: str):
+    """
+    Parse one fixed-width order file line into (code, billable, description).
+
+    Columns: order number (1-5), code (7-13, no dot), billable flag (15),
+    short description (17-76), long description (78-).
+    """
+    if len(line) < 17:
+        return None
+    code = line[6:13].strip().upper()
+    if not code:
+        return None
+    if len(code) > 3:
+        code = f"{code[:3]}.{code[3:]}"
+    billable = line[14:15].strip() or "0"
+    description = line[77:].strip() or line[16:76].strip()
+    return code, billable, description
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the ICD-10-CM code table from a CMS order file")
+    parser.add_argument("order_file", type=Path, help="CMS icd10cm_order_<year>.txt")
+    parser.add_argument("--release", type=str, required=True, help="Release label, e.g. FY2026")
+    parser.add_argument("--output", type=Path, default=None, help="Output table (default: Settings.icd10_table_path)")
+    args = parser.parse_args()
+
+    from backend.config.settings import get_settings
+
+    output = args.output or Path(get_settings().icd10_table_path)
+    rows = []
+    with open(args.order_file, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            parsed = parse_order_line(line.rstrip("\n"))
+            if parsed:
+                rows.append(parsed)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        f.write("# ICD-10-CM code table (code, billable, description)\n")
+        f.write(f"# release: {args.release}\n")
+        f.write("# complete: true\n")
+        for code, billable, description in sorted(rows):
+            f.write(f"{code}\t{billable}\t{description}\n")
+
+    print(f"Wrote {len(rows)} codes ({sum(1 for r in rows if r[1] == '1')} billable) to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
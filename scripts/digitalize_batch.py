@@ -0,0 +1,57 @@
+"""
+Digitalize a Batch of Policies — runs a manifest through the 3-pass pipeline.
+
+Items run concurrently under per-provider limits and are checkpointed after
+every pass; re-running with the same --run-id resumes where a crashed or
+interrupted run left off.
+
+Usage:
+  source venv/bin/activate
+  python scripts/digitalize_batch.py MANIFEST.json [--run-id ID] [--force-extract] [--no-skip-existing]
+
+Manifest: JSON list of {"payer_name", "medication_name", "source", "version_label",
+"version_year", "source_type", "skip_validation"} (see backend/policy_digitalization/batch_runner.py).
+"""
+
+import asyncio
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.config.logging_config import setup_logging
+setup_logging(log_level="INFO", log_file="digitalize_batch.log")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Digitalize a manifest of policies")
+    parser.add_argument("manifest", type=Path, help="JSON manifest of policies to digitalize")
+    parser.add_argument("--run-id", type=str, default=None, help="Checkpoint run ID (default: manifest file name)")
+    parser.add_argument("--force-extract", action="store_true", help="Bypass the Pass 1 extraction cache")
+    parser.add_argument(
+        "--no-skip-existing", action="store_true",
+        help="Re-digitalize versions that are already in the policy repository",
+    )
+    args = parser.parse_args()
+
+    from backend.storage.database import init_db
+    from backend.policy_digitalization.batch_runner import BatchDigitalizationRunner, load_manifest
+
+    await init_db()
+    items = load_manifest(args.manifest)
+    runner = BatchDigitalizationRunner(run_id=args.run_id or args.manifest.stem)
+    report = await runner.run(
+        items,
+        skip_existing=not args.no_skip_existing,
+        force_refresh=args.force_extract,
+    )
+
+    print(json.dumps(report.model_dump(), indent=2))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -13,7 +13,7 @@ Steps:
 
 Usage:
   source venv/bin/activate
-  python scripts/precompute_demo_data.py [--fresh] [--skip-digitize] [--skip-assess] [--only PATIENT_ID]
+  python scripts/precompute_demo_data.py [--fresh] [--force-extract] [--skip-digitize] [--skip-assess] [--only PATIENT_ID]
 """
 
 import asyncio
@@ -91,84 +91,51 @@ async def step_init_db(fresh: bool = False):
     print("  Database initialized ✓")
 
 
-async def step_digitize_policies(skip: bool = False):
-    """Step 2: Digitize all policies."""
-    from backend.policy_digitalization.pipeline import get_digitalization_pipeline
-    from backend.policy_digitalization.policy_repository import get_policy_repository
-    from backend.models.policy_schema import DigitizedPolicy
+async def step_digitize_policies(skip: bool = False, force_extract: bool = False):
+    """Step 2: Digitize all policies (concurrent and resumable via the batch runner)."""
+    from backend.policy_digitalization.batch_runner import BatchDigitalizationRunner, BatchItem
 
     print("\n═══ Step 2: Digitize Policies ═══")
     if skip:
         print("  --skip-digitize: skipping policy digitalization")
         return
 
-    pipeline = get_digitalization_pipeline()
-    repo = get_policy_repository()
-    results = {}
-
+    items = []
     for payer, med, filepath, src_type, versions in POLICY_CONFIGS:
-        path = Path(filepath)
-        if not path.exists():
+        if not Path(filepath).exists():
             print(f"  SKIP {payer}/{med}: file not found ({filepath})")
             continue
-
         # Handle the ibrance_v2 special case — store under "ibrance" payer/med
         store_med = "ibrance" if med == "ibrance_v2" else med
-
         for version_label, version_year in versions:
-            # Check if already cached
-            existing = await repo.load_version(payer, store_med, version_label)
-            if existing:
-                print(f"  CACHED {payer}/{store_med} {version_label} — skipping")
-                results[f"{payer}/{store_med}/{version_label}"] = "cached"
-                continue
-
-            try:
-                t0 = time.time()
-                if src_type == "json":
-                    # Pre-digitized JSON — load directly and store
-                    with open(path) as f:
-                        data = json.load(f)
-                    policy = DigitizedPolicy(**data)
-                    policy.payer_name = payer
-                    policy.medication_name = store_med
-                    await repo.store_version(policy, version_label)
-                    elapsed = time.time() - t0
-                    print(f"  OK {payer}/{store_med} {version_label} (pre-digitized, {elapsed:.1f}s)")
-                elif src_type == "pdf":
-                    result = await pipeline.digitalize_versioned(
-                        source=str(path),
-                        source_type="pdf",
-                        payer_name=payer,
-                        medication_name=store_med,
-                        version_label=version_label,
-                        version_year=version_year,
-                    )
-                    elapsed = time.time() - t0
-                    print(f"  OK {payer}/{store_med} {version_label} — {result.criteria_count} criteria ({elapsed:.1f}s)")
-                else:
-                    with open(path, encoding="utf-8") as f:
-                        text = f.read()
-                    result = await pipeline.digitalize_versioned(
-                        source=text,
-                        source_type="text",
-                        payer_name=payer,
-                        medication_name=store_med,
-                        version_label=version_label,
-                        version_year=version_year,
-                    )
-                    elapsed = time.time() - t0
-                    print(f"  OK {payer}/{store_med} {version_label} — {result.criteria_count} criteria ({elapsed:.1f}s)")
+            items.append(BatchItem(
+                payer_name=payer,
+                medication_name=store_med,
+                source=filepath,
+                source_type=src_type,
+                version_label=version_label,
+                version_year=version_year,
+            ))
 
-                results[f"{payer}/{store_med}/{version_label}"] = "ok"
+    # Re-running after a crash resumes each policy after its last completed pass
+    runner = BatchDigitalizationRunner(run_id="precompute_demo")
+    report = await runner.run(items, force_refresh=force_extract)
 
-            except Exception as e:
-                elapsed = time.time() - t0
-                print(f"  FAIL {payer}/{store_med} {version_label}: {e} ({elapsed:.1f}s)")
-                logger.error("Digitization failed", payer=payer, med=store_med, error=str(e))
-                results[f"{payer}/{store_med}/{version_label}"] = f"error: {e}"
+    results = {}
+    for item in report.items:
+        if item.status == "skipped":
+            print(f"  CACHED {item.item_id} — skipping")
+            results[item.item_id] = "cached"
+        elif item.status == "stored":
+            resumed = f", resumed after {item.resumed_from}" if item.resumed_from else ""
+            print(f"  OK {item.item_id} — {item.criteria_count} criteria ({item.seconds:.1f}s{resumed})")
+            results[item.item_id] = "ok"
+        else:
+            print(f"  FAIL {item.item_id}: {item.error} ({item.seconds:.1f}s)")
+            results[item.item_id] = f"error: {item.error}"
 
-    print(f"\n  Summary: {sum(1 for v in results.values() if v in ('ok', 'cached'))}/{len(results)} policies digitized")
+    print(f"\n  Summary: {report.stored + report.skipped}/{report.total} policies digitized "
+          f"in {report.elapsed_seconds:.1f}s ({report.policies_per_minute} policies/min)")
     return results
 
 
@@ -665,6 +632,10 @@ def step_verification_report(assessments: Dict):
 async def main():
     parser = argparse.ArgumentParser(description="Precompute demo data for all 14 patients")
     parser.add_argument("--fresh", action="store_true", help="Drop and recreate database tables")
+    parser.add_argument(
+        "--force-extract", action="store_true",
+        help="Re-run Pass 1 extraction even for documents in the extraction cache",
+    )
     parser.add_argument("--skip-digitize", action="store_true", help="Skip policy digitalization step")
     parser.add_argument("--skip-assess", action="store_true", help="Skip coverage assessment step")
     parser.add_argument("--only", type=str, default=None, help="Only process this patient ID")
@@ -680,7 +651,7 @@ async def main():
     await step_init_db(fresh=args.fresh)
 
     # Step 2: Digitize policies
-    await step_digitize_policies(skip=args.skip_digitize)
+    await step_digitize_policies(skip=args.skip_digitize, force_extract=args.force_extract)
 
     # Step 3: Coverage assessments
     assessments = await step_coverage_assessments(skip=args.skip_assess, only_patient=args.only)
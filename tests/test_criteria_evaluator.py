@@ -15,8 +15,42 @@ from backend.policy_digitalization.evaluator import (
     evaluate_group,
     evaluate_policy,
     evaluate_step_therapy,
+    EvaluationMemo,
     PolicyEvaluationResult,
+    EVALUATOR_REGISTRY,
+    EVALUATOR_DEPENDENCIES,
+    collect_all_criteria_evals,
+    changed_patient_fields,
+    reevaluate,
+    evaluate_policy_fast,
+    CriterionRecord,
+    PolicyRecord,
 )
+from backend.policy_digitalization.compiled_policy import (
+    CompiledCriterion,
+    compile_policy,
+    clear_compiled_policy_cache,
+)
+from backend.policy_digitalization.batch_evaluator import evaluate_policy_batch
+from backend.policy_digitalization.evaluation_matrix import (
+    matrix_row,
+    rank_policies_for_patient,
+    stream_evaluation_matrix,
+)
+from backend.policy_digitalization.counterfactual import (
+    PatientChange,
+    apply_changes,
+    baseline_evaluation,
+    minimal_resolutions,
+    what_if,
+)
+from backend.policy_digitalization.exceptions import EvaluationError
+from backend.policy_digitalization.evaluator_metrics import (
+    EVALUATOR_METRICS,
+    dump_evaluator_metrics,
+    instrument_evaluators,
+)
+from backend.policy_digitalization.matchers import AhoCorasick, DrugMatcher, ICD10PrefixTrie
 from backend.policy_digitalization.patient_data_adapter import (
     normalize_patient_data,
     NormalizedPatientData,
@@ -408,3 +442,538 @@ class TestFullPolicyEvaluation:
         result = evaluate_policy(cigna_policy, david_c_normalized)
         # Some gaps expected (e.g., criteria for non-Crohn indications won't be met)
         assert isinstance(result.gaps, list)
+
+
+# --- Compiled policy plan tests ---
+
+class TestCompiledPolicy:
+    def test_plan_cached_by_content_hash(self, cigna_policy):
+        clear_compiled_policy_cache()
+        plan = compile_policy(cigna_policy)
+        assert compile_policy(cigna_policy) is plan
+        # An equal-content copy reuses the same plan
+        copy_policy = DigitizedPolicy(**cigna_policy.model_dump())
+        assert compile_policy(copy_policy) is plan
+
+    def test_plan_follows_in_place_mutation(self, cigna_policy):
+        plan = compile_policy(cigna_policy)
+        cigna_policy.atomic_criteria.pop("DIAG_CD")
+        mutated = compile_policy(cigna_policy)
+        assert mutated is not plan and "DIAG_CD" not in mutated.criteria
+
+    def test_plan_resolves_criteria_and_groups(self, cigna_policy):
+        plan = compile_policy(cigna_policy)
+        assert set(plan.criteria) == set(cigna_policy.atomic_criteria)
+        assert isinstance(plan.criteria["DIAG_CD"], CompiledCriterion)
+        assert {"K50", "K501"} <= plan.criteria["DIAG_CD"].icd_codes
+        # Children come before parents in the flattened order
+        position = {gid: i for i, gid in enumerate(plan.topo_order)}
+        for gid, group_plan in plan.groups.items():
+            for sg in group_plan.subgroups:
+                assert position[sg] < position[gid]
+        assert plan.has_cycles is False
+
+    def test_cycle_detected(self, david_c_normalized):
+        policy = DigitizedPolicy(
+            policy_id="TEST",
+            policy_number="TEST",
+            policy_title="Test",
+            payer_name="Test",
+            medication_name="Test",
+            effective_date="2026-01-01",
+            criterion_groups={
+                "A": CriterionGroup(group_id="A", name="A", operator=LogicalOperator.AND, subgroups=["B"]),
+                "B": CriterionGroup(group_id="B", name="B", operator=LogicalOperator.AND, subgroups=["A"]),
+            },
+        )
+        assert compile_policy(policy).has_cycles is True
+        result = evaluate_group(policy.get_group("A"), policy, david_c_normalized)
+        assert result.subgroup_results[0].subgroup_results[0].reasoning == "Circular group reference detected"
+
+    def test_compiled_criterion_matches_raw(self, cigna_policy, david_c_normalized):
+        plan = compile_policy(cigna_policy)
+        for cid, criterion in cigna_policy.atomic_criteria.items():
+            raw = evaluate_criterion(criterion, david_c_normalized)
+            compiled = evaluate_criterion(plan.criteria[cid], david_c_normalized)
+            assert raw == compiled
+
+
+class TestICD10PrefixTrie:
+    def test_prefix_and_exact_match(self):
+        trie = ICD10PrefixTrie(["K50", "M059"])
+        assert trie.matches("K50")
+        assert trie.matches("K5010")
+        assert trie.matches("M0591")
+        assert not trie.matches("K5")  # no reverse prefix
+        assert not trie.matches("M05")
+        assert not trie.matches("K51")
+        assert len(trie) == 2
+
+    def test_empty_trie_matches_nothing(self):
+        trie = ICD10PrefixTrie()
+        assert not trie
+        assert not trie.matches("K50")
+
+    def test_diagnosis_criterion_matches_dotted_codes(self):
+        criterion = AtomicCriterion(
+            criterion_id="DX", criterion_type=CriterionType.DIAGNOSIS_CONFIRMED,
+            name="Crohn's", description="Crohn's Disease", policy_text="",
+            clinical_codes=[ClinicalCode(system="ICD-10", code=f"K50.{i}") for i in range(10)],
+            category="diagnosis",
+        )
+        patient = NormalizedPatientData(patient_id="P1", diagnosis_codes=["Z00.00", "K50.112", "k50.90"])
+        result = evaluate_criterion(criterion, patient)
+        assert result.verdict == CriterionVerdict.MET
+        assert result.evidence == [
+            "Diagnosis K50.112 matches criterion code",
+            "Diagnosis k50.90 matches criterion code",
+        ]
+
+
+class TestDrugMatcher:
+    def test_automaton_finds_all_patterns(self):
+        ac = AhoCorasick(["aza", "azathioprine", "thio", "mtx"])
+        assert ac.find("azathioprine 50mg") == {"aza", "azathioprine", "thio"}
+        assert ac.find("methotrexate") == set()
+
+    def test_related_is_bidirectional_containment(self):
+        matcher = DrugMatcher(["infliximab", "mesalamine"])
+        assert matcher.related("infliximab-dyyb") == {"infliximab"}  # pattern inside treatment
+        assert matcher.related("inflix") == {"infliximab"}  # treatment inside pattern
+        assert matcher.related("adalimumab") == set()
+
+    def test_policy_shares_one_matcher(self, cigna_policy):
+        plan = compile_policy(cigna_policy)
+        matchers = {id(c.drug_matcher) for c in plan.criteria.values()}
+        assert matchers == {id(plan.drug_matcher)}
+        for step in plan.step_therapy:
+            assert set(step.items_lower) <= plan.drug_matcher.patterns
+
+    def test_treatment_matched_by_substring(self):
+        criterion = AtomicCriterion(
+            criterion_id="TX", criterion_type=CriterionType.PRIOR_TREATMENT_TRIED,
+            name="Prior therapy", description="", policy_text="",
+            drug_names=["Mesalamine"], category="step_therapy",
+        )
+        patient = NormalizedPatientData(
+            patient_id="P1",
+            prior_treatments=[
+                NormalizedTreatment(medication_name="Prednisone"),
+                NormalizedTreatment(medication_name="Mesalamine DR"),
+            ],
+        )
+        result = evaluate_criterion(criterion, patient)
+        assert result.verdict == CriterionVerdict.MET
+
+
+# --- Evaluation memo tests ---
+
+class TestEvaluationMemo:
+    def test_shared_nodes_evaluated_once(self, cigna_policy, david_c_normalized):
+        memo = EvaluationMemo()
+        result = evaluate_policy(cigna_policy, david_c_normalized, memo=memo)
+        stats = memo.stats()
+        assert stats["criterion_hits"] > 0
+        assert stats["group_hits"] > 0
+        assert stats["criteria_evaluated"] <= len(cigna_policy.atomic_criteria)
+        # Memoized evaluation is indistinguishable from unshared evaluation
+        assert result.model_dump() == evaluate_policy(cigna_policy, david_c_normalized).model_dump()
+
+    def test_diamond_subgroup_memoized(self, david_c_normalized):
+        policy = DigitizedPolicy(
+            policy_id="TEST",
+            policy_number="TEST",
+            policy_title="Test",
+            payer_name="Test",
+            medication_name="Test",
+            effective_date="2026-01-01",
+            atomic_criteria={
+                "C1": AtomicCriterion(
+                    criterion_id="C1", criterion_type=CriterionType.AGE,
+                    name="Age >= 6", description="", policy_text="",
+                    threshold_value=6, category="age",
+                ),
+            },
+            criterion_groups={
+                "ROOT": CriterionGroup(group_id="ROOT", name="Root", operator=LogicalOperator.AND, subgroups=["L", "R"]),
+                "L": CriterionGroup(group_id="L", name="L", operator=LogicalOperator.AND, subgroups=["SHARED"]),
+                "R": CriterionGroup(group_id="R", name="R", operator=LogicalOperator.OR, subgroups=["SHARED"]),
+                "SHARED": CriterionGroup(group_id="SHARED", name="Shared", operator=LogicalOperator.AND, criteria=["C1"]),
+            },
+        )
+        memo = EvaluationMemo()
+        result = evaluate_group(policy.get_group("ROOT"), policy, david_c_normalized, memo=memo)
+        assert result.verdict == CriterionVerdict.MET
+        assert memo.group_hits == 1
+        assert len(memo.criteria) == 1
+
+    def test_cyclic_groups_not_shared(self, david_c_normalized):
+        policy = DigitizedPolicy(
+            policy_id="TEST",
+            policy_number="TEST",
+            policy_title="Test",
+            payer_name="Test",
+            medication_name="Test",
+            effective_date="2026-01-01",
+            criterion_groups={
+                "A": CriterionGroup(group_id="A", name="A", operator=LogicalOperator.AND, subgroups=["B"]),
+                "B": CriterionGroup(group_id="B", name="B", operator=LogicalOperator.AND, subgroups=["A"]),
+            },
+        )
+        memo = EvaluationMemo()
+        result = evaluate_group(policy.get_group("A"), policy, david_c_normalized, memo=memo)
+        assert result.subgroup_results[0].subgroup_results[0].reasoning == "Circular group reference detected"
+        assert memo.groups == {}
+
+
+# --- Incremental re-evaluation tests ---
+
+class TestIncrementalReevaluation:
+    def test_every_evaluator_declares_dependencies(self):
+        assert set(EVALUATOR_DEPENDENCIES) == set(EVALUATOR_REGISTRY)
+        assert EVALUATOR_DEPENDENCIES[CriterionType.LAB_VALUE] == {"lab_results"}
+
+    def test_changed_fields(self, david_c_normalized):
+        updated = david_c_normalized.model_copy(update={"age_years": 90, "gender": "female"})
+        assert changed_patient_fields(david_c_normalized, updated) == {"age_years", "gender"}
+
+    def test_lab_patch_matches_full_evaluation(self, cigna_policy, david_c_normalized):
+        previous = evaluate_policy(cigna_policy, david_c_normalized)
+        updated = david_c_normalized.model_copy(deep=True)
+        updated.lab_results[0].value = (updated.lab_results[0].value or 0) + 100
+        result = reevaluate(previous, david_c_normalized, updated, cigna_policy)
+        assert result == evaluate_policy(cigna_policy, updated)
+
+        # Criteria that do not read lab_results are reused as-is
+        def by_id(policy_result):
+            found = {}
+            for ind in policy_result.indication_evaluations:
+                stack = [ind.approval_criteria_result] if ind.approval_criteria_result else []
+                while stack:
+                    group = stack.pop()
+                    found.update((c.criterion_id, c) for c in group.criteria_results)
+                    stack.extend(group.subgroup_results)
+            return found
+        before, after = by_id(previous), by_id(result)
+        for cid, criterion in cigna_policy.atomic_criteria.items():
+            if cid in after and criterion.criterion_type not in (CriterionType.LAB_VALUE, CriterionType.LAB_TEST_COMPLETED):
+                assert after[cid] is before[cid]
+
+    def test_unchanged_patient_returns_previous(self, cigna_policy, david_c_normalized):
+        previous = evaluate_policy(cigna_policy, david_c_normalized)
+        same = david_c_normalized.model_copy(deep=True)
+        assert reevaluate(previous, david_c_normalized, same, cigna_policy) is previous
+
+
+# --- Fast-mode record tests ---
+
+class TestFastMode:
+    def test_fast_records_convert_to_same_result(self, cigna_policy, david_c_normalized):
+        record = evaluate_policy_fast(cigna_policy, david_c_normalized)
+        assert isinstance(record, PolicyRecord)
+        assert record.to_model() == evaluate_policy(cigna_policy, david_c_normalized)
+
+    def test_reasoning_rendered_lazily(self, cigna_policy, david_c_normalized):
+        record = evaluate_policy_fast(cigna_policy, david_c_normalized)
+        lazy = [c for c in record.indication_evaluations[0].unmet_criteria + record.exclusion_evaluations
+                if callable(c._reasoning)]
+        assert lazy
+        criterion = lazy[0]
+        assert isinstance(criterion, CriterionRecord)
+        text = criterion.reasoning
+        assert isinstance(text, str) and text
+        assert criterion._reasoning == text  # rendered once, then cached
+
+    def test_fast_mode_scoped_to_call(self, cigna_policy, david_c_normalized):
+        evaluate_policy_fast(cigna_policy, david_c_normalized)
+        assert isinstance(evaluate_policy(cigna_policy, david_c_normalized), PolicyEvaluationResult)
+
+
+# --- Batch evaluation tests ---
+
+@pytest.fixture
+def all_patients_normalized():
+    """Every patient on disk, plus a copy of each without treatments and labs."""
+    patients = []
+    for path in sorted(Path("data/patients").glob("*.json")):
+        with open(path) as f:
+            raw = json.load(f)
+        patients.append(normalize_patient_data(raw))
+        stripped = {k: v for k, v in raw.items() if k not in ("prior_treatments", "laboratory_results")}
+        patients.append(normalize_patient_data(stripped))
+    return patients
+
+
+class TestBatchEvaluation:
+    def test_batch_matches_per_patient(self, cigna_policy, all_patients_normalized):
+        batch = evaluate_policy_batch(cigna_policy, all_patients_normalized)
+        assert len(batch) == len(all_patients_normalized)
+        for patient, result in zip(all_patients_normalized, batch):
+            assert result == evaluate_policy(cigna_policy, patient)
+
+    def test_batch_vectorized_types_match(self, cigna_policy, all_patients_normalized):
+        # Retarget criteria onto the vectorized types with assorted operators
+        data = cigna_policy.model_dump()
+        types = [CriterionType.AGE, CriterionType.GENDER, CriterionType.LAB_VALUE, CriterionType.DIAGNOSIS_CONFIRMED]
+        operators = [None, "gt", "lte", "eq", "ne", "between", "in", "not_in"]
+        for i, criterion in enumerate(data["atomic_criteria"].values()):
+            criterion["criterion_type"] = types[i % len(types)]
+            criterion["comparison_operator"] = operators[i % len(operators)]
+            criterion["threshold_value"] = [18, 5.0, None, "n/a"][i % 4]
+            criterion["threshold_value_upper"] = [65, None, 10][i % 3]
+        policy = DigitizedPolicy(**data)
+        batch = evaluate_policy_batch(policy, all_patients_normalized)
+        for patient, result in zip(all_patients_normalized, batch):
+            assert result == evaluate_policy(policy, patient)
+
+    def test_batch_empty(self, cigna_policy):
+        assert evaluate_policy_batch(cigna_policy, []) == []
+
+
+# --- Evaluation matrix tests ---
+
+class TestEvaluationMatrix:
+    @pytest.mark.asyncio
+    async def test_matrix_matches_per_patient(self, cigna_policy, all_patients_normalized):
+        rows = [
+            row async for row in stream_evaluation_matrix(
+                [cigna_policy], all_patients_normalized, max_workers=2
+            )
+        ]
+        assert len(rows) == len(all_patients_normalized)
+        expected = sorted(
+            (p.patient_id, evaluate_policy(cigna_policy, p).overall_verdict.value)
+            for p in all_patients_normalized
+        )
+        assert sorted((r["patient_id"], r["overall_verdict"]) for r in rows) == expected
+
+    def test_matrix_row_details(self, cigna_policy, david_c_normalized):
+        row = matrix_row(cigna_policy, david_c_normalized, include_details=True)
+        result = evaluate_policy(cigna_policy, david_c_normalized)
+        assert row["overall_readiness"] == result.overall_readiness
+        assert row["gap_count"] == len(result.gaps)
+        assert row["result"] == result.model_dump(mode="json")
+
+    @pytest.mark.asyncio
+    async def test_matrix_empty(self, cigna_policy):
+        assert [row async for row in stream_evaluation_matrix([cigna_policy], [])] == []
+
+    def test_rank_policies_for_patient(self, cigna_policy, david_c_normalized):
+        # A stricter copy of the policy: every criterion retargeted to an age bound no one meets
+        data = cigna_policy.model_dump()
+        data["payer_name"] = "Stricter"
+        for criterion in data["atomic_criteria"].values():
+            criterion["criterion_type"] = CriterionType.AGE
+            criterion["comparison_operator"] = "gt"
+            criterion["threshold_value"] = 200
+        stricter = DigitizedPolicy(**data)
+
+        rows = rank_policies_for_patient(david_c_normalized, [stricter, cigna_policy])
+        assert [r["payer_name"] for r in rows] == [cigna_policy.payer_name, "Stricter"]
+        readiness = [r["overall_readiness"] for r in rows]
+        assert readiness == sorted(readiness, reverse=True)
+        assert rows[0]["overall_readiness"] == evaluate_policy(cigna_policy, david_c_normalized).overall_readiness
+
+
+# --- Evaluator metrics tests ---
+
+class TestEvaluatorMetrics:
+    @pytest.fixture(autouse=True)
+    def instrumented(self):
+        originals = dict(EVALUATOR_REGISTRY)
+        EVALUATOR_METRICS.reset()
+        instrument_evaluators()
+        yield
+        instrument_evaluators(False)
+        EVALUATOR_METRICS.reset()
+        assert EVALUATOR_REGISTRY == originals
+
+    def test_records_calls_and_verdicts(self, cigna_policy, david_c_normalized):
+        result = evaluate_policy(cigna_policy, david_c_normalized)
+        assert result == evaluate_policy(cigna_policy, david_c_normalized)
+
+        report = dump_evaluator_metrics()
+        assert report["instrumented"] is True
+        stats = report["criterion_types"]
+        assert stats
+        for row in stats.values():
+            assert row["calls"] == sum(row["verdicts"].values()) + row["exceptions"]
+            assert row["p95_ms"] <= row["max_ms"]
+        totals = [row["total_ms"] for row in stats.values()]
+        assert totals == sorted(totals, reverse=True)
+
+    def test_records_exceptions(self):
+        def broken(criterion, patient):
+            raise ValueError("boom")
+
+        instrument_evaluators(False)
+        original = EVALUATOR_REGISTRY[CriterionType.AGE]
+        EVALUATOR_REGISTRY[CriterionType.AGE] = broken
+        try:
+            instrument_evaluators()
+            criterion = AtomicCriterion(
+                criterion_id="AGE_TEST",
+                criterion_type=CriterionType.AGE,
+                name="Age >= 18",
+                description="Patient must be 18+",
+                policy_text="Age >= 18",
+                comparison_operator=ComparisonOperator.GREATER_THAN_OR_EQUAL,
+                threshold_value=18,
+                category="age",
+            )
+            result = evaluate_criterion(criterion, NormalizedPatientData(age_years=30))
+            assert result.verdict == CriterionVerdict.INSUFFICIENT_DATA
+            assert dump_evaluator_metrics()["criterion_types"][CriterionType.AGE]["exceptions"] == 1
+        finally:
+            instrument_evaluators(False)
+            EVALUATOR_REGISTRY[CriterionType.AGE] = original
+
+    def test_dump_to_file_and_reset(self, cigna_policy, david_c_normalized, tmp_path):
+        evaluate_policy(cigna_policy, david_c_normalized)
+        path = tmp_path / "metrics.json"
+        report = dump_evaluator_metrics(path, reset=True)
+        with open(path) as f:
+            assert json.load(f) == report
+        assert dump_evaluator_metrics()["criterion_types"] == {}
+
+
+# --- Counterfactual (what-if) tests ---
+
+TB_NEGATIVE = PatientChange(
+    op="add", field="completed_screenings",
+    value={"screening_type": "tb", "completed": True, "result_negative": True, "date": "2026-10-01"},
+)
+FAILED_MTX = PatientChange(
+    op="add", field="prior_treatments",
+    value={"medication_name": "methotrexate", "drug_class": "DMARD", "duration_weeks": 12,
+           "outcome": "failed", "adequate_trial": True},
+)
+
+
+@pytest.fixture
+def maria_r_normalized(maria_r_data):
+    return normalize_patient_data(maria_r_data)
+
+
+def _evaluate_with_overrides(policy, patient, result, overrides):
+    """Re-combine a result with some criterion verdicts replaced."""
+    memo = EvaluationMemo()
+    for ie in result.indication_evaluations:
+        for ce in collect_all_criteria_evals(ie.approval_criteria_result):
+            memo.criteria[ce.criterion_id] = ce.model_copy(
+                update={"verdict": overrides.get(ce.criterion_id, ce.verdict)}
+            )
+    return evaluate_policy(policy, patient, memo=memo)
+
+
+class TestCounterfactual:
+    def test_what_if_matches_full_evaluation(self, cigna_policy, maria_r_normalized):
+        changes = [TB_NEGATIVE, FAILED_MTX]
+        result = what_if(cigna_policy, maria_r_normalized, changes)
+        assert result.result == evaluate_policy(cigna_policy, apply_changes(maria_r_normalized, changes))
+        assert result.changed_fields == ["completed_screenings", "prior_treatments"]
+        changed = {c.criterion_id: c for c in result.changed_criteria}
+        assert changed["SAFETY_TB_SCREENING_NEGATIVE"].before == CriterionVerdict.INSUFFICIENT_DATA
+        assert changed["SAFETY_TB_SCREENING_NEGATIVE"].after == CriterionVerdict.MET
+
+    def test_apply_changes_copies_patient(self, maria_r_normalized):
+        before = maria_r_normalized.model_copy(deep=True)
+        updated = apply_changes(maria_r_normalized, [
+            TB_NEGATIVE,
+            PatientChange(op="set", field="age_years", value=70),
+            PatientChange(op="set", field="clinical_markers.rems_enrolled", value=True),
+        ])
+        assert maria_r_normalized == before
+        assert updated.completed_screenings[0].screening_type == "tb"
+        assert updated.age_years == 70
+        assert updated.clinical_markers["rems_enrolled"] is True
+
+    @pytest.mark.parametrize("change", [
+        PatientChange(op="add", field="age_years", value=1),
+        PatientChange(op="set", field="lab_results", value=[]),
+        PatientChange(op="set", field="no_such_field", value=1),
+        PatientChange(op="add", field="lab_results", value={"value": 1.0}),
+    ])
+    def test_apply_changes_rejects_invalid(self, maria_r_normalized, change):
+        with pytest.raises(EvaluationError):
+            apply_changes(maria_r_normalized, [change])
+
+    def test_minimal_resolutions_flip_indications(self, cigna_policy, all_patients_normalized):
+        found = 0
+        for patient in all_patients_normalized:
+            result = evaluate_policy(cigna_policy, patient)
+            resolutions = minimal_resolutions(cigna_policy, result)
+            for i, ie in enumerate(result.indication_evaluations):
+                resolution = resolutions[ie.indication_id]
+                if ie.overall_verdict == CriterionVerdict.MET:
+                    assert resolution == []
+                if not resolution:
+                    continue
+                found += 1
+                insufficient = {c.criterion_id for c in ie.insufficient_criteria}
+                assert {r.criterion_id for r in resolution} <= insufficient
+                overrides = {r.criterion_id: r.required_verdict for r in resolution}
+                flipped = _evaluate_with_overrides(cigna_policy, patient, result, overrides)
+                assert flipped.indication_evaluations[i].overall_verdict == CriterionVerdict.MET
+        assert found > 0
+
+    @staticmethod
+    def _age_policy(groups):
+        """Policy with one indication whose criteria (age thresholds) are all INSUFFICIENT_DATA without an age."""
+        from backend.models.policy_schema import IndicationCriteria
+
+        return DigitizedPolicy(
+            policy_id="TEST", policy_number="TEST", policy_title="Test",
+            payer_name="Test", medication_name="Test", effective_date="2026-01-01",
+            atomic_criteria={
+                cid: AtomicCriterion(
+                    criterion_id=cid, criterion_type=CriterionType.AGE, name=f"Age >= {age}",
+                    description="", policy_text="", threshold_value=age, category="age",
+                    comparison_operator=ComparisonOperator.GREATER_THAN_OR_EQUAL,
+                )
+                for cid, age in (("A", 6), ("B", 12), ("C", 18))
+            },
+            criterion_groups={
+                gid: CriterionGroup(group_id=gid, name=gid, operator=LogicalOperator(op), criteria=criteria, subgroups=sub)
+                for gid, (op, criteria, sub) in groups.items()
+            },
+            indications=[IndicationCriteria(
+                indication_id="I1", indication_name="Test", initial_approval_criteria="ROOT",
+                initial_approval_duration_months=12,
+            )],
+        )
+
+    @pytest.mark.parametrize("groups, expected", [
+        # A is needed MET by the OR but NOT_MET by the NOT — only B resolves the OR
+        ({"ROOT": ("AND", [], ["OR1", "NOT_A"]), "OR1": ("OR", ["A", "B"], []), "NOT_A": ("NOT", ["A"], [])},
+         {"A": CriterionVerdict.NOT_MET, "B": CriterionVerdict.MET}),
+        # C is shared by both ORs: resolving it alone beats one criterion per OR
+        ({"ROOT": ("AND", [], ["OR1", "OR2"]), "OR1": ("OR", ["A", "C"], []), "OR2": ("OR", ["B", "C"], [])},
+         {"C": CriterionVerdict.MET}),
+    ])
+    def test_minimal_resolutions_search_alternatives(self, groups, expected):
+        policy = self._age_policy(groups)
+        result = evaluate_policy(policy, NormalizedPatientData(patient_id="P1"))
+        assert result.indication_evaluations[0].overall_verdict == CriterionVerdict.INSUFFICIENT_DATA
+
+        resolution = minimal_resolutions(policy, result)["I1"]
+        assert {r.criterion_id: r.required_verdict for r in resolution} == expected
+
+    def test_baseline_cache(self, cigna_policy, maria_r_normalized):
+        first = baseline_evaluation(cigna_policy, maria_r_normalized, cache_key=("maria_r", 1))
+        assert baseline_evaluation(cigna_policy, maria_r_normalized, cache_key=("maria_r", 1)) is first
+        assert first == evaluate_policy(cigna_policy, maria_r_normalized)
+
+    def test_baseline_cache_concurrent(self, cigna_policy, maria_r_normalized, monkeypatch):
+        from concurrent.futures import ThreadPoolExecutor
+        from backend.policy_digitalization import counterfactual
+
+        monkeypatch.setattr(counterfactual, "MAX_CACHED_BASELINES", 2)
+        counterfactual.clear_baseline_cache()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(
+                lambda i: baseline_evaluation(cigna_policy, maria_r_normalized, cache_key=("maria_r", i % 4)),
+                range(32),
+            ))
+        assert all(r.overall_verdict == results[0].overall_verdict for r in results)
+        assert len(counterfactual._baselines) == 2
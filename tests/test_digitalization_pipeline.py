@@ -9,6 +9,7 @@ from unittest.mock import AsyncMock, patch, MagicMock
 
 import pytest
 
+from backend.config.settings import get_settings
 from backend.policy_digitalization.extractor import RawExtractionResult, GeminiPolicyExtractor
 from backend.policy_digitalization.validator import ValidatedExtractionResult, ClaudePolicyValidator
 from backend.policy_digitalization.reference_validator import ReferenceDataValidator
@@ -201,6 +202,69 @@ class TestCodeFormatValidation:
         assert validator._validate_code_format("RxNorm", "12345") is True
 
 
+class TestICD10LocalValidation:
+    """Pass 3 ICD-10 checks resolve from the local table and query the service once per distinct miss."""
+
+    TABLE = (
+        "# release: test\n"
+        "# complete: {complete}\n"
+        "K50\t0\tCrohn's disease [regional enteritis]\n"
+        "K50.10\t1\tCrohn's disease of large intestine without complications\n"
+        "K50.113\t1\tCrohn's disease of large intestine with fistula\n"
+        "M06.9\t1\tRheumatoid arthritis, unspecified\n"
+    )
+
+    def _table(self, tmp_path, complete=False):
+        from backend.mcp.icd10_table import ICD10CodeTable
+
+        source = tmp_path / "icd10cm_codes.tsv"
+        source.write_text(self.TABLE.format(complete="true" if complete else "false"))
+        return ICD10CodeTable(source_path=source, db_path=tmp_path / "icd10cm.sqlite")
+
+    def _validator(self, table, response=None):
+        from backend.mcp.icd10_validator import ICD10Validator
+
+        client = MagicMock()
+        client.call = AsyncMock(return_value=response)
+        with patch("backend.mcp.icd10_validator.get_mcp_client", return_value=client), \
+                patch("backend.mcp.icd10_validator.get_icd10_code_table", return_value=table):
+            return ICD10Validator()
+
+    def test_table_lookup_and_prefix(self, tmp_path):
+        table = self._table(tmp_path)
+        assert table.lookup("K50.10").is_billable
+        assert not table.lookup("K50").is_billable
+        assert table.lookup("K50.90") is None
+        assert [e.code for e in table.with_prefix("K50.1")] == ["K50.10", "K50.113"]
+        assert [e.code for e in table.with_prefix("K50")] == ["K50", "K50.10", "K50.113"]
+
+    @pytest.mark.asyncio
+    async def test_batch_dedupes_and_caches_remote_misses(self, tmp_path):
+        table = self._table(tmp_path)
+        validator = self._validator(table, [1, ["L40.0"], None, [["L40.0", "Psoriasis vulgaris"]]])
+
+        codes = ["K50.10", "k5010", "L40.0", "L400", "M06.9", "9X"]
+        result = await validator.validate_batch(codes)
+
+        assert [c.code for c in result.codes] == codes
+        assert [c.is_valid for c in result.codes] == [True, True, True, True, True, False]
+        assert result.codes[0].description == "Crohn's disease of large intestine without complications"
+        validator._client.call.assert_awaited_once()
+
+        # The remote answer is cached in the table database
+        again = await self._validator(self._table(tmp_path)).validate_batch(["L40.0"])
+        assert again.codes[0].is_valid and again.codes[0].description == "Psoriasis vulgaris"
+
+    @pytest.mark.asyncio
+    async def test_complete_table_is_offline(self, tmp_path):
+        validator = self._validator(self._table(tmp_path, complete=True))
+        result = await validator.validate_batch(["K50.10", "K50.99"])
+
+        assert [c.is_valid for c in result.codes] == [True, False]
+        validator._client.call.assert_not_awaited()
+        assert [c.code for c in await validator.search_codes("K50.1")] == ["K50.10", "K50.113"]
+
+
 class TestValidatorCorrections:
     @pytest.mark.asyncio
     async def test_apply_corrections(self):
@@ -249,6 +313,799 @@ class TestValidatorCorrections:
         assert "NEW_CRIT" in result["atomic_criteria"]
 
 
+class TestIncrementalValidation:
+    """New versions of a stored policy re-validate only added/modified criteria."""
+
+    POLICY_TEXT = (
+        "Test Policy\nTestDrug coverage criteria.\n\n"
+        "Age Requirements\nAge >= 18 years for all indications.\n\n"
+        "Diagnosis\nConfirmed diagnosis required with chart documentation.\n\n"
+        "Dosing\nUp to 5 mg/kg every 8 weeks.\n"
+    )
+
+    @pytest.fixture
+    def previous(self, sample_extracted_data):
+        import copy
+
+        data = copy.deepcopy(sample_extracted_data)
+        data["atomic_criteria"]["AGE_18"]["validation_status"] = "confirmed"
+        validated = ValidatedExtractionResult(extracted_data=data, quality_score=0.9)
+        policy = ReferenceDataValidator()._build_policy(data, validated, {})
+        policy.version = "v1"
+        return policy
+
+    def _validator(self, response):
+        validator = ClaudePolicyValidator()
+        validator.llm_gateway = MagicMock()
+        validator.llm_gateway.generate = AsyncMock(return_value=response)
+        return validator
+
+    @pytest.mark.asyncio
+    async def test_validates_only_changed_criteria(self, raw_extraction_result, previous):
+        raw_extraction_result.extracted_data["atomic_criteria"]["DIAG_TEST"]["clinical_codes"] = [
+            {"system": "ICD-10", "code": "K50.90", "display": "Crohn's"}
+        ]
+        validator = self._validator({
+            "validation_status": "needs_corrections",
+            "quality_score": 0.9,
+            "corrections": [
+                {"criterion_id": "DIAG_TEST", "field": "name", "corrected_value": "Crohn's Diagnosis"},
+                {"criterion_id": "AGE_18", "field": "threshold_value", "corrected_value": 6},
+            ],
+            "completeness": {"missing_criteria": []},
+        })
+
+        result = await validator.validate_extraction(raw_extraction_result, self.POLICY_TEXT, previous=previous)
+
+        prompt = validator.llm_gateway.generate.call_args.kwargs["prompt"]
+        assert "Confirmed diagnosis required with chart documentation" in prompt
+        assert "Test Policy" in prompt
+        assert "Age >= 18 years for all indications" not in prompt
+        assert "Up to 5 mg/kg" not in prompt
+        assert "K50.90" in prompt
+
+        assert (result.incremental, result.base_version) == (True, "v1")
+        assert (result.criteria_validated, result.criteria_carried_over) == (1, 1)
+        criteria = result.extracted_data["atomic_criteria"]
+        assert criteria["DIAG_TEST"]["name"] == "Crohn's Diagnosis"
+        # Unchanged criterion keeps the previous verdict and ignores corrections to it
+        assert criteria["AGE_18"]["validation_status"] == "confirmed"
+        assert criteria["AGE_18"]["threshold_value"] == 18
+        assert [c["criterion_id"] for c in result.corrections_applied] == ["DIAG_TEST"]
+
+    @pytest.mark.asyncio
+    async def test_no_changes_skips_llm(self, raw_extraction_result, previous):
+        validator = self._validator({})
+        result = await validator.validate_extraction(raw_extraction_result, self.POLICY_TEXT, previous=previous)
+
+        validator.llm_gateway.generate.assert_not_awaited()
+        assert result.incremental and result.criteria_carried_over == 2
+        assert result.validation_status == "skipped"  # Nothing was validated
+        assert result.quality_score == 0.8  # previous version was "good"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("key, change, changed_id", [
+        ("indications", lambda d: d["indications"][0].update(initial_approval_duration_months=12), "IND_TEST"),
+        ("criterion_groups", lambda d: d["criterion_groups"]["GRP_INITIAL"].update(operator="OR"), "GRP_INITIAL"),
+        ("step_therapy_requirements", lambda d: d["step_therapy_requirements"].append(
+            {"requirement_id": "ST_TNF", "indication": "Test Indication", "required_drugs": ["methotrexate"]},
+        ), "ST_TNF"),
+        ("exclusions", lambda d: d["exclusions"].append({
+            "exclusion_id": "EX_INFECTION", "name": "Active infection",
+            "policy_text": "Confirmed diagnosis required with chart documentation", "trigger_criteria": [],
+        }), "EX_INFECTION"),
+    ])
+    async def test_structure_change_is_validated(self, raw_extraction_result, previous, key, change, changed_id):
+        change(raw_extraction_result.extracted_data)
+        validator = self._validator({"validation_status": "valid", "quality_score": 0.9})
+
+        result = await validator.validate_extraction(raw_extraction_result, self.POLICY_TEXT, previous=previous)
+
+        validator.llm_gateway.generate.assert_awaited_once()
+        prompt = validator.llm_gateway.generate.call_args.kwargs["prompt"]
+        assert changed_id in prompt
+        assert result.incremental and result.validation_status == "valid"
+        assert (result.criteria_validated, result.criteria_carried_over) == (0, 2)
+
+    @pytest.mark.asyncio
+    async def test_removed_base_criterion_validates_in_full(self, raw_extraction_result, previous):
+        from backend.policy_digitalization.reference_validator import parse_atomic_criterion
+
+        # Added by the base version's Pass 2 as missing; absent from the new Pass 1 extraction
+        previous.atomic_criteria["PRIOR_TNF"] = parse_atomic_criterion("PRIOR_TNF", {
+            "criterion_type": "prior_treatment_tried", "name": "Prior TNF", "validation_status": "added",
+        })
+        validator = self._validator({"validation_status": "valid", "quality_score": 0.9})
+
+        result = await validator.validate_extraction(raw_extraction_result, self.POLICY_TEXT, previous=previous)
+
+        prompt = validator.llm_gateway.generate.call_args.kwargs["prompt"]
+        assert "Up to 5 mg/kg" in prompt
+        assert not result.incremental
+
+    @pytest.mark.parametrize("field, value", [
+        ("description", "Patient must be at least 18 years old"),  # e.g. corrected by the base's Pass 2
+        ("allowed_values", ["adult"]),
+        ("name", "Adult patients"),
+        ("minimum_duration_days", 90),
+    ])
+    def test_any_content_change_is_validated(self, raw_extraction_result, previous, field, value):
+        from backend.policy_digitalization.incremental_validation import (
+            carry_over_unchanged, plan_incremental_validation,
+        )
+
+        raw_extraction_result.extracted_data["atomic_criteria"]["AGE_18"][field] = value
+        plan = plan_incremental_validation(raw_extraction_result.extracted_data, previous, self.POLICY_TEXT, 1.0)
+
+        assert (plan.changed_ids, plan.unchanged_ids) == (["AGE_18"], ["DIAG_TEST"])
+        data = carry_over_unchanged(raw_extraction_result.extracted_data, previous, plan.unchanged_ids)
+        assert data["atomic_criteria"]["AGE_18"][field] == value
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("version_label, expected", [("v3", "v2"), ("v2", "v1"), ("v1", None)])
+    async def test_base_is_version_stored_before(self, previous, version_label, expected):
+        from backend.policy_digitalization.pipeline import PolicyDigitalizationPipeline
+        from backend.policy_digitalization.policy_repository import PolicyVersionInfo
+
+        async def load_version(payer, medication, version):
+            return previous.model_copy(update={"version": version})
+
+        pipeline = PolicyDigitalizationPipeline()
+        pipeline.repository = MagicMock()
+        pipeline.repository.list_versions = AsyncMock(return_value=[
+            PolicyVersionInfo(version=v, cached_at="", content_hash="") for v in ("v2", "v1")
+        ])
+        pipeline.repository.load_version = AsyncMock(side_effect=load_version)
+
+        base = await pipeline.load_base_version("TestPayer", "TestDrug", version_label)
+        assert (base.version if base else None) == expected
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_full_validation(self, raw_extraction_result, previous):
+        criteria = raw_extraction_result.extracted_data["atomic_criteria"]
+        criteria["AGE_18"]["threshold_value"] = 21
+        criteria["DIAG_TEST"]["is_required"] = False
+        validator = self._validator({"validation_status": "valid", "quality_score": 0.9})
+
+        result = await validator.validate_extraction(raw_extraction_result, self.POLICY_TEXT, previous=previous)
+
+        prompt = validator.llm_gateway.generate.call_args.kwargs["prompt"]
+        assert "Up to 5 mg/kg" in prompt
+        assert not result.incremental
+
+    def test_unlocated_source_uses_full_text(self):
+        from backend.policy_digitalization.incremental_validation import source_sections
+
+        assert source_sections(self.POLICY_TEXT, [{"policy_text": "Confirmed diagnosis required"}]) == (
+            "Test Policy\nTestDrug coverage criteria.\n\n[...]\n"
+            "Diagnosis\nConfirmed diagnosis required with chart documentation.\n\n"
+        )
+        assert source_sections(self.POLICY_TEXT, [{"policy_text": "Prior trial of methotrexate"}]) is None
+
+
+class TestExtractionCache:
+    """Pass 1 results are reused for unchanged document, prompt, model and version hint."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        from backend.policy_digitalization.extraction_cache import ExtractionCache
+
+        cache = ExtractionCache(tmp_path, max_entries=2)
+        with patch("backend.policy_digitalization.extraction_cache.get_extraction_cache", return_value=cache):
+            yield cache
+
+    @pytest.fixture
+    def extractor(self, sample_extracted_data):
+        extractor = GeminiPolicyExtractor()
+        extractor.llm_gateway = MagicMock()
+        extractor.llm_gateway.generate = AsyncMock(return_value=sample_extracted_data)
+        return extractor
+
+    @pytest.mark.asyncio
+    async def test_second_extraction_served_from_cache(self, cache, extractor):
+        first = await extractor.extract_from_text("Policy text", policy_id="TEST_001")
+        second = await extractor.extract_from_text("Policy text", policy_id="TEST_001")
+
+        extractor.llm_gateway.generate.assert_awaited_once()
+        assert not first.from_cache and second.from_cache
+        assert second.extracted_data == first.extracted_data
+        assert second.source_hash == first.source_hash
+
+    @pytest.mark.asyncio
+    async def test_key_covers_document_and_version_hint(self, cache, extractor):
+        await extractor.extract_from_text("Policy text")
+        await extractor.extract_from_text("Policy text, amended")
+        await extractor.extract_from_text("Policy text", version_hint="Extract ONLY the 2025 policy version.")
+        assert extractor.llm_gateway.generate.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_bypasses_cache(self, cache, extractor):
+        await extractor.extract_from_text("Policy text")
+        refreshed = await extractor.extract_from_text("Policy text", force_refresh=True)
+        assert extractor.llm_gateway.generate.await_count == 2
+        assert not refreshed.from_cache
+
+    @pytest.mark.asyncio
+    async def test_empty_extraction_not_cached(self, cache, extractor):
+        extractor.llm_gateway.generate = AsyncMock(return_value={"atomic_criteria": {}, "indications": []})
+        await extractor.extract_from_text("Policy text")
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, cache, raw_extraction_result):
+        import os
+
+        for i, key in enumerate(("a", "b")):
+            cache.put(key, raw_extraction_result)
+            os.utime(cache.cache_dir / f"{key}.json", (1000 + i, 1000 + i))
+        assert cache.get("a") is not None  # "a" becomes most recently used
+        cache.put("c", raw_extraction_result)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.clear() == 2
+
+
+class TestChunkedExtraction:
+    """Large documents are extracted in section chunks and merged."""
+
+    def test_split_keeps_text_and_respects_limit(self):
+        from backend.policy_digitalization.chunked_extraction import split_policy_sections
+
+        text = Path("data/policies/uhc_infliximab.txt").read_text(encoding="utf-8")
+        chunks = split_policy_sections(text, 40_000)
+        assert len(chunks) > 1
+        assert "".join(chunks) == text
+        assert all(len(chunk) <= 40_000 for chunk in chunks)
+
+    def test_merge_dedupes_and_renames_colliding_ids(self):
+        from backend.policy_digitalization.chunked_extraction import merge_chunk_extractions
+
+        age = {"criterion_id": "AGE_18", "criterion_type": "age", "threshold_value": 18, "comparison_operator": "gte"}
+        part1 = {
+            "policy_id": "P1",
+            "atomic_criteria": {"AGE_18": age, "DIAG": {"criterion_id": "DIAG", "criterion_type": "diagnosis_confirmed",
+                                                       "clinical_codes": [{"system": "ICD-10", "code": "K50"}]}},
+            "criterion_groups": {"GRP_INIT": {"group_id": "GRP_INIT", "operator": "AND", "criteria": ["AGE_18", "DIAG"]}},
+            "indications": [{"indication_id": "CD", "initial_approval_criteria": "GRP_INIT"}],
+        }
+        part2 = {
+            "policy_id": "IGNORED",
+            "atomic_criteria": {"AGE_18": dict(age), "DIAG": {"criterion_id": "DIAG", "criterion_type": "diagnosis_confirmed",
+                                                             "clinical_codes": [{"system": "ICD-10", "code": "K51"}]}},
+            "criterion_groups": {"GRP_INIT": {"group_id": "GRP_INIT", "operator": "AND", "criteria": ["AGE_18", "DIAG"]}},
+            "indications": [{"indication_id": "UC", "initial_approval_criteria": "GRP_INIT"}],
+            "exclusions": [{"exclusion_id": "EX", "trigger_criteria": ["DIAG"]}],
+        }
+
+        merged = merge_chunk_extractions([part1, None, part2])
+
+        assert merged["policy_id"] == "P1"
+        assert set(merged["atomic_criteria"]) == {"AGE_18", "DIAG", "DIAG__P3"}
+        assert merged["atomic_criteria"]["DIAG__P3"]["criterion_id"] == "DIAG__P3"
+        assert merged["criterion_groups"]["GRP_INIT__P3"]["criteria"] == ["AGE_18", "DIAG__P3"]
+        assert [i["initial_approval_criteria"] for i in merged["indications"]] == ["GRP_INIT", "GRP_INIT__P3"]
+        assert merged["exclusions"][0]["trigger_criteria"] == ["DIAG__P3"]
+
+    @pytest.mark.asyncio
+    async def test_chunks_extracted_concurrently_with_partial_failure(self, tmp_path, sample_extracted_data):
+        from backend.policy_digitalization.extraction_cache import ExtractionCache
+
+        async def generate(prompt, **kwargs):
+            if "[Part 2 of" in prompt:
+                raise RuntimeError("timeout")
+            return json.loads(json.dumps(sample_extracted_data))
+
+        extractor = GeminiPolicyExtractor()
+        extractor.llm_gateway = MagicMock()
+        extractor.llm_gateway.generate = AsyncMock(side_effect=generate)
+        text = "\n".join(f"--- Page {n} ---\n" + "criterion text line\n" * 40 for n in range(1, 7))
+        cache = ExtractionCache(tmp_path)
+        settings = get_settings().model_copy(update={"extraction_chunk_max_chars": 1000})
+
+        with patch("backend.policy_digitalization.extraction_cache.get_extraction_cache", return_value=cache), \
+                patch("backend.policy_digitalization.extractor.get_settings", return_value=settings):
+            raw = await extractor.extract_from_text(text, chunked=True)
+
+        assert raw.chunks_total == extractor.llm_gateway.generate.await_count > 2
+        assert raw.chunks_failed == [2]
+        assert set(raw.extracted_data["atomic_criteria"]) == set(sample_extracted_data["atomic_criteria"])
+        # Partial extractions are not cached
+        assert cache.stats()["entries"] == 0
+
+
+class TestStreamingExtraction:
+    """Pass 1 responses are parsed incrementally and criteria handed over as they complete."""
+
+    def test_incremental_parser_any_split(self, sample_extracted_data):
+        from backend.reasoning.json_utils import IncrementalJSONMemberParser
+
+        data = {"notes": {"atomic_criteria": {"X": 1}}, **sample_extracted_data}
+        data["atomic_criteria"] = {**data["atomic_criteria"], "QUOTED": {"name": 'a "b" {c} [d]', "n": [1, {"e": 2}]}}
+        text = "```json\n" + json.dumps(data, indent=2) + "\n```"
+        for step in (1, 7, 64):
+            parser = IncrementalJSONMemberParser("atomic_criteria")
+            members = []
+            for start in range(0, len(text), step):
+                members.extend(parser.feed(text[start:start + step]))
+            assert dict(members) == data["atomic_criteria"]
+            assert list(dict(members)) == list(data["atomic_criteria"])
+
+    @pytest.fixture
+    def extractor(self, sample_extracted_data):
+        text = json.dumps(sample_extracted_data)
+        extractor = GeminiPolicyExtractor()
+        extractor.llm_gateway = MagicMock()
+        extractor.llm_gateway.generate = AsyncMock(return_value=sample_extracted_data)
+        extractor.received = []
+
+        async def stream(*args, **kwargs):
+            for start in range(0, len(text), 40):
+                extractor.received.append(start)
+                yield text[start:start + 40]
+
+        extractor.llm_gateway.gemini_client.generate_stream = stream
+        return extractor
+
+    @pytest.mark.asyncio
+    async def test_criteria_emitted_before_stream_ends(self, extractor, sample_extracted_data):
+        seen = []
+
+        async def on_criterion(criterion_id, criterion_data):
+            seen.append((criterion_id, len(extractor.received)))
+
+        settings = get_settings().model_copy(update={"extraction_cache_enabled": False})
+        with patch("backend.policy_digitalization.extractor.get_settings", return_value=settings):
+            raw = await extractor.extract_from_text("Policy text", on_criterion=on_criterion)
+
+        assert [cid for cid, _ in seen] == list(sample_extracted_data["atomic_criteria"])
+        assert seen[0][1] < len(extractor.received)  # First criterion arrived mid-stream
+        assert raw.extracted_data == sample_extracted_data
+        extractor.llm_gateway.generate.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_stream_falls_back(self, extractor, sample_extracted_data):
+        async def broken(*args, **kwargs):
+            yield '{"atomic_criteria": {'
+            raise RuntimeError("stream reset")
+
+        extractor.llm_gateway.gemini_client.generate_stream = broken
+        settings = get_settings().model_copy(update={"extraction_cache_enabled": False})
+        with patch("backend.policy_digitalization.extractor.get_settings", return_value=settings):
+            raw = await extractor.extract_from_text("Policy text", on_criterion=AsyncMock())
+
+        extractor.llm_gateway.generate.assert_awaited_once()
+        assert raw.extracted_data == sample_extracted_data
+
+    @pytest.mark.asyncio
+    async def test_fallback_hands_over_each_criterion_once(self, extractor, sample_extracted_data):
+        criteria = sample_extracted_data["atomic_criteria"]
+        first_id = next(iter(criteria))
+        partial = json.dumps({"atomic_criteria": {first_id: criteria[first_id]}})[:-2]
+
+        async def broken(*args, **kwargs):
+            yield partial + ', "NEXT": {'
+            raise RuntimeError("stream reset")
+
+        extractor.llm_gateway.gemini_client.generate_stream = broken
+        on_criterion = AsyncMock()
+        settings = get_settings().model_copy(update={"extraction_cache_enabled": False})
+        with patch("backend.policy_digitalization.extractor.get_settings", return_value=settings):
+            await extractor.extract_from_text("Policy text", on_criterion=on_criterion)
+
+        assert [c.args[0] for c in on_criterion.await_args_list] == list(criteria)
+
+    @pytest.mark.asyncio
+    async def test_failed_pdf_stream_falls_back(self, extractor, sample_extracted_data, tmp_path):
+        pdf = tmp_path / "policy.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test")
+
+        async def broken(*args, **kwargs):
+            yield '{"atomic_criteria": {'
+            raise RuntimeError("stream reset")
+
+        extractor.llm_gateway.gemini_client.generate_stream = broken
+        file_cache = MagicMock()
+        file_cache.get_or_upload = AsyncMock(return_value="uploaded-file")
+        model = MagicMock()
+        model.generate_content_async = AsyncMock(return_value=MagicMock(text=json.dumps(sample_extracted_data)))
+        on_criterion = AsyncMock()
+        settings = get_settings().model_copy(update={"extraction_cache_enabled": False})
+        with patch("backend.policy_digitalization.extractor.get_settings", return_value=settings), \
+                patch("backend.policy_digitalization.extractor.get_gemini_file_cache", return_value=file_cache), \
+                patch("google.generativeai.configure"), \
+                patch("google.generativeai.GenerativeModel", return_value=model):
+            raw = await extractor.extract_from_pdf(str(pdf), on_criterion=on_criterion)
+
+        assert raw.extracted_data == sample_extracted_data
+        model.generate_content_async.assert_awaited_once()
+        file_cache.invalidate.assert_called_once()
+        assert [c.args[0] for c in on_criterion.await_args_list] == list(sample_extracted_data["atomic_criteria"])
+
+    @pytest.mark.asyncio
+    async def test_prefetcher_resolves_each_code_once(self):
+        from backend.policy_digitalization.reference_validator import ICD10CodePrefetcher
+
+        validator = MagicMock()
+        validator.validate_batch = AsyncMock()
+        prefetcher = ICD10CodePrefetcher()
+        with patch("backend.mcp.icd10_validator.get_icd10_validator", return_value=validator):
+            prefetcher.add({"clinical_codes": [{"system": "ICD-10", "code": "K50.90"}, {"system": "HCPCS", "code": "J1745"}]})
+            prefetcher.add({"clinical_codes": [{"system": "ICD-10", "code": "K50.90"}, {"system": "ICD-10", "code": "K51"}]})
+            prefetcher.add({"criterion_type": "age"})
+            assert await prefetcher.wait() == 2
+
+        assert [c.args[0] for c in validator.validate_batch.await_args_list] == [["K50.90"], ["K51"]]
+
+
+class TestBatchRunner:
+    """Batch digitalization checkpoints each pass and resumes after failures."""
+
+    @pytest.fixture
+    def items(self, tmp_path):
+        from backend.policy_digitalization.batch_runner import BatchItem
+
+        items = []
+        for i in range(4):
+            source = tmp_path / f"payer{i}_drug.txt"
+            source.write_text(f"Policy {i} text")
+            items.append(BatchItem(payer_name=f"payer{i}", medication_name="drug", source=str(source)))
+        return items
+
+    @pytest.fixture
+    def pipeline(self, raw_extraction_result):
+        from backend.models.policy_schema import DigitizedPolicy
+
+        pipeline = MagicMock()
+        pipeline.run_extraction = AsyncMock(return_value=raw_extraction_result)
+        pipeline.run_validation = AsyncMock(return_value=ValidatedExtractionResult(
+            extracted_data=raw_extraction_result.extracted_data, quality_score=0.9,
+        ))
+        pipeline.run_reference_validation = AsyncMock(side_effect=lambda *args, payer_name, medication_name: DigitizedPolicy(
+            policy_id="TEST_001", policy_number="TEST_001", policy_title="Test",
+            payer_name=payer_name, medication_name=medication_name, effective_date="2026-01-01",
+        ))
+        pipeline.policy_text_for = lambda source, source_type: source
+        pipeline.load_base_version = AsyncMock(return_value=None)
+        # In-memory repository: (payer, medication, version) -> policy
+        pipeline.stored = {}
+
+        async def store_version(policy, version_label, **kwargs):
+            pipeline.stored[(policy.payer_name, policy.medication_name, version_label)] = policy.model_copy(
+                update={"version": version_label},
+            )
+            return "cache-id"
+
+        async def load_version(payer, medication, version):
+            return pipeline.stored.get((payer, medication, version))
+
+        pipeline.repository.load_version = AsyncMock(side_effect=load_version)
+        pipeline.repository.store_version = AsyncMock(side_effect=store_version)
+        return pipeline
+
+    def _runner(self, tmp_path, pipeline, **kwargs):
+        from backend.policy_digitalization.batch_runner import BatchDigitalizationRunner
+        return BatchDigitalizationRunner("test_run", checkpoint_dir=tmp_path / "runs", pipeline=pipeline, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_failed_pass(self, tmp_path, items, pipeline):
+        validation = pipeline.run_validation.return_value
+        pipeline.run_validation = AsyncMock(side_effect=[RuntimeError("rate limited")] + [validation] * 10)
+
+        first = await self._runner(tmp_path, pipeline).run(items)
+        assert (first.stored, first.failed) == (3, 1)
+        assert pipeline.run_extraction.await_count == 4
+
+        second = await self._runner(tmp_path, pipeline).run(items)
+        # Only the failed item runs again, starting after its checkpointed Pass 1
+        assert (second.stored, second.skipped, second.failed) == (1, 3, 0)
+        assert pipeline.run_extraction.await_count == 4
+        assert [r.resumed_from for r in second.items if r.status == "stored"] == ["extracted"]
+        assert pipeline.repository.store_version.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_stored_checkpoint_without_row_stores_again(self, tmp_path, items, pipeline):
+        await self._runner(tmp_path, pipeline).run(items[:1])
+        pipeline.stored.clear()  # e.g. the database was recreated
+
+        report = await self._runner(tmp_path, pipeline).run(items[:1])
+        # Pass 3 and storage run again from the checkpointed Pass 1 / Pass 2 results
+        assert report.stored == 1 and report.items[0].resumed_from == "validated"
+        assert (pipeline.run_extraction.await_count, pipeline.run_validation.await_count) == (1, 1)
+        assert pipeline.repository.store_version.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_changed_source_restarts_item(self, tmp_path, items, pipeline):
+        await self._runner(tmp_path, pipeline).run(items[:1])
+        Path(items[0].source).write_text("Amended policy text")
+
+        report = await self._runner(tmp_path, pipeline).run(items[:1])
+        assert report.stored == 1 and report.items[0].resumed_from is None
+        assert pipeline.run_extraction.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_provider_concurrency_limit(self, tmp_path, items, pipeline):
+        import asyncio
+
+        active = peak = 0
+        raw = pipeline.run_extraction.return_value
+
+        async def extract(*args, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return raw
+
+        pipeline.run_extraction = AsyncMock(side_effect=extract)
+        report = await self._runner(tmp_path, pipeline, provider_concurrency={"gemini": 2}).run(items)
+
+        assert report.stored == 4 and peak == 2
+        assert set(report.mean_pass_seconds) == {"extraction", "validation", "reference"}
+
+
+class TestPolicyRepositoryCache:
+    """Parsed policies are reused until their row's content hash changes."""
+
+    @pytest.fixture
+    def session_factory(self, tmp_path):
+        import asyncio
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from backend.storage.models import Base
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'policies.db'}")
+
+        async def create():
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+        asyncio.run(create())
+        yield async_sessionmaker(engine, expire_on_commit=False)
+        asyncio.run(engine.dispose())
+
+    @pytest.fixture
+    def repo(self, session_factory):
+        from contextlib import asynccontextmanager
+        from backend.policy_digitalization.policy_repository import PolicyRepository
+
+        @asynccontextmanager
+        async def get_db():
+            async with session_factory() as session:
+                yield session
+                await session.commit()
+
+        with patch("backend.policy_digitalization.policy_repository.get_db", get_db):
+            yield PolicyRepository(cache_size=2)
+
+    @staticmethod
+    def _policy(title="Test Policy", version="latest"):
+        from backend.models.policy_schema import DigitizedPolicy
+        return DigitizedPolicy(
+            policy_id="TEST_001", policy_number="TEST_001", policy_title=title, version=version,
+            payer_name="TestPayer", medication_name="Spinraza", effective_date="2026-01-01",
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeated_loads_reuse_parsed_policy(self, repo):
+        await repo.store(self._policy())
+
+        first = await repo.load("TestPayer", "spinraza")
+        second = await repo.load("testpayer", "nusinersen")  # Alias resolves to the same row
+        assert first is second and first.policy_title == "Test Policy"
+        assert (repo.cache_misses, repo.cache_hits) == (1, 1)
+        assert (await repo.load_all())[0] is first
+
+    @pytest.mark.asyncio
+    async def test_store_and_external_writes_invalidate(self, repo, session_factory):
+        from sqlalchemy import update
+        from backend.storage.models import PolicyCacheModel
+
+        await repo.store(self._policy())
+        await repo.load("testpayer", "spinraza")
+        await repo.store(self._policy(title="Amended"))
+        assert (await repo.load("testpayer", "spinraza")).policy_title == "Amended"
+
+        # Row rewritten by another process: new content hash, so the cached object is not served
+        data = self._policy(title="Rewritten").model_dump(mode="json")
+        async with session_factory() as session:
+            await session.execute(
+                update(PolicyCacheModel).values(parsed_criteria=data, content_hash="rewritten")
+            )
+            await session.commit()
+        assert (await repo.load("testpayer", "spinraza")).policy_title == "Rewritten"
+
+        await repo.invalidate("testpayer", "spinraza")
+        assert await repo.load("testpayer", "spinraza") is None
+        assert repo.cache_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_load_preference_in_one_query(self, repo, session_factory):
+        from sqlalchemy import event
+
+        repo.cache_size = 8
+        await repo.store(self._policy(title="Primary v2", version="v2"))
+        await repo.store(self._policy(title="Primary v1", version="v1"))
+        alias_latest = self._policy(title="Alias latest")
+        alias_latest.medication_name = "nusinersen"
+        await repo.store(alias_latest)
+
+        # Exact version first, then the primary name, then the newest row
+        assert (await repo.load("testpayer", "spinraza", "v2")).policy_title == "Primary v2"
+        assert (await repo.load("testpayer", "spinraza")).policy_title == "Alias latest"
+        assert (await repo.load("testpayer", "spinraza", "v9")).policy_title == "Primary v1"
+
+        statements = []
+        engine = session_factory.kw["bind"].sync_engine
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            await repo.load("testpayer", "spinraza", "v2")
+            versions = await repo.list_versions("testpayer", "spinraza")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert len(statements) == 2  # Cached load + listing, one query each
+        assert all("parsed_criteria" not in s and "policy_text" not in s for s in statements)
+        assert [v.version for v in versions] == ["latest", "v1", "v2"]
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self, repo):
+        for version in ("v1", "v2", "v3"):
+            await repo.store(self._policy(version=version))
+        for version in ("v1", "v2", "v3"):
+            await repo.load_version("testpayer", "spinraza", version)
+        assert repo.cache_stats()["entries"] == 2
+        await repo.load_version("testpayer", "spinraza", "v1")
+        assert repo.cache_misses == 4
+
+
+class TestPipelineMetrics:
+    """Each pass records wall time, tokens, cost, retries and cache hits."""
+
+    @pytest.mark.asyncio
+    async def test_usage_attributed_to_active_pass(self):
+        import asyncio
+        from backend.policy_digitalization.pipeline_metrics import PipelineMetrics
+        from backend.reasoning.usage_tracking import record_cache_hit, record_llm_attempt, record_llm_usage
+
+        async def call(tokens):
+            record_llm_attempt()
+            record_llm_usage("gemini", "gemini-test", tokens, tokens // 10)
+
+        metrics = PipelineMetrics()
+        with metrics.track("extraction"):
+            record_llm_attempt()  # Failed attempt, retried below
+            await asyncio.gather(call(1000), call(2000))  # Chunks inherit the context
+        with metrics.track("reference"):
+            record_cache_hit(3)
+        record_llm_usage("claude", "claude-test", 500, 50)  # Outside any pass: not counted
+
+        extraction = metrics.passes["extraction"]
+        assert (extraction.llm_calls, extraction.attempts, extraction.retries) == (2, 3, 1)
+        assert (extraction.input_tokens, extraction.output_tokens) == (3000, 300)
+        assert extraction.cost_usd == pytest.approx((3000 * 2.0 + 300 * 12.0) / 1_000_000)
+        assert extraction.models == ["gemini-test"]
+        assert metrics.passes["reference"].cache_hits == 3
+
+        totals = metrics.to_record()["totals"]
+        assert (totals["llm_calls"], totals["cache_hits"], totals["retries"]) == (2, 3, 1)
+
+    @pytest.mark.asyncio
+    async def test_batch_runner_stores_metrics(self, tmp_path, raw_extraction_result):
+        from backend.policy_digitalization.batch_runner import BatchDigitalizationRunner, BatchItem
+        from backend.models.policy_schema import DigitizedPolicy
+        from backend.reasoning.usage_tracking import record_llm_attempt, record_llm_usage
+
+        async def extract(*args, **kwargs):
+            record_llm_attempt()
+            record_llm_usage("gemini", "gemini-test", 1000, 100)
+            return raw_extraction_result
+
+        source = tmp_path / "payer_drug.txt"
+        source.write_text("Policy text")
+        pipeline = MagicMock()
+        pipeline.run_extraction = AsyncMock(side_effect=extract)
+        pipeline.run_validation = AsyncMock(return_value=ValidatedExtractionResult(
+            extracted_data=raw_extraction_result.extracted_data,
+        ))
+        pipeline.run_reference_validation = AsyncMock(side_effect=lambda *args, payer_name, medication_name: DigitizedPolicy(
+            policy_id="TEST_001", policy_number="TEST_001", policy_title="Test",
+            payer_name=payer_name, medication_name=medication_name, effective_date="2026-01-01",
+        ))
+        pipeline.policy_text_for = lambda source, source_type: source
+        pipeline.load_base_version = AsyncMock(return_value=None)
+        pipeline.repository.load_version = AsyncMock(return_value=None)
+        pipeline.repository.store_version = AsyncMock(return_value="cache-id")
+
+        runner = BatchDigitalizationRunner("metrics_run", checkpoint_dir=tmp_path / "runs", pipeline=pipeline)
+        await runner.run([BatchItem(payer_name="payer", medication_name="drug", source=str(source))])
+
+        stored = pipeline.repository.store_version.await_args.kwargs["pipeline_metrics"]
+        assert set(stored["passes"]) == {"extraction", "validation", "reference"}
+        assert stored["passes"]["extraction"]["input_tokens"] == 1000
+        assert stored["totals"]["llm_calls"] == 1
+
+    def test_aggregate(self):
+        from backend.policy_digitalization.pipeline_metrics import aggregate_pipeline_metrics
+
+        def row(medication, seconds, cost):
+            return {
+                "payer_name": "uhc", "medication_name": medication, "policy_version": "v1",
+                "pipeline_metrics": {"passes": {
+                    "extraction": {"seconds": seconds, "cost_usd": cost, "input_tokens": 1000, "llm_calls": 1},
+                    "validation": {"seconds": 1.0, "cost_usd": 0.01, "attempts": 2, "llm_calls": 1, "retries": 1},
+                }},
+            }
+
+        summary = aggregate_pipeline_metrics(
+            [row("infliximab", 10.0, 0.5), row("adalimumab", 2.0, 0.1), {"pipeline_metrics": None}], top=1,
+        )
+        assert summary["runs"] == 2
+        assert list(summary["passes"]) == ["extraction", "validation"]
+        assert summary["passes"]["extraction"]["mean_seconds"] == 6.0
+        assert summary["passes"]["validation"]["retries"] == 2
+        assert summary["total_cost_usd"] == pytest.approx(0.62)
+        assert [p["medication_name"] for p in summary["slowest"]] == ["infliximab"]
+
+
+class TestGeminiFileCache:
+    """PDF uploads run off the event loop and handles are reused until they expire."""
+
+    @pytest.fixture
+    def file_cache(self):
+        import time
+        from backend.reasoning.gemini_file_cache import GeminiFileCache
+
+        cache = GeminiFileCache()
+
+        def slow_upload(path, mime_type):
+            time.sleep(0.05)  # Blocking, like genai.upload_file
+            return MagicMock(name=f"files/{Path(path).name}", expiration_time=None)
+
+        cache._upload_path = MagicMock(side_effect=slow_upload)
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_upload_without_blocking(self, tmp_path, file_cache):
+        import asyncio
+
+        pdf = tmp_path / "policy.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test")
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        first, second, _ = await asyncio.gather(
+            file_cache.get_or_upload(pdf), file_cache.get_or_upload(pdf), ticker(),
+        )
+
+        assert first is second
+        assert file_cache._upload_path.call_count == 1
+        assert ticks == 5  # The event loop kept running during the upload
+        assert await file_cache.get_or_upload_bytes(b"%PDF-1.4 test") is first
+        assert file_cache.stats() == {"cached": 1, "uploads": 1, "reuses": 2}
+
+    @pytest.mark.asyncio
+    async def test_expired_or_invalidated_handle_is_reuploaded(self, tmp_path, file_cache):
+        from datetime import datetime, timedelta, timezone
+        from backend.reasoning.gemini_file_cache import sha256_file
+
+        pdf = tmp_path / "policy.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test")
+        sha = sha256_file(pdf)
+
+        first = await file_cache.get_or_upload(pdf)
+        file_cache._files[sha] = (first, datetime.now(timezone.utc) + timedelta(minutes=30))
+        await file_cache.get_or_upload(pdf)
+        file_cache.invalidate(sha)
+        await file_cache.get_or_upload(pdf)
+
+        assert file_cache._upload_path.call_count == 3
+
+
 class TestCignaDigitizedPolicyLoading:
     """Test that the real Cigna policy loads correctly."""
 
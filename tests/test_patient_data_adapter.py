@@ -8,6 +8,8 @@ import pytest
 from backend.policy_digitalization.patient_data_adapter import (
     normalize_patient_data,
     NormalizedPatientData,
+    NormalizedLabResult,
+    NormalizedScreening,
 )
 
 
@@ -110,3 +112,66 @@ class TestNormalizePatientData:
         assert result.diagnosis_codes == ["K50.10"]
         assert result.prior_treatments == []
         assert result.completed_screenings == []
+
+
+class TestLookupIndexes:
+    def test_lab_index_built_on_normalize(self, david_c_raw):
+        result = normalize_patient_data(david_c_raw)
+        index = result.lab_index()
+        assert index.results is result.lab_results
+        for name, positions in index.by_name.items():
+            assert all(result.lab_results[p].test_name.lower() == name for p in positions)
+        for loinc, positions in index.by_loinc.items():
+            assert positions == sorted(positions)
+            assert all(result.lab_results[p].loinc_code == loinc for p in positions)
+
+    def test_lab_index_tokens(self):
+        patient = NormalizedPatientData(lab_results=[
+            NormalizedLabResult(test_name="C-Reactive Protein", loinc_code="1988-5"),
+            NormalizedLabResult(test_name="Serum Albumin"),
+        ])
+        index = patient.lab_index()
+        assert index.by_loinc == {"1988-5": [0]}
+        assert index.by_token["albumin"] == {"serum albumin"}
+
+    def test_lab_index_rebuilt_after_change(self):
+        patient = NormalizedPatientData(lab_results=[NormalizedLabResult(test_name="CRP")])
+        assert list(patient.lab_index().by_name) == ["crp"]
+        patient.lab_results.append(NormalizedLabResult(test_name="ESR"))
+        assert list(patient.lab_index().by_name) == ["crp", "esr"]
+        updated = patient.model_copy(update={"lab_results": [NormalizedLabResult(test_name="TSH")]})
+        assert list(updated.lab_index().by_name) == ["tsh"]
+
+    def test_indexes_follow_same_length_replacement(self):
+        patient = NormalizedPatientData(
+            lab_results=[NormalizedLabResult(test_name="CRP", loinc_code="1988-5")],
+            completed_screenings=[NormalizedScreening(screening_type="tb", completed=True)],
+        )
+        assert patient.lab_index().by_loinc == {"1988-5": [0]}
+        assert patient.screening_index().by_type == {"tb": 0}
+
+        patient.lab_results[0] = NormalizedLabResult(test_name="ESR", loinc_code="4537-7")
+        patient.completed_screenings[0].screening_type = "hepatitis_b"
+        assert patient.lab_index().by_loinc == {"4537-7": [0]}
+        assert patient.screening_index().by_type == {"hepatitis_b": 0}
+
+    def test_copies_do_not_share_indexes(self):
+        patient = NormalizedPatientData(lab_results=[NormalizedLabResult(test_name="CRP")])
+        copied = patient.model_copy()
+        copied.lab_results = [NormalizedLabResult(test_name="TSH")]
+        assert list(copied.lab_index().by_name) == ["tsh"]
+        assert list(patient.lab_index().by_name) == ["crp"]
+        assert patient._indexes is not copied._indexes
+
+    def test_screening_index_first_seen(self):
+        patient = NormalizedPatientData(completed_screenings=[
+            NormalizedScreening(screening_type="tb", completed=False),
+            NormalizedScreening(screening_type="TB", completed=True),
+            NormalizedScreening(screening_type="hepatitis_b", completed=True),
+        ])
+        assert patient.screening_index().by_type == {"tb": 0, "hepatitis_b": 2}
+
+    def test_indexes_do_not_affect_equality(self, david_c_raw):
+        indexed = normalize_patient_data(david_c_raw)
+        plain = NormalizedPatientData(**indexed.model_dump())
+        assert indexed == plain
@@ -0,0 +1,79 @@
+"""Tests for the cached patient store."""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from backend.storage.patient_store import PatientStore
+
+PATIENTS_DIR = Path("data/patients")
+
+
+@pytest.fixture
+def store(tmp_path):
+    for name in ("david_c.json", "maria_r.json"):
+        shutil.copy(PATIENTS_DIR / name, tmp_path / name)
+    return PatientStore(tmp_path)
+
+
+def _bump_mtime(path: Path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestPatientStore:
+    def test_list_and_missing(self, store):
+        assert store.list_ids() == ["david_c", "maria_r"]
+        assert store.get_raw("nobody") is None
+        assert store.get_normalized("nobody") is None
+
+    def test_cached_until_file_changes(self, store):
+        first = store.get_raw("david_c", copy=False)
+        assert store.get_raw("david_c", copy=False) is first
+        assert store.reads == 1 and store.hits == 1
+
+    def test_copies_are_private(self, store):
+        data = store.get_raw("david_c")
+        data["demographics"]["first_name"] = "Changed"
+        assert store.get_raw("david_c")["demographics"]["first_name"] != "Changed"
+
+    def test_touch_keeps_normalized(self, store):
+        normalized = store.get_normalized("david_c")
+        _bump_mtime(store.path_for("david_c"))
+        assert store.get_normalized("david_c") is normalized
+        assert store.reads == 2  # Re-read to compare content hashes, not re-parsed
+
+    def test_content_change_invalidates(self, store):
+        normalized = store.get_normalized("david_c")
+        path = store.path_for("david_c")
+        data = json.loads(path.read_text())
+        data["demographics"]["gender"] = "other"
+        path.write_text(json.dumps(data))
+        _bump_mtime(path)
+        updated = store.get_normalized("david_c")
+        assert updated is not normalized
+        assert updated.gender == "other"
+
+    def test_save_writes_through(self, store):
+        data = store.get_raw("maria_r")
+        data["corrections"] = [{"field": "x"}]
+        store.save("maria_r", data)
+        reads = store.reads
+        assert store.get_raw("maria_r", copy=False)["corrections"] == [{"field": "x"}]
+        assert store.reads == reads
+        assert json.loads(store.path_for("maria_r").read_text())["corrections"] == [{"field": "x"}]
+
+    def test_rejects_path_traversal(self, store):
+        with pytest.raises(ValueError):
+            store.get_raw("../secrets")
+
+    @pytest.mark.asyncio
+    async def test_load_many(self, store):
+        raw = await store.load_many()
+        assert sorted(raw) == ["david_c", "maria_r"]
+        normalized = await store.load_many_normalized(["maria_r", "nobody"])
+        assert list(normalized) == ["maria_r"]
+        assert normalized["maria_r"] is store.get_normalized("maria_r")
@@ -0,0 +1,225 @@
+"""Tests for the deterministic-first path of PolicyReasoner.assess_coverage.
+
+The LLM gateway is mocked; no LLM calls are made.
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, patch, MagicMock
+
+import pytest
+
+from backend.config.settings import get_settings
+from backend.models.enums import CoverageStatus
+from backend.models.policy_schema import DigitizedPolicy
+from backend.reasoning.policy_reasoner import PolicyReasoner
+
+MEDICATION_INFO = {"medication_name": "infliximab"}
+
+
+@pytest.fixture
+def cigna_policy():
+    with open(Path("data/policies/cigna_infliximab_digitized.json")) as f:
+        return DigitizedPolicy(**json.load(f))
+
+
+@pytest.fixture
+def patient_store(tmp_path):
+    from backend.storage.patient_store import PatientStore
+
+    store = PatientStore(tmp_path)
+    with patch("backend.storage.patient_store.get_patient_store", return_value=store):
+        yield store
+
+
+def _load_patient(patient_id):
+    with open(Path("data/patients") / f"{patient_id}.json") as f:
+        return json.load(f)
+
+
+def _without_exclusions_or_step_therapy(policy):
+    # No exclusions or step therapy left to review, so MET can stand alone
+    data = policy.model_dump()
+    data["exclusions"] = []
+    data["step_therapy_requirements"] = []
+    return DigitizedPolicy(**data)
+
+
+def _patient_info(store, patient):
+    """Store the patient's record; returns the partial patient_info the case orchestrator passes."""
+    store.save(patient["patient_id"], patient)
+    return {
+        "patient_id": patient["patient_id"],
+        "demographics": patient.get("demographics", {}),
+        "clinical_profile": {},
+        "insurance": patient.get("insurance", {}),
+    }
+
+
+def _make_reasoner(llm_result=None):
+    gateway = MagicMock()
+    gateway.analyze_policy = AsyncMock(return_value=llm_result or {})
+    with patch("backend.reasoning.policy_reasoner.get_llm_gateway", return_value=gateway):
+        reasoner = PolicyReasoner()
+    return reasoner, gateway
+
+
+def _settings(**overrides):
+    return patch(
+        "backend.reasoning.policy_reasoner.get_settings",
+        return_value=get_settings().model_copy(update=overrides),
+    )
+
+
+class TestDeterministicFastPath:
+    @pytest.mark.asyncio
+    async def test_decisive_met_skips_llm(self, cigna_policy, patient_store):
+        policy = _without_exclusions_or_step_therapy(cigna_policy)
+        reasoner, gateway = _make_reasoner()
+
+        with _settings(coverage_fast_path_max_insufficient=100):
+            assessment = await reasoner.assess_coverage(
+                _patient_info(patient_store, _load_patient("david_c")), MEDICATION_INFO, "cigna",
+                digitized_policy=policy,
+            )
+
+        gateway.analyze_policy.assert_not_called()
+        assert assessment.coverage_status == CoverageStatus.COVERED
+        assert assessment.llm_raw_response is None
+        assert assessment.criteria_total_count == len(assessment.criteria_assessments) > 0
+        assert all(c.criterion_id in policy.atomic_criteria for c in assessment.criteria_assessments)
+
+    @pytest.mark.asyncio
+    async def test_decisive_met_on_shipped_policy(self, cigna_policy, patient_store):
+        # Unmodified policy: its concurrent-biologic exclusion is unresolved (tolerated, reported
+        # as a gap) and only the Crohn's step therapy requirement applies to the MET indication
+        patient = _load_patient("david_c")
+        patient["prior_treatments"][1]["drug_class"] = "Systemic corticosteroids"
+        reasoner, gateway = _make_reasoner()
+
+        # The two INSUFFICIENT_DATA criteria are unused alternatives to step therapy
+        with _settings(coverage_fast_path_max_insufficient=2):
+            assessment = await reasoner.assess_coverage(
+                _patient_info(patient_store, patient), MEDICATION_INFO, "cigna", digitized_policy=cigna_policy,
+            )
+
+        gateway.analyze_policy.assert_not_called()
+        assert assessment.coverage_status == CoverageStatus.COVERED
+        assert assessment.step_therapy_satisfied
+        exclusion_gaps = [g for g in assessment.documentation_gaps if g.gap_type == "exclusion_review"]
+        assert [g.required_for for g in exclusion_gaps] == [["CRIT_CONCURRENT_BIOLOGIC"]]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("overrides", [
+        {"coverage_fast_path_exclusion_verdicts": ["not_applicable"]},  # Unresolved exclusions escalate
+        {"coverage_fast_path_max_insufficient": 1},
+    ])
+    async def test_shipped_policy_escalates(self, cigna_policy, patient_store, overrides):
+        patient = _load_patient("david_c")
+        patient["prior_treatments"][1]["drug_class"] = "Systemic corticosteroids"
+        reasoner, gateway = _make_reasoner({"coverage_status": "requires_pa", "approval_likelihood": 0.6})
+
+        with _settings(**{"coverage_fast_path_max_insufficient": 2, **overrides}):
+            await reasoner.assess_coverage(
+                _patient_info(patient_store, patient), MEDICATION_INFO, "cigna", digitized_policy=cigna_policy,
+            )
+
+        gateway.analyze_policy.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_decisive_not_met_maps_to_human_review(self, cigna_policy, patient_store):
+        reasoner, gateway = _make_reasoner()
+
+        with _settings(coverage_fast_path_max_insufficient=100):
+            assessment = await reasoner.assess_coverage(
+                _patient_info(patient_store, _load_patient("maria_r")), MEDICATION_INFO, "cigna",
+                digitized_policy=cigna_policy,
+            )
+
+        gateway.analyze_policy.assert_not_called()
+        assert assessment.coverage_status == CoverageStatus.REQUIRES_HUMAN_REVIEW
+        assert assessment.documentation_gaps
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_escalates_with_resolved_criteria(self, cigna_policy, patient_store):
+        llm_result = {"coverage_status": "requires_pa", "approval_likelihood": 0.6, "criteria_assessments": []}
+        reasoner, gateway = _make_reasoner(llm_result)
+
+        assessment = await reasoner.assess_coverage(
+            _patient_info(patient_store, _load_patient("maria_r")), MEDICATION_INFO, "cigna",
+                digitized_policy=cigna_policy,
+        )
+
+        gateway.analyze_policy.assert_awaited_once()
+        assert "Deterministic Pre-Evaluation" in gateway.analyze_policy.call_args.kwargs["prompt"]
+        deterministic = [c for c in assessment.criteria_assessments if c.reasoning.startswith("[DETERMINISTIC]")]
+        assert deterministic
+
+    @pytest.mark.asyncio
+    async def test_fast_path_disabled_always_calls_llm(self, cigna_policy, patient_store):
+        llm_result = {"coverage_status": "requires_pa", "approval_likelihood": 0.6, "criteria_assessments": []}
+        reasoner, gateway = _make_reasoner(llm_result)
+
+        with _settings(coverage_fast_path_enabled=False, coverage_fast_path_max_insufficient=100):
+            await reasoner.assess_coverage(
+                _patient_info(patient_store, _load_patient("maria_r")), MEDICATION_INFO, "cigna",
+                digitized_policy=cigna_policy,
+            )
+
+        gateway.analyze_policy.assert_awaited_once()
+        assert "Deterministic Pre-Evaluation" not in gateway.analyze_policy.call_args.kwargs["prompt"]
+
+    @pytest.mark.asyncio
+    async def test_without_stored_record_calls_llm(self, cigna_policy, patient_store):
+        # The raw record, but no stored file to evaluate: partial data must not be treated as final
+        llm_result = {"coverage_status": "requires_pa", "approval_likelihood": 0.6, "criteria_assessments": []}
+        reasoner, gateway = _make_reasoner(llm_result)
+
+        with _settings(coverage_fast_path_max_insufficient=100):
+            await reasoner.assess_coverage(
+                _load_patient("maria_r"), MEDICATION_INFO, "cigna", digitized_policy=cigna_policy,
+            )
+
+        gateway.analyze_policy.assert_awaited_once()
+        assert "Deterministic Pre-Evaluation" not in gateway.analyze_policy.call_args.kwargs["prompt"]
+
+    @pytest.mark.asyncio
+    async def test_policy_analyzer_inputs_use_stored_record(self, cigna_policy, patient_store):
+        from backend.agents.policy_analyzer import PolicyAnalyzerAgent
+        from backend.models.case_state import CaseState, MedicationRequest, PatientInfo, PayerState
+
+        raw = _load_patient("david_c")
+        _patient_info(patient_store, raw)
+        case = CaseState(
+            patient=PatientInfo(
+                patient_id=raw["patient_id"],
+                first_name=raw["demographics"]["first_name"],
+                last_name=raw["demographics"]["last_name"],
+                date_of_birth=raw["demographics"]["date_of_birth"],
+                primary_payer="cigna",
+                primary_member_id="M1",
+                diagnosis_codes=[d["icd10_code"] for d in raw["diagnoses"]],
+            ),
+            medication=MedicationRequest(
+                medication_name="infliximab", generic_name="infliximab", ndc_code="", dose="5 mg/kg",
+                frequency="q8w", route="IV", duration="12 months", diagnosis="Crohn's disease",
+                icd10_code=raw["diagnoses"][0]["icd10_code"], prescriber_npi="", prescriber_name="",
+                clinical_rationale="",
+            ),
+            payer_states={"cigna": PayerState(payer_name="cigna")},
+        )
+        reasoner, gateway = _make_reasoner()
+        pipeline = MagicMock()
+        pipeline.get_or_digitalize = AsyncMock(return_value=_without_exclusions_or_step_therapy(cigna_policy))
+        with patch("backend.agents.policy_analyzer.get_policy_reasoner", return_value=reasoner):
+            agent = PolicyAnalyzerAgent(write_waypoints=False)
+
+        with _settings(coverage_fast_path_max_insufficient=100), \
+                patch("backend.agents.policy_analyzer.get_patient_store", return_value=patient_store), \
+                patch("backend.policy_digitalization.pipeline.get_digitalization_pipeline", return_value=pipeline):
+            assessments = await agent.analyze_all_payers(case)
+
+        # Decided on david_c's full record (as test_decisive_met_skips_llm); the analyzer's
+        # reshaped patient_info has no demographics section, so his age would be unknown
+        gateway.analyze_policy.assert_not_called()
+        assert assessments["cigna"].coverage_status == CoverageStatus.COVERED
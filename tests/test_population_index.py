@@ -0,0 +1,112 @@
+"""Tests for the patient population and active-case cohort indexes."""
+
+import json
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.storage.models import Base, CaseModel
+from backend.storage.patient_store import PatientStore
+from backend.storage.population_index import CaseCohortIndex, PatientPopulationIndex, icd10_family
+
+PATIENTS_DIR = Path("data/patients")
+
+
+@pytest.fixture
+def patients_dir(tmp_path):
+    for name in ("david_c.json", "maria_r.json"):
+        shutil.copy(PATIENTS_DIR / name, tmp_path / name)
+    return tmp_path
+
+
+@pytest.fixture
+def index(patients_dir):
+    return PatientPopulationIndex(PatientStore(patients_dir))
+
+
+class TestPatientPopulationIndex:
+    def test_icd10_family(self):
+        assert icd10_family("K50.913") == "K50"
+        assert icd10_family(" k50 ") == "K50"
+        assert icd10_family(None) == ""
+
+    def test_payer_medication_lookup(self, index):
+        # Brand and generic names both match, case-insensitively
+        assert index.patient_ids(payer="cigna", medication="infliximab") == ["david_c", "maria_r"]
+        assert index.patient_ids(payer="Cigna", medication="Remicade") == ["maria_r"]
+        assert index.patient_ids(medication="inflectra") == ["david_c"]
+        assert index.patient_ids(payer="aetna") == []
+        assert index.patient_ids() == ["david_c", "maria_r"]
+
+    def test_icd_family_lookup(self, index):
+        assert index.patient_ids(icd10_family="K50") == ["david_c", "maria_r"]
+        assert index.patient_ids(icd10_family="D50.9") == ["maria_r"]
+        assert index.patient_ids(payer="cigna", icd10_family="K60") == ["maria_r"]
+
+    def test_refresh_reindexes_only_changed_files(self, index, patients_dir):
+        assert index.refresh() == 2
+        assert index.refresh() == 0
+
+        path = patients_dir / "david_c.json"
+        data = json.loads(path.read_text())
+        data["insurance"]["primary"]["payer_name"] = "Aetna"
+        path.write_text(json.dumps(data))
+
+        assert index.refresh() == 1
+        assert index.patient_ids(payer="aetna") == ["david_c"]
+        assert index.patient_ids(payer="cigna") == ["maria_r"]
+
+    def test_deleted_file_drops_out(self, index, patients_dir):
+        assert index.patient_ids(icd10_family="K50") == ["david_c", "maria_r"]
+        (patients_dir / "maria_r.json").unlink()
+
+        assert index.patient_ids(icd10_family="K50") == ["david_c"]
+        summary = index.summary()
+        assert summary["patients"] == 1
+        assert "D50" not in summary["by_icd10_family"]
+
+
+class TestCaseCohortIndex:
+    @pytest.mark.asyncio
+    async def test_active_cases_follow_updates(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cases.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        now = datetime.now(timezone.utc)
+
+        def make_case(case_id, stage, payer, medication, updated_at):
+            return CaseModel(
+                id=case_id, stage=stage, updated_at=updated_at,
+                medication_data={"medication_name": medication},
+                payer_states={payer: {"status": "pending"}},
+            )
+
+        index = CaseCohortIndex()
+        try:
+            async with session_factory() as session:
+                session.add_all([
+                    make_case("c1", "intake", "Cigna", "Infliximab", now),
+                    make_case("c2", "strategy_selection", "Cigna", "infliximab", now + timedelta(seconds=1)),
+                    make_case("c3", "completed", "Cigna", "infliximab", now),
+                    make_case("c4", "intake", "Aetna", "infliximab", now),
+                ])
+                await session.commit()
+
+                cases = await index.active_cases(session, "cigna", "infliximab")
+                assert [c.id for c in cases] == ["c2", "c1"]
+
+                # Moving a case to a terminal stage drops it on the next lookup
+                case = await session.get(CaseModel, "c1")
+                case.stage = "completed"
+                case.updated_at = now + timedelta(seconds=5)
+                await session.commit()
+
+                cases = await index.active_cases(session, "cigna", "infliximab")
+                assert [c.id for c in cases] == ["c2"]
+                assert [c.id for c in await index.active_cases(session, "aetna", "infliximab")] == ["c4"]
+        finally:
+            await engine.dispose()